@@ -11,10 +11,11 @@ Adapted from https://github.com/pyQode/pyqode.core/blob/master/pyqode/core/api/p
 """
 from qtpy.QtWidgets import QWidget, QApplication
 from qtpy.QtGui import QBrush, QColor, QPen, QPainter
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QEvent
 
 from spyder.api.mode import Mode
 from spyder.config.base import debug_print
+from spyder.utils.instrumentation import INSTRUMENTATION
 
 
 class Panel(QWidget, Mode):
@@ -101,6 +102,13 @@ class Panel(QWidget, Mode):
         if self.position == self.Position.FLOATING:
             self.setAttribute(Qt.WA_TransparentForMouseEvents)
 
+    def event(self, event):
+        """Records the time spent painting the panel when instrumented."""
+        if INSTRUMENTATION.enabled and event.type() == QEvent.Paint:
+            with INSTRUMENTATION.measure('panel.' + type(self).__name__):
+                return super(Panel, self).event(event)
+        return super(Panel, self).event(event)
+
     def paintEvent(self, event):
         """Fills the panel background using QPalette."""
         if self.isVisible() and self.position != self.Position.FLOATING:
@@ -16,7 +16,7 @@ import inspect
 import os
 
 # Third party imports
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import QEventLoop, Qt, Signal
 from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import QApplication, QMainWindow
 
@@ -168,6 +168,16 @@ class PluginWidget(BasePluginWidget):
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         QApplication.processEvents()
 
+    def long_process_progress(self, message):
+        """
+        Update the message shown in main window's status bar.
+
+        User input is left pending until the process ends, since the
+        process is still running.
+        """
+        self.show_message(message)
+        QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+
     def ending_long_process(self, message=""):
         """Clear main window's status bar and restore mouse cursor."""
         QApplication.restoreOverrideCursor()
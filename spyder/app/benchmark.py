@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Startup time benchmark for Spyder
+
+Spyder records how long each startup phase takes (importing the main window,
+setting it up, registering every plugin and reaching the event loop) when
+the SPYDER_STARTUP_BENCHMARK environment variable points to a file. This
+module also provides a command line harness that starts Spyder headless
+several times, collects those timings together with per-module import costs
+and checks them against a budget:
+
+    python -m spyder.app.benchmark --runs 3 --budget budget.json
+
+The budget is a JSON file like this one (all keys are optional, times are
+in seconds):
+
+    {"total": 15, "phases": {"setup": 10},
+     "plugins": {"Editor": 2}, "imports": {"spyder.app.mainwindow": 3}}
+"""
+
+from __future__ import print_function
+
+from contextlib import contextmanager
+import json
+import optparse
+import os
+import os.path as osp
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from spyder.py3compat import PY2
+
+
+# Environment variable used to ask Spyder to dump its startup timings
+BENCHMARK_ENV = 'SPYDER_STARTUP_BENCHMARK'
+
+# Highest resolution clock available (Python 2 doesn't have perf_counter)
+clock = getattr(time, 'perf_counter', time.time)
+TimeoutExpired = getattr(subprocess, 'TimeoutExpired', OSError)
+
+# Lines printed by Python's -X importtime option
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|'
+                           r'(\s*)(\S+)')
+
+
+class StartupTimer(object):
+    """Record the duration of Spyder's startup phases and plugins."""
+
+    def __init__(self):
+        self.enabled = bool(os.environ.get(BENCHMARK_ENV))
+        self.t0 = clock()
+        self.phases = []
+        self.plugins = []
+
+    def reset(self):
+        """Start measuring again from now."""
+        self.t0 = clock()
+        self.phases = []
+        self.plugins = []
+
+    def elapsed(self):
+        """Return the time elapsed since the timer was started."""
+        return clock() - self.t0
+
+    @contextmanager
+    def phase(self, name):
+        """Time the code executed inside this context as phase *name*."""
+        t0 = clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, clock() - t0))
+
+    @contextmanager
+    def plugin(self, plugin):
+        """Time the registration of *plugin*."""
+        t0 = clock()
+        try:
+            yield
+        finally:
+            self.plugins.append((plugin.__class__.__name__, clock() - t0))
+
+    def to_dict(self):
+        """Return recorded timings as a dictionary."""
+        return {'total': self.elapsed(),
+                'phases': dict(self.phases),
+                'plugins': dict(self.plugins)}
+
+    def dump(self, filename=None):
+        """Save recorded timings as JSON to *filename*."""
+        if filename is None:
+            filename = os.environ.get(BENCHMARK_ENV)
+        with open(filename, 'w') as fd:
+            json.dump(self.to_dict(), fd, indent=2, sort_keys=True)
+
+
+STARTUP_TIMER = StartupTimer()
+
+
+#==============================================================================
+# Results analysis
+#==============================================================================
+def parse_importtime(text):
+    """
+    Parse the output of Python's -X importtime option.
+
+    Returns a dictionary mapping module names to their cumulative import
+    time in seconds.
+    """
+    imports = {}
+    for line in text.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match is not None:
+            cumulative, module = int(match.group(2)), match.group(4)
+            imports[module] = max(imports.get(module, 0), cumulative / 1e6)
+    return imports
+
+
+def summarize(runs):
+    """
+    Summarize several startup *runs*.
+
+    The first run is considered cold and the median of the remaining ones
+    warm. Phase, plugin and import times are taken from warm runs when
+    available.
+    """
+    if not runs:
+        return {}
+    warm = runs[1:] or runs
+
+    def median(values):
+        values = sorted(values)
+        middle = len(values) // 2
+        if len(values) % 2:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2.
+
+    def merge(key):
+        names = set()
+        for run in warm:
+            names.update(run.get(key, {}))
+        return dict((name, median([run.get(key, {}).get(name, 0)
+                                   for run in warm]))
+                    for name in names)
+
+    return {'cold': runs[0]['total'],
+            'warm': median([run['total'] for run in warm]),
+            'total': median([run['total'] for run in warm]),
+            'phases': merge('phases'),
+            'plugins': merge('plugins'),
+            'imports': merge('imports'),
+            'runs': runs}
+
+
+def check_budget(results, budget):
+    """
+    Check summarized *results* against *budget*.
+
+    Returns a list of (name, measured, allowed) tuples, one for every entry
+    exceeding its budget.
+    """
+    violations = []
+    for key in ('total', 'cold', 'warm'):
+        if key in budget and results.get(key, 0) > budget[key]:
+            violations.append((key, results[key], budget[key]))
+    for key in ('phases', 'plugins', 'imports'):
+        measured = results.get(key, {})
+        for name, allowed in sorted(budget.get(key, {}).items()):
+            if measured.get(name, 0) > allowed:
+                violations.append(("%s:%s" % (key, name), measured[name],
+                                   allowed))
+    return violations
+
+
+#==============================================================================
+# Harness
+#==============================================================================
+def run_once(conf_dir, pycache_dir=None, timeout=300):
+    """
+    Start Spyder headless in a subprocess and return its startup timings.
+
+    *conf_dir* is used as configuration directory so that user settings
+    are left untouched; *pycache_dir* as bytecode cache (Python 3.8+).
+    """
+    fd, filename = tempfile.mkstemp(suffix='.json', prefix='spyder-bench-')
+    os.close(fd)
+    env = os.environ.copy()
+    env[BENCHMARK_ENV] = filename
+    env['XDG_CONFIG_HOME'] = conf_dir
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    if pycache_dir is not None:
+        env['PYTHONPYCACHEPREFIX'] = pycache_dir
+    command = [sys.executable]
+    if sys.version_info >= (3, 7):
+        command += ['-X', 'importtime']
+    command += ['-c', 'from spyder.app import start; start.main()',
+                '--new-instance']
+    t0 = clock()
+    proc = subprocess.Popen(command, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE)
+    try:
+        if PY2:
+            _out, err = proc.communicate()
+        else:
+            _out, err = proc.communicate(timeout=timeout)
+        process_time = clock() - t0
+        with open(filename) as fp:
+            result = json.load(fp)
+    except (IOError, OSError, ValueError, TimeoutExpired):
+        raise RuntimeError("Spyder didn't report its startup timings")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        os.remove(filename)
+    result['process'] = process_time
+    result['imports'] = parse_importtime(err.decode('utf-8', 'replace'))
+    return result
+
+
+def run_benchmark(runs=3, timeout=300):
+    """Run Spyder *runs* times (the first one cold) and summarize results."""
+    tmpdir = tempfile.mkdtemp(prefix='spyder-bench-')
+    try:
+        conf_dir = osp.join(tmpdir, 'config')
+        pycache_dir = osp.join(tmpdir, 'pycache')
+        os.mkdir(conf_dir)
+        results = [run_once(conf_dir, pycache_dir, timeout)
+                   for _i in range(max(runs, 1))]
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return summarize(results)
+
+
+def print_report(results, violations, top=15, file=sys.stdout):
+    """Print a human readable summary of *results*."""
+    print("Cold startup: %.2f s" % results['cold'], file=file)
+    print("Warm startup: %.2f s" % results['warm'], file=file)
+    for key in ('phases', 'plugins', 'imports'):
+        items = sorted(results[key].items(), key=lambda item: -item[1])
+        if items:
+            print("\nSlowest %s:" % key, file=file)
+            for name, value in items[:top]:
+                print("  %-45s %8.3f s" % (name, value), file=file)
+    if violations:
+        print("\nBudget exceeded:", file=file)
+        for name, measured, allowed in violations:
+            print("  %-45s %8.3f s > %.3f s" % (name, measured, allowed),
+                  file=file)
+
+
+def main():
+    """Command line entry point"""
+    parser = optparse.OptionParser(usage="python -m spyder.app.benchmark "
+                                         "[options]")
+    parser.add_option('-n', '--runs', type=int, default=3,
+                      help="Number of Spyder starts (the first one is cold)")
+    parser.add_option('-o', '--output', default=None,
+                      help="Save results as JSON to this file")
+    parser.add_option('-b', '--budget', default=None,
+                      help="JSON file with the allowed time budget")
+    parser.add_option('--max-startup', type=float, default=None,
+                      help="Maximum allowed warm startup time (seconds)")
+    parser.add_option('--timeout', type=int, default=300,
+                      help="Seconds to wait for each Spyder start")
+    options, _args = parser.parse_args()
+
+    results = run_benchmark(options.runs, options.timeout)
+    budget = {}
+    if options.budget is not None:
+        with open(options.budget) as fd:
+            budget = json.load(fd)
+    if options.max_startup is not None:
+        budget['warm'] = options.max_startup
+    violations = check_budget(results, budget)
+    results['violations'] = violations
+
+    if options.output is not None:
+        with open(options.output, 'w') as fd:
+            json.dump(results, fd, indent=2, sort_keys=True)
+    print_report(results, violations)
+    if violations:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
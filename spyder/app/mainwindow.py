@@ -41,6 +41,13 @@ import traceback
 ORIGINAL_SYS_EXIT = sys.exit
 
 
+#==============================================================================
+# Startup timings (only saved when benchmarking, see spyder.app.benchmark)
+#==============================================================================
+from spyder.app.benchmark import clock, STARTUP_TIMER
+MAINWINDOW_IMPORT_T0 = clock()
+
+
 #==============================================================================
 # Check requirements
 #==============================================================================
@@ -317,6 +324,7 @@ class MainWindow(QMainWindow):
         self.ipyconsole = None
         self.variableexplorer = None
         self.findinfiles = None
+        self.instrumentation = None
         self.thirdparty_plugins = []
 
         # Tour  # TODO: Should I consider it a plugin?? or?
@@ -396,6 +404,7 @@ class MainWindow(QMainWindow):
         # Status bar widgets
         self.mem_status = None
         self.cpu_status = None
+        self.kernel_status = None
 
         # Toolbars
         self.visible_toolbars = []
@@ -525,6 +534,11 @@ class MainWindow(QMainWindow):
         self.toolbarslist.append(toolbar)
         return toolbar
 
+    def register_plugin(self, plugin):
+        """Register *plugin* in the main window, timing its registration"""
+        with STARTUP_TIMER.plugin(plugin):
+            plugin.register_plugin()
+
     def setup(self):
         """Setup main window"""
         self.debug_print("*** Start of MainWindow setup ***")
@@ -804,13 +818,13 @@ class MainWindow(QMainWindow):
                                     "internals with the following commands:\n"
                                     "  spy.app, spy.window, dir(spy)\n\n"
                                     "Please don't use it to run your code\n\n"))
-        self.console.register_plugin()
+        self.register_plugin(self.console)
 
         # Working directory plugin
         self.debug_print("  ..plugin: working directory")
         from spyder.plugins.workingdirectory import WorkingDirectory
         self.workingdirectory = WorkingDirectory(self, self.init_workdir, main=self)
-        self.workingdirectory.register_plugin()
+        self.register_plugin(self.workingdirectory)
         self.toolbarslist.append(self.workingdirectory.toolbar)
 
         # Help plugin
@@ -818,7 +832,7 @@ class MainWindow(QMainWindow):
             self.set_splash(_("Loading help..."))
             from spyder.plugins.help import Help
             self.help = Help(self)
-            self.help.register_plugin()
+            self.register_plugin(self.help)
 
         # Outline explorer widget
         if CONF.get('outline_explorer', 'enable'):
@@ -827,13 +841,13 @@ class MainWindow(QMainWindow):
             fullpath_sorting = CONF.get('editor', 'fullpath_sorting', True)
             self.outlineexplorer = OutlineExplorer(self,
                                         fullpath_sorting=fullpath_sorting)
-            self.outlineexplorer.register_plugin()
+            self.register_plugin(self.outlineexplorer)
 
         # Editor plugin
         self.set_splash(_("Loading editor..."))
         from spyder.plugins.editor import Editor
         self.editor = Editor(self)
-        self.editor.register_plugin()
+        self.register_plugin(self.editor)
 
         # Populating file menu entries
         quit_action = create_action(self, _("&Quit"),
@@ -860,27 +874,27 @@ class MainWindow(QMainWindow):
         self.set_splash(_("Loading namespace browser..."))
         from spyder.plugins.variableexplorer import VariableExplorer
         self.variableexplorer = VariableExplorer(self)
-        self.variableexplorer.register_plugin()
+        self.register_plugin(self.variableexplorer)
 
         # History log widget
         if CONF.get('historylog', 'enable'):
             self.set_splash(_("Loading history plugin..."))
             from spyder.plugins.history import HistoryLog
             self.historylog = HistoryLog(self)
-            self.historylog.register_plugin()
+            self.register_plugin(self.historylog)
 
         # IPython console
         self.set_splash(_("Loading IPython console..."))
         from spyder.plugins.ipythonconsole import IPythonConsole
         self.ipyconsole = IPythonConsole(self)
-        self.ipyconsole.register_plugin()
+        self.register_plugin(self.ipyconsole)
 
         # Explorer
         if CONF.get('explorer', 'enable'):
             self.set_splash(_("Loading file explorer..."))
             from spyder.plugins.explorer import Explorer
             self.explorer = Explorer(self)
-            self.explorer.register_plugin()
+            self.register_plugin(self.explorer)
 
         # Online help widget
         try:    # Qt >= v4.4
@@ -890,20 +904,27 @@ class MainWindow(QMainWindow):
         if CONF.get('onlinehelp', 'enable') and OnlineHelp is not None:
             self.set_splash(_("Loading online help..."))
             self.onlinehelp = OnlineHelp(self)
-            self.onlinehelp.register_plugin()
+            self.register_plugin(self.onlinehelp)
 
         # Project explorer widget
         self.set_splash(_("Loading project explorer..."))
         from spyder.plugins.projects import Projects
         self.projects = Projects(self)
-        self.projects.register_plugin()
+        self.register_plugin(self.projects)
         self.project_path = self.projects.get_pythonpath(at_start=True)
 
         # Find in files
         if CONF.get('find_in_files', 'enable'):
             from spyder.plugins.findinfiles import FindInFiles
             self.findinfiles = FindInFiles(self)
-            self.findinfiles.register_plugin()
+            self.register_plugin(self.findinfiles)
+
+        # Performance (see spyder/utils/instrumentation.py)
+        from spyder.utils.instrumentation import INSTRUMENTATION
+        if INSTRUMENTATION.enabled:
+            from spyder.plugins.instrumentation import Instrumentation
+            self.instrumentation = Instrumentation(self)
+            self.register_plugin(self.instrumentation)
 
         # Third-party plugins
         self.set_splash(_("Loading third-party plugins..."))
@@ -912,7 +933,7 @@ class MainWindow(QMainWindow):
                 plugin = mod.PLUGIN_CLASS(self)
                 if plugin.check_compatibility()[0]:
                     self.thirdparty_plugins.append(plugin)
-                    plugin.register_plugin()
+                    self.register_plugin(plugin)
             except Exception as error:
                 print("%s: %s" % (mod, str(error)), file=STDERR)
                 traceback.print_exc(file=STDERR)
@@ -1068,9 +1089,11 @@ class MainWindow(QMainWindow):
         self.help_menu_actions += [MENU_SEPARATOR, about_action]
 
         # Status bar widgets
-        from spyder.widgets.status import MemoryStatus, CPUStatus
+        from spyder.widgets.status import (MemoryStatus, CPUStatus,
+                                           KernelStatus)
         self.mem_status = MemoryStatus(self, status)
         self.cpu_status = CPUStatus(self, status)
+        self.kernel_status = KernelStatus(self, status)
         self.apply_statusbar_settings()
 
         # ----- View
@@ -2170,6 +2193,7 @@ class MainWindow(QMainWindow):
         self.dialog_manager.close_all()
         if self.toolbars_visible:
             self.save_visible_toolbars()
+        CONF.flush()
         self.already_closed = True
         return True
 
@@ -2951,6 +2975,13 @@ class Spy(object):
         return get_versions()
 
 
+def finish_startup_benchmark(app, main):
+    """Save startup timings and close Spyder (used by benchmarks)"""
+    STARTUP_TIMER.dump()
+    main.closing(False)
+    app.quit()
+
+
 def run_spyder(app, options, args):
     """
     Create and show Spyder's main window
@@ -2958,9 +2989,11 @@ def run_spyder(app, options, args):
     """
     #TODO: insert here
     # Main window
-    main = MainWindow(options)
+    with STARTUP_TIMER.phase('constructor'):
+        main = MainWindow(options)
     try:
-        main.setup()
+        with STARTUP_TIMER.phase('setup'):
+            main.setup()
     except BaseException:
         if main.console is not None:
             try:
@@ -2969,8 +3002,10 @@ def run_spyder(app, options, args):
                 pass
         raise
 
-    main.show()
-    main.post_visible_setup()
+    with STARTUP_TIMER.phase('show'):
+        main.show()
+    with STARTUP_TIMER.phase('post_visible_setup'):
+        main.post_visible_setup()
 
     if main.console:
         main.console.shell.interpreter.namespace['spy'] = \
@@ -2993,6 +3028,10 @@ def run_spyder(app, options, args):
     # the window
     app.focusChanged.connect(main.change_last_focused_widget)
 
+    # Save startup timings and quit as soon as the event loop is running
+    if STARTUP_TIMER.enabled:
+        QTimer.singleShot(0, lambda: finish_startup_benchmark(app, main))
+
     if not PYTEST:
         app.exec_()
     return main
@@ -3017,6 +3056,7 @@ def main():
                                      or options.optimize)
 
     app = initialize()
+    STARTUP_TIMER.phases.append(('import', clock() - MAINWINDOW_IMPORT_T0))
     if options.reset_config_files:
         # <!> Remove all configuration files!
         reset_config_files()
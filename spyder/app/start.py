@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+# Start measuring startup time as soon as possible
+from spyder.app.benchmark import STARTUP_TIMER  # analysis:ignore
+
 # Std imports
 import os
 import os.path as osp
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the startup time benchmark
+"""
+
+# Standard library imports
+import json
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.app.benchmark import (check_budget, parse_importtime,
+                                  StartupTimer, summarize)
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     spyder.config.base
+import time:     10000 |     500000 | spyder.app.mainwindow
+Some other line printed on stderr
+"""
+
+
+def test_startup_timer(tmpdir):
+    """Test that phases and plugins are recorded and dumped."""
+    class Editor(object):
+        pass
+
+    timer = StartupTimer()
+    with timer.phase('setup'):
+        with timer.plugin(Editor()):
+            pass
+    filename = str(tmpdir.join('timings.json'))
+    timer.dump(filename)
+    with open(filename) as fd:
+        result = json.load(fd)
+    assert set(result['phases']) == {'setup'}
+    assert set(result['plugins']) == {'Editor'}
+    assert result['total'] >= result['phases']['setup'] >= 0
+
+
+def test_parse_importtime():
+    """Test parsing the output of -X importtime."""
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+    assert imports == {'_io': 120e-6, 'spyder.config.base': 2500e-6,
+                       'spyder.app.mainwindow': 0.5}
+
+
+def test_summarize_and_check_budget():
+    """Test that the cold run is kept apart and the budget is enforced."""
+    runs = [{'total': 10., 'phases': {'setup': 8.}, 'plugins': {},
+             'imports': {}},
+            {'total': 4., 'phases': {'setup': 3.}, 'plugins': {'Editor': 1.},
+             'imports': {'spyder.app.mainwindow': 1.}},
+            {'total': 6., 'phases': {'setup': 5.}, 'plugins': {'Editor': 2.},
+             'imports': {'spyder.app.mainwindow': 2.}}]
+    results = summarize(runs)
+    assert results['cold'] == 10.
+    assert results['warm'] == 5.
+    assert results['phases'] == {'setup': 4.}
+    assert results['plugins'] == {'Editor': 1.5}
+
+    assert check_budget(results, {'warm': 6, 'plugins': {'Editor': 2}}) == []
+    violations = check_budget(results, {'cold': 5, 'phases': {'setup': 1},
+                                        'imports': {'spyder.app.mainwindow':
+                                                    1}})
+    assert [name for name, _measured, _allowed in violations] == [
+        'cold', 'phases:setup', 'imports:spyder.app.mainwindow']
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -118,6 +118,7 @@ DEFAULTS = [
             ('internal_console',
              {
               'max_line_count': 300,
+              'scrollback': True,
               'working_dir_history': 30,
               'working_dir_adjusttocontents': False,
               'wrap': True,
@@ -140,6 +141,8 @@ DEFAULTS = [
             ('console',
              {
               'max_line_count': 500,
+              'max_output_rate': 10000,
+              'scrollback': True,
               'wrap': True,
               'single_tab': True,
               'calltips': True,
@@ -182,7 +185,12 @@ DEFAULTS = [
               'in_prompt': '',
               'out_prompt': '',
               'light_color': True,
-              'dark_color': False
+              'dark_color': False,
+              'monitor/enable': True,
+              'monitor/timeout': 2000,
+              'monitor/memory_limit/enable': False,
+              'monitor/memory_limit': 4096,
+              'monitor/memory_limit/interrupt': False
               }),
             ('variable_explorer',
              {
@@ -210,6 +218,7 @@ DEFAULTS = [
               'todo_list': True,
               'realtime_analysis': True,
               'realtime_analysis/timeout': 2500,
+              'realtime_analysis/incremental': True,
               'outline_explorer': True,
               'line_numbers': True,
               'blank_spaces': False,
@@ -259,6 +268,8 @@ DEFAULTS = [
               'connect/ipython_console': False,
               'math': True,
               'automatic_import': True,
+              'prefetch': True,
+              'prefetch_budget': 200,
               }),
             ('onlinehelp',
              {
@@ -661,15 +672,19 @@ DEFAULTS = [
 # 3. You don't need to touch this value if you're just adding a new option
 CONF_VERSION = '37.2.0'
 
+# Seconds to wait before writing changed options to disk. Options set in
+# the meantime are written together (and pending ones are written at exit)
+CONF_SAVE_DELAY = 1
+
 # Main configuration instance
 try:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=(not TEST),
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, save_delay=CONF_SAVE_DELAY)
 except:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=False,
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, save_delay=CONF_SAVE_DELAY)
 
 # Removing old .spyder.ini location:
 old_location = osp.join(get_home_dir(), '.spyder.ini')
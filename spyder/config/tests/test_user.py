@@ -8,8 +8,13 @@
 Tests for config/user.py
 """
 
+# Standard library imports
+import threading
+
 # Third party imports
 import pytest
+# Writes are only delayed when qtpy is used (i.e. in Spyder's GUI)
+import qtpy.QtCore  # analysis:ignore
 
 # Local imports
 from spyder.config.user import UserConfig
@@ -47,6 +52,53 @@ def test_userconfig_set_with_string(userconfig):
         expected += "[section]\noption = new value\n\n"
     assert iniContents == expected
 
+def test_userconfig_get_returns_cached_copies(userconfig):
+    userconfig.set('section', 'list_option', [1, 2])
+    value = userconfig.get('section', 'list_option')
+    value.append(3)
+    assert userconfig.get('section', 'list_option') == [1, 2]
+    userconfig.set('section', 'list_option', [4])
+    assert userconfig.get('section', 'list_option') == [4]
+
+def test_userconfig_write_behind(qtbot, userconfig, monkeypatch):
+    saves = []
+    save = userconfig._save
+    def counted_save():
+        saves.append(None)
+        save()
+    monkeypatch.setattr(userconfig, '_save', counted_save)
+
+    userconfig.set_save_delay(60)
+    userconfig.set('section', 'option', 'first')
+    userconfig.set('section', 'option', 'second')
+    userconfig.set('section', 'other_option', 3)
+    assert saves == []
+    with open(userconfig.filename()) as inifile:
+        assert 'second' not in inifile.read()
+
+    userconfig.flush()
+    assert len(saves) == 1
+    with open(userconfig.filename()) as inifile:
+        iniContents = inifile.read()
+    assert 'second' in iniContents and 'other_option = 3' in iniContents
+
+    # Nothing left to write
+    userconfig.flush()
+    assert len(saves) == 1
+
+    # Pending changes are written by the timer of the GUI thread
+    userconfig.set_save_delay(0.01)
+    userconfig.set('section', 'option', 'third')
+    assert len(saves) == 1
+    qtbot.waitUntil(lambda: len(saves) == 2)
+
+    # Changes made in other threads are written right away
+    thread = threading.Thread(
+        target=lambda: userconfig.set('section', 'option', 'fourth'))
+    thread.start()
+    thread.join()
+    assert len(saves) == 3
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -14,10 +14,14 @@ from __future__ import print_function
 
 # Std imports
 import ast
+import atexit
+import copy
 import os
 import re
 import os.path as osp
 import shutil
+import sys
+import threading
 import time
 
 # Local imports
@@ -98,14 +102,25 @@ class DefaultsConfig(cp.ConfigParser):
         fname = self.filename()
 
         def _write_file(fname):
+            # Write to a temporary file first and then rename it, so that
+            # a crash while writing doesn't leave a truncated .ini file
+            tmp_fname = fname + '.tmp'
             if PY2:
                 # Python 2
-                with codecs.open(fname, 'w', encoding='utf-8') as configfile:
+                with codecs.open(tmp_fname, 'w',
+                                 encoding='utf-8') as configfile:
                     self._write(configfile)
             else:
                 # Python 3
-                with open(fname, 'w', encoding='utf-8') as configfile:
+                with open(tmp_fname, 'w', encoding='utf-8') as configfile:
                     self.write(configfile)
+            if hasattr(os, 'replace'):
+                os.replace(tmp_fname, fname)
+            else:
+                # Python 2 can't rename over an existing file on Windows
+                if os.name == 'nt' and osp.isfile(fname):
+                    os.remove(fname)
+                os.rename(tmp_fname, fname)
 
         try: # the "easy" way
             _write_file(fname)
@@ -174,6 +189,10 @@ class UserConfig(DefaultsConfig):
               *or* list of tuples (section_name, options)
     version: version of the configuration file (X.Y.Z format)
     subfolder: configuration file will be saved in %home%/subfolder/%name%.ini
+    save_delay: if not None, changes made in the thread of the Qt
+                application are written to the .ini file in a single batch
+                this many seconds after the first unsaved change (and at
+                exit), instead of on every 'set'
     
     Note that 'get' and 'set' arguments number and type
     differ from the overriden methods
@@ -181,9 +200,17 @@ class UserConfig(DefaultsConfig):
     DEFAULT_SECTION_NAME = 'main'
     def __init__(self, name, defaults=None, load=True, version=None,
                  subfolder=None, backup=False, raw_mode=False,
-                 remove_obsolete=False):
+                 remove_obsolete=False, save_delay=None):
         DefaultsConfig.__init__(self, name, subfolder)
         self.raw = 1 if raw_mode else 0
+        # Parsed values returned by 'get', by (section, option)
+        self._cache = {}
+        # Write-behind state
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self._save_pending = False
+        self.save_delay = None
+        self.set_save_delay(save_delay)
         if (version is not None) and (re.match('^(\d+).(\d+).(\d+)$', version) is None):
             raise ValueError("Version number %r is incorrect - must be in X.Y.Z format" % version)
         if isinstance(defaults, dict):
@@ -225,6 +252,77 @@ class UserConfig(DefaultsConfig):
                 # If no defaults are defined, set .ini file settings as default
                 self.set_as_defaults()
         
+    def set_save_delay(self, delay):
+        """
+        Set the delay (in seconds) used to batch writes to the .ini file
+
+        Use None to write it on every change.
+        """
+        if delay is not None and self.save_delay is None:
+            atexit.register(self.flush)
+        self.save_delay = delay
+        if delay is None:
+            self.flush()
+
+    def _in_gui_thread(self):
+        """
+        Return True if called from the thread of a running Qt application
+        (without importing Qt in processes not using it, like kernels)
+        """
+        QtCore = sys.modules.get('qtpy.QtCore')
+        if QtCore is None:
+            return False
+        app = QtCore.QCoreApplication.instance()
+        return app is not None and \
+            QtCore.QThread.currentThread() == app.thread()
+
+    def _schedule_save(self):
+        """
+        Write the .ini file now or, from the GUI thread, after the save
+        delay (a single-shot QTimer, so that it's written in the thread
+        changing options)
+        """
+        if self.save_delay is None or not self._in_gui_thread():
+            self._save()
+            return
+        if self._save_timer is None:
+            from qtpy.QtCore import QTimer
+            self._save_timer = QTimer()
+            self._save_timer.setSingleShot(True)
+            self._save_timer.timeout.connect(self.flush)
+        self._save_pending = True
+        if not self._save_timer.isActive():
+            self._save_timer.start(int(self.save_delay * 1000))
+
+    def flush(self):
+        """
+        Write pending changes to the .ini file, if there are any
+
+        This must be called before other processes (e.g. kernels) read
+        options which were just changed.
+        """
+        with self._lock:
+            if self._save_pending:
+                self._save()
+
+    def _save(self):
+        """
+        Save config into the associated .ini file
+        """
+        with self._lock:
+            if self._save_timer is not None and self._in_gui_thread():
+                self._save_timer.stop()
+            self._save_pending = False
+            DefaultsConfig._save(self)
+
+    def _set(self, section, option, value, verbose):
+        """
+        Private set method
+        """
+        with self._lock:
+            self._cache.pop((section, option), None)
+            DefaultsConfig._set(self, section, option, value, verbose)
+
     def get_version(self, version='0.0.0'):
         """Return configuration (not application!) version"""
         return self.get(self.DEFAULT_SECTION_NAME, 'version', version)
@@ -237,6 +335,7 @@ class UserConfig(DefaultsConfig):
         """
         Load config from the associated .ini file
         """
+        self._cache.clear()
         try:
             if PY2:
                 # Python 2
@@ -311,6 +410,7 @@ class UserConfig(DefaultsConfig):
         """
         Set defaults from the current config
         """
+        self._cache.clear()
         self.defaults = []
         for section in self.sections():
             secdict = {}
@@ -328,7 +428,7 @@ class UserConfig(DefaultsConfig):
                     value = options[ option ]
                     self._set(sec, option, value, verbose)
         if save:
-            self._save()
+            self._schedule_save()
         
     def _check_section_option(self, section, option):
         """
@@ -368,7 +468,8 @@ class UserConfig(DefaultsConfig):
             if default is NoDefault:
                 raise cp.NoSectionError(section)
             else:
-                self.add_section(section)
+                with self._lock:
+                    self.add_section(section)
         
         if not self.has_option(section, option):
             if default is NoDefault:
@@ -376,7 +477,19 @@ class UserConfig(DefaultsConfig):
             else:
                 self.set(section, option, default)
                 return default
-            
+
+        try:
+            value = self._cache[(section, option)]
+        except KeyError:
+            value = self._get_parsed(section, option)
+            self._cache[(section, option)] = value
+        if isinstance(value, (list, dict, set)):
+            # Callers may modify mutable values
+            value = copy.deepcopy(value)
+        return value
+
+    def _get_parsed(self, section, option):
+        """Read an option from the .ini contents and convert it to its type"""
         value = cp.ConfigParser.get(self, section, option, raw=self.raw)
         # Use type of default_value to parse value correctly
         default_value = self.get_default(section, option)
@@ -413,6 +526,7 @@ class UserConfig(DefaultsConfig):
         -> called when a new (section, option) is set and no default exists
         """
         section = self._check_section_option(section, option)
+        self._cache.pop((section, option), None)
         for sec, options in self.defaults:
             if sec == section:
                 options[ option ] = default_value
@@ -442,12 +556,16 @@ class UserConfig(DefaultsConfig):
             value = repr(value)
         self._set(section, option, value, verbose)
         if save:
-            self._save()
+            self._schedule_save()
             
     def remove_section(self, section):
-        cp.ConfigParser.remove_section(self, section)
-        self._save()
+        with self._lock:
+            self._cache.clear()
+            cp.ConfigParser.remove_section(self, section)
+        self._schedule_save()
             
     def remove_option(self, section, option):
-        cp.ConfigParser.remove_option(self, section, option)
-        self._save()
+        with self._lock:
+            self._cache.pop((section, option), None)
+            cp.ConfigParser.remove_option(self, section, option)
+        self._schedule_save()
@@ -38,12 +38,17 @@ class Dependency(object):
                 self.installed_version = None
         else:
             self.installed_version = installed_version
+        self._ok = None
 
     def check(self):
         """Check if dependency is installed"""
-        return programs.is_module_installed(self.modname,
-                                            self.required_version,
-                                            self.installed_version)
+        # Installed and required versions don't change during a session,
+        # so the result is computed only once
+        if self._ok is None:
+            self._ok = programs.is_module_installed(self.modname,
+                                                    self.required_version,
+                                                    self.installed_version)
+        return self._ok
 
     def get_installed_version(self):
         """Return dependency status (string)"""
@@ -60,6 +60,7 @@ class Console(SpyderPluginWidget):
                                    self.get_plugin_font(), exitfunc, profile,
                                    multithreaded,
                                    light_background=light_background)
+        self.shell.set_scrollback_enabled(self.get_option('scrollback'))
         self.shell.status.connect(lambda msg: self.show_message.emit(msg, 0))
         self.shell.go_to_error.connect(self.go_to_error)
         self.shell.focus_changed.connect(lambda: self.focus_changed.emit())
@@ -81,10 +81,13 @@ def save_breakpoints(filename, breakpoints):
     bp_dict = _load_all_breakpoints()
     bp_dict[filename] = breakpoints
     CONF.set('run', 'breakpoints', bp_dict)
+    # Kernels read breakpoints from the .ini file
+    CONF.flush()
 
 
 def clear_all_breakpoints():
     CONF.set('run', 'breakpoints', {})
+    CONF.flush()
 
 
 def clear_breakpoint(filename, lineno):
@@ -286,6 +289,14 @@ class EditorConfigPage(PluginConfigPage):
         af_layout = QHBoxLayout()
         af_layout.addWidget(realtime_radio)
         af_layout.addWidget(af_spin)
+        incremental_box = newcb(_("Only analyze code changed since the "
+                                  "previous analysis"),
+                                'realtime_analysis/incremental', default=True,
+                                tip=_("Results of unchanged functions and "
+                                      "classes are reused, which is "
+                                      "much faster in large files"))
+        realtime_radio.toggled.connect(incremental_box.setEnabled)
+        incremental_box.setEnabled(self.get_option('realtime_analysis'))
         
         run_layout = QVBoxLayout()
         run_layout.addWidget(saveall_box)
@@ -314,6 +325,7 @@ class EditorConfigPage(PluginConfigPage):
         analysis_layout.addLayout(analysis_pep_layout)
         analysis_layout.addWidget(todolist_box)
         analysis_layout.addLayout(af_layout)
+        analysis_layout.addWidget(incremental_box)
         analysis_layout.addWidget(saveonly_radio)
         analysis_group.setLayout(analysis_layout)
         
@@ -443,6 +455,10 @@ class Editor(SpyderPluginWidget):
         
         self.editorstacks = []
         self.last_focus_editorstack = {}
+        # Profiler line hits, see set_line_hits
+        self.line_hits = {}
+        self.line_hits_total = 0
+        self.line_hits_sizes = False
         self.editorwindows = []
         self.editorwindows_to_be_created = []
         self.toolbar_list = None
@@ -1257,6 +1273,7 @@ class Editor(SpyderPluginWidget):
             ('set_todolist_enabled',                'todo_list'),
             ('set_realtime_analysis_enabled',       'realtime_analysis'),
             ('set_realtime_analysis_timeout',       'realtime_analysis/timeout'),
+            ('set_incremental_analysis_enabled',    'realtime_analysis/incremental'),
             ('set_blanks_enabled',                  'blank_spaces'),
             ('set_linenumbers_enabled',             'line_numbers'),
             ('set_edgeline_enabled',                'edge_line'),
@@ -1294,6 +1311,7 @@ class Editor(SpyderPluginWidget):
         editorstack.set_default_font(self.get_plugin_font(), color_scheme)
 
         editorstack.starting_long_process.connect(self.starting_long_process)
+        editorstack.long_process_progress.connect(self.long_process_progress)
         editorstack.ending_long_process.connect(self.ending_long_process)
 
         # Redirect signals
@@ -1930,6 +1948,7 @@ class Editor(SpyderPluginWidget):
                 current_editor = current_es.set_current_filename(filename,
                                                                  focus=focus)
                 current_editor.set_breakpoints(load_breakpoints(filename))
+                self._set_file_line_hits(filename)
                 self.register_widget_shortcuts(current_editor)
                 current_es.analyze_script()
                 self.__add_recent_file(filename)
@@ -2335,6 +2354,34 @@ class Editor(SpyderPluginWidget):
             index = self.is_file_opened(filename)
             if index is not None:
                 editorstack.data[index].editor.add_remove_breakpoint(lineno)
+
+    def set_line_hits(self, line_hits, total=0, sizes=False):
+        """
+        Show profiler line hits (*line_hits*: {filename: {line number:
+        hits}}) in the margin of editors, *total* being the number of samples
+        (or, if *sizes* is True, the memory allocated by lines and the peak
+        memory usage, in bytes)
+        """
+        self.line_hits = dict((osp.normcase(filename), hits)
+                              for filename, hits in line_hits.items())
+        self.line_hits_total = total
+        self.line_hits_sizes = sizes
+        for editorstack in self.editorstacks:
+            for finfo in editorstack.data:
+                finfo.editor.set_line_hits(
+                    self.line_hits.get(osp.normcase(finfo.filename)), total,
+                    sizes)
+
+    def _set_file_line_hits(self, filename):
+        """Show profiler line hits in the editors of *filename*"""
+        hits = self.line_hits.get(osp.normcase(filename))
+        if not hits:
+            return
+        for editorstack in self.editorstacks:
+            for finfo in editorstack.data:
+                if osp.normcase(finfo.filename) == osp.normcase(filename):
+                    finfo.editor.set_line_hits(hits, self.line_hits_total,
+                                               self.line_hits_sizes)
                 
     def debug_command(self, command):
         """Debug actions"""
@@ -2578,6 +2625,8 @@ class Editor(SpyderPluginWidget):
             rt_analysis_o = self.get_option(rt_analysis_n)
             rta_timeout_n = 'realtime_analysis/timeout'
             rta_timeout_o = self.get_option(rta_timeout_n)
+            rta_incremental_n = 'realtime_analysis/incremental'
+            rta_incremental_o = self.get_option(rta_incremental_n)
             finfo = self.get_current_finfo()
             if fpsorting_n in options:
                 if self.outlineexplorer is not None:
@@ -2649,6 +2698,9 @@ class Editor(SpyderPluginWidget):
                     editorstack.set_realtime_analysis_enabled(rt_analysis_o)
                 if rta_timeout_n in options:
                     editorstack.set_realtime_analysis_timeout(rta_timeout_o)
+                if rta_incremental_n in options:
+                    editorstack.set_incremental_analysis_enabled(
+                        rta_incremental_o)
             # We must update the current editor after the others:
             # (otherwise, code analysis buttons state would correspond to the
             #  last editor instead of showing the one of the current editor)
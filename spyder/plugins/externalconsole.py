@@ -72,6 +72,18 @@ class ExternalConsoleConfigPage(PluginConfigPage):
                             _("Buffer: "), _(" lines"),
                             'max_line_count', min_=0, max_=1000000, step=100,
                             tip=_("Set maximum line count"))
+        rate_spin = self.create_spinbox(
+                            _("Output rate limit: "), _(" lines/s"),
+                            'max_output_rate', min_=0, max_=1000000, step=1000,
+                            tip=_("Standard output lines beyond this number\n"
+                                  "per second are not shown (0 for no "
+                                  "limit)"))
+        scrollback_box = newcb(_("Keep removed lines in a scrollback file"),
+                               'scrollback',
+                               tip=_("Lines removed from the console beyond "
+                                     "the buffer size are\ncompressed in a "
+                                     "temporary file, where they can\nbe "
+                                     "read and searched."))
         wrap_mode_box = newcb(_("Wrap lines"), 'wrap')
         merge_channels_box = newcb(
                _("Merge process standard output/error channels"),
@@ -92,6 +104,8 @@ class ExternalConsoleConfigPage(PluginConfigPage):
         
         display_layout = QVBoxLayout()
         display_layout.addWidget(buffer_spin)
+        display_layout.addWidget(rate_spin)
+        display_layout.addWidget(scrollback_box)
         display_layout.addWidget(wrap_mode_box)
         display_layout.addWidget(merge_channels_box)
         display_layout.addWidget(colorize_sys_stderr_box)
@@ -605,6 +619,9 @@ class ExternalConsole(SpyderPluginWidget):
         # Code completion / calltips
         shellwidget.shell.setMaximumBlockCount(
                                             self.get_option('max_line_count') )
+        shellwidget.shell.set_max_output_rate(
+                                            self.get_option('max_output_rate'))
+        shellwidget.shell.set_scrollback_enabled(self.get_option('scrollback'))
         shellwidget.shell.set_font( self.get_plugin_font() )
         shellwidget.shell.toggle_wrap_mode( self.get_option('wrap') )
         shellwidget.shell.set_calltips( self.get_option('calltips') )
@@ -832,6 +849,10 @@ class ExternalConsole(SpyderPluginWidget):
         compenter_o = self.get_option(compenter_n)
         mlc_n = 'max_line_count'
         mlc_o = self.get_option(mlc_n)
+        mor_n = 'max_output_rate'
+        mor_o = self.get_option(mor_n)
+        scrollback_n = 'scrollback'
+        scrollback_o = self.get_option(scrollback_n)
         for shellwidget in self.shellwidgets:
             if showtime_n in options:
                 shellwidget.set_elapsed_time_visible(showtime_o)
@@ -849,6 +870,10 @@ class ExternalConsole(SpyderPluginWidget):
                 shellwidget.shell.set_codecompletion_enter(compenter_o)
             if mlc_n in options:
                 shellwidget.shell.setMaximumBlockCount(mlc_o)
+            if mor_n in options:
+                shellwidget.shell.set_max_output_rate(mor_o)
+            if scrollback_n in options:
+                shellwidget.shell.set_scrollback_enabled(scrollback_o)
     
     #------ SpyderPluginMixin API ---------------------------------------------
     def toggle_view(self, checked):
@@ -13,7 +13,7 @@ import socket
 import sys
 
 # Third party imports
-from qtpy.QtCore import QThread, QUrl, Signal, Slot
+from qtpy.QtCore import QMutex, QMutexLocker, QThread, QUrl, Signal, Slot
 from qtpy.QtWidgets import (QActionGroup, QComboBox, QGroupBox, QHBoxLayout,
                             QLabel, QLineEdit, QMenu, QMessageBox, QSizePolicy,
                             QToolButton, QVBoxLayout, QWidget)
@@ -28,8 +28,11 @@ from spyder.api.preferences import PluginConfigPage
 from spyder.py3compat import get_meth_class_inst, to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils import programs
+from spyder.utils.help.prefetch import (get_imported_names, HelpPrefetcher,
+                                        NAME_PATTERN)
 from spyder.utils.help.sphinxify import (CSS_PATH, generate_context,
-                                         sphinxify, usage, warning)
+                                         HTMLCache, sphinxify, usage,
+                                         warning)
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     create_toolbutton)
 from spyder.widgets.browser import FrameWebView
@@ -142,8 +145,21 @@ class HelpConfigPage(PluginConfigPage):
             sphinx_tip += "\n" + _("Sphinx %s is currently installed.") % sphinx_ver
             math_box.setToolTip(sphinx_tip)
 
+        prefetch_box = self.create_checkbox(
+                _("Render help of imported objects when idle"), 'prefetch',
+                tip=_("Help of objects shown before and of objects "
+                      "imported in the Editor is rendered in advance, so "
+                      "that it's shown faster"))
+        prefetch_spin = self.create_spinbox(
+                _("Objects rendered at most:"), "", 'prefetch_budget',
+                min_=0, max_=10000, step=50)
+        prefetch_box.toggled.connect(prefetch_spin.setEnabled)
+        prefetch_spin.setEnabled(self.get_option('prefetch'))
+
         features_layout = QVBoxLayout()
         features_layout.addWidget(math_box)
+        features_layout.addWidget(prefetch_box)
+        features_layout.addWidget(prefetch_spin)
         features_group.setLayout(features_layout)
 
         # Source code group
@@ -261,58 +277,84 @@ class SphinxThread(QThread):
         Text to be rendered if doc string cannot be extracted.
     math_option : bool
         Use LaTeX math rendering.
+    cache : HTMLCache
+        Cache of rendered documentation, or None.
 
     """
     # Signals
     error_msg = Signal(str)
     html_ready = Signal(str)
 
-    def __init__(self, html_text_no_doc=''):
+    def __init__(self, html_text_no_doc='', cache=None):
         super(SphinxThread, self).__init__()
-        self.doc = None
-        self.context = None
         self.html_text_no_doc = html_text_no_doc
-        self.math_option = False
+        self.cache = cache
+        self.mutex = QMutex()
+        # (doc, context, math_option, img_path) of the next rendering
+        self.request = None
+        self.running = False
 
     def render(self, doc, context=None, math_option=False, img_path=''):
-        """Start thread to render a given documentation"""
-        # If the thread is already running wait for it to finish before
-        # starting it again.
-        if self.wait():
-            self.doc = doc
-            self.context = context
-            self.math_option = math_option
-            self.img_path = img_path
-            # This causes run() to be executed in separate thread
-            self.start()
+        """
+        Render a given documentation in the thread
+
+        If a rendering is in progress, the documentation is rendered after
+        it, in place of any documentation requested meanwhile, and the
+        result of the rendering in progress is dropped.
+        """
+        with QMutexLocker(self.mutex):
+            self.request = (doc, context, math_option, img_path)
+            if self.running:
+                return
+            self.running = True
+        # The thread may still be finishing after its last rendering
+        self.wait()
+        # This causes run() to be executed in separate thread
+        self.start()
 
     def run(self):
+        while True:
+            with QMutexLocker(self.mutex):
+                if self.request is None:
+                    self.running = False
+                    return
+                doc, context, math_option, img_path = self.request
+                self.request = None
+            try:
+                html_text = self.render_doc(doc, context, math_option,
+                                            img_path)
+            except Exception as error:
+                html_text = None
+                error_msg = to_text_string(error)
+            with QMutexLocker(self.mutex):
+                if self.request is not None:
+                    # Superseded by another rendering
+                    continue
+            if html_text is None:
+                self.error_msg.emit(error_msg)
+            else:
+                self.html_ready.emit(html_text)
+
+    def render_doc(self, doc, context, math_option, img_path):
+        """Return a given documentation rendered as HTML"""
         html_text = self.html_text_no_doc
-        doc = self.doc
         if doc is not None:
             if type(doc) is dict and 'docstring' in doc.keys():
-                try:
-                    context = generate_context(name=doc['name'],
-                                               argspec=doc['argspec'],
-                                               note=doc['note'],
-                                               math=self.math_option,
-                                               img_path=self.img_path)
-                    html_text = sphinxify(doc['docstring'], context)
-                    if doc['docstring'] == '' and \
-                      any([doc['name'], doc['argspec'], doc['note']]):
-                        msg = _("No further documentation available")
-                        html_text += '<div class="hr"></div>'
-                        html_text += '<div id="doc-warning">%s</div>' % msg
-                except Exception as error:
-                    self.error_msg.emit(to_text_string(error))
-                    return
-            elif self.context is not None:
-                try:
-                    html_text = sphinxify(doc, self.context)
-                except Exception as error:
-                    self.error_msg.emit(to_text_string(error))
-                    return
-        self.html_ready.emit(html_text)
+                context = generate_context(name=doc['name'],
+                                           argspec=doc['argspec'],
+                                           note=doc['note'],
+                                           math=math_option,
+                                           img_path=img_path)
+                html_text = sphinxify(doc['docstring'], context,
+                                      cache=self.cache)
+                if doc['docstring'] == '' and \
+                  any([doc['name'], doc['argspec'], doc['note']]):
+                    msg = _("No further documentation available")
+                    html_text += '<div class="hr"></div>'
+                    html_text += '<div id="doc-warning">%s</div>' % msg
+            elif context is not None:
+                html_text = sphinxify(doc, context, cache=self.cache)
+        return html_text
 
 
 class Help(SpyderPluginWidget):
@@ -453,11 +495,18 @@ class Help(SpyderPluginWidget):
 
         # Add worker thread for handling rich text rendering
         self._sphinx_thread = SphinxThread(
-                                  html_text_no_doc=warning(self.no_doc_string))
+                                  html_text_no_doc=warning(self.no_doc_string),
+                                  cache=HTMLCache(get_conf_path('help_cache')))
         self._sphinx_thread.html_ready.connect(
                                              self._on_sphinx_thread_html_ready)
         self._sphinx_thread.error_msg.connect(self._on_sphinx_thread_error_msg)
 
+        # Render help of objects likely to be requested when idle
+        self._prefetcher = HelpPrefetcher(self, self._get_prefetch_names,
+                                          self._is_prefetch_paused,
+                                          cache=self._sphinx_thread.cache)
+        self._prefetcher.math_option = self.get_option('math')
+
         # Handle internal and external links
         view = self.rich_text.webview
         if not WEBENGINE:
@@ -497,9 +546,12 @@ class Help(SpyderPluginWidget):
         self.main.add_dockwidget(self)
         self.main.console.set_help(self)
         self.internal_shell = self.main.console.shell
+        self._prefetcher.namespace = self.internal_shell.interpreter.locals
+        self.toggle_prefetch(self.get_option('prefetch'))
 
     def closing_plugin(self, cancelable=False):
         """Perform actions before parent main window is closed"""
+        self._prefetcher.stop()
         return True
 
     def refresh_plugin(self):
@@ -528,6 +580,9 @@ class Help(SpyderPluginWidget):
         self.wrap_action.setChecked(wrap_o)
         math_n = 'math'
         math_o = self.get_option(math_n)
+        prefetch_n = 'prefetch'
+        prefetch_o = self.get_option(prefetch_n)
+        prefetch_budget_n = 'prefetch_budget'
 
         if color_scheme_n in options:
             self.set_plain_text_color_scheme(color_scheme_o)
@@ -535,6 +590,8 @@ class Help(SpyderPluginWidget):
             self.toggle_wrap_mode(wrap_o)
         if math_n in options:
             self.toggle_math_mode(math_o)
+        if prefetch_n in options or prefetch_budget_n in options:
+            self.toggle_prefetch(prefetch_o)
 
         # To make auto-connection changes take place instantly
         self.main.editor.apply_plugin_settings(options=[connect_n])
@@ -620,6 +677,13 @@ class Help(SpyderPluginWidget):
     def toggle_math_mode(self, checked):
         """Toggle math mode"""
         self.set_option('math', checked)
+        self._prefetcher.math_option = checked
+
+    def toggle_prefetch(self, checked):
+        """Toggle help prefetch"""
+        self._prefetcher.stop()
+        if checked:
+            self._prefetcher.start(self.get_option('prefetch_budget'))
 
     def is_plain_text_mode(self):
         """Return True if plain text mode is active"""
@@ -894,22 +958,54 @@ class Help(SpyderPluginWidget):
                 self.shell = self.internal_shell
         return self.shell
 
+    def get_img_path(self):
+        """Return path of images of rendered docs (current file's dir)"""
+        fname = self.parent().parent().editor.get_current_filename()
+        return osp.dirname(fname)
+
     def render_sphinx_doc(self, doc, context=None):
         """Transform doc string dictionary to HTML and show it"""
         # Math rendering option could have changed
-        fname = self.parent().parent().editor.get_current_filename()
-        dname = osp.dirname(fname)
+        dname = self.get_img_path()
+        self._prefetcher.img_path = dname
         self._sphinx_thread.render(doc, context, self.get_option('math'),
                                    dname)
 
+    def _get_prefetch_names(self):
+        """
+        Return names of objects whose help is likely to be requested:
+        objects of Help history (dotted names only), then objects imported
+        in the Editor
+        """
+        self._prefetcher.img_path = self.get_img_path()
+        names = [to_text_string(self.combo.itemText(index))
+                 for index in range(self.combo.count())]
+        for finfo in self.main.editor.editorstacks[0].data:
+            if finfo.editor.is_python():
+                names += get_imported_names(
+                                    to_text_string(finfo.editor.toPlainText()))
+        return [name for name in names if NAME_PATTERN.match(name)]
+
+    def _is_prefetch_paused(self):
+        """
+        Return True if help shouldn't be prefetched now: rich text isn't
+        shown, help is being rendered or code is running in the console
+        """
+        if not self.rich_help or self._sphinx_thread.isRunning():
+            return True
+        ipyconsole = self.main.ipyconsole
+        if ipyconsole is not None:
+            shellwidget = ipyconsole.get_current_shellwidget()
+            if shellwidget is not None and shellwidget._executing:
+                return True
+        return False
+
     def _on_sphinx_thread_html_ready(self, html_text):
         """Set our sphinx documentation based on thread result"""
-        self._sphinx_thread.wait()
         self.set_rich_text_html(html_text, QUrl.fromLocalFile(CSS_PATH))
 
     def _on_sphinx_thread_error_msg(self, error_msg):
         """ Display error message on Sphinx rich text failure"""
-        self._sphinx_thread.wait()
         self.plain_text_action.setChecked(True)
         sphinx_ver = programs.get_module_version('sphinx')
         QMessageBox.critical(self,
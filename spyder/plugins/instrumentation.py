@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Performance Plugin"""
+
+# Third party imports
+from qtpy.QtWidgets import QVBoxLayout
+
+# Local imports
+from spyder.api.plugins import SpyderPluginWidget
+from spyder.config.base import _
+from spyder.widgets.instrumentation import InstrumentationWidget
+
+
+class Instrumentation(SpyderPluginWidget):
+    """
+    Performance Plugin
+
+    Only available when Spyder is started with the SPYDER_INSTRUMENTATION
+    environment variable set.
+    """
+
+    CONF_SECTION = 'instrumentation'
+
+    def __init__(self, parent=None):
+        SpyderPluginWidget.__init__(self, parent)
+
+        self.instrumentation = InstrumentationWidget(self)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.instrumentation)
+        self.setLayout(layout)
+
+        # Initialize plugin
+        self.initialize_plugin()
+
+    #------ SpyderPluginMixin API ---------------------------------------------
+    def visibility_changed(self, enable):
+        """DockWidget visibility has changed"""
+        super(SpyderPluginWidget, self).visibility_changed(enable)
+        if enable:
+            self.instrumentation.refresh()
+
+    #------ SpyderPluginWidget API --------------------------------------------
+    def get_plugin_title(self):
+        """Return widget title"""
+        return _("Performance")
+
+    def get_focus_widget(self):
+        """
+        Return the widget to give focus to when
+        this plugin's dockwidget is raised on top-level
+        """
+        return self.instrumentation.tree
+
+    def closing_plugin(self, cancelable=False):
+        """Perform actions before parent main window is closed"""
+        return True
+
+    def refresh_plugin(self):
+        """Refresh widget"""
+        self.instrumentation.refresh()
+
+    def get_plugin_actions(self):
+        """Return a list of actions related to plugin"""
+        return []
+
+    def register_plugin(self):
+        """Register plugin in Spyder's main window"""
+        self.main.add_dockwidget(self)
@@ -556,6 +556,38 @@ class IPythonConsoleConfigPage(PluginConfigPage):
         prompts_layout.addLayout(prompts_g_layout)
         prompts_group.setLayout(prompts_layout)
 
+        # Kernel resources group
+        monitor_group = QGroupBox(_("Kernel resources"))
+        monitor_box = newcb(_("Monitor CPU and memory usage of kernels every"),
+                            'monitor/enable',
+                            tip=_("The usage of the kernel of the current "
+                                  "console is shown in the status bar"))
+        monitor_spin = self.create_spinbox("", _(" ms"), 'monitor/timeout',
+                                           min_=100, max_=1000000, step=100)
+        monitor_box.toggled.connect(monitor_spin.setEnabled)
+        monitor_spin.setEnabled(self.get_option('monitor/enable'))
+        limit_box = newcb(_("Warn when a kernel uses more memory than"),
+                          'monitor/memory_limit/enable')
+        limit_spin = self.create_spinbox("", _(" MB"), 'monitor/memory_limit',
+                                         min_=1, max_=1000000, step=100)
+        interrupt_box = newcb(_("Interrupt the kernel too"),
+                              'monitor/memory_limit/interrupt')
+        limit_box.toggled.connect(limit_spin.setEnabled)
+        limit_box.toggled.connect(interrupt_box.setEnabled)
+        limit_spin.setEnabled(self.get_option('monitor/memory_limit/enable'))
+        interrupt_box.setEnabled(
+                            self.get_option('monitor/memory_limit/enable'))
+        monitor_box.toggled.connect(limit_box.setEnabled)
+        limit_box.setEnabled(self.get_option('monitor/enable'))
+
+        monitor_layout = QGridLayout()
+        monitor_layout.addWidget(monitor_box, 0, 0)
+        monitor_layout.addWidget(monitor_spin, 0, 1)
+        monitor_layout.addWidget(limit_box, 1, 0)
+        monitor_layout.addWidget(limit_spin, 1, 1)
+        monitor_layout.addWidget(interrupt_box, 2, 0)
+        monitor_group.setLayout(monitor_layout)
+
         # --- Tabs organization ---
         tabs = QTabWidget()
         tabs.addTab(self.create_tab(interface_group, comp_group,
@@ -565,7 +597,8 @@ class IPythonConsoleConfigPage(PluginConfigPage):
         tabs.addTab(self.create_tab(run_lines_group, run_file_group),
                                     _("Startup"))
         tabs.addTab(self.create_tab(greedy_group, autocall_group, sympy_group,
-                                    prompts_group), _("Advanced Settings"))
+                                    prompts_group, monitor_group),
+                                    _("Advanced Settings"))
 
         vlayout = QVBoxLayout()
         vlayout.addWidget(tabs)
@@ -588,6 +621,7 @@ class IPythonConsole(SpyderPluginWidget):
     # Signals
     focus_changed = Signal()
     edit_goto = Signal((str, int, str), (str, int, str, bool))
+    sig_memory_profile = Signal(str)
 
     def __init__(self, parent, testing=False):
         """Ipython Console constructor."""
@@ -676,6 +710,9 @@ class IPythonConsole(SpyderPluginWidget):
                 control.set_help_enabled(help_o)
             if color_scheme_n in options:
                 client.set_color_scheme(color_scheme_o)
+        if any(option.startswith('monitor/') for option in options):
+            for client in self.get_clients():
+                self.set_monitor_options(client)
 
     def toggle_view(self, checked):
         """Toggle view"""
@@ -735,6 +772,9 @@ class IPythonConsole(SpyderPluginWidget):
             sw = client.shellwidget
             self.variableexplorer.set_shellwidget_from_id(id(sw))
             self.help.set_shell(sw)
+        if not self.testing and self.main.kernel_status is not None:
+            self.main.kernel_status.set_monitor(
+                client.monitor if client else None)
         self.sig_update_plugin_title.emit()
 
     def get_plugin_actions(self):
@@ -825,8 +865,15 @@ class IPythonConsole(SpyderPluginWidget):
             return client.shellwidget
 
     def run_script_in_current_client(self, filename, wdir, args, debug,
-                                     post_mortem, clear_variables):
-        """Run script in current client, if any"""
+                                     post_mortem, clear_variables,
+                                     memory_profile=None, memory_interval=1.):
+        """
+        Run script in current client, if any
+
+        If *memory_profile* is given, memory snapshots are saved in this
+        file every *memory_interval* seconds (internal kernels only) and
+        sig_memory_profile is emitted with it when the script ends.
+        """
         norm = lambda text: remove_backslashes(to_text_string(text))
         client = self.get_current_client()
         if client is not None:
@@ -840,6 +887,9 @@ class IPythonConsole(SpyderPluginWidget):
                     line += ", wdir='%s'" % norm(wdir)
                 if post_mortem:
                     line += ", post_mortem=True"
+                if memory_profile:
+                    line += ", memory_profile='%s', memory_interval=%r" % (
+                                    norm(memory_profile), memory_interval)
                 line += ")"
             else: # External kernels, use %run
                 line = "%run "
@@ -1116,6 +1166,12 @@ class IPythonConsole(SpyderPluginWidget):
                               lambda fname, lineno, shellwidget=shellwidget:
                               self.pdb_has_stopped(fname, lineno, shellwidget))
 
+        # For the memory profiler
+        shellwidget.sig_memory_profile.connect(self.sig_memory_profile)
+
+        # Monitor resource usage of the kernel
+        self.set_monitor_options(client)
+
         # Connect text widget to Help
         if self.help is not None:
             control.set_help(self.help)
@@ -1141,6 +1197,22 @@ class IPythonConsole(SpyderPluginWidget):
             page_control.visibility_changed.connect(self.refresh_plugin)
             page_control.show_find_widget.connect(self.find_widget.show)
 
+    def set_monitor_options(self, client):
+        """Apply the options of the resource monitor of *client*"""
+        monitor = client.monitor
+        monitor.set_interval(self.get_option('monitor/timeout'))
+        if self.get_option('monitor/memory_limit/enable'):
+            monitor.memory_limit = self.get_option('monitor/memory_limit') \
+                                   * 1024 ** 2
+        else:
+            monitor.memory_limit = 0
+        client.interrupt_on_memory_limit = self.get_option(
+                                            'monitor/memory_limit/interrupt')
+        if self.get_option('monitor/enable'):
+            monitor.start()
+        else:
+            monitor.stop()
+
     def close_client(self, index=None, client=None, force=False):
         """Close client tab from index or widget (or close current tab)"""
         if not self.tabwidget.count():
@@ -1289,6 +1361,9 @@ class IPythonConsole(SpyderPluginWidget):
                           "different location.")
             return (error_msg, None)
 
+        # Kernels read their options from the .ini file
+        CONF.flush()
+
         # Kernel manager
         kernel_manager = QtKernelManager(connection_file=connection_file,
                                          config=None, autorestart=True)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Code analysis worker pool
+
+Pyflakes, pycodestyle and the TODO finder run in a few long-lived worker
+processes (see spyder/utils/analysis_server.py) instead of a new thread
+(and, for pycodestyle, a new subprocess) for every check.
+"""
+
+# Standard library imports
+from collections import OrderedDict
+import os.path as osp
+
+# Third party imports
+from qtpy.QtCore import QObject, Signal
+
+# Local imports
+from spyder.config.base import debug_print
+from spyder.utils.instrumentation import INSTRUMENTATION
+
+
+# Number of worker processes
+POOL_SIZE = 2
+
+# Checks run by the workers (see spyder/utils/analysis_server.py)
+CHECKERS = ('check_with_pyflakes', 'check_with_pep8', 'find_tasks')
+
+
+class AnalysisPool(QObject):
+    """
+    Pool of code analysis worker processes.
+
+    Requests are queued by (parent, checker): a new request replaces the
+    one still waiting for the same file and checker, and results of a
+    request superseded while running are discarded.
+    """
+
+    # Emitted with the checker name and its duration (in seconds)
+    sig_check_finished = Signal(str, float)
+
+    # Emitted when workers can't be started
+    sig_errored = Signal()
+
+    def __init__(self, size=POOL_SIZE, parent=None):
+        super(AnalysisPool, self).__init__(parent)
+        self.size = size
+        self.workers = []
+        self.errored = False
+        # (parent_id, checker_name) ->
+        #     (source_code, callback, fallback, file_id)
+        self.pending = OrderedDict()
+        # request_id -> (worker, key, source_code, callback, fallback, file_id)
+        self.running = {}
+
+    def start(self):
+        """Start worker processes"""
+        from spyder.utils.introspection.plugin_client import AsyncClient
+        target = osp.join(osp.dirname(__file__), 'analysis_server.py')
+        for _i in range(self.size):
+            worker = AsyncClient(target, libs=['pyflakes', 'pycodestyle'],
+                                 name='code analysis')
+            worker.initialized.connect(
+                lambda worker=worker: self._worker_initialized(worker))
+            worker.received.connect(self._response_received)
+            worker.errored.connect(self._worker_errored)
+            self.workers.append(worker)
+            worker.run()
+
+    def close(self):
+        """Stop worker processes"""
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
+
+    def add_request(self, checker_name, source_code, callback, parent_id,
+                    fallback, file_id=None):
+        """
+        Queue a request to run *checker_name* on *source_code*.
+
+        *callback* is called with the check results; *fallback* is called
+        (without arguments) instead if the workers stop working, to run the
+        check some other way. If *file_id* is given, workers reuse results
+        of previous checks with the same *file_id* when possible.
+        """
+        if self.errored:
+            fallback()
+            return
+        key = (parent_id, checker_name)
+        self.pending.pop(key, None)
+        self.pending[key] = (source_code, callback, fallback, file_id)
+        self._dispatch()
+
+    def cancel(self, parent_id):
+        """Cancel queued and running requests of *parent_id*"""
+        for key in list(self.pending):
+            if key[0] == parent_id:
+                self.pending.pop(key)
+        for request_id, request in list(self.running.items()):
+            if request[1][0] == parent_id:
+                worker, key, source_code, _callback, fallback, file_id = \
+                    request
+                self.running[request_id] = (worker, key, source_code, None,
+                                            fallback, file_id)
+
+    def _idle_workers(self):
+        busy = [request[0] for request in self.running.values()]
+        return [worker for worker in self.workers
+                if worker.is_initialized and worker not in busy]
+
+    def _dispatch(self):
+        """Send pending requests to idle workers"""
+        running_keys = [request[1] for request in self.running.values()]
+        for worker in self._idle_workers():
+            for key in self.pending:
+                # Wait for a running check of the same file to finish
+                if key not in running_keys:
+                    break
+            else:
+                return
+            request = self.pending.pop(key)
+            request_id = worker.request('run_check', key[1], request[0],
+                                        request[3])
+            if request_id is None:
+                self.pending[key] = request
+                continue
+            self.running[request_id] = (worker, key) + request
+            running_keys.append(key)
+
+    def _response_received(self, response):
+        """Handle a response from a worker"""
+        request = self.running.pop(response['request_id'], None)
+        if request is not None:
+            key, callback = request[1], request[3]
+            if 'error' in response:
+                debug_print(response['error'])
+            else:
+                result = response['result']
+                debug_print('%s: %.3f s' % (key[1], result['elapsed']))
+                self.sig_check_finished.emit(key[1], result['elapsed'])
+                INSTRUMENTATION.record('analysis.' + key[1],
+                                       result['elapsed'])
+                # Skip results already superseded by a new request
+                if callback is not None and key not in self.pending:
+                    callback(result['results'])
+        self._dispatch()
+
+    def _worker_initialized(self, worker):
+        """Requeue requests lost by a worker which has been restarted"""
+        for request_id, request in list(self.running.items()):
+            if request[0] is worker:
+                self.running.pop(request_id)
+                key, callback = request[1], request[3]
+                if callback is not None and key not in self.pending:
+                    self.pending[key] = request[2:]
+        self._dispatch()
+
+    def _worker_errored(self):
+        """Run queued requests some other way if workers can't start"""
+        if self.errored:
+            return
+        self.errored = True
+        requests = list(self.pending.values())
+        requests += [request[2:] for request in self.running.values()
+                     if request[3] is not None]
+        self.pending.clear()
+        self.running.clear()
+        self.close()
+        for _source_code, _callback, fallback, _file_id in requests:
+            fallback()
+        self.sig_errored.emit()
+
+
+ANALYSIS_POOL = None
+
+
+def get_analysis_pool():
+    """
+    Return the code analysis pool shared by all editors, starting it if
+    necessary, or None if workers can't be used.
+    """
+    global ANALYSIS_POOL
+    if ANALYSIS_POOL is None:
+        ANALYSIS_POOL = AnalysisPool()
+        try:
+            ANALYSIS_POOL.start()
+        except Exception as error:
+            debug_print('Unable to start code analysis workers: %s' % error)
+            ANALYSIS_POOL.errored = True
+    if ANALYSIS_POOL.errored:
+        return None
+    return ANALYSIS_POOL
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Code analysis server
+
+Long-lived process that keeps pyflakes and pycodestyle imported and runs
+the checks requested by the Editor (see spyder/utils/analysis_client.py).
+"""
+
+from collections import OrderedDict
+import os.path as osp
+import sys
+import time
+
+# Don't let the modules in this directory shadow standard library ones
+if sys.path and sys.path[0] and \
+  osp.abspath(sys.path[0]) == osp.dirname(osp.abspath(__file__)):
+    sys.path.pop(0)
+
+from spyder.utils import codeanalysis
+from spyder.utils.introspection.plugin_server import AsyncServer
+
+
+# Checks that can be requested, by name
+CHECKERS = {
+    'check_with_pyflakes': codeanalysis.check_with_pyflakes,
+    'check_with_pep8': codeanalysis.check_with_pycodestyle,
+    'find_tasks': codeanalysis.find_tasks,
+}
+
+# Checks that can be run incrementally (see IncrementalAnalysis)
+INCREMENTAL_CHECKERS = ('check_with_pyflakes', 'find_tasks')
+
+# Number of files whose incremental analysis results are kept
+MAX_ANALYZED_FILES = 20
+
+
+class CodeAnalysis(object):
+    """Object exposed by the server to run checks"""
+
+    def __init__(self):
+        # Import checkers now instead of on the first request
+        import pyflakes.checker  # analysis:ignore
+        try:
+            import pycodestyle  # analysis:ignore
+        except ImportError:
+            pass
+        # file_id -> IncrementalAnalysis, least recently used first
+        self.files = OrderedDict()
+
+    def run_check(self, checker_name, source_code, file_id=None):
+        """
+        Run check *checker_name* and return its results and duration
+
+        If *file_id* is given, results of a previous check of the same file
+        are reused if possible.
+        """
+        t0 = time.time()
+        if file_id is not None and checker_name in INCREMENTAL_CHECKERS:
+            analysis = self.files.pop(file_id, None)
+            if analysis is None:
+                analysis = codeanalysis.IncrementalAnalysis()
+            self.files[file_id] = analysis
+            while len(self.files) > MAX_ANALYZED_FILES:
+                self.files.popitem(last=False)
+            results = getattr(analysis, checker_name)(source_code)
+        else:
+            results = CHECKERS[checker_name](source_code)
+        return dict(results=results, elapsed=time.time() - t0)
+
+
+class AnalysisServer(AsyncServer):
+    """Code analysis server"""
+
+    def initialize(self):
+        """Initialize the object and return it."""
+        return CodeAnalysis()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not len(args) == 1:
+        print('Usage: analysis_server.py client_port')  # spyder: test-skip
+        sys.exit(0)
+    server = AnalysisServer(*args)
+    print('Started')  # spyder: test-skip
+    server.run()
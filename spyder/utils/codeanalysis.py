@@ -8,6 +8,7 @@
 Source code analysis utilities
 """
 
+import ast
 import sys
 import re
 import os
@@ -86,6 +87,383 @@ def check_with_pyflakes(source_code, filename=None):
             traceback.print_exc()  # Print exception in internal console
     return results
 
+
+#==============================================================================
+# Incremental code analysis
+#==============================================================================
+def _ast_types(*names):
+    """Return the set of AST node types called *names* in this Python"""
+    return frozenset(getattr(ast, name) for name in names
+                     if hasattr(ast, name))
+
+# Nodes whose body only runs when they are called
+FUNCTION_NODES = _ast_types('FunctionDef', 'AsyncFunctionDef', 'Lambda')
+# Nodes binding a name which pyflakes reports if redefined while unused
+DEFINITION_NODES = _ast_types('FunctionDef', 'AsyncFunctionDef', 'ClassDef')
+# Declarations of names bound in enclosing scopes
+GLOBAL_NODES = _ast_types('Global', 'Nonlocal')
+# Nodes with their own scope (list comprehensions don't in Python 2)
+SCOPE_NODES = _ast_types('ClassDef', 'SetComp', 'DictComp', 'GeneratorExp',
+                         *(('ListComp',) if PY3 else ()))
+# Nodes which can have annotations
+ANNOTATED_NODES = _ast_types('FunctionDef', 'AsyncFunctionDef', 'arg',
+                             'AnnAssign')
+# Nodes without names (contexts and operators)
+LEAF_NODES = frozenset(node_type for base in (ast.expr_context, ast.operator,
+                                              ast.boolop, ast.cmpop,
+                                              ast.unaryop)
+                       for node_type in base.__subclasses__())
+
+# Lines that can't start a top-level block
+CONTINUATION_PATTERN = r"(else|elif|except|finally)\b"
+QUOTES_PATTERN = r"\\.|'''|" + r'"""' + r"""|'|"|#"""
+NAME_PATTERN = r"[A-Za-z_]\w*"
+TYPE_COMMENT_PATTERN = r"#\s*type:(.*)"
+
+# Maximum number of consecutive blocks merged to get one which compiles
+# (more than that usually means there's a syntax error)
+MAX_MERGED_BLOCKS = 10
+
+# Fraction of changed lines above which files are analyzed at once
+MAX_CHANGED_RATIO = 0.5
+
+
+def split_blocks(lines):
+    """
+    Split source code *lines* into top-level blocks
+
+    Returns a list of (first line, last line + 1) ranges starting at
+    non-indented lines. Blank lines and comments belong to the block above
+    them; lines in triple-quoted strings, after a backslash, starting with
+    a closing bracket or with else/elif/except/finally never start a block.
+    """
+    if not lines:
+        return []
+    starts = [0]
+    string = None
+    continued = False
+    for index, line in enumerate(lines):
+        if string is None and not continued and line and index and \
+          line[0] not in ' \t#)]}' and \
+          not re.match(CONTINUATION_PATTERN, line):
+            starts.append(index)
+        continued = line.endswith('\\')
+        if string is None and '"' not in line and "'" not in line:
+            continue
+        for match in re.finditer(QUOTES_PATTERN, line):
+            token = match.group()
+            if string is None:
+                if token == '#':
+                    break
+                elif token[0] != '\\':
+                    string = token
+            elif token == string:
+                string = None
+        if string in ('"', "'") and not continued:
+            string = None
+    return list(zip(starts, starts[1:] + [len(lines)]))
+
+
+class BlockAnalysis(object):
+    """Pyflakes messages and module-level names of a top-level block"""
+
+    def __init__(self, tree, messages):
+        # (message class name, message, message arguments, line)
+        self.messages = messages
+        # Module-level names bound, and those pyflakes reports if redefined
+        self.bound = set()
+        self.redefinable = set()
+        # Names bound anywhere in the block (including functions), and
+        # declared global or nonlocal
+        self.names = set()
+        self.declared = set()
+        # Names used when the block runs and later (in functions)
+        self.uses = set()
+        self.deferred_uses = set()
+        # (first line, last line) of functions
+        self.functions = []
+        # (line, import as printed by pyflakes) -> name bound
+        self.imports = {}
+        self.import_lines = set()
+        # True if results depend on other blocks in ways not handled here
+        self.unreliable = False
+        # True for __future__ imports and blocks made of them and docstrings
+        self.future = False
+        self.header = True
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom) and \
+              node.module == '__future__':
+                self.future = True
+            elif not (isinstance(node, ast.Expr) and
+                      isinstance(node.value, ast.Str)):
+                self.header = False
+            self._visit(node, True, False)
+        if '__all__' in self.bound:
+            self.unreliable = True
+
+    def is_deferred(self, lineno):
+        """Return True if line *lineno* is in a function"""
+        return any(first <= lineno <= last for first, last in self.functions)
+
+    def _visit(self, node, module_level, deferred):
+        """Collect the names of *node* and return its last line"""
+        node_type = type(node)
+        if node_type is ast.Name:
+            if type(node.ctx) is ast.Load:
+                if deferred:
+                    self.deferred_uses.add(node.id)
+                else:
+                    self.uses.add(node.id)
+            elif module_level and type(node.ctx) is ast.Del:
+                self.unreliable = True
+            else:
+                self.names.add(node.id)
+                if module_level:
+                    self.bound.add(node.id)
+            return node.lineno
+        elif node_type in GLOBAL_NODES:
+            if not module_level:
+                self.declared.update(node.names)
+        elif node_type is ast.Import or node_type is ast.ImportFrom:
+            self._add_import(node, module_level)
+        elif node_type in DEFINITION_NODES:
+            self.names.add(node.name)
+            if module_level:
+                self.bound.add(node.name)
+                self.redefinable.add(node.name)
+        elif node_type is ast.ExceptHandler and isinstance(node.name, str):
+            self.names.add(node.name)
+            if module_level:
+                self.bound.add(node.name)
+        elif PY3 and node_type is ast.arg:
+            self.names.add(node.arg)
+
+        if node_type in ANNOTATED_NODES:
+            # Names in string annotations are used when the module is done
+            annotation = getattr(node, 'annotation', None) or \
+                         getattr(node, 'returns', None)
+            if annotation is not None:
+                for child in ast.walk(annotation):
+                    if type(child) is ast.Str:
+                        self.deferred_uses.update(re.findall(NAME_PATTERN,
+                                                             child.s))
+
+        if node_type in FUNCTION_NODES:
+            module_level, deferred = False, True
+        elif node_type in SCOPE_NODES:
+            module_level = False
+        lineno = getattr(node, 'lineno', 0)
+        for child in ast.iter_child_nodes(node):
+            if type(child) not in LEAF_NODES:
+                lineno = max(lineno, self._visit(child, module_level,
+                                                 deferred))
+        if node_type in FUNCTION_NODES:
+            self.functions.append((node.lineno, lineno))
+        return lineno
+
+    def _add_import(self, node, module_level):
+        """Collect the names bound by import statement *node*"""
+        if isinstance(node, ast.ImportFrom):
+            if node.module == '__future__':
+                return
+            module = '.' * (node.level or 0) + (node.module or '')
+            if not module.endswith('.'):
+                module += '.'
+        for alias in node.names:
+            if alias.name == '*':
+                self.unreliable = True
+                continue
+            if isinstance(node, ast.Import):
+                full_name = alias.name
+                name = alias.asname or alias.name.split('.')[0]
+            else:
+                full_name = module + alias.name
+                name = alias.asname or alias.name
+            if alias.asname:
+                full_name += ' as ' + alias.asname
+            self.names.add(name)
+            if not module_level:
+                continue
+            self.bound.add(name)
+            self.redefinable.add(name)
+            self.imports[(node.lineno, full_name)] = name
+            self.import_lines.add(node.lineno)
+
+
+def analyze_block(text):
+    """Check block *text* with pyflakes
+    Returns a BlockAnalysis instance, or None if *text* doesn't compile"""
+    from pyflakes.checker import Checker
+    try:
+        tree = compile(text if PY3 else text.encode('utf-8'), '<string>',
+                       "exec", ast.PyCF_ONLY_AST)
+    except (SyntaxError, ValueError, TypeError):
+        return None
+    messages = [(warning.__class__.__name__, warning.message,
+                 warning.message_args, warning.lineno)
+                for warning in Checker(tree, '<string>').messages]
+    block = BlockAnalysis(tree, messages)
+    for comment in re.findall(TYPE_COMMENT_PATTERN, text):
+        block.deferred_uses.update(re.findall(NAME_PATTERN, comment))
+    return block
+
+
+class IncrementalAnalysis(object):
+    """
+    Incremental code analysis of a file
+
+    Pyflakes and TODO finder results are cached for every top-level block
+    (see split_blocks) by contents, so that only the blocks changed since
+    the previous call are analyzed again. Undefined names and unused imports
+    are resolved against the names bound and used by the other blocks.
+    The whole file is analyzed instead when the names bound at module level
+    change or when that isn't reliable: syntax errors, star imports,
+    __all__ or imports and definitions bound again by other blocks.
+    """
+
+    def __init__(self):
+        self.blocks = {}
+        self.tasks = {}
+        self.bound = None
+
+    def check_with_pyflakes(self, source_code, filename=None):
+        """Same as check_with_pyflakes, reusing previous results"""
+        try:
+            results = self._check_with_pyflakes(source_code)
+        except Exception:
+            self.blocks = {}
+            self.bound = None
+            results = None
+            if DEBUG_EDITOR:
+                traceback.print_exc()  # Print exception in internal console
+        if results is None:
+            results = check_with_pyflakes(source_code, filename)
+        return results
+
+    def _check_with_pyflakes(self, source_code):
+        """Return pyflakes results or None if a full pass is needed"""
+        coding = encoding.get_coding(source_code)
+        try:
+            source_code = to_text_string(source_code, coding)
+        except TypeError:
+            source_code = to_text_string(source_code)
+        # Split lines as the compiler does
+        lines = re.split(r'\r\n|\r|\n', source_code)
+        ranges = split_blocks(lines)
+        texts = ['\n'.join(lines[start:end]) + '\n' for start, end in ranges]
+
+        # Analyzing most of the file by blocks is slower than at once
+        if self.blocks:
+            changed = sum(end - start for (start, end), text
+                          in zip(ranges, texts) if text not in self.blocks)
+            if changed > MAX_CHANGED_RATIO * len(lines):
+                return None
+
+        # Analyze new blocks, merging them with the next ones until they
+        # compile (a line in a multi-line string could start a block)
+        blocks = []
+        cache = {}
+        index = 0
+        while index < len(ranges):
+            start = ranges[index][0]
+            text = ''
+            for _i in range(MAX_MERGED_BLOCKS):
+                if index == len(ranges):
+                    return None
+                text += texts[index]
+                index += 1
+                block = cache.get(text) or self.blocks.get(text)
+                if block is None:
+                    block = analyze_block(text)
+                if block is not None:
+                    break
+            else:
+                return None
+            cache[text] = block
+            blocks.append((start, block))
+        self.blocks = cache
+
+        # Check that blocks can be analyzed separately: pyflakes reports
+        # imports and definitions redefined anywhere while unused
+        bound_by = {}
+        blocks_binding = {}
+        declared = set()
+        for number, (_start, block) in enumerate(blocks):
+            if block.unreliable or (block.future and
+                                    not all(other.header for _s, other
+                                            in blocks[:number])):
+                return None
+            for name in block.bound:
+                bound_by.setdefault(name, []).append(number)
+            for name in block.names:
+                blocks_binding[name] = blocks_binding.get(name, 0) + 1
+            declared.update(block.declared)
+        for _start, block in blocks:
+            if any(blocks_binding[name] > 1 for name in block.redefinable):
+                return None
+        # Be safe when names bound at module level change
+        bound = set(bound_by)
+        bound_changed = self.bound is not None and bound != self.bound
+        self.bound = bound
+        if bound_changed:
+            return None
+
+        results = []
+        for number, (start, block) in enumerate(blocks):
+            for kind, message, args, lineno in block.messages:
+                argument = args[0] if args else None
+                if kind == 'UndefinedName':
+                    numbers = bound_by.get(argument, [])
+                    if argument in declared:
+                        # Pyflakes removes these messages when it finds
+                        # global (and nonlocal) statements
+                        continue
+                    elif block.is_deferred(lineno):
+                        if numbers:
+                            continue
+                    elif any(other < number for other in numbers):
+                        continue
+                elif kind == 'UnusedImport' and lineno in block.import_lines:
+                    name = block.imports.get((lineno, argument))
+                    if name is None:
+                        return None
+                    if any(name in other.deferred_uses or
+                           (other_number > number and name in other.uses)
+                           for other_number, (_s, other) in enumerate(blocks)
+                           if other_number != number):
+                        continue
+                if 'line %r' in message:
+                    # Line numbers of other definitions
+                    args = tuple(arg + start if isinstance(arg, int) else arg
+                                 for arg in args)
+                lineno += start
+                if 'analysis:ignore' not in lines[lineno-1]:
+                    results.append((message % args, lineno))
+        results.sort(key=lambda result: result[1])
+        return results
+
+    def find_tasks(self, source_code):
+        """Same as find_tasks, reusing previous results"""
+        lines = source_code.splitlines()
+        results = []
+        cache = {}
+        starts = [index for index, line in enumerate(lines)
+                  if line and line[0] not in ' \t']
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        for start, end in zip(starts, starts[1:] + [len(lines)]):
+            text = '\n'.join(lines[start:end])
+            tasks = cache.get(text)
+            if tasks is None:
+                tasks = self.tasks.get(text)
+            if tasks is None:
+                tasks = find_tasks(text)
+            cache[text] = tasks
+            results += [(task, start + lineno) for task, lineno in tasks]
+        self.tasks = cache
+        return results
+
+
 # Required version:
 # Why 0.5 (Python2)? Because it's based on _ast (thread-safe)
 PYFLAKES_REQVER = '>=0.6.0' if PY3 else '>=0.5.0'
@@ -179,6 +557,55 @@ def check_with_pep8(source_code, filename=None):
     return results
 
 
+def check_with_pycodestyle(source_code, filename=None):
+    """Check source code with pycodestyle, in the current process
+
+    Same results as check_with_pep8, but without starting a subprocess
+    nor writing a temporary file. It's used by the code analysis worker
+    process (see spyder/utils/analysis_server.py)
+    """
+    try:
+        import pycodestyle
+
+        class Report(pycodestyle.BaseReport):
+            """Collect messages instead of printing them"""
+            def __init__(self, options):
+                super(Report, self).__init__(options)
+                self.results = []
+
+            def error(self, line_number, offset, text, check):
+                code = super(Report, self).error(line_number, offset, text,
+                                                 check)
+                if code:
+                    self.results.append((line_number, offset, text))
+                return code
+
+        coding = encoding.get_coding(source_code)
+        try:
+            source_code = to_text_string(source_code, coding)
+        except TypeError:
+            source_code = to_text_string(source_code)
+        lines = source_code.splitlines(True)
+        style = pycodestyle.StyleGuide(parse_argv=False, config_file=False,
+                                       repeat=True, reporter=Report)
+        checker = pycodestyle.Checker(filename=filename or '<string>',
+                                      lines=lines, options=style.options,
+                                      report=style.init_report(Report))
+        checker.check_all()
+        # Sorted as the pycodestyle script does
+        results = [(message, lineno) for (lineno, _offset, message)
+                   in sorted(checker.report.results)
+                   if lineno > len(lines) or
+                   'analysis:ignore' not in lines[lineno-1]]
+    except Exception:
+        # Never return None to avoid lock in spyder/widgets/editor.py
+        # See Issue 1547
+        results = []
+        if DEBUG_EDITOR:
+            traceback.print_exc()  # Print exception in internal console
+    return results
+
+
 if __name__ == '__main__':
 #    fname = __file__
     fname = os.path.join(os.path.dirname(__file__),
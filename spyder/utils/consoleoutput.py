@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Console output pipeline
+
+Output written to a console is queued, parsed (ANSI escape sequences,
+tracebacks, form feeds) and inserted in the console at most once per frame.
+Only the lines the console can keep are parsed and inserted, large batches
+are parsed in a thread, and standard output beyond a rate limit is dropped,
+the number of dropped lines being shown instead.
+"""
+
+# Standard library imports
+import re
+import time
+
+# Third party imports
+from qtpy.QtCore import QObject, QTimer, Signal
+
+# Local imports
+from spyder.config.base import _
+from spyder.utils.workers import WorkerManager
+
+
+# Styles of output segments
+DEFAULT, ERROR, LINK, PROMPT = range(4)
+
+COLOR_PATTERN = re.compile('\x01?\x1b\\[(.*?)m\x02?')
+
+FORM_FEED = chr(12)
+
+
+def get_codes(match):
+    """Return the ANSI codes of a COLOR_PATTERN *match*"""
+    try:
+        return [int(code) for code in match.group(1).split(';')]
+    except ValueError:
+        return []
+
+
+def get_all_codes(text):
+    """Return the ANSI codes found in *text*"""
+    codes = []
+    for match in COLOR_PATTERN.finditer(text):
+        codes += get_codes(match)
+    return codes
+
+
+def merge_chunks(chunks):
+    """Merge consecutive (text, error, prompt) chunks of the same kind"""
+    merged = []
+    texts = []
+    for text, error, prompt in chunks:
+        if merged and merged[-1][1:] != (error, prompt):
+            merged[-1] = (''.join(texts),) + merged[-1][1:]
+            texts = []
+        if not texts:
+            merged.append((None, error, prompt))
+        texts.append(text)
+    if merged:
+        merged[-1] = (''.join(texts),) + merged[-1][1:]
+    return merged
+
+
+def parse_output(chunks, max_lines=0):
+    """
+    Parse (text, error, prompt) output *chunks*, keeping only the last
+    *max_lines* lines if not 0
+
+    Return (clear, segments, traceback, removed): *clear* is True if the
+    console has to be cleared first (form feed), *segments* are (text, style,
+    codes) tuples, *codes* being ANSI codes to apply before inserting *text*,
+    *traceback* is the last line of an error output showing a traceback (or
+    None) and *removed* is the text of lines which won't be kept, without
+    ANSI codes.
+    """
+    chunks = [(text.replace('\r\n', '\n').replace('\r', '\n'), error, prompt)
+              for text, error, prompt in merge_chunks(chunks)]
+
+    # Output before the last form feed and lines which won't be kept are
+    # dropped, only their ANSI codes are taken into account
+    dropped = []
+    removed = ''
+    clear = False
+    for index in range(len(chunks) - 1, -1, -1):
+        text, error, prompt = chunks[index]
+        position = text.rfind(FORM_FEED)
+        if position != -1:
+            clear = True
+            dropped = chunks[:index] + [(text[:position], error, prompt)]
+            chunks = [(text[position + 1:], error, prompt)] + \
+                     chunks[index + 1:]
+            break
+    if max_lines:
+        needed = max_lines
+        for index in range(len(chunks) - 1, -1, -1):
+            text, error, prompt = chunks[index]
+            count = text.count('\n')
+            if count < needed:
+                needed -= count
+                continue
+            position = len(text)
+            for _i in range(needed):
+                position = text.rfind('\n', 0, position)
+            removed_chunks = chunks[:index] + [(text[:position + 1], error,
+                                                prompt)]
+            removed = COLOR_PATTERN.sub('', ''.join(
+                chunk[0] for chunk in removed_chunks))
+            dropped += removed_chunks
+            chunks = [(text[position + 1:], error, prompt)] + \
+                     chunks[index + 1:]
+            break
+
+    segments = []
+    codes = []
+    for text, error, prompt in dropped:
+        if not error and not prompt:
+            codes += get_all_codes(text)
+    if codes:
+        segments.append(('', DEFAULT, codes))
+    traceback = None
+    for text, error, prompt in chunks:
+        if error:
+            is_traceback = False
+            lines = text.splitlines(True)
+            for line in lines:
+                if line.startswith('  File') \
+                  and not line.startswith('  File "<'):
+                    is_traceback = True
+                    # Show error links in blue underlined text
+                    segments.append(('  ', DEFAULT, []))
+                    segments.append((line[2:], LINK, []))
+                elif segments and segments[-1][1] == ERROR:
+                    segments[-1] = (segments[-1][0] + line, ERROR, [])
+                else:
+                    # Show error/warning messages in red
+                    segments.append((line, ERROR, []))
+            if is_traceback:
+                traceback = lines[-1]
+        elif prompt:
+            segments.append((text, PROMPT, []))
+        else:
+            last_end = 0
+            codes = []
+            for match in COLOR_PATTERN.finditer(text):
+                if last_end < match.start() or codes:
+                    segments.append((text[last_end:match.start()], DEFAULT,
+                                     codes))
+                last_end = match.end()
+                codes = get_codes(match)
+            segments.append((text[last_end:], DEFAULT, codes))
+    return clear, segments, traceback, removed
+
+
+class OutputPipeline(QObject):
+    """
+    Output of a console, from writes to insertion
+
+    Written text is queued and parsed at most once per frame (every
+    FRAME_INTERVAL ms), in a thread when more than THREAD_MIN_SIZE
+    characters are queued, then sig_output_ready is emitted with the
+    result of parse_output, to be inserted in the console at once.
+
+    When *max_rate* isn't 0, standard output written beyond *max_rate* lines
+    per second is dropped, and a line giving the number of dropped lines is
+    written instead when the second is over.
+    """
+    # Interval between two insertions (ms)
+    FRAME_INTERVAL = 33
+    # Number of characters above which output is parsed in a thread
+    THREAD_MIN_SIZE = 32768
+
+    #: Signal emitted with parsed output (see parse_output)
+    sig_output_ready = Signal(object)
+
+    def __init__(self, parent=None, max_lines=None):
+        QObject.__init__(self, parent)
+        # Callable returning the number of lines kept by the console
+        self.max_lines = max_lines
+        self.max_rate = 0
+        self._chunks = []
+        self._worker = None
+        self._worker_chunks = None
+        self._worker_manager = WorkerManager()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME_INTERVAL)
+        self._timer.timeout.connect(self.process)
+        self._scheduled_time = 0.
+        # Time output was last emitted
+        self._output_time = 0.
+        # Rate limiting: start of the current second, lines written and
+        # dropped since
+        self._rate_start = 0.
+        self._rate_lines = 0
+        self._suppressed = 0
+
+    def write(self, text, error=False, prompt=False):
+        """Queue *text* to be inserted in the console"""
+        if self.max_rate and not error and not prompt:
+            text = self._limit_rate(text)
+        if text:
+            self._chunks.append((text, error, prompt))
+        self._schedule()
+
+    def has_pending_output(self):
+        """Return True if output hasn't been inserted yet"""
+        return bool(self._chunks) or self._worker is not None
+
+    def is_idle(self):
+        """Return True if no output is queued nor was emitted during the
+        last frame, so that output written now can be inserted right away"""
+        return not self._timer.isActive() and self._worker is None and \
+            time.time() - self._output_time > 1e-3 * self.FRAME_INTERVAL
+
+    def is_overdue(self):
+        """Return True if queued output should have been inserted by now,
+        the event loop being blocked"""
+        return self._timer.isActive() and \
+            time.time() - self._scheduled_time > 2e-3 * self.FRAME_INTERVAL
+
+    def flush(self):
+        """Parse queued output now and emit it"""
+        self._timer.stop()
+        if self._worker is not None:
+            self._worker_manager.terminate_all()
+            self._chunks[:0] = self._worker_chunks
+            self._worker = self._worker_chunks = None
+        chunks = self._take_chunks()
+        if chunks:
+            self._output_time = time.time()
+            self.sig_output_ready.emit(parse_output(chunks,
+                                                    self._get_max_lines()))
+
+    def process(self):
+        """Parse queued output, in a thread if there's a lot of it"""
+        if self._worker is not None:
+            return
+        if sum(len(chunk[0]) for chunk in self._chunks) \
+          < self.THREAD_MIN_SIZE:
+            self.flush()
+            return
+
+        def worker_output(worker, output, error):
+            """Worker finished callback."""
+            if worker is not self._worker:
+                return
+            self._worker = self._worker_chunks = None
+            if error is None and output is not None:
+                self._output_time = time.time()
+                self.sig_output_ready.emit(output)
+            if self._chunks or self._suppressed:
+                self._schedule()
+
+        chunks = self._worker_chunks = self._take_chunks()
+        self._worker = self._worker_manager.create_python_worker(
+            parse_output, chunks, self._get_max_lines())
+        self._worker.sig_finished.connect(worker_output)
+        self._worker.start()
+
+    def _schedule(self):
+        """Start the frame timer if not started yet"""
+        if not self._timer.isActive():
+            self._scheduled_time = time.time()
+            self._timer.start()
+
+    def _get_max_lines(self):
+        """Return the number of lines kept by the console"""
+        return self.max_lines() if self.max_lines is not None else 0
+
+    def _take_chunks(self):
+        """Return queued chunks, adding dropped lines count if needed"""
+        if self._suppressed:
+            if time.time() - self._rate_start >= 1:
+                self._add_suppressed_line()
+            else:
+                self._schedule()
+        chunks = self._chunks
+        self._chunks = []
+        return chunks
+
+    def _add_suppressed_line(self):
+        """Queue the number of lines dropped by the rate limit"""
+        self._chunks.append((_("[... %d lines suppressed ...]"
+                               ) % self._suppressed + '\n', True, False))
+        self._suppressed = 0
+
+    def _limit_rate(self, text):
+        """Return the part of *text* within the rate limit"""
+        now = time.time()
+        if now - self._rate_start >= 1:
+            if self._suppressed:
+                self._add_suppressed_line()
+            self._rate_start = now
+            self._rate_lines = 0
+        count = text.count('\n')
+        if self._suppressed:
+            self._suppressed += count
+            return ''
+        allowed = self.max_rate - self._rate_lines
+        if count <= allowed:
+            self._rate_lines += count
+            return text
+        position = -1
+        for _i in range(allowed):
+            position = text.find('\n', position + 1)
+        self._rate_lines = self.max_rate
+        self._suppressed = count - allowed
+        return text[:position + 1]
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+State of a document shared by its editors
+
+A file shown in several editors (split panes or several editor windows) has a
+single QTextDocument; what is computed from it is kept here, once, for all of
+them.
+"""
+
+# Third party imports
+from qtpy.QtCore import QObject, Signal
+
+# Local imports
+from spyder.utils.foldregions import FoldRegions
+from spyder.utils.wordindex import WordIndex
+
+
+class DocumentState(QObject):
+    """
+    State of a QTextDocument shared by the editors showing it
+
+    Besides the document syntax highlighter (and its symbol table, see
+    spyder/utils/symboltable.py), which clones share too, it holds:
+
+    * the word index and fold regions of the document
+    * the user data of its blocks (breakpoints, code analysis results and
+      todos, see BlockUserData in spyder/widgets/sourcecode/codeeditor.py)
+    * the last code analysis and todo results set on blocks
+
+    Results are set on blocks by the first editor they're given to, the
+    other ones only updating their own markers when the signals below are
+    emitted (as they do when breakpoints are set in any of them).
+    """
+    #: Signal emitted when code analysis results have been set on blocks
+    sig_analysis_results_changed = Signal()
+
+    #: Signal emitted when todo results have been set on blocks
+    sig_todo_results_changed = Signal()
+
+    #: Signal emitted when breakpoints of blocks have changed
+    sig_breakpoints_changed = Signal()
+
+    def __init__(self, document):
+        QObject.__init__(self)
+        self.document = document
+        self.word_index = WordIndex(document)
+        self.fold_regions = FoldRegions(document)
+        self.blockuserdata_list = []
+        self.analysis_results = []
+        self.todo_results = []
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Fold regions of a document
+
+Indentation based fold regions of a QTextDocument, computed in a thread from
+a snapshot of its text, to find the scope of a line or fold/unfold all
+regions without walking the blocks of the document.
+"""
+
+# Standard library imports
+from bisect import bisect_right
+
+# Third party imports
+from qtpy.QtCore import QObject, QTimer, Signal
+
+# Local imports
+from spyder.py3compat import to_text_string
+from spyder.utils.workers import WorkerManager
+
+
+def get_fold_regions(lines, indent_len=4):
+    """
+    Return the indentation fold regions of *lines*
+
+    Fold levels of lines are those given by the IndentFoldDetector (see
+    spyder/widgets/sourcecode/folding.py), *indent_len* being the length of
+    an indentation level when the previous line isn't indented. A region
+    starts at a non-blank line followed by one of a higher level and ends
+    before the next non-blank line of a level lower or equal to its own.
+
+    Regions are returned sorted as (first line, last non-blank line, last
+    line, fold level) tuples.
+    """
+    regions = []
+    # Indexes in regions of regions not ended yet
+    stack = []
+    last_line = None
+    last_level = last_indent = 0
+    for line_nb, text in enumerate(lines):
+        stripped = text.lstrip()
+        if not stripped:
+            continue
+        indent = len(text) - len(stripped)
+        if last_level:
+            level = indent // (last_indent // last_level)
+        else:
+            level = indent // indent_len
+        while stack and regions[stack[-1]][3] >= level:
+            regions[stack.pop()][1:3] = [last_line, line_nb - 1]
+        if last_line is not None and level > last_level:
+            stack.append(len(regions))
+            regions.append([last_line, None, None, last_level])
+        last_line, last_level, last_indent = line_nb, level, indent
+    for index in stack:
+        regions[index][1:3] = [last_line, len(lines) - 1]
+    return [tuple(region) for region in regions]
+
+
+class FoldRegions(QObject):
+    """
+    Fold regions of a QTextDocument
+
+    Regions are kept as sorted lists of first lines, ends and fold levels,
+    with the index of the enclosing region of each one, so that the regions
+    enclosing a line are found by bisection and by following enclosing
+    regions.
+
+    They are computed when first needed. Then regions are moved as lines are
+    inserted or removed, and computed again in a thread once the document
+    hasn't changed for UPDATE_DELAY ms.
+    """
+    # Delay before computing regions again after a change (ms)
+    UPDATE_DELAY = 500
+
+    #: Signal emitted when regions are up to date with the document
+    sig_regions_updated = Signal()
+
+    def __init__(self, document):
+        QObject.__init__(self)
+        self.document = document
+        # Length of an indentation level (see get_fold_regions)
+        self.indent_len = 4
+        self._starts = None
+        self._ends = []
+        self._raw_ends = []
+        self._levels = []
+        self._parents = []
+        self._block_count = document.blockCount()
+        # Number of changes of the document, when regions were last asked
+        # for and when the current ones were computed
+        self._revision = 0
+        self._requested_revision = None
+        self._regions_revision = None
+        self._worker_manager = WorkerManager()
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.UPDATE_DELAY)
+        self._update_timer.timeout.connect(self.update)
+        document.contentsChange.connect(self._contents_changed)
+
+    def is_up_to_date(self):
+        """Return True if regions are those of the current text, computing
+        them in a thread otherwise"""
+        if self._requested_revision != self._revision and \
+          not self._update_timer.isActive():
+            self.update()
+        return self._regions_revision == self._revision
+
+    def update(self):
+        """Compute regions in a thread from the current text"""
+        def worker_output(worker, output, error):
+            """Worker finished callback."""
+            if error is not None or output is None or \
+              revision != self._revision:
+                return
+            self._set_regions(output)
+            self._regions_revision = revision
+            self.sig_regions_updated.emit()
+
+        self._update_timer.stop()
+        revision = self._requested_revision = self._revision
+        lines = to_text_string(self.document.toPlainText()).split('\n')
+        self._worker_manager.terminate_all()
+        worker = self._worker_manager.create_python_worker(
+            get_fold_regions, lines, self.indent_len)
+        worker.sig_finished.connect(worker_output)
+        worker.start()
+
+    def _set_regions(self, regions):
+        """Set regions from (first, end, raw end, level) tuples"""
+        self._starts = [region[0] for region in regions]
+        self._ends = [region[1] for region in regions]
+        self._raw_ends = [region[2] for region in regions]
+        self._levels = [region[3] for region in regions]
+        self._parents = []
+        stack = []
+        for index, level in enumerate(self._levels):
+            while stack and self._levels[stack[-1]] >= level:
+                stack.pop()
+            self._parents.append(stack[-1] if stack else None)
+            stack.append(index)
+
+    #---- Queries
+    def get_range(self, block_nb):
+        """
+        Return the (first block, last non-blank block) range of the region
+        starting at *block_nb*, or None if there's none
+        """
+        if self._starts is None:
+            return None
+        index = bisect_right(self._starts, block_nb) - 1
+        if index < 0 or self._starts[index] != block_nb:
+            return None
+        return (block_nb, self._ends[index])
+
+    def find_scope(self, block_nb):
+        """
+        Return the first block number of the innermost region containing
+        *block_nb* (or starting at it), or None if there's none
+        """
+        if self._starts is None:
+            return None
+        index = bisect_right(self._starts, block_nb) - 1
+        while index is not None and index >= 0:
+            if block_nb <= self._ends[index] or \
+              self._starts[index] == block_nb:
+                return self._starts[index]
+            index = self._parents[index]
+        return None
+
+    def get_regions(self, outermost=False):
+        """
+        Return the (first block, last non-blank block, last block) ranges of
+        regions, only of those not inside another one if *outermost*
+        """
+        if self._starts is None:
+            return []
+        return [(start, end, raw_end) for start, end, raw_end, parent
+                in zip(self._starts, self._ends, self._raw_ends,
+                       self._parents)
+                if not outermost or parent is None]
+
+    #---- Changes
+    def _contents_changed(self, position, removed, added):
+        """Move regions following changed blocks and compute them again"""
+        block_count = self.document.blockCount()
+        delta = block_count - self._block_count
+        self._block_count = block_count
+        self._revision += 1
+        if self._starts is None:
+            return
+        first = self.document.findBlock(position).blockNumber()
+        last = self.document.findBlock(position + added).blockNumber()
+        if first < 0 or last < first:
+            first, last = max(first, 0), block_count - 1
+        self._update_timer.start()
+        if not delta:
+            return
+
+        # Regions starting in changed blocks are forgotten until regions are
+        # computed again, those containing them are resized
+        last_changed = last - delta
+        regions = []
+        for start, end, raw_end, level in zip(self._starts, self._ends,
+                                              self._raw_ends, self._levels):
+            if start > last_changed:
+                regions.append((start + delta, end + delta, raw_end + delta,
+                                level))
+            elif start < first:
+                if end >= first:
+                    end = max(end + delta, start)
+                if raw_end >= first:
+                    raw_end = max(raw_end + delta, start)
+                regions.append((start, end, raw_end, level))
+        self._set_regions(regions)
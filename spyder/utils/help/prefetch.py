@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Help prefetch
+
+Help of objects likely to be requested (see HelpPrefetcher) is rendered
+when Spyder is idle, so that it's found in the rendered help cache when it
+is requested.
+"""
+
+# Standard library imports
+import inspect
+import re
+import sys
+import time
+
+# Third party imports
+from qtpy.QtCore import QObject, QTimer
+
+# Local imports
+from spyder.utils.dochelpers import getdoc, getobjdir
+from spyder.utils.help.sphinxify import generate_context, sphinxify
+from spyder.utils.workers import WorkerManager
+
+
+IMPORT_PATTERN = re.compile(r'^[ \t]*import[ \t]+([\w., \t]+)', re.M)
+FROM_IMPORT_PATTERN = re.compile(
+    r'^[ \t]*from[ \t]+([\w.]+)[ \t]+import[ \t]+(\([^)]*|[\w., \t]+)', re.M)
+NAME_PATTERN = re.compile(r'^\w+(\.\w+)*$', re.U)
+
+
+def get_imported_names(source):
+    """Return the (dotted) names of objects imported by *source* code"""
+    names = []
+    for match in IMPORT_PATTERN.finditer(source):
+        for name in match.group(1).split(','):
+            names.append(name.split(' as ')[0].strip())
+    for match in FROM_IMPORT_PATTERN.finditer(source):
+        module = match.group(1)
+        imported = re.sub(r'#.*', '', match.group(2).lstrip('('))
+        for name in imported.split(','):
+            names.append(module + '.' + name.split(' as ')[0].strip())
+    return [name for name in names if NAME_PATTERN.match(name)]
+
+
+def get_loaded_object(name, namespace):
+    """
+    Return object *name* of *namespace*, or of the modules already imported
+    (sys.modules), or None
+
+    Nothing is imported or evaluated: *name* must be a dotted name, and it's
+    looked up with getattr.
+    """
+    if not NAME_PATTERN.match(name):
+        return None
+    parts = name.split('.')
+    if parts[0] in namespace:
+        obj, index = namespace[parts[0]], 1
+    else:
+        # Longest prefix of name which is an imported module
+        for index in range(len(parts), 0, -1):
+            obj = sys.modules.get('.'.join(parts[:index]))
+            if obj is not None:
+                break
+        else:
+            return None
+    try:
+        for part in parts[index:]:
+            obj = getattr(obj, part)
+    except Exception:
+        return None
+    return obj
+
+
+def prefetch_doc(name, namespace, math_option=False, img_path='',
+                 cache=None):
+    """
+    Render the help of object *name* of *namespace*, as the Help plugin
+    does, in *cache*
+
+    Modules are never imported: objects of modules not imported yet are
+    skipped (see get_loaded_object).
+
+    Return the names of the public members of the object if it's a module.
+    """
+    obj = get_loaded_object(name, namespace)
+    if obj is None:
+        return []
+    doc = getdoc(obj)
+    if doc is not None:
+        context = generate_context(name=doc['name'], argspec=doc['argspec'],
+                                   note=doc['note'], math=math_option,
+                                   img_path=img_path)
+        sphinxify(doc['docstring'], context, cache=cache)
+    if not inspect.ismodule(obj):
+        return []
+    return [name + '.' + member for member in getobjdir(obj)
+            if not member.startswith('_')]
+
+
+class HelpPrefetcher(QObject):
+    """
+    Render help of objects likely to be requested when idle
+
+    Every IDLE_INTERVAL ms, unless *is_busy()* returns True, the help of the
+    next object name is rendered in a thread (see prefetch_doc). Names are
+    given by *get_names()* (at most every COLLECT_INTERVAL seconds), and the
+    public members of modules are added after them.
+
+    At most *budget* objects are rendered.
+    """
+    # Interval between two renderings (ms)
+    IDLE_INTERVAL = 1000
+    # Minimal interval between two calls to get_names (s)
+    COLLECT_INTERVAL = 30
+
+    def __init__(self, parent, get_names, is_busy, cache=None):
+        QObject.__init__(self, parent)
+        self.get_names = get_names
+        self.is_busy = is_busy
+        self.cache = cache
+        self.budget = 0
+        # Rendering options, as set by the Help plugin
+        self.namespace = None
+        self.math_option = False
+        self.img_path = ''
+        self._names = []
+        self._done = set()
+        self._collect_time = None
+        self._worker = None
+        self._worker_manager = WorkerManager()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.IDLE_INTERVAL)
+        self._timer.timeout.connect(self.prefetch_next)
+
+    def start(self, budget):
+        """Start rendering at most *budget* objects"""
+        self.budget = budget
+        self._timer.start()
+
+    def stop(self):
+        """Stop rendering"""
+        self._timer.stop()
+        self._worker_manager.terminate_all()
+        self._worker = None
+
+    def is_active(self):
+        """Return True if objects are still to be rendered"""
+        return self._timer.isActive()
+
+    def prefetch_next(self):
+        """Render the next object, unless busy"""
+        if self._worker is not None or self.namespace is None \
+          or self.is_busy():
+            return
+        if self.budget <= 0:
+            self._timer.stop()
+            return
+        if not self._names:
+            now = time.time()
+            if self._collect_time is not None \
+              and now - self._collect_time < self.COLLECT_INTERVAL:
+                return
+            self._collect_time = now
+            self._add_names(self.get_names())
+            if not self._names:
+                return
+
+        def worker_output(worker, output, error):
+            """Worker finished callback."""
+            if worker is not self._worker:
+                return
+            self._worker = None
+            if error is None and output:
+                self._add_names(output)
+
+        name = self._names.pop(0)
+        self.budget -= 1
+        self._worker = self._worker_manager.create_python_worker(
+            prefetch_doc, name, self.namespace, self.math_option,
+            self.img_path, self.cache)
+        self._worker.sig_finished.connect(worker_output)
+        self._worker.start()
+
+    def _add_names(self, names):
+        """Add *names* not rendered yet"""
+        for name in names:
+            if name not in self._done:
+                self._done.add(name)
+                self._names.append(name)
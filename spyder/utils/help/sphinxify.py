@@ -17,12 +17,17 @@ www.sagemath.org/doc/reference/sagenb/misc/sphinxify.html
 """
 
 # Stdlib imports
+import atexit
 import codecs
+import hashlib
+import json
 import os
 import os.path as osp
 import shutil
 import sys
 from tempfile import mkdtemp
+import threading
+import time
 from xml.sax.saxutils import escape
 
 # 3rd party imports
@@ -142,7 +147,147 @@ def generate_context(name='', argspec='', note='', math=False, collapse=False,
     return context
 
 
-def sphinxify(docstring, context, buildername='html'):
+class HTMLCache(object):
+    """
+    On-disk LRU cache of rendered docstrings
+
+    Each entry is a file named after the hash of what was rendered (see
+    get_key). Its modification time is updated when it's read, so that the
+    least recently used entries are removed when there are more than
+    *max_entries*.
+    """
+
+    def __init__(self, directory, max_entries=500):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    @staticmethod
+    def get_key(docstring, context, buildername='html'):
+        """Return the key of the rendering of *docstring* with *context*"""
+        data = json.dumps([sphinx.__version__, buildername, docstring,
+                           sorted(context.items())])
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the text cached under *key*, or None"""
+        filename = osp.join(self.directory, key)
+        try:
+            with codecs.open(filename, 'r', encoding='utf-8') as cache_file:
+                text = cache_file.read()
+            os.utime(filename, None)
+        except (IOError, OSError):
+            return None
+        return text
+
+    def set(self, key, text):
+        """Cache *text* under *key*"""
+        try:
+            if not osp.isdir(self.directory):
+                os.makedirs(self.directory)
+            with codecs.open(osp.join(self.directory, key), 'w',
+                             encoding='utf-8') as cache_file:
+                cache_file.write(text)
+            self._evict()
+        except (IOError, OSError):
+            pass
+
+    def clear(self):
+        """Remove all entries"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _evict(self):
+        """Remove the least recently used entries in excess"""
+        filenames = [osp.join(self.directory, name)
+                     for name in os.listdir(self.directory)]
+        if len(filenames) <= self.max_entries:
+            return
+        filenames.sort(key=osp.getmtime)
+        for filename in filenames[:len(filenames) - self.max_entries]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+class SphinxRenderer(object):
+    """
+    Sphinx application reused to render docstrings
+
+    Creating a Sphinx application (loading extensions, templates and the
+    configuration) takes most of the time needed to render a docstring, so
+    the same application and environment are used for all renderings with
+    the same builder and math option, only the html_context changing.
+    """
+
+    def __init__(self):
+        self.tempdir = None
+        self.app = None
+        self._app_key = None
+        self._mtime = 0
+        self._lock = threading.Lock()
+
+    def render(self, docstring, context, buildername='html'):
+        """Return *docstring* rendered, or None if it couldn't be"""
+        with self._lock:
+            app = self._get_app(buildername, context['math_on'])
+            srcdir = app.srcdir
+            rst_name = osp.join(srcdir, 'docstring.rst')
+            with codecs.open(rst_name, 'w', encoding='utf-8') as doc_file:
+                doc_file.write(docstring)
+            # Sphinx reads documents again only if they are newer than
+            # their last reading, which may not be the case on file systems
+            # with coarse timestamps
+            self._mtime = max(time.time(), self._mtime + 1)
+            os.utime(rst_name, (self._mtime, self._mtime))
+
+            app.config.html_context = context
+            suffix = '.html' if buildername == 'html' else '.txt'
+            output_name = osp.join(app.outdir, 'docstring' + suffix)
+            if osp.exists(output_name):
+                os.remove(output_name)
+            try:
+                app.build(None, [rst_name])
+            except SystemMessage:
+                self.close()
+                return None
+
+            if not osp.exists(output_name):
+                return None
+            with codecs.open(output_name, 'r', encoding='utf-8') as out_file:
+                return out_file.read()
+
+    def close(self):
+        """Forget the application and remove its directories"""
+        self.app = None
+        self._app_key = None
+        if self.tempdir is not None:
+            shutil.rmtree(self.tempdir, ignore_errors=True)
+            self.tempdir = None
+
+    def _get_app(self, buildername, math_on):
+        """Return the application for *buildername* and *math_on*"""
+        # The math extension is chosen by conf.py when the application is
+        # created, so it's created again when the math option changes
+        if self.app is not None and self._app_key == (buildername, math_on):
+            return self.app
+        self.close()
+        self.tempdir = encoding.to_unicode_from_fs(mkdtemp())
+        srcdir = osp.join(self.tempdir, 'src')
+        os.makedirs(srcdir)
+        self.app = Sphinx(srcdir, CONFDIR_PATH,
+                          osp.join(self.tempdir, 'build'),
+                          osp.join(self.tempdir, 'doctrees'), buildername,
+                          {'html_context': {}}, status=None, warning=None,
+                          freshenv=True, warningiserror=False, tags=None)
+        self._app_key = (buildername, math_on)
+        return self.app
+
+
+RENDERER = SphinxRenderer()
+atexit.register(RENDERER.close)
+
+
+def sphinxify(docstring, context, buildername='html', cache=None):
     """
     Runs Sphinx on a docstring and outputs the processed documentation.
 
@@ -158,23 +303,19 @@ def sphinxify(docstring, context, buildername='html'):
     buildername:  str
         It can be either `html` or `text`.
 
+    cache : HTMLCache
+        Cache of previous renderings, or None
+
     Returns
     -------
     An Sphinx-processed string, in either HTML or plain text format, depending
     on the value of `buildername`
     """
-
-    srcdir = mkdtemp()
-    srcdir = encoding.to_unicode_from_fs(srcdir)
-
-    base_name = osp.join(srcdir, 'docstring')
-    rst_name = base_name + '.rst'
-
-    if buildername == 'html':
-        suffix = '.html'
-    else:
-        suffix = '.txt'
-    output_name = base_name + suffix
+    if cache is not None:
+        key = cache.get_key(docstring, context, buildername)
+        output = cache.get(key)
+        if output is not None:
+            return output
 
     # This is needed so users can type \\ on latex eqnarray envs inside raw
     # docstrings
@@ -189,50 +330,18 @@ def sphinxify(docstring, context, buildername='html'):
     for char in ['=', ',', '(', ')', '*', '**']:
         argspec = argspec.replace(char,
                          '<span class="argspec-highlight">' + char + '</span>')
-    context['argspec'] = argspec
+    context = dict(context, argspec=argspec)
 
-    doc_file = codecs.open(rst_name, 'w', encoding='utf-8')
-    doc_file.write(docstring)
-    doc_file.close()
-    
-    temp_confdir = False
-    if temp_confdir:
-        # TODO: This may be inefficient. Find a faster way to do it.
-        confdir = mkdtemp()
-        confdir = encoding.to_unicode_from_fs(confdir)
-        generate_configuration(confdir)
-    else:
-        confdir = osp.join(get_module_source_path('spyder.utils.help'))
-
-    confoverrides = {'html_context': context}
-
-    doctreedir = osp.join(srcdir, 'doctrees')
-
-    sphinx_app = Sphinx(srcdir, confdir, srcdir, doctreedir, buildername,
-                        confoverrides, status=None, warning=None,
-                        freshenv=True, warningiserror=False, tags=None)
-    try:
-        sphinx_app.build(None, [rst_name])
-    except SystemMessage:
+    output = RENDERER.render(docstring, context, buildername)
+    if output is None:
         output = _("It was not possible to generate rich text help for this "
                     "object.</br>"
                     "Please see it in plain text.")
         return warning(output)
+    output = output.replace('<pre>', '<pre class="literal-block">')
 
-    # TODO: Investigate if this is necessary/important for us
-    if osp.exists(output_name):
-        output = codecs.open(output_name, 'r', encoding='utf-8').read()
-        output = output.replace('<pre>', '<pre class="literal-block">')
-    else:
-        output = _("It was not possible to generate rich text help for this "
-                    "object.</br>"
-                    "Please see it in plain text.")
-        return warning(output)
-
-    if temp_confdir:
-        shutil.rmtree(confdir, ignore_errors=True)
-    shutil.rmtree(srcdir, ignore_errors=True)
-
+    if cache is not None:
+        cache.set(key, output)
     return output
 
 
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Editor performance instrumentation
+
+When enabled, the time spent by the editor highlighting blocks, painting
+panels, waiting for introspection, refreshing the outline and running code
+analysis is recorded into histograms, and as a trace which can be saved in
+the Trace Event Format (used by chrome://tracing and Perfetto) for offline
+analysis.
+
+Instrumentation is enabled at startup when the SPYDER_INSTRUMENTATION
+environment variable is set; the Performance pane (see
+spyder/plugins/instrumentation.py) is then available to look at timings.
+"""
+
+# Standard library imports
+from collections import deque
+from contextlib import contextmanager
+import functools
+import json
+import os
+import threading
+import time
+
+
+# Environment variable used to enable instrumentation at startup
+INSTRUMENTATION_ENV = 'SPYDER_INSTRUMENTATION'
+
+# Highest resolution clock available (Python 2 doesn't have perf_counter)
+clock = getattr(time, 'perf_counter', time.time)
+
+
+class Histogram(object):
+    """Durations of an operation, counted in logarithmic buckets"""
+
+    # Upper bounds of buckets (in seconds), the last one having none
+    BOUNDS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.
+        self.max = 0.
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+
+    def add(self, duration):
+        """Count *duration* (in seconds)"""
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        index = 0
+        for bound in self.BOUNDS:
+            if duration < bound:
+                break
+            index += 1
+        self.buckets[index] += 1
+
+    def mean(self):
+        """Return the mean duration"""
+        return self.total / self.count if self.count else 0.
+
+    def percentile(self, percent):
+        """Return the upper bound of the bucket of the *percent* percentile
+        (the maximum duration for the last bucket)"""
+        rank = self.count * percent / 100.
+        cumulated = 0
+        for bound, count in zip(self.BOUNDS, self.buckets):
+            cumulated += count
+            if cumulated >= rank and cumulated:
+                return min(bound, self.max)
+        return self.max
+
+
+class Instrumentation(object):
+    """
+    Timings recorded by the instrumentation hooks
+
+    Hooks call record, or use the measure context manager or the timed
+    decorator, with the name of the operation (like 'editor.highlightBlock').
+    They can be called from any thread, and cost a single attribute lookup
+    when instrumentation is disabled. Functions decorated with timed while
+    it's disabled (i.e. at import time, unless it's enabled at startup) are
+    left as they are, so that they cost nothing.
+    """
+
+    # Number of operations kept in the trace
+    MAX_TRACE_EVENTS = 100000
+
+    def __init__(self):
+        self.enabled = bool(os.environ.get(INSTRUMENTATION_ENV))
+        self.t0 = clock()
+        self.histograms = {}
+        # (name, start, duration, thread id) of the last operations
+        self.trace = deque(maxlen=self.MAX_TRACE_EVENTS)
+        self._lock = threading.Lock()
+
+    def set_enabled(self, state):
+        """Enable or disable recording"""
+        self.enabled = state
+
+    def reset(self):
+        """Forget all timings"""
+        with self._lock:
+            self.histograms = {}
+            self.trace.clear()
+
+    def record(self, name, duration, start=None):
+        """Record an operation *name* which took *duration* seconds"""
+        if not self.enabled:
+            return
+        if start is None:
+            start = clock() - duration
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(duration)
+            self.trace.append((name, start, duration,
+                               threading.current_thread().ident))
+
+    @contextmanager
+    def measure(self, name):
+        """Record the time spent in the code executed in this context"""
+        if not self.enabled:
+            yield
+            return
+        start = clock()
+        try:
+            yield
+        finally:
+            self.record(name, clock() - start, start)
+
+    def timed(self, name):
+        """
+        Decorator recording the time spent in the decorated function, if
+        instrumentation is enabled when it's decorated
+        """
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, clock() - start, start)
+            return wrapper
+        return decorator
+
+    def get_stats(self):
+        """
+        Return (name, count, total, mean, 50th percentile, 95th percentile,
+        max) tuples of recorded operations, sorted by decreasing total time
+        """
+        with self._lock:
+            histograms = list(self.histograms.items())
+        stats = [(name, h.count, h.total, h.mean(), h.percentile(50),
+                  h.percentile(95), h.max) for name, h in histograms]
+        return sorted(stats, key=lambda stat: -stat[2])
+
+    def to_trace_events(self):
+        """Return the trace in the Trace Event Format"""
+        with self._lock:
+            trace = list(self.trace)
+        pid = os.getpid()
+        return {'traceEvents': [{'name': name, 'cat': name.split('.')[0],
+                                 'ph': 'X', 'pid': pid, 'tid': tid,
+                                 'ts': int((start - self.t0) * 1e6),
+                                 'dur': int(duration * 1e6)}
+                                for name, start, duration, tid in trace],
+                'displayTimeUnit': 'ms'}
+
+    def dump_trace(self, filename):
+        """Save the trace to *filename*"""
+        with open(filename, 'w') as fd:
+            json.dump(self.to_trace_events(), fd)
+
+
+INSTRUMENTATION = Instrumentation()
@@ -17,6 +17,7 @@ from qtpy.QtWidgets import QApplication
 from spyder import dependencies
 from spyder.config.base import _, DEBUG, debug_print, get_conf_path
 from spyder.utils import sourcecode
+from spyder.utils.instrumentation import INSTRUMENTATION
 from spyder.utils.introspection.plugin_client import PluginClient
 from spyder.utils.introspection.utils import CodeInfo
 
@@ -142,6 +143,7 @@ class PluginManager(QObject):
             debug_print('%s request from %s finished: "%s" in %.1f sec'
                 % (self.info.name, response['name'],
                    str(response['result'])[:100], delta))
+            INSTRUMENTATION.record('introspection.' + self.info.name, delta)
             response['info'] = self.info
             self.introspection_complete.emit(response)
             self.info = None
@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Resource usage monitor of IPython Console kernels
+"""
+
+# Standard library imports
+from collections import deque
+
+# Third party imports
+from qtpy.QtCore import QObject, QTimer, Signal
+
+# Local imports
+from spyder.utils.procstats import ProcessSampler
+
+
+class KernelMonitor(QObject):
+    """
+    Resource usage monitor of the kernel of a client
+
+    The kernel process started by the kernel manager of the client is
+    sampled every *interval* ms (see ProcessSampler), the last
+    HISTORY_LENGTH samples being kept. sig_memory_exceeded is emitted with
+    the memory of the kernel when it gets above *memory_limit* (bytes, 0 for
+    no limit), once until it gets back below it.
+    """
+    HISTORY_LENGTH = 60
+
+    sig_updated = Signal()
+    sig_memory_exceeded = Signal(object)
+
+    def __init__(self, client, interval=2000):
+        QObject.__init__(self, client)
+        self.client = client
+        self.memory_limit = 0
+        self.history = deque(maxlen=self.HISTORY_LENGTH)
+        self.sampler = None
+        self._exceeded = False
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.sample)
+
+    def start(self):
+        """Start sampling the kernel"""
+        self.timer.start()
+
+    def stop(self):
+        """Stop sampling the kernel, forgetting previous samples"""
+        self.timer.stop()
+        self.sampler = None
+        self.history.clear()
+        self._exceeded = False
+        self.sig_updated.emit()
+
+    def set_interval(self, interval):
+        """Set the interval between two samples (ms)"""
+        self.timer.setInterval(interval)
+
+    def get_pid(self):
+        """Return the PID of the kernel, or None if it's not a local one"""
+        kernel_manager = self.client.get_kernel()
+        if kernel_manager is None:
+            return None
+        return getattr(kernel_manager.kernel, 'pid', None)
+
+    def get_last_sample(self):
+        """Return the last sample (see ProcessSampler), or None"""
+        return self.history[-1] if self.history else None
+
+    def sample(self):
+        """Sample the resource usage of the kernel"""
+        pid = self.get_pid()
+        if pid is None:
+            self.sampler = None
+            return
+        if self.sampler is None or self.sampler.pid != pid:
+            # Restarted kernels are new processes
+            self.sampler = ProcessSampler(pid)
+            self.history.clear()
+        sample = self.sampler.sample()
+        if sample is None:
+            return
+        self.history.append(sample)
+        exceeded = bool(self.memory_limit) and \
+                   sample['memory'] > self.memory_limit
+        if exceeded and not self._exceeded:
+            self.sig_memory_exceeded.emit(sample['memory'])
+        self._exceeded = exceeded
+        self.sig_updated.emit()
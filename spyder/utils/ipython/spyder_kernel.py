@@ -220,6 +220,14 @@ class SpyderKernel(IPythonKernel):
                          step = self._pdb_step)
             publish_data({'__spy_pdb_state__': state})
 
+    # --- For the Profiler plugin
+    def publish_memory_profile(self, filename):
+        """
+        Publish the file in which runfile saved memory snapshots through
+        publish_data.
+        """
+        publish_data({'__spy_memory_profile__': filename})
+
     # --- For the Help plugin
     def is_defined(self, obj, force_import=False):
         """Return True if object is defined in current namespace"""
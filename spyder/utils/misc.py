@@ -235,6 +235,19 @@ def get_common_path(pathlist):
                 return osp.abspath(common)
 
 
+def format_size(size):
+    """Return *size* (bytes) as a short string, e.g. '1.5M'"""
+    for unit in ('B', 'K', 'M', 'G'):
+        if abs(size) < 1024:
+            break
+        size /= 1024.
+    else:
+        unit = 'T'
+    if unit == 'B':
+        return '%d%s' % (size, unit)
+    return '%.1f%s' % (size, unit)
+
+
 def add_pathlist_to_PYTHONPATH(env, pathlist, drop_env=False,
                                ipyconsole=False):
     # PyQt API 1/2 compatibility-related tests:
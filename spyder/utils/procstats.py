@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Resource usage of processes
+
+Usage is read from /proc on Linux, which is cheap enough to be sampled
+every few seconds, and with psutil (if installed) on other platforms.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import time
+
+# Local imports
+from spyder.utils import programs
+
+
+PROC_DIR = '/proc'
+
+
+def read_proc_stats(pid):
+    """
+    Return the CPU time (seconds), resident memory (bytes) and number of
+    threads of process *pid*, read from /proc, or None
+    """
+    try:
+        with open(osp.join(PROC_DIR, str(pid), 'stat')) as stat_file:
+            stat = stat_file.read()
+        clock_ticks = os.sysconf('SC_CLK_TCK')
+        page_size = os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, AttributeError):
+        return None
+    # The process name (2nd field) may contain spaces and parentheses, so
+    # fields are counted after it (see proc(5)): utime, stime, num_threads
+    # and rss are the 14th, 15th, 20th and 24th ones
+    fields = stat[stat.rfind(')') + 2:].split()
+    try:
+        cpu_time = float(int(fields[11]) + int(fields[12])) / clock_ticks
+        return cpu_time, int(fields[21]) * page_size, int(fields[17])
+    except (IndexError, ValueError):
+        return None
+
+
+def read_psutil_stats(pid):
+    """
+    Return the CPU time (seconds), resident memory (bytes) and number of
+    threads of process *pid*, read with psutil (2.0+), or None
+    """
+    import psutil
+    try:
+        process = psutil.Process(pid)
+        times = process.cpu_times()
+        return (times.user + times.system, process.memory_info().rss,
+                process.num_threads())
+    except (psutil.Error, ValueError):
+        return None
+
+
+class ProcessSampler(object):
+    """
+    Resource usage sampler of process *pid*
+
+    sample() returns the usage of the process as a dictionary: cpu (CPU
+    usage since the previous sample, in percent of a processor), memory
+    (resident memory, in bytes) and threads (number of threads), or None if
+    it can't be read (e.g. if the process is gone).
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        if osp.isdir(PROC_DIR):
+            self.read_stats = read_proc_stats
+        elif programs.is_module_installed('psutil', '>=2.0'):
+            self.read_stats = read_psutil_stats
+        else:
+            self.read_stats = lambda pid: None
+        self._cpu_time = None
+        self._time = None
+
+    def sample(self):
+        """Return the current resource usage of the process, or None"""
+        stats = self.read_stats(self.pid)
+        now = time.time()
+        if stats is None:
+            self._cpu_time = None
+            return None
+        cpu_time, memory, threads = stats
+        cpu = 0.
+        if self._cpu_time is not None and now > self._time:
+            cpu = max(0., 100. * (cpu_time - self._cpu_time) /
+                      (now - self._time))
+        self._cpu_time, self._time = cpu_time, now
+        return dict(cpu=cpu, memory=memory, threads=threads)
@@ -11,7 +11,7 @@ from __future__ import print_function
 from distutils.version import LooseVersion
 from getpass import getuser
 import imp
-import inspect
+import json
 import os
 import os.path as osp
 import re
@@ -28,6 +28,34 @@ class ProgramError(Exception):
     pass
 
 
+# File (in Spyder's config dir) where module versions probed in external
+# interpreters are saved
+MODULE_VERSIONS_FILE = 'module_versions.json'
+
+# Script run by external interpreters to get the versions of the modules
+# passed as arguments (it must work with Python 2 and 3)
+MODULE_VERSIONS_SCRIPT = """
+import json, os, sys
+versions = {}
+for name in sys.argv[1:]:
+    try:
+        mod = __import__(name)
+        ver = getattr(mod, '__version__', getattr(mod, 'VERSION', None))
+        if isinstance(ver, tuple):
+            ver = '.'.join([str(i) for i in ver])
+        elif ver is not None:
+            ver = str(ver)
+        versions[name] = ver
+    except:
+        versions[name] = False
+paths = [path for path in sys.path if path and os.path.isdir(path)]
+sys.stdout.write(json.dumps({'versions': versions, 'paths': paths}) + '\\n')
+"""
+
+# Module versions probed in external interpreters, keyed by interpreter
+_MODULE_VERSIONS_CACHE = None
+
+
 if os.name == 'nt':
     TEMPDIR = tempfile.gettempdir() + osp.sep + 'spyder'
 else:
@@ -382,6 +410,96 @@ def get_module_version(module_name):
     return getattr(mod, '__version__', getattr(mod, 'VERSION', None))
 
 
+def _load_module_versions_cache():
+    """Load module versions saved by previous Spyder sessions."""
+    from spyder.config.base import get_conf_path
+    try:
+        with open(get_conf_path(MODULE_VERSIONS_FILE)) as f:
+            cache = json.load(f)
+        assert isinstance(cache, dict)
+        return cache
+    except Exception:
+        return {}
+
+
+def _save_module_versions_cache(cache):
+    """Save module versions, except for modules that are not installed."""
+    from spyder.config.base import get_conf_path
+    persistent = {}
+    for interpreter, entry in cache.items():
+        versions = dict((name, version) for name, version
+                        in entry['versions'].items() if version is not False)
+        persistent[interpreter] = {'mtime': entry['mtime'],
+                                   'paths': entry['paths'],
+                                   'versions': versions}
+    try:
+        with open(get_conf_path(MODULE_VERSIONS_FILE), 'w') as f:
+            json.dump(persistent, f)
+    except (IOError, OSError):
+        pass
+
+
+def get_module_versions(module_names, interpreter):
+    """
+    Return a dict with the versions of *module_names* in *interpreter*.
+
+    Versions are None if they can't be retrieved and False if the module is
+    not installed.
+
+    Installed module versions are cached (in memory and on disk, for later
+    sessions) by interpreter path, and are valid as long as the modification
+    times of the interpreter and of the directories of its sys.path (like
+    site-packages) don't change, i.e. until packages are installed or
+    removed. Modules that are not installed are probed again every time.
+    All modules missing from the cache are probed in a single subprocess
+    call.
+    """
+    global _MODULE_VERSIONS_CACHE
+    if _MODULE_VERSIONS_CACHE is None:
+        _MODULE_VERSIONS_CACHE = _load_module_versions_cache()
+    interpreter = osp.abspath(interpreter)
+    mtime = os.stat(interpreter).st_mtime
+    entry = _MODULE_VERSIONS_CACHE.get(interpreter)
+    if entry is None or not _is_module_versions_entry_valid(entry, mtime):
+        entry = {'mtime': mtime, 'paths': {}, 'versions': {}}
+        _MODULE_VERSIONS_CACHE[interpreter] = entry
+
+    versions = entry['versions']
+    missing = [name for name in module_names
+               if versions.get(name, False) is False]
+    if missing:
+        proc = run_program(interpreter, ['-c', MODULE_VERSIONS_SCRIPT] +
+                           sorted(set(missing)))
+        output, _err = proc.communicate()
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode,
+                                                interpreter)
+        lines = output.decode().strip().splitlines()
+        if not lines:
+            raise ValueError("No output from %s" % interpreter)
+        result = json.loads(lines[-1])
+        versions.update(result['versions'])
+        entry['paths'] = dict((path, os.stat(path).st_mtime)
+                              for path in result['paths'] if osp.isdir(path))
+        _save_module_versions_cache(_MODULE_VERSIONS_CACHE)
+    return dict((name, versions[name]) for name in module_names)
+
+
+def _is_module_versions_entry_valid(entry, mtime):
+    """
+    Return True if the module versions *entry* of an interpreter modified at
+    *mtime* is still valid, i.e. if the directories of its sys.path didn't
+    change since it was created
+    """
+    if entry.get('mtime') != mtime or 'paths' not in entry:
+        return False
+    try:
+        return all(os.stat(path).st_mtime == path_mtime
+                   for path, path_mtime in entry['paths'].items())
+    except OSError:
+        return False
+
+
 def is_module_installed(module_name, version=None, installed_version=None,
                         interpreter=None):
     """
@@ -398,33 +516,20 @@ def is_module_installed(module_name, version=None, installed_version=None,
     """
     if interpreter:
         if osp.isfile(interpreter) and ('python' in interpreter):
-            checkver = inspect.getsource(check_version)
-            get_modver = inspect.getsource(get_module_version)
-            stable_ver = inspect.getsource(is_stable_version)
-            ismod_inst = inspect.getsource(is_module_installed)
-            fd, script = tempfile.mkstemp(suffix='.py', dir=TEMPDIR)
-            with os.fdopen(fd, 'w') as f:
-                f.write("# -*- coding: utf-8 -*-" + "\n\n")
-                f.write("from distutils.version import LooseVersion" + "\n")
-                f.write("import re" + "\n\n")
-                f.write(stable_ver + "\n")
-                f.write(checkver + "\n")
-                f.write(get_modver + "\n")
-                f.write(ismod_inst + "\n")
-                if version:
-                    f.write("print(is_module_installed('%s','%s'))"\
-                            % (module_name, version))
-                else:
-                    f.write("print(is_module_installed('%s'))" % module_name)
             try:
-                proc = run_program(interpreter, [script])
-                output, _err = proc.communicate()
-            except subprocess.CalledProcessError:
+                actver = get_module_versions([module_name], interpreter)
+            except (OSError, ValueError, subprocess.CalledProcessError):
+                return True
+            actver = actver[module_name]
+            if actver is False:
+                # Module is not installed
+                return False
+            elif version is None:
                 return True
-            if output:  # TODO: Check why output could be empty!
-                return eval(output.decode())
-            else:
+            elif actver is None:
                 return False
+            return is_module_installed(module_name, version,
+                                       installed_version=actver)
         else:
             # Try to not take a wrong decision if there is no interpreter
             # available (needed for the change_pystartup method of ExtConsole
@@ -447,7 +552,8 @@ def is_module_installed(module_name, version=None, installed_version=None,
             if ';' in version:
                 output = True
                 for ver in version.split(';'):
-                    output = output and is_module_installed(module_name, ver)
+                    output = output and is_module_installed(module_name,
+                                                            ver, actver)
                 return output
             match = re.search('[0-9]', version)
             assert match is not None, "Invalid version number"
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Console scrollback
+
+Lines removed from a console, to keep its number of lines under its maximum
+block count, are kept in a temporary file, compressed by pages of lines, so
+that output of long running code can still be read and searched without
+keeping it in the console document.
+"""
+
+# Standard library imports
+import re
+import tempfile
+import zlib
+
+# Local imports
+from spyder.py3compat import to_text_string
+
+
+def get_search_regex(text, case=False, words=False, regexp=False):
+    """Return the regular expression used to find *text* in lines, as
+    FindReplace finds it in a console"""
+    if not regexp:
+        text = re.escape(to_text_string(text))
+    if words:
+        text = r"\b{}\b".format(text)
+    flags = re.UNICODE if case else re.UNICODE | re.IGNORECASE
+    return re.compile(text, flags)
+
+
+class ScrollbackStore(object):
+    """
+    Lines removed from a console
+
+    Lines are appended to the last page, which is compressed and written to
+    a temporary file once it has PAGE_SIZE lines. When more than MAX_PAGES
+    pages have been written, the oldest ones are forgotten (the file being
+    rewritten when half of it isn't used anymore).
+
+    Lines are numbered from the oldest line kept.
+    """
+    # Number of lines of a page
+    PAGE_SIZE = 1000
+    # Number of pages kept
+    MAX_PAGES = 10000
+
+    def __init__(self):
+        self._file = None
+        # (offset, size) of pages in file
+        self._pages = []
+        self._unused_size = 0
+        # Lines of the page not written yet
+        self._last_page = []
+        # (index, lines) of the last page read
+        self._cache = None
+
+    def append(self, text):
+        """Append lines of *text* ('\\n' being the line separator)"""
+        if not text:
+            return
+        lines = text.split('\n')
+        if text.endswith('\n'):
+            lines.pop()
+        while lines:
+            count = self.PAGE_SIZE - len(self._last_page)
+            self._last_page += lines[:count]
+            del lines[:count]
+            if len(self._last_page) == self.PAGE_SIZE:
+                self._write_page(self._last_page)
+                self._last_page = []
+
+    def clear(self):
+        """Forget all lines"""
+        self.close()
+        self._pages = []
+        self._unused_size = 0
+        self._last_page = []
+        self._cache = None
+
+    def close(self):
+        """Close (and remove) the temporary file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def line_count(self):
+        """Return the number of lines"""
+        return len(self._pages) * self.PAGE_SIZE + len(self._last_page)
+
+    def page_count(self):
+        """Return the number of pages"""
+        return len(self._pages) + (1 if self._last_page else 0)
+
+    def get_page(self, index):
+        """Return the lines of page *index*"""
+        if index == len(self._pages):
+            return list(self._last_page)
+        if self._cache is None or self._cache[0] != index:
+            offset, size = self._pages[index]
+            self._file.seek(offset)
+            data = zlib.decompress(self._file.read(size))
+            self._cache = (index, data.decode('utf-8').split('\n'))
+        return list(self._cache[1])
+
+    def get_lines(self, start, end):
+        """Return lines from *start* to *end* (excluded)"""
+        lines = []
+        end = min(end, self.line_count())
+        while start < end:
+            index, offset = divmod(start, self.PAGE_SIZE)
+            page = self.get_page(index)
+            lines += page[offset:offset + end - start]
+            start = (index + 1) * self.PAGE_SIZE
+        return lines
+
+    def get_text(self):
+        """Return all lines, followed by line separators"""
+        return ''.join(line + '\n' for index in range(self.page_count())
+                       for line in self.get_page(index))
+
+    def find(self, regex, line=None, forward=True):
+        """
+        Return the number of the first line matching *regex* (see
+        get_search_regex) after *line* (or before it if not *forward*), or
+        None if there's none
+
+        Lines are searched from the first (or last) one if *line* is None.
+        """
+        count = self.line_count()
+        if line is None:
+            line = -1 if forward else count
+        step = 1 if forward else -1
+        line += step
+        while 0 <= line < count:
+            index, offset = divmod(line, self.PAGE_SIZE)
+            page = self.get_page(index)
+            stop = len(page) if forward else -1
+            for offset in range(offset, stop, step):
+                if regex.search(page[offset]):
+                    return index * self.PAGE_SIZE + offset
+            line = (index + 1) * self.PAGE_SIZE if forward \
+                else index * self.PAGE_SIZE - 1
+        return None
+
+    def count(self, regex):
+        """Return the number of lines matching *regex*"""
+        return sum(1 for index in range(self.page_count())
+                   for line in self.get_page(index) if regex.search(line))
+
+    def _write_page(self, lines):
+        """Compress and write *lines*"""
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='spyder-scrollback-')
+        data = zlib.compress('\n'.join(lines).encode('utf-8'))
+        self._file.seek(0, 2)
+        self._pages.append((self._file.tell(), len(data)))
+        self._file.write(data)
+        if len(self._pages) > self.MAX_PAGES:
+            self._unused_size += self._pages.pop(0)[1]
+            self._cache = None
+            if self._unused_size > self._file.tell() // 2:
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the temporary file without forgotten pages"""
+        new_file = tempfile.TemporaryFile(prefix='spyder-scrollback-')
+        pages = []
+        for offset, size in self._pages:
+            self._file.seek(offset)
+            pages.append((new_file.tell(), size))
+            new_file.write(self._file.read(size))
+        self._file.close()
+        self._file = new_file
+        self._pages = pages
+        self._unused_size = 0
@@ -879,6 +879,106 @@ if "SPYDER_EXCEPTHOOK" in os.environ:
     set_post_mortem()
 
 
+#==============================================================================
+# Memory profiler
+#==============================================================================
+class MemoryProfiler(object):
+    """
+    Memory profiler of scripts run with runfile, based on tracemalloc
+    (Python 3.4+)
+
+    A snapshot of the memory allocated by each line is taken every
+    *interval* seconds by a thread, and reduced right away to the *top*
+    lines allocating the most memory and to the lines whose allocated
+    memory grew the most since the previous snapshot.
+    """
+
+    def __init__(self, interval=1., top=20):
+        import tracemalloc
+        self.tracemalloc = tracemalloc
+        self.interval = interval
+        self.top = top
+        self.snapshots = []
+        self.peak = 0
+        self.duration = 0.
+        # Largest memory allocated by each line, as {(filename, line): size}
+        self.line_sizes = {}
+        self._sizes = {}
+        self._was_tracing = False
+        self._start_time = None
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        """Start tracing memory allocations and taking snapshots"""
+        import threading
+        self._was_tracing = self.tracemalloc.is_tracing()
+        if not self._was_tracing:
+            self.tracemalloc.start()
+        self._start_time = time.time()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Take a last snapshot and stop tracing memory allocations"""
+        self._stop.set()
+        self._thread.join()
+        self.take_snapshot()
+        self.peak = self.tracemalloc.get_traced_memory()[1]
+        self.duration = time.time() - self._start_time
+        if not self._was_tracing:
+            self.tracemalloc.stop()
+
+    def take_snapshot(self):
+        """Take a snapshot of the memory allocated by each line"""
+        tracemalloc = self.tracemalloc
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+                        tracemalloc.Filter(False, tracemalloc.__file__),
+                        tracemalloc.Filter(False, __file__)))
+        statistics = snapshot.statistics('lineno')
+        sizes = {}
+        for stat in statistics:
+            frame = stat.traceback[0]
+            key = (frame.filename, frame.lineno)
+            sizes[key] = stat.size
+            if stat.size > self.line_sizes.get(key, 0):
+                self.line_sizes[key] = stat.size
+        growth = [(size - self._sizes.get(key, 0), key, size)
+                  for key, size in sizes.items()]
+        growth = sorted([item for item in growth if item[0] > 0],
+                        reverse=True)[:self.top]
+        self.snapshots.append({
+            'time': time.time() - self._start_time,
+            'size': sum(stat.size for stat in statistics),
+            'count': sum(stat.count for stat in statistics),
+            'top': [[stat.traceback[0].filename, stat.traceback[0].lineno,
+                     stat.size, stat.count]
+                    for stat in statistics[:self.top]],
+            'growth': [[filename, line, size_diff, size]
+                       for size_diff, (filename, line), size in growth]})
+        self._sizes = sizes
+
+    def save(self, filename):
+        """Save snapshots in *filename* (JSON)"""
+        import json
+        lines = {}
+        for (source, line), size in self.line_sizes.items():
+            if not source.startswith('<'):
+                lines.setdefault(source, []).append([line, size])
+        data = {'version': 1, 'interval': self.interval,
+                'duration': self.duration, 'peak': self.peak,
+                'snapshots': self.snapshots, 'lines': lines}
+        with open(filename, 'w') as data_file:
+            json.dump(data, data_file)
+
+    def _run(self):
+        """Take snapshots until stopped"""
+        while not self._stop.wait(self.interval):
+            self.take_snapshot()
+
+
 #==============================================================================
 # runfile and debugfile commands
 #==============================================================================
@@ -895,12 +995,16 @@ def _get_globals():
     return namespace
 
 
-def runfile(filename, args=None, wdir=None, namespace=None, post_mortem=False):
+def runfile(filename, args=None, wdir=None, namespace=None, post_mortem=False,
+            memory_profile=None, memory_interval=1.):
     """
     Run filename
     args: command line arguments (string)
     wdir: working directory
     post_mortem: boolean, whether to enter post-mortem mode on error
+    memory_profile: file in which memory snapshots are saved (see
+                    MemoryProfiler), or None not to profile memory usage
+    memory_interval: interval between two memory snapshots (seconds)
     """
     try:
         filename = filename.decode('utf-8')
@@ -937,15 +1041,32 @@ def runfile(filename, args=None, wdir=None, namespace=None, post_mortem=False):
         os.chdir(wdir)
     if post_mortem:
         set_post_mortem()
-    if HAS_CYTHON and os.path.splitext(filename)[1].lower() == '.pyx':
-        # Cython files
-        with io.open(filename, encoding='utf-8') as f:
+    memory_profiler = None
+    if memory_profile is not None:
+        try:
+            memory_profiler = MemoryProfiler(memory_interval)
+        except ImportError:
+            _print("Memory profiling requires Python 3.4 or later",
+                   file=sys.stderr)
+        else:
+            memory_profiler.start()
+    try:
+        if HAS_CYTHON and os.path.splitext(filename)[1].lower() == '.pyx':
+            # Cython files
+            with io.open(filename, encoding='utf-8') as f:
+                if IS_IPYKERNEL:
+                    from IPython.core.getipython import get_ipython
+                    ipython_shell = get_ipython()
+                    ipython_shell.run_cell_magic('cython', '', f.read())
+        else:
+            execfile(filename, namespace)
+    finally:
+        if memory_profiler is not None:
+            memory_profiler.stop()
+            memory_profiler.save(memory_profile)
             if IS_IPYKERNEL:
                 from IPython.core.getipython import get_ipython
-                ipython_shell = get_ipython()
-                ipython_shell.run_cell_magic('cython', '', f.read())
-    else:
-        execfile(filename, namespace)
+                get_ipython().kernel.publish_memory_profile(memory_profile)
 
     clear_post_mortem()
     sys.argv = ['']
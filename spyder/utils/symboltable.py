@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Symbol table of a document
+
+Outline explorer data of a document (see spyder/utils/syntaxhighlighters.py)
+by block number, sorted, with the scopes of class and function definitions,
+for the Outline Explorer, the class/function dropdowns and the file switcher.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+
+class SymbolTable(object):
+    """
+    Outline explorer data of a document by block number
+
+    Besides being a mapping of block numbers to outline explorer data, the
+    table keeps the sorted block numbers of all the data and of class and
+    function definitions, so that the definitions enclosing a block are
+    found by bisection and by following the definitions less indented than
+    each other, instead of scanning all blocks of the document.
+
+    Scopes of definitions are given by *get_range*, a function taking the
+    block number of a definition and returning a (last block, last block
+    including trailing blank lines) tuple, or None if the definition has no
+    scope. They are computed when needed, and forgotten when a block in them
+    or right after them changes (see block_changed).
+
+    *revision* is incremented every time definitions or their scopes may
+    have changed.
+    """
+
+    def __init__(self, get_range=None):
+        self.get_range = get_range
+        self.revision = 0
+        self.clear()
+
+    def clear(self):
+        """Remove all data"""
+        self._data = {}
+        self._blocks = []
+        self._definitions = []
+        self._counts = {}
+        # Definition block number -> scope (see get_range), and index of the
+        # closest previous definition less indented than each definition
+        self._ranges = {}
+        self._outer = None
+        self.revision += 1
+
+    #---- Mapping interface
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(list(self._blocks))
+
+    def __contains__(self, block_nb):
+        return block_nb in self._data
+
+    def __getitem__(self, block_nb):
+        return self._data[block_nb]
+
+    def get(self, block_nb, default=None):
+        return self._data.get(block_nb, default)
+
+    def keys(self):
+        return list(self._blocks)
+
+    def values(self):
+        return [self._data[block_nb] for block_nb in self._blocks]
+
+    def items(self):
+        return [(block_nb, self._data[block_nb]) for block_nb in self._blocks]
+
+    def __setitem__(self, block_nb, data):
+        old_data = self._data.get(block_nb)
+        self._data[block_nb] = data
+        if old_data is None:
+            insort(self._blocks, block_nb)
+        else:
+            self._count(old_data, -1)
+        self._count(data, 1)
+        if old_data is not None and old_data.is_class_or_function():
+            if data.is_class_or_function() and \
+              old_data.get_key() == data.get_key():
+                return
+            self._remove_definition(block_nb)
+        if data.is_class_or_function():
+            insort(self._definitions, block_nb)
+            self._definitions_changed()
+
+    def pop(self, block_nb, default=None):
+        data = self._data.pop(block_nb, None)
+        if data is None:
+            return default
+        del self._blocks[bisect_left(self._blocks, block_nb)]
+        self._count(data, -1)
+        if data.is_class_or_function():
+            self._remove_definition(block_nb)
+        return data
+
+    def _count(self, data, increment):
+        self._counts[data.def_type] = \
+            self._counts.get(data.def_type, 0) + increment
+
+    def _remove_definition(self, block_nb):
+        del self._definitions[bisect_left(self._definitions, block_nb)]
+        self._ranges.pop(block_nb, None)
+        self._definitions_changed()
+
+    def _definitions_changed(self):
+        self._outer = None
+        self.revision += 1
+
+    #---- Queries
+    def count(self, def_type):
+        """Return the number of blocks with data of type *def_type*"""
+        return self._counts.get(def_type, 0)
+
+    def get_blocks(self, first=0, end=None):
+        """Return the sorted numbers of blocks from *first* to *end*
+        (excluded) with data"""
+        start = bisect_left(self._blocks, first)
+        if end is None:
+            return self._blocks[start:]
+        return self._blocks[start:bisect_left(self._blocks, end)]
+
+    def get_definitions(self):
+        """Return the sorted block numbers of class/function definitions"""
+        return list(self._definitions)
+
+    def get_scope(self, block_nb):
+        """
+        Return the (first block, last block) range of the scope of the
+        definition at *block_nb*, or None if it has none
+        """
+        if block_nb not in self._ranges:
+            if self.get_range is None:
+                self._ranges[block_nb] = None
+            else:
+                self._ranges[block_nb] = self.get_range(block_nb)
+        scope = self._ranges[block_nb]
+        if scope is None:
+            return None
+        return (block_nb, scope[0])
+
+    def get_scopes(self, block_nb):
+        """
+        Return the block numbers of definitions whose scope contains
+        *block_nb*, outermost first
+        """
+        index = bisect_right(self._definitions, block_nb) - 1
+        scopes = []
+        for number in self._get_outer_definitions(index):
+            scope = self.get_scope(number)
+            if scope is not None and block_nb <= scope[1]:
+                scopes.append(number)
+        scopes.reverse()
+        return scopes
+
+    def get_parent(self, block_nb):
+        """Return the block number of the innermost definition containing
+        the definition at *block_nb* (None if there's none)"""
+        for number in reversed(self.get_scopes(block_nb)):
+            if number < block_nb:
+                return number
+        return None
+
+    def _get_outer_definitions(self, index):
+        """Return the definition at *index* and those less indented than
+        each other before it"""
+        if self._outer is None:
+            self._outer = []
+            stack = []
+            for number in self._definitions:
+                level = self._data[number].fold_level
+                while stack and \
+                  self._data[self._definitions[stack[-1]]].fold_level >= level:
+                    stack.pop()
+                self._outer.append(stack[-1] if stack else None)
+                stack.append(len(self._outer) - 1)
+        numbers = []
+        while index is not None and index >= 0:
+            numbers.append(self._definitions[index])
+            index = self._outer[index]
+        return numbers
+
+    #---- Changes
+    def shift(self, block_nb, delta):
+        """
+        Update the table after *delta* blocks were inserted after block
+        *block_nb* (removed if negative)
+        """
+        if not delta:
+            return
+        last_removed = block_nb - min(delta, 0)
+
+        start = bisect_right(self._blocks, block_nb)
+        moved = [(number, self._data.pop(number))
+                 for number in self._blocks[start:]]
+        del self._blocks[start:]
+        for number, data in moved:
+            if number > last_removed:
+                self._data[number + delta] = data
+                self._blocks.append(number + delta)
+            else:
+                self._count(data, -1)
+
+        start = bisect_right(self._definitions, block_nb)
+        count = len(self._definitions)
+        self._definitions[start:] = [number + delta for number
+                                     in self._definitions[start:]
+                                     if number > last_removed]
+        if len(self._definitions) != count:
+            self._outer = None
+
+        ranges = {}
+        for number, scope in self._ranges.items():
+            if number > last_removed:
+                if scope is not None:
+                    scope = (scope[0] + delta, scope[1] + delta)
+                ranges[number + delta] = scope
+            elif number <= block_nb and \
+              (scope is None or scope[1] < block_nb):
+                ranges[number] = scope
+        self._ranges = ranges
+        self.revision += 1
+
+    def block_changed(self, block_nb):
+        """Forget the scopes which may have changed with block *block_nb*"""
+        if not self._ranges:
+            return
+        index = bisect_right(self._definitions, block_nb) - 1
+        if index < 0:
+            return
+        forgotten = False
+        # Whether a definition has a scope depends on the next non-blank
+        # block
+        if index and self._definitions[index] == block_nb:
+            number = self._definitions[index - 1]
+            forgotten = self._ranges.pop(number, False) is not False
+        for number in self._get_outer_definitions(index):
+            scope = self._ranges.get(number, False)
+            if scope is False:
+                continue
+            if number == block_nb or scope is None and \
+              number == self._definitions[index] or \
+              scope is not None and block_nb <= scope[1] + 1:
+                del self._ranges[number]
+                forgotten = True
+        if forgotten:
+            self.revision += 1
@@ -11,24 +11,31 @@ Editor widget syntax highlighters based on QtGui.QSyntaxHighlighter
 
 # Standard library imports
 from __future__ import print_function
+import functools
 import keyword
+import logging
 import os
 import re
+import sys
+import time
 import weakref
 
 # Third party imports
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QTimer, Signal
 from qtpy.QtGui import (QColor, QCursor, QFont, QSyntaxHighlighter,
-                        QTextCharFormat, QTextOption)
+                        QTextCharFormat, QTextCursor, QTextOption)
 from qtpy.QtWidgets import QApplication
 
 # Local imports
 from spyder import dependencies
 from spyder.config.base import _
 from spyder.config.main import CONF
-from spyder.py3compat import builtins, is_text_string, to_text_string
+from spyder.py3compat import (builtins, get_func_code, get_meth_func,
+                              is_text_string, to_text_string)
 from spyder.utils.sourcecode import CELL_LANGUAGES
 from spyder.utils.editor import TextBlockHelper as tbh
+from spyder.utils.instrumentation import INSTRUMENTATION
+from spyder.utils.symboltable import SymbolTable
 from spyder.utils.workers import WorkerManager
 
 PYGMENTS_REQVER = '>=2.0'
@@ -59,6 +66,8 @@ COLOR_SCHEME_KEYS = {
                       "instance":       _("Instance:"),
                       }
 COLOR_SCHEME_NAMES = CONF.get('color_schemes', 'names')
+# Clock used to limit the time spent highlighting large documents
+clock = getattr(time, 'perf_counter', time.time)
 # Mapping for file extensions that use Pygments highlighting but should use
 # different lexers than Pygments' autodetection suggests.  Keys are file
 # extensions or tuples of extensions, values are Pygments lexer names.
@@ -95,6 +104,18 @@ def get_color_scheme(name):
     return scheme
 
 
+def shift_block_data(data, block_nb, delta):
+    """
+    Update *data*, a dictionary of block data by block number, after *delta*
+    blocks were inserted after block *block_nb* (removed if negative)
+    """
+    for number in sorted((key for key in data if isinstance(key, int) and
+                          key > block_nb), reverse=delta > 0):
+        value = data.pop(number)
+        if number > block_nb - delta:
+            data[number + delta] = value
+
+
 #==============================================================================
 # Syntax highlighting color schemes
 #==============================================================================
@@ -107,11 +128,29 @@ class BaseSH(QSyntaxHighlighter):
     NORMAL = 0
     # Syntax highlighting parameters.
     BLANK_ALPHA_FACTOR = 0.31
+    # Documents with at least this number of blocks are highlighted by
+    # chunks, visible blocks first (see highlightBlock)
+    HIGHLIGHT_BY_CHUNKS = True
+    LARGE_DOCUMENT_BLOCKS = 5000
+    # Seconds spent highlighting them after a change, and in every chunk
+    HIGHLIGHT_TIME = 0.05
+    CHUNK_TIME = 0.02
+    # Maximum number of outline explorer data changes kept until they are
+    # consumed (see get_outlineexplorer_changes)
+    MAX_OUTLINEEXPLORER_CHANGES = 500
+
+    # Emitted when a document highlighted by chunks is done
+    sig_highlighting_finished = Signal()
 
     def __init__(self, parent, font=None, color_scheme='Spyder'):
         QSyntaxHighlighter.__init__(self, parent)
 
-        self.outlineexplorer_data = {}
+        self.outlineexplorer_data = SymbolTable(self.get_scope_range)
+        self.found_cell_separators = False
+        # Changes of outline explorer data not consumed yet (None if all
+        # data may have changed) and number of blocks when last highlighted
+        self.outlineexplorer_changes = None
+        self._block_count = None
 
         self.font = font
         if is_text_string(color_scheme):
@@ -134,6 +173,17 @@ class BaseSH(QSyntaxHighlighter):
         self.cell_separators = None
         self.fold_detector = None
         self.editor = None
+
+        # Highlighting by chunks: cursor on the first block not highlighted
+        # yet (None if there's none), end of the current pass and range of
+        # visible blocks
+        self._frontier = None
+        self._finished = False
+        self._deadline = None
+        self._visible = (0, -1)
+        self._chunk_timer = QTimer(self)
+        self._chunk_timer.setSingleShot(True)
+        self._chunk_timer.timeout.connect(self._highlight_chunk)
         
     def get_background_color(self):
         return QColor(self.background_color)
@@ -214,6 +264,7 @@ class BaseSH(QSyntaxHighlighter):
             previous_block = previous_block.previous()
         return previous_block
 
+    @INSTRUMENTATION.timed('editor.highlightBlock')
     def highlightBlock(self, text):
         """
         Highlights a block of text. Please do not override, this method.
@@ -222,6 +273,19 @@ class BaseSH(QSyntaxHighlighter):
 
         :param text: text to highlight.
         """
+        block_count = self.document().blockCount()
+        if block_count != self._block_count:
+            # Qt highlights the block where lines were inserted or removed
+            # first: block data after it must be moved
+            if self._block_count is None:
+                self.outlineexplorer_changes = None
+            else:
+                self.blocks_inserted(self.currentBlock().blockNumber(),
+                                     block_count - self._block_count)
+            self._block_count = block_count
+        if self.HIGHLIGHT_BY_CHUNKS and not self._can_highlight():
+            self._keep_formats()
+            return
         self.highlight_block(text)
 
         # Process blocks for fold detection
@@ -232,6 +296,7 @@ class BaseSH(QSyntaxHighlighter):
                 self.fold_detector._editor = weakref.ref(self.editor)
                 self.fold_detector.process_block(
                     current_block, previous_block, text)
+        self.outlineexplorer_data.block_changed(current_block.blockNumber())
 
     def highlight_block(self, text):
         """
@@ -272,15 +337,208 @@ class BaseSH(QSyntaxHighlighter):
                 self.setFormat(start, end-start, color_foreground)
                 match = self.BLANKPROG.search(text, match.end())
     
+    def blocks_inserted(self, block_nb, delta):
+        """*delta* blocks were inserted after *block_nb* (or removed)"""
+        self.outlineexplorer_data.shift(block_nb, delta)
+        self._add_outlineexplorer_change(block_nb, block_nb + max(delta, 0),
+                                         delta)
+
     def get_outlineexplorer_data(self):
+        """Return outline explorer data (a SymbolTable)"""
         return self.outlineexplorer_data
 
+    def get_scope_range(self, block_nb):
+        """
+        Return the (last block, last block including trailing blank lines)
+        of the fold scope starting at block *block_nb*, or None if there's
+        none (see spyder/utils/symboltable.py)
+        """
+        from spyder.widgets.sourcecode.folding import FoldScope
+        document = self.document()
+        if document is None:
+            return None
+        block = document.findBlockByNumber(block_nb)
+        if not block.isValid() or not tbh.is_fold_trigger(block):
+            return None
+        _first, raw_last = FoldScope(block).get_range(
+                                                    ignore_blank_lines=False)
+        block = document.findBlockByNumber(raw_last)
+        while block.blockNumber() > block_nb and block.text().strip() == '':
+            block = block.previous()
+        return (block.blockNumber(), raw_last)
+
+    def set_outlineexplorer_data(self, block_nb, oedata):
+        """
+        Set outline explorer data of block *block_nb* (None if it has none)
+        and return its previous data
+        """
+        if oedata is None:
+            old_oedata = self.outlineexplorer_data.pop(block_nb, None)
+        else:
+            old_oedata = self.outlineexplorer_data.get(block_nb)
+            self.outlineexplorer_data[block_nb] = oedata
+        if old_oedata is None or oedata is None:
+            changed = old_oedata is not oedata
+        else:
+            changed = old_oedata.get_key() != oedata.get_key()
+        if changed:
+            self._add_outlineexplorer_change(block_nb, block_nb, 0)
+        return old_oedata
+
+    def get_outlineexplorer_changes(self):
+        """
+        Return and forget changes of outline explorer data since last call
+
+        Changes are (first block, last block, number of blocks inserted
+        after the first one (removed if negative)) tuples, in the order they
+        happened: data of blocks from first to last changed after blocks
+        were inserted or removed, if any. Returns None if all data may have
+        changed.
+        """
+        changes = self.outlineexplorer_changes
+        self.outlineexplorer_changes = []
+        if changes is not None:
+            changes = [tuple(change) for change in changes]
+        return changes
+
+    def _add_outlineexplorer_change(self, first, last, delta):
+        changes = self.outlineexplorer_changes
+        if changes is None:
+            return
+        if delta == 0 and changes and \
+          changes[-1][0] <= first <= changes[-1][1] + 1:
+            # Merge consecutive changes of outline explorer data
+            changes[-1][1] = max(changes[-1][1], last)
+        elif len(changes) < self.MAX_OUTLINEEXPLORER_CHANGES:
+            changes.append([first, last, delta])
+        else:
+            self.outlineexplorer_changes = None
+
     def rehighlight(self):
-        self.outlineexplorer_data = {}
+        self.outlineexplorer_data.clear()
+        self.outlineexplorer_changes = None
+        if self.document() is not None:
+            self._block_count = self.document().blockCount()
+        if self._is_large_document():
+            self._set_frontier(self.document().firstBlock())
+            self.highlight_viewport()
+            return
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         QSyntaxHighlighter.rehighlight(self)
         QApplication.restoreOverrideCursor()
 
+    #---- Highlighting by chunks
+    def is_highlighting(self):
+        """Return True if some blocks are waiting to be highlighted"""
+        return self._frontier is not None
+
+    def highlight_viewport(self):
+        """Highlight visible blocks now if they are waiting"""
+        if self._frontier is None or self.editor is None:
+            return
+        editor = self.editor
+        block = editor.firstVisibleBlock()
+        lines = editor.viewport().height() // max(editor.fontMetrics().height(),
+                                                  1)
+        self._visible = (block.blockNumber(), block.blockNumber() + lines + 1)
+        while block.isValid() and block.blockNumber() <= self._visible[1]:
+            if self._frontier is None:
+                break
+            if block.blockNumber() >= self._frontier.blockNumber():
+                self.rehighlightBlock(block)
+            block = block.next()
+
+    def _is_large_document(self):
+        document = self.document()
+        return (self.HIGHLIGHT_BY_CHUNKS and document is not None and
+                document.blockCount() >= self.LARGE_DOCUMENT_BLOCKS)
+
+    def _can_highlight(self):
+        """
+        Return True if the current block can be highlighted now.
+
+        Blocks of large documents are highlighted in order and only during
+        HIGHLIGHT_TIME after a change: the rest is left to a timer which
+        highlights CHUNK_TIME worth of blocks at a time, to keep the
+        interface responsive. Visible blocks are highlighted right away,
+        from the state of the previous block even if it's not up to date
+        (they are highlighted again when their turn comes).
+
+        Blocks not highlighted keep their state, so that Qt stops
+        highlighting the following ones.
+        """
+        if self._deadline is None:
+            if self._frontier is None and not self._is_large_document():
+                return True
+            # Qt is highlighting blocks after a change
+            self._deadline = clock() + self.HIGHLIGHT_TIME
+            QTimer.singleShot(0, self._end_pass)
+        block = self.currentBlock()
+        number = block.blockNumber()
+        if self._frontier is not None and \
+          number > self._frontier.blockNumber():
+            return self._visible[0] <= number <= self._visible[1]
+        if clock() > self._deadline:
+            self._set_frontier(block)
+            return False
+        if self._frontier is not None and \
+          number == self._frontier.blockNumber():
+            if block.next().isValid():
+                self._frontier.setPosition(block.next().position())
+            else:
+                self._frontier = None
+                self._finished = True
+        return True
+
+    def _keep_formats(self):
+        """
+        Set the formats the current block had again, until it's highlighted
+        (they would be cleared otherwise, making colors flicker)
+        """
+        layout = self.currentBlock().layout()
+        if layout is None:
+            return
+        for format_range in layout.additionalFormats():
+            self.setFormat(format_range.start, format_range.length,
+                           format_range.format)
+
+    def _set_frontier(self, block):
+        """Highlight *block* and the following ones by chunks"""
+        if self._frontier is None or \
+          block.blockNumber() < self._frontier.blockNumber():
+            # The cursor follows the block when the text before changes
+            self._frontier = QTextCursor(block)
+            self._frontier.setKeepPositionOnInsert(True)
+        self._chunk_timer.start()
+
+    def _end_pass(self):
+        """Qt is done highlighting blocks after a change"""
+        self._deadline = None
+        self._emit_finished()
+
+    def _emit_finished(self):
+        if self._finished:
+            self._finished = False
+            self.sig_highlighting_finished.emit()
+
+    def _highlight_chunk(self):
+        """Highlight the next blocks waiting for CHUNK_TIME"""
+        if self._frontier is None:
+            return
+        if self.document() is None:
+            self._frontier = None
+            return
+        self._deadline = clock() + self.CHUNK_TIME
+        try:
+            while self._frontier is not None and clock() < self._deadline:
+                self.rehighlightBlock(self._frontier.block())
+        finally:
+            self._deadline = None
+        if self._frontier is None:
+            self._emit_finished()
+        else:
+            self._chunk_timer.start()
+
 
 class TextSH(BaseSH):
     """Simple Text Syntax Highlighter Class (only highlight spaces)"""
@@ -367,6 +625,10 @@ class OutlineExplorerData(object):
         self.fold_level = None
         self.def_type = None
         self.def_name = None
+
+    def get_key(self):
+        """Return what the Outline Explorer shows of this data"""
+        return (self.text, self.fold_level, self.def_type, self.def_name)
         
     def is_not_class_nor_function(self):
         return self.def_type not in (self.CLASS, self.FUNCTION)
@@ -412,7 +674,6 @@ class PythonSH(BaseSH):
     def __init__(self, parent, font=None, color_scheme='Spyder'):
         BaseSH.__init__(self, parent, font, color_scheme)
         self.import_statements = {}
-        self.found_cell_separators = False
         self.cell_separators = CELL_LANGUAGES['Python']
 
     def highlight_block(self, text):
@@ -531,13 +792,21 @@ class PythonSH(BaseSH):
         self.formats['trailing'] = self.formats['normal']
         self.highlight_spaces(text, offset)
         
-        if oedata is not None:
-            block_nb = self.currentBlock().blockNumber()
-            self.outlineexplorer_data[block_nb] = oedata
-            self.outlineexplorer_data['found_cell_separators'] = self.found_cell_separators
+        block_nb = self.currentBlock().blockNumber()
+        old_oedata = self.set_outlineexplorer_data(block_nb, oedata)
+        if old_oedata is not None and \
+          old_oedata.def_type == OutlineExplorerData.CELL:
+            self.found_cell_separators = self.outlineexplorer_data.count(
+                                                OutlineExplorerData.CELL) > 0
         if import_stmt is not None:
-            block_nb = self.currentBlock().blockNumber()
             self.import_statements[block_nb] = import_stmt
+        else:
+            self.import_statements.pop(block_nb, None)
+
+    def blocks_inserted(self, block_nb, delta):
+        """Reimplemented BaseSH method"""
+        BaseSH.blocks_inserted(self, block_nb, delta)
+        shift_block_data(self.import_statements, block_nb, delta)
             
     def get_import_statements(self):
         return list(self.import_statements.values())
@@ -1014,7 +1283,10 @@ class MarkdownSH(BaseSH):
     PROG = re.compile(make_md_patterns(), re.S)
     NORMAL = 0
     CODE = 1
+    # highlightBlock is reimplemented
+    HIGHLIGHT_BY_CHUNKS = False
 
+    @INSTRUMENTATION.timed('editor.highlightBlock')
     def highlightBlock(self, text):
         text = to_text_string(text)
         previous_state = self.previousBlockState()
@@ -1098,6 +1370,73 @@ class MarkdownSH(BaseSH):
 # highlighter based on PygmentsSH would be 2 to 3 times slower than the 
 # current native PythonSH syntax highlighter.
 
+logger = logging.getLogger(__name__)
+
+class LineStateContext(object):
+    """
+    Mixin for Pygments' LexerContext recording lexer states at line starts
+
+    Regex lexers read the end of their context before matching the text at
+    its position, once the previous match has changed the state stack, so
+    the state of the context at that time is the one to lex a line from when
+    the position is the start of the line. Only then is the end removed
+    from the attributes of the context to be looked up with __getattr__,
+    which keeps other lookups fast.
+
+    States are tuples of (name, value) tuples of the public attributes of
+    the context but its text, position and end (only its state stack for
+    most lexers), lists being turned into tuples.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.__dict__.update(_line_states={}, _next_line=0, _end=None,
+                             _recording=False)
+        super(LineStateContext, self).__init__(*args, **kwargs)
+
+    def __setattr__(self, name, value):
+        if name == 'pos' and value >= self._next_line:
+            if value == self._next_line:
+                # Record the state when the end is read next
+                self.__dict__.pop('end', None)
+                self._recording = True
+            self._next_line = (self.text.find('\n', value) + 1 or
+                               len(self.text) + 1)
+        elif name == 'end':
+            self._end = value
+            if self._recording:
+                return
+        self.__dict__[name] = value
+
+    def __getattr__(self, name):
+        if name != 'end' or not self.__dict__.get('_recording'):
+            raise AttributeError(name)
+        self._line_states[self.pos] = self.get_state()
+        self._recording = False
+        self.end = self._end
+        return self._end
+
+    def get_state(self):
+        """Return the current lexer state"""
+        return tuple((name, tuple(value) if isinstance(value, list) else value)
+                     for name, value in sorted(vars(self).items())
+                     if not name.startswith('_') and
+                     name not in ('text', 'pos', 'end'))
+
+    def set_state(self, state):
+        """Set the lexer state to *state*"""
+        for name, value in state:
+            if isinstance(value, tuple):
+                value = list(value)
+            setattr(self, name, value)
+
+    def get_line_state(self, pos):
+        """
+        Return the lexer state at *pos*, the start of a line, or None if it
+        wasn't reached between two matches
+        """
+        return self._line_states.get(pos)
+
+
 class PygmentsSH(BaseSH):
     """ Generic Pygments syntax highlighter """
     # Store the language name and a ref to the lexer
@@ -1106,9 +1445,14 @@ class PygmentsSH(BaseSH):
 
     # Syntax highlighting states (from one text block to another):
     NORMAL = 0
+    # highlightBlock is reimplemented
+    HIGHLIGHT_BY_CHUNKS = False
+
     def __init__(self, parent, font=None, color_scheme=None):
         # Warning: do not move out those import statements
         # (pygments is an optional dependency)
+        from pygments.lexer import (ExtendedRegexLexer, LexerContext,
+                                    RegexLexer)
         from pygments.lexers import get_lexer_by_name
         from pygments.token import (Text, Other, Keyword, Name, String, Number,
                                     Comment, Generic, Token)
@@ -1123,93 +1467,275 @@ class PygmentsSH(BaseSH):
                         Comment: "comment",
                         String: "string",
                         Number: "number"}
+        # Spyder token of every Pygments token found so far
+        self._fmt_names = {}
         # Load Pygments' Lexer
         if self._lang_name is not None:
             self._lexer = get_lexer_by_name(self._lang_name)
 
+        # Lexing can be restarted from the middle of the text only with regex
+        # lexers, lexing with a context which records their state at line
+        # starts (see _get_tokens)
+        self._context_class = None
+        # Whether tokens are those of the lexer's own get_tokens_unprocessed
+        # rather than those of its regular expressions, and whether it can
+        # be restarted from any state
+        self._own_tokens = False
+        self._restart_stack = True
+        lexer = self._lexer
+        if isinstance(lexer, ExtendedRegexLexer):
+            # Lexers having their own context class name it after them (like
+            # YamlLexerContext)
+            lexer_class = type(lexer)
+            context_class = getattr(sys.modules[lexer_class.__module__],
+                                    lexer_class.__name__ + 'Context',
+                                    LexerContext)
+            self._lex_context = lexer.get_tokens_unprocessed
+        elif isinstance(lexer, RegexLexer):
+            # ExtendedRegexLexer's get_tokens_unprocessed is RegexLexer's one
+            # working with a context
+            context_class = LexerContext
+            lex_context = ExtendedRegexLexer.__dict__['get_tokens_unprocessed']
+            self._lex_context = functools.partial(lex_context, lexer)
+            # Lexers changing the tokens of their regular expressions (like
+            # CFamilyLexer) may not take a state stack
+            lex = get_meth_func(lexer.get_tokens_unprocessed)
+            if lex is not RegexLexer.__dict__['get_tokens_unprocessed']:
+                self._own_tokens = True
+                code = get_func_code(lex)
+                self._restart_stack = \
+                  'stack' in code.co_varnames[:code.co_argcount]
+        else:
+            context_class = None
+            logger.debug("%s isn't a regex lexer, files highlighted with it "
+                         "will be lexed again from the start on every change",
+                         type(lexer).__name__)
+        if context_class is not None:
+            self._context_class = type('LineState' + context_class.__name__,
+                                       (LineStateContext, context_class), {})
+            self._initial_state = self._context_class(u'', 0).get_state()
+
         BaseSH.__init__(self, parent, font, color_scheme)
 
         # This worker runs in a thread to avoid blocking when doing full file
         # parsing
         self._worker_manager = WorkerManager()
 
-        # Store the format for all the tokens after Pygments parsing
-        self._charlist = []
+        # Text of every block the last time it was lexed, with its format
+        # spans (lists of (start, length, Spyder token) tuples) and the lexer
+        # state at its start (None if a token spans the previous line break)
+        self._lines = []
+        self._spans = []
+        self._states = []
 
-        # Flag variable to avoid unnecessary highlights if the worker has not
-        # yet finished processing
-        self._allow_highlight = True
+        # Number of the last lexing started, to discard outdated results
+        self._lexing_id = 0
 
     def make_charlist(self):
-        """Parses the complete text and stores format for each character."""
+        """
+        Lex the text changed since the last time and update format spans.
+
+        Lexing starts from the last block before the first changed one
+        whose lexer state is known, and stops at the first unchanged block
+        after the last changed one reached with the same state as before.
+        """
 
         def worker_output(worker, output, error):
             """Worker finished callback."""
-            self._charlist = output
-            if error is None and output:
-                self._allow_highlight = True
+            if error is not None or output is None or \
+              lexing_id != self._lexing_id:
+                return
+            lines, start, spans, states, end = output
+            self._lines = lines
+            self._spans[start:end] = spans
+            self._states[start:end] = states
+            if start == 0 and len(spans) == len(lines):
                 self.rehighlight()
-            self._allow_highlight = False
-
-        text = to_text_string(self.document().toPlainText())
-        tokens = self._lexer.get_tokens(text)
+                return
+            block = self.document().findBlockByNumber(start)
+            for _i in range(len(spans)):
+                if not block.isValid():
+                    break
+                self.rehighlightBlock(block)
+                block = block.next()
+
+        self._lexing_id += 1
+        lexing_id = self._lexing_id
+        lines = to_text_string(self.document().toPlainText()).split('\n')
 
         # Before starting a new worker process make sure to end previous
         # incarnations
         self._worker_manager.terminate_all()
 
         worker = self._worker_manager.create_python_worker(
-            self._make_charlist,
-            tokens,
-            self._tokmap,
-            self.formats,
+            self._make_spans,
+            lines,
+            self._lines,
+            self._states,
         )
         worker.sig_finished.connect(worker_output)
         worker.start()
 
-    def _make_charlist(self, tokens, tokmap, formats):
-        """
-        Parses the complete text and stores format for each character.
-
-        Uses the attached lexer to parse into a list of tokens and Pygments
-        token types.  Then breaks tokens into individual letters, each with a
-        Spyder token type attached.  Stores this list as self._charlist.
-
-        It's attached to the contentsChange signal of the parent QTextDocument
-        so that the charlist is updated whenever the document changes.
-        """
-
-        def _get_fmt(typ):
-            """Get the Spyder format code for the given Pygments token type."""
-            # Exact matches first
-            if typ in tokmap:
-                return tokmap[typ]
+    def _get_fmt(self, typ):
+        """Get the Spyder format code for the given Pygments token type."""
+        fmt = self._fmt_names.get(typ)
+        if fmt is not None:
+            return fmt
+        # Exact matches first
+        fmt = self._tokmap.get(typ)
+        if fmt is None:
             # Partial (parent-> child) matches
-            for key, val in tokmap.items():
+            for key, val in self._tokmap.items():
                 if typ in key: # Checks if typ is a subtype of key.
-                    return val
-
-            return 'normal'
+                    fmt = val
+                    break
+            else:
+                fmt = 'normal'
+        self._fmt_names[typ] = fmt
+        return fmt
+
+    def _get_tokens(self, text, state=None):
+        """
+        Lex *text* from *state* (the initial state of the lexer if None).
 
-        charlist = []
-        for typ, token in tokens:
-            fmt = formats[_get_fmt(typ)]
-            for letter in token:
-                charlist.append((fmt, letter))
+        Returns the tokens and a function returning the lexer state at the
+        start of a line from its position, once tokens have been read up to
+        it (None if it isn't known).
+        """
+        if self._context_class is None:
+            return self._lexer.get_tokens_unprocessed(text), lambda pos: None
+        context = self._context_class(text, 0)
+        if state is not None:
+            context.set_state(state)
+        tokens = self._lex_context(context=context)
+        if not self._own_tokens:
+            return tokens, context.get_line_state
+
+        # Lex the text with the lexer too, with the context only to record
+        # states as far as tokens are read
+        context_tokens = tokens
+        if state is None or state == self._initial_state:
+            tokens = self._lexer.get_tokens_unprocessed(text)
+        else:
+            tokens = self._lexer.get_tokens_unprocessed(text,
+                                                        list(context.stack))
+
+        def get_line_state(pos):
+            if context.pos <= pos:
+                for _token in context_tokens:
+                    if context.pos > pos:
+                        break
+            return context.get_line_state(pos)
+        return tokens, get_line_state
+
+    def _can_restart(self, state):
+        """Return True if lexing can be restarted from *state*"""
+        return state is not None and (self._restart_stack or
+                                      state == self._initial_state)
+
+    def _make_spans(self, lines, old_lines, old_states):
+        """
+        Lex *lines* and return format spans of the blocks which changed.
 
-        return charlist
+        *old_lines* and *old_states* are the blocks and lexer states of the
+        previous call. Returns a (lines, start, spans, states, end) tuple
+        meaning that spans and states of old blocks start to end must be
+        replaced by *spans* and *states*.
+        """
+        try:
+            return self._lex_spans(lines, old_lines, old_states)
+        except Exception:
+            if self._context_class is None:
+                raise
+            # Callbacks of the lexer may not support contexts
+            logger.warning("Lexing with a context failed, files highlighted "
+                           "with %s will be lexed again from the start on "
+                           "every change", type(self._lexer).__name__,
+                           exc_info=True)
+            self._context_class = None
+            lines, _start, spans, states, _end = self._lex_spans(lines, [],
+                                                                 [])
+            return lines, 0, spans, states, len(old_lines)
+
+    def _lex_spans(self, lines, old_lines, old_states):
+        """Lex *lines* changed since *old_lines* (see _make_spans)"""
+        # Find the lines changed since the last time
+        size = min(len(lines), len(old_lines))
+        first = 0
+        while first < size and lines[first] == old_lines[first]:
+            first += 1
+        if first == len(lines) == len(old_lines):
+            return lines, first, [], [], first
+        last = 0
+        while last < size - first and lines[-1 - last] == old_lines[-1 - last]:
+            last += 1
+        delta = len(lines) - len(old_lines)
+
+        # Restart from a line before the changed one (regular expressions
+        # may look past the end of the line) with a known lexer state
+        start = min(first, len(old_states)) - 1
+        while start > 0 and not self._can_restart(old_states[start]):
+            start -= 1
+        start = max(start, 0)
+        text = '\n'.join(lines[start:]) + '\n'
+        tokens, get_line_state = self._get_tokens(
+            text, old_states[start] if start else None)
+
+        line_spans = []
+        spans, states = [line_spans], [None]
+        line_start = 0
+        end = len(old_lines)
+        for pos, typ, value in tokens:
+            if pos == line_start and states[-1] is None:
+                # The state is known if a match starts the line
+                states[-1] = get_line_state(pos)
+                number = start + len(spans) - 1
+                old_number = number - delta
+                if states[-1] is not None and number > start and \
+                  number >= len(lines) - last and \
+                  0 <= old_number < len(old_states) and \
+                  states[-1] == old_states[old_number]:
+                    # The rest of the text will be lexed as before
+                    spans.pop()
+                    states.pop()
+                    end = old_number
+                    break
+            fmt = self._get_fmt(typ)
+            for index, part in enumerate(value.split('\n')):
+                if index:
+                    pos += 1
+                    line_start = pos
+                    line_spans = []
+                    spans.append(line_spans)
+                    states.append(None)
+                if part:
+                    column = pos - line_start
+                    if line_spans and line_spans[-1][2] == fmt and \
+                      sum(line_spans[-1][:2]) == column:
+                        # Merge with the previous span
+                        column, length, fmt = line_spans[-1]
+                        line_spans[-1] = (column, length + len(part), fmt)
+                    else:
+                        line_spans.append((column, len(part), fmt))
+                    pos += len(part)
+        else:
+            # Drop the line after the final line break
+            del spans[len(lines) - start:]
+            del states[len(lines) - start:]
+        return lines, start, spans, states, end
 
+    @INSTRUMENTATION.timed('editor.highlightBlock')
     def highlightBlock(self, text):
         """ Actually highlight the block"""
-        # Note that an undefined blockstate is equal to -1, so the first block
-        # will have the correct behaviour of starting at 0.
-        if self._allow_highlight:
-            start = self.previousBlockState() + 1
-            end = start + len(text)
-            for i, (fmt, letter) in enumerate(self._charlist[start:end]):
-                self.setFormat(i, 1, fmt)
-            self.setCurrentBlockState(end)
-            self.highlight_spaces(text)
+        text = to_text_string(text)
+        number = self.currentBlock().blockNumber()
+        # Blocks changed since they were lexed are highlighted again when
+        # lexing is done
+        if number < len(self._lines) and \
+          self._lines[number] == text.replace(u'\xa0', u' '):
+            for start, length, fmt in self._spans[number]:
+                self.setFormat(start, length, self.formats[fmt])
+        self.highlight_spaces(text)
 
 
 def guess_pygments_highlighter(filename):
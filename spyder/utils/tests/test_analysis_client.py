@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for analysis_client.py
+"""
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.analysis_client import AnalysisPool
+
+
+@pytest.fixture
+def pool(qtbot, request):
+    """Set up a code analysis pool with a single worker."""
+    pool = AnalysisPool(size=1)
+    pool.start()
+    qtbot.waitUntil(lambda: pool.workers[0].is_initialized, timeout=20000)
+    request.addfinalizer(pool.close)
+    return pool
+
+
+def test_analysis_pool(pool, qtbot):
+    """Test that checks run in the worker and superseded ones are skipped."""
+    results = []
+    fallback = lambda: results.append('fallback')
+    source = "import os\nx=1\n"
+    pool.add_request('check_with_pyflakes', source.encode(),
+                     lambda r: results.append(('pyflakes', r)), 1, fallback)
+    # Both are queued while the worker is busy, so only the last one runs
+    pool.add_request('check_with_pep8', source.encode(),
+                     lambda r: results.append(('pep8 old', r)), 1, fallback)
+    pool.add_request('check_with_pep8', source.encode(),
+                     lambda r: results.append(('pep8', r)), 1, fallback)
+    qtbot.waitUntil(lambda: len(results) == 2, timeout=20000)
+    assert results == [
+        ('pyflakes', [("'os' imported but unused", 1)]),
+        ('pep8', [('E225 missing whitespace around operator', 2)])]
+
+    # Incremental checks give the same results
+    pool.add_request('check_with_pyflakes', source.encode(),
+                     lambda r: results.append(('incremental', r)), 1,
+                     fallback, file_id=1)
+    qtbot.waitUntil(lambda: len(results) == 3, timeout=20000)
+    assert results[2] == ('incremental', [("'os' imported but unused", 1)])
+
+    # Cancelled requests don't call back
+    pool.add_request('find_tasks', "# TODO: test", results.append, 2,
+                     fallback)
+    pool.cancel(2)
+    qtbot.wait(500)
+    assert len(results) == 3
+
+
+if __name__ == "__main__":
+    pytest.main()
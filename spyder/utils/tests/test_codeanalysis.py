@@ -16,7 +16,8 @@ import pytest
 
 # Local imports
 from spyder.utils.codeanalysis import (check_with_pep8, check_with_pyflakes,
-                                       find_tasks)
+                                       check_with_pycodestyle, find_tasks,
+                                       IncrementalAnalysis, split_blocks)
 from spyder.py3compat import PY2
 
 TEST_FILE = os.path.join(os.path.dirname(__file__), 'data/example.py')
@@ -33,5 +34,45 @@ def test_codeanalysis():
     assert len(check_results) == num_results
 
 
+def test_check_with_pycodestyle():
+    """Test that pycodestyle gives the same results in-process."""
+    code = open(TEST_FILE).read()
+    assert set(check_with_pycodestyle(code, TEST_FILE)) == \
+           set(check_with_pep8(code, TEST_FILE))
+
+
+
+def test_split_blocks():
+    """Test splitting code in top-level blocks."""
+    lines = ['import os', '', '@decorator', 'def f():', '    pass',
+             '# comment', 'if x:', '    pass', 'else:', '    pass',
+             's = """', 'not a block', '"""', 'x = (1,', ')']
+    assert split_blocks(lines) == [(0, 2), (2, 3), (3, 6), (6, 10),
+                                   (10, 13), (13, 15)]
+
+
+@pytest.mark.parametrize('edit', [
+    # Unchanged
+    lambda lines: lines,
+    # Change inside a function
+    lambda lines: lines[:20] + ['    undefined_name'] + lines[20:],
+    # Remove a definition used in other blocks
+    lambda lines: [line for line in lines if line != 'import numpy as np'],
+    # Syntax error
+    lambda lines: lines + ['def g(:'],
+])
+def test_incremental_analysis(edit):
+    """Test that incremental analysis gives the same results."""
+    code = open(TEST_FILE).read()
+    analysis = IncrementalAnalysis()
+    analysis.check_with_pyflakes(code.encode('utf-8'))
+    analysis.find_tasks(code)
+    code = '\n'.join(edit(code.splitlines()))
+    source_code = code.encode('utf-8')
+    assert sorted(analysis.check_with_pyflakes(source_code)) == \
+           sorted(check_with_pyflakes(source_code))
+    assert analysis.find_tasks(code) == find_tasks(code)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for consoleoutput.py"""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.utils.consoleoutput import (DEFAULT, ERROR, LINK, PROMPT,
+                                        OutputPipeline, parse_output)
+
+
+def test_parse_output():
+    """Test parsing ANSI codes, tracebacks, prompts and form feeds."""
+    clear, segments, traceback, removed = parse_output([
+        ('a\r\n\x1b[1;31mb\x1b[0m', False, False),
+        ('c\n', False, False),
+        ('Traceback (most recent call last):\n', True, False),
+        ('  File "foo.py", line 1, in <module>\n', True, False),
+        ('NameError\n', True, False),
+        ('>>> ', False, True)])
+    assert not clear
+    assert segments == [
+        ('a\n', DEFAULT, []), ('b', DEFAULT, [1, 31]), ('c\n', DEFAULT, [0]),
+        ('Traceback (most recent call last):\n', ERROR, []),
+        ('  ', DEFAULT, []), ('File "foo.py", line 1, in <module>\n', LINK, []),
+        ('NameError\n', ERROR, []),
+        ('>>> ', PROMPT, [])]
+    assert traceback == 'NameError\n'
+    assert removed == ''
+
+    clear, segments, traceback, removed = parse_output(
+        [('a\x1b[32m\x0cb', False, False)])
+    assert clear
+    assert segments == [('', DEFAULT, [32]), ('b', DEFAULT, [])]
+    assert traceback is None
+
+
+def test_parse_output_max_lines():
+    """Test that only the lines which are kept are parsed."""
+    lines = ['\x1b[%dm%d\n' % (30 + i % 8, i) for i in range(1000)]
+    clear, segments, traceback, removed = parse_output(
+        [(''.join(lines[:600]), False, False),
+         (''.join(lines[600:]), False, False)], max_lines=3)
+    assert segments[0] == ('', DEFAULT, [30 + i % 8 for i in range(998)])
+    assert segments[1:] == [('998\n', DEFAULT, [36]),
+                            ('999\n', DEFAULT, [37])]
+    assert removed == ''.join('%d\n' % i for i in range(998))
+
+
+def test_pipeline_rate_limit(qtbot):
+    """Test that standard output beyond the rate limit is dropped."""
+    outputs = []
+    pipeline = OutputPipeline()
+    pipeline.sig_output_ready.connect(outputs.append)
+    pipeline.max_rate = 10
+    pipeline.write('line\n' * 8)
+    pipeline.write('line\n' * 4)
+    pipeline.write('error\n' * 4, error=True)
+    pipeline.write('line\n' * 100)
+    pipeline._rate_start -= 1
+    pipeline.write('last line\n')
+    pipeline.flush()
+    text = ''.join(segment[0] for output in outputs
+                   for segment in output[1])
+    assert text == 'line\n' * 10 + 'error\n' * 4 + \
+        '[... 102 lines suppressed ...]\n' + 'last line\n'
+
+
+def test_pipeline_thread(qtbot):
+    """Test that large outputs are parsed in a thread, in order."""
+    pipeline = OutputPipeline(max_lines=lambda: 100)
+    outputs = []
+    pipeline.sig_output_ready.connect(outputs.append)
+    pipeline.write('%d\n' * 10000 % tuple(range(10000)))
+    with qtbot.waitSignal(pipeline.sig_output_ready, timeout=5000):
+        pipeline.process()
+        assert pipeline.has_pending_output()
+    assert not pipeline.has_pending_output()
+    assert outputs[0][1] == [('%d\n' * 99 % tuple(range(9901, 10000)),
+                              DEFAULT, [])]
+
+    # Output written while parsing isn't inserted before
+    pipeline.write('%d\n' * 10000 % tuple(range(10000)))
+    pipeline.process()
+    pipeline.write('done\n')
+    pipeline.flush()
+    assert not pipeline.has_pending_output()
+    assert outputs[1][1] == [('%d\n' * 98 % tuple(range(9902, 10000)) +
+                              'done\n', DEFAULT, [])]
+    qtbot.waitUntil(lambda: all(thread.isFinished() for thread in
+                                pipeline._worker_manager._threads))
+    assert len(outputs) == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
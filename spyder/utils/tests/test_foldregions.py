@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for foldregions.py"""
+
+# Third party imports
+from qtpy.QtGui import QTextCursor
+import pytest
+
+# Local imports
+from spyder.utils.editor import TextBlockHelper
+from spyder.utils.foldregions import get_fold_regions
+from spyder.widgets.sourcecode.codeeditor import CodeEditor
+from spyder.widgets.sourcecode.folding import FoldScope
+
+
+TEXT = '''# dummy test file
+class a():
+    self.b = 1
+    print(self.b)
+
+    def some_method(self):
+        """Docstring
+        continued"""
+        self.b = 3
+
+    def other_method(self):
+         a = (1,
+              2,
+              3)
+
+
+def function():
+    pass
+'''
+
+
+def create_editor(qtbot, text):
+    editor = CodeEditor(None)
+    editor.setup_editor(language='Python')
+    editor.highlighter.HIGHLIGHT_BY_CHUNKS = False
+    editor.set_text(text)
+    qtbot.addWidget(editor)
+    return editor
+
+
+def get_scopes(editor):
+    """Return the ranges of fold scopes given by block fold levels"""
+    scopes = []
+    block = editor.document().firstBlock()
+    while block.isValid():
+        if TextBlockHelper.is_fold_trigger(block):
+            scopes.append(FoldScope(block).get_range())
+        block = block.next()
+    return scopes
+
+
+def test_get_fold_regions(qtbot):
+    """Test that regions are the fold scopes of the fold detector."""
+    regions = get_fold_regions(TEXT.split('\n'))
+    assert [region[0] for region in regions] == [1, 5, 10, 11, 16]
+    assert regions[0] == (1, 13, 15, 0)
+    assert regions[3] == (11, 13, 15, 2)
+
+    editor = create_editor(qtbot, TEXT)
+    assert [region[:2] for region in regions] == get_scopes(editor)
+
+
+def test_fold_regions_changes(qtbot):
+    """Test that regions follow changes of the document."""
+    editor = create_editor(qtbot, TEXT)
+    fold_regions = editor.fold_regions
+    fold_regions._update_timer.setInterval(0)
+    with qtbot.waitSignal(fold_regions.sig_regions_updated, timeout=5000):
+        assert not fold_regions.is_up_to_date()
+    assert fold_regions.is_up_to_date()
+    assert fold_regions.find_scope(8) == 5
+    assert fold_regions.find_scope(9) == 1
+    assert fold_regions.find_scope(12) == 11
+    assert fold_regions.find_scope(14) is None
+
+    # Lines inserted in a method: the regions after it are moved until
+    # regions are computed again
+    cursor = QTextCursor(editor.document().findBlockByNumber(8))
+    with qtbot.waitSignal(fold_regions.sig_regions_updated, timeout=5000):
+        cursor.insertText('        x = 1\n' * 3)
+        assert not fold_regions.is_up_to_date()
+        assert fold_regions.get_range(1) == (1, 16)
+        assert fold_regions.get_range(13) == (13, 16)
+    assert [region[:2] for region in fold_regions.get_regions()] == \
+        get_scopes(editor)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for prefetch.py"""
+
+# Standard library imports
+import os
+import sys
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.help.prefetch import (get_imported_names, get_loaded_object,
+                                        HelpPrefetcher, prefetch_doc)
+from spyder.utils.help.sphinxify import HTMLCache
+
+
+def test_get_imported_names():
+    """Find names imported by code."""
+    source = ("import os, sys as system\n"
+              "from os.path import (join,\n"
+              "    split as spl)\n"
+              "from . import foo\n"
+              "    import numpy.linalg  # comment\n"
+              "x = 'import y'\n")
+    assert get_imported_names(source) == ['os', 'sys', 'numpy.linalg',
+                                          'os.path.join', 'os.path.split']
+
+
+def test_get_loaded_object():
+    """Find objects without importing modules or evaluating code."""
+    namespace = {'path': os.path}
+    assert get_loaded_object('path.join', namespace) is os.path.join
+    assert get_loaded_object('os.path.join', namespace) is os.path.join
+    assert get_loaded_object('os.nothing', namespace) is None
+    assert get_loaded_object('os.getcwd()', namespace) is None
+    assert 'this' not in sys.modules
+    assert get_loaded_object('this', namespace) is None
+    assert 'this' not in sys.modules
+    assert namespace == {'path': os.path}
+
+
+def test_prefetch_doc(tmpdir):
+    """Render help of a module and get its members."""
+    cache = HTMLCache(str(tmpdir))
+    namespace = {}
+    assert prefetch_doc('this', namespace, cache=cache) == []
+    assert len(os.listdir(str(tmpdir))) == 0
+    members = prefetch_doc('os', namespace, cache=cache)
+    assert 'os.path' in members
+    assert not any(name.startswith('os._') for name in members)
+    assert len(os.listdir(str(tmpdir))) == 1
+    assert prefetch_doc('os.getcwd', namespace, cache=cache) == []
+    assert len(os.listdir(str(tmpdir))) == 2
+
+
+def test_prefetcher(qtbot, tmpdir):
+    """Render help of objects within a budget, unless busy."""
+    cache = HTMLCache(str(tmpdir))
+    busy = [True]
+    prefetcher = HelpPrefetcher(None, lambda: ['os', 'os.getcwd'],
+                                lambda: busy[0], cache=cache)
+    prefetcher._timer.setInterval(10)
+    prefetcher.namespace = {}
+    prefetcher.start(3)
+    qtbot.wait(100)
+    assert prefetcher.budget == 3
+    busy[0] = False
+    qtbot.waitUntil(lambda: not prefetcher.is_active(), timeout=10000)
+    qtbot.waitUntil(lambda: all(thread.isFinished() for thread in
+                                prefetcher._worker_manager._threads))
+    assert prefetcher.budget == 0
+    # os, os.getcwd and the first public member of os
+    assert len(os.listdir(str(tmpdir))) == 3
+
+
+if __name__ == "__main__":
+    pytest.main()
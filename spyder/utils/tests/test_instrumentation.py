@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for instrumentation.py"""
+
+# Standard library imports
+import json
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.utils.instrumentation import Histogram, Instrumentation
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = Instrumentation()
+    instrumentation.set_enabled(True)
+    return instrumentation
+
+
+def test_histogram():
+    """Test counting durations in buckets."""
+    histogram = Histogram()
+    assert histogram.mean() == 0.
+    for duration in [2e-6] * 90 + [5e-3] * 9 + [2.]:
+        histogram.add(duration)
+    assert histogram.count == 100
+    assert histogram.buckets == [90, 0, 0, 9, 0, 0, 1]
+    assert histogram.mean() == pytest.approx(2.04518 / 100)
+    assert histogram.percentile(50) == 1e-5
+    assert histogram.percentile(95) == 1e-2
+    assert histogram.percentile(100) == 2.
+
+
+def test_record(instrumentation):
+    """Test that timings are recorded only when enabled."""
+    @instrumentation.timed('test.timed')
+    def timed(value):
+        return value
+
+    assert timed(1) == 1
+    with instrumentation.measure('test.measure'):
+        pass
+    instrumentation.record('test.record', 1.)
+    instrumentation.record('test.record', 3.)
+    stats = instrumentation.get_stats()
+    assert stats[0][0] == 'test.record'
+    assert set(stat[0] for stat in stats[1:]) == {'test.timed',
+                                                  'test.measure'}
+    assert stats[0][1:4] == (2, 4., 2.)
+    assert stats[0][6] == 3.
+
+    instrumentation.set_enabled(False)
+    assert timed(2) == 2
+    instrumentation.record('test.record', 1.)
+    assert instrumentation.get_stats()[0][1] == 2
+
+    instrumentation.reset()
+    assert instrumentation.get_stats() == []
+
+
+def test_timed_disabled():
+    """Test that functions aren't wrapped when instrumentation is disabled
+    at startup."""
+    instrumentation = Instrumentation()
+    instrumentation.set_enabled(False)
+    def func():
+        pass
+    assert instrumentation.timed('test.timed')(func) is func
+
+
+def test_dump_trace(instrumentation, tmpdir):
+    """Test saving the trace in the Trace Event Format."""
+    instrumentation.record('editor.highlightBlock', 2e-3)
+    filename = str(tmpdir.join('trace.json'))
+    instrumentation.dump_trace(filename)
+    with open(filename) as fd:
+        trace = json.load(fd)
+    event, = trace['traceEvents']
+    assert event['name'] == 'editor.highlightBlock'
+    assert event['cat'] == 'editor'
+    assert event['ph'] == 'X'
+    assert event['dur'] == 2000
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -15,7 +15,7 @@ import os
 import pytest
 
 # Local imports
-from spyder.utils.misc import get_common_path
+from spyder.utils.misc import format_size, get_common_path
 
 def test_get_common_path():
     """Test getting the common path."""
@@ -35,5 +35,14 @@ def test_get_common_path():
                                 ]) == '/Python'
 
 
+def test_format_size():
+    """Test formatting sizes."""
+    assert format_size(0) == '0B'
+    assert format_size(1023) == '1023B'
+    assert format_size(1536) == '1.5K'
+    assert format_size(-3 * 1024 ** 2) == '-3.0M'
+    assert format_size(2 * 1024 ** 5) == '2048.0T'
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for procstats.py
+"""
+
+# Standard library imports
+import os
+import threading
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.programs import is_module_installed
+from spyder.utils.procstats import (ProcessSampler, read_proc_stats,
+                                    read_psutil_stats)
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc'), reason="Requires /proc")
+def test_read_proc_stats():
+    """Test reading the resource usage of a process in /proc."""
+    event = threading.Event()
+    thread = threading.Thread(target=event.wait)
+    thread.start()
+    try:
+        cpu_time, memory, threads = read_proc_stats(os.getpid())
+    finally:
+        event.set()
+        thread.join()
+    assert cpu_time > 0
+    assert memory > 0
+    assert threads >= 2
+    if is_module_installed('psutil', '>=2.0'):
+        stats = read_psutil_stats(os.getpid())
+        assert abs(stats[1] - memory) < 0.5 * memory
+
+
+def test_process_sampler():
+    """Test sampling the resource usage of a process."""
+    sampler = ProcessSampler(os.getpid())
+    if sampler.sample() is None:
+        pytest.skip("Resource usage can't be read on this platform")
+    sum(i * i for i in range(100000))
+    sample = sampler.sample()
+    assert sample['cpu'] >= 0
+    assert sample['memory'] > 0
+    assert sample['threads'] >= 1
+
+    # Processes which don't exist
+    assert ProcessSampler(-1).sample() is None
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -6,6 +6,7 @@
 """Tests for programs.py"""
 
 import os
+import sys
 
 from flaky import flaky
 import pytest
@@ -14,7 +15,8 @@ from spyder.utils.programs import (run_python_script_in_terminal,
                                    is_python_interpreter,
                                    is_python_interpreter_valid_name,
                                    find_program, shell_split, check_version,
-                                   is_module_installed)
+                                   is_module_installed, get_module_versions)
+from spyder.utils import programs
 
 
 if os.name == 'nt':
@@ -96,6 +98,57 @@ def test_is_module_installed():
     assert not is_module_installed('IPython', '>=1.0;<3.0')
     assert is_module_installed('jedi', '>=0.7.0')
 
+def test_get_module_versions(tmpdir, monkeypatch):
+    """Test that installed module versions in an interpreter are cached."""
+    monkeypatch.setattr('spyder.config.base.get_conf_path',
+                        lambda filename: tmpdir.join(filename).strpath)
+    monkeypatch.setattr(programs, '_MODULE_VERSIONS_CACHE', None)
+    calls = []
+    run_program = programs.run_program
+    def counted_run_program(*args, **kwargs):
+        calls.append(args)
+        return run_program(*args, **kwargs)
+    monkeypatch.setattr(programs, 'run_program', counted_run_program)
+
+    versions = get_module_versions(['pytest', 'foo_spyder_test'],
+                                   sys.executable)
+    assert versions == {'pytest': pytest.__version__,
+                        'foo_spyder_test': False}
+    assert is_module_installed('pytest', '>=1.0', interpreter=sys.executable)
+    assert not is_module_installed('foo_spyder_test',
+                                   interpreter=sys.executable)
+    assert len(calls) == 2
+
+    # Installed modules are saved for later sessions, modules not installed
+    # are probed again
+    monkeypatch.setattr(programs, '_MODULE_VERSIONS_CACHE', None)
+    assert is_module_installed('pytest', interpreter=sys.executable)
+    assert len(calls) == 2
+    assert not is_module_installed('foo_spyder_test',
+                                   interpreter=sys.executable)
+    assert len(calls) == 3
+
+    # Versions are probed again when a directory of sys.path changes (e.g.
+    # when a package is installed)
+    entry = programs._MODULE_VERSIONS_CACHE[os.path.abspath(sys.executable)]
+    path = sorted(entry['paths'])[0]
+    entry['paths'][path] -= 1
+    assert is_module_installed('pytest', interpreter=sys.executable)
+    assert len(calls) == 4
+
+
+def test_get_module_versions_no_output(monkeypatch):
+    """Test that an interpreter printing nothing is reported as an error."""
+    monkeypatch.setattr(programs, '_MODULE_VERSIONS_CACHE', {})
+    monkeypatch.setattr(programs, '_save_module_versions_cache',
+                        lambda cache: None)
+    monkeypatch.setattr(programs, 'MODULE_VERSIONS_SCRIPT', 'pass')
+    with pytest.raises(ValueError):
+        get_module_versions(['pytest'], sys.executable)
+    # is_module_installed doesn't take a decision then
+    assert is_module_installed('foo_spyder_test', interpreter=sys.executable)
+
+
 if __name__ == '__main__':
     pytest.main()
     
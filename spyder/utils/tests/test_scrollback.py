@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for scrollback.py"""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.utils.scrollback import ScrollbackStore, get_search_regex
+
+
+@pytest.fixture
+def scrollback():
+    scrollback = ScrollbackStore()
+    scrollback.PAGE_SIZE = 10
+    yield scrollback
+    scrollback.close()
+
+
+def test_pages(scrollback):
+    """Test that lines are paged and read back."""
+    scrollback.append(''.join('line %d\n' % i for i in range(25)))
+    scrollback.append(u'é\n')
+    assert scrollback.line_count() == 26
+    assert scrollback.page_count() == 3
+    assert scrollback.get_page(1)[0] == 'line 10'
+    assert scrollback.get_lines(8, 12) == ['line 8', 'line 9', 'line 10',
+                                           'line 11']
+    assert scrollback.get_lines(24, 30) == ['line 24', u'é']
+    assert scrollback.get_text().startswith('line 0\nline 1\n')
+
+    scrollback.clear()
+    assert scrollback.line_count() == 0
+
+
+def test_find(scrollback):
+    """Test finding lines in all pages."""
+    scrollback.append(''.join('line %d\n' % i for i in range(25)))
+    regex = get_search_regex('LINE 1', words=True)
+    assert scrollback.find(regex) == 1
+    assert scrollback.find(regex, 1) is None
+    assert scrollback.find(regex, forward=False) == 1
+    regex = get_search_regex(r'line \d3', regexp=True)
+    assert scrollback.find(regex, forward=False) == 23
+    assert scrollback.find(regex, 23, forward=False) == 13
+    assert scrollback.find(regex, 13, forward=False) is None
+    assert scrollback.count(regex) == 2
+    assert scrollback.count(get_search_regex('LINE', case=True)) == 0
+
+
+def test_max_pages(scrollback):
+    """Test that the oldest pages are forgotten."""
+    scrollback.MAX_PAGES = 4
+    for i in range(100):
+        scrollback.append('line %d\n' % i)
+    assert scrollback.line_count() == 40
+    assert scrollback.get_lines(0, 2) == ['line 60', 'line 61']
+    assert scrollback.get_lines(39, 40) == ['line 99']
+
+
+if __name__ == "__main__":
+    pytest.main()
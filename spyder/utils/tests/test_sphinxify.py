@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for sphinxify.py"""
+
+# Standard library imports
+import os
+import os.path as osp
+import time
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.help.sphinxify import (generate_context, HTMLCache,
+                                         sphinxify)
+
+
+def test_sphinxify_reuses_renderer():
+    """Run sphinxify on successive docstrings."""
+    for index in range(3):
+        html = sphinxify("Docstring number%d" % index,
+                         generate_context(name='func', argspec='(a=1)'))
+        assert "Docstring number%d" % index in html
+        assert 'argspec-highlight' in html
+
+
+def test_sphinxify_cache(tmpdir):
+    """Run sphinxify with a cache."""
+    cache = HTMLCache(str(tmpdir))
+    context = generate_context(name='func')
+    html = sphinxify("Cached docstring", context, cache=cache)
+    key = cache.get_key("Cached docstring", context)
+    assert cache.get(key) == html
+    assert sphinxify("Cached docstring", context, cache=cache) == html
+    assert cache.get_key("Cached docstring", generate_context(name='other')) \
+        != key
+    assert cache.get_key("Cached docstring", generate_context(
+        name='func', math=True)) != key
+
+
+def test_html_cache_eviction(tmpdir):
+    """Remove the least recently used entries of a cache."""
+    cache = HTMLCache(str(tmpdir), max_entries=2)
+    cache.set('a', u'é')
+    cache.set('b', u'b')
+    # Make 'a' the most recently used entry
+    past = time.time() - 10
+    os.utime(osp.join(str(tmpdir), 'b'), (past, past))
+    os.utime(osp.join(str(tmpdir), 'a'), (past - 10, past - 10))
+    assert cache.get('a') == u'é'
+    cache.set('c', u'c')
+    assert cache.get('b') is None
+    assert cache.get('a') == u'é'
+    assert cache.get('c') == u'c'
+    cache.clear()
+    assert cache.get('a') is None
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for symboltable.py"""
+
+# Third party imports
+from qtpy.QtGui import QTextCursor
+import pytest
+
+# Local imports
+from spyder.utils.symboltable import SymbolTable
+from spyder.utils.syntaxhighlighters import OutlineExplorerData as OED
+from spyder.widgets.sourcecode.codeeditor import CodeEditor
+
+
+TEXT = """import os
+
+class Foo(object):
+    def method(self):
+        def inner():
+            return 1
+
+        return inner()
+
+    def other(self):
+        pass
+
+def function(a):
+    return a
+"""
+
+
+def make_data(def_type, name, fold_level=0):
+    data = OED()
+    data.text = name
+    data.fold_level = fold_level
+    data.def_type = def_type
+    data.def_name = name
+    return data
+
+
+def test_mapping():
+    """Test that data is sorted by block number and moved with blocks."""
+    table = SymbolTable()
+    table[10] = make_data(OED.FUNCTION, 'f')
+    table[2] = make_data(OED.CLASS, 'Foo')
+    table[5] = make_data(OED.COMMENT, '# ---- Section')
+    assert table.keys() == [2, 5, 10]
+    assert table.get_definitions() == [2, 10]
+    assert table.get_blocks(3, 10) == [5]
+    assert table.count(OED.COMMENT) == 1
+
+    # Two blocks inserted after block 3, then blocks 7 to 9 removed
+    table.shift(3, 2)
+    assert table.keys() == [2, 7, 12]
+    table.shift(6, -3)
+    assert table.keys() == [2, 9]
+    assert table.get_definitions() == [2, 9]
+    assert table.count(OED.COMMENT) == 0
+
+    revision = table.revision
+    assert table.pop(2).def_name == 'Foo'
+    assert table.get_definitions() == [9]
+    assert table.revision > revision
+
+
+def test_scopes(qtbot):
+    """Test that scopes follow changes of the document."""
+    editor = CodeEditor(None)
+    editor.setup_editor(language='Python')
+    editor.set_text(TEXT)
+    qtbot.addWidget(editor)
+    table = editor.get_outlineexplorer_data()
+
+    assert table.get_definitions() == [2, 3, 4, 9, 12]
+    assert table.get_scope(2) == (2, 10)
+    assert table.get_scopes(5) == [2, 3, 4]
+    assert table.get_scopes(7) == [2, 3]
+    assert table.get_scopes(11) == []
+    assert table.get_parent(9) == 2
+
+    # Dedent the end of the method: it's not in the class anymore
+    cursor = QTextCursor(editor.document().findBlockByNumber(9))
+    cursor.insertText('x = 1\n')
+    assert table.get_scope(2) == (2, 7)
+    assert table.get_scopes(11) == [10]
+    assert table.get_parent(10) is None
+
+    # Lines inserted in a function
+    cursor = QTextCursor(editor.document().findBlockByNumber(5))
+    cursor.insertText('            y = 2\n' * 3)
+    assert table.get_scope(2) == (2, 10)
+    assert table.get_scopes(8) == [2, 3, 4]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -7,9 +7,10 @@
 
 import pytest
 from qtpy.QtWidgets import QApplication
-from qtpy.QtGui import QTextDocument
+from qtpy.QtGui import QTextCursor, QTextDocument
 
-from spyder.utils.syntaxhighlighters import HtmlSH, PythonSH, MarkdownSH
+from spyder.utils.syntaxhighlighters import (HtmlSH, PythonSH, MarkdownSH,
+                                            PygmentsSH)
 
 def compare_formats(actualFormats, expectedFormats, sh):
     assert len(actualFormats) == len(expectedFormats)
@@ -81,5 +82,196 @@ def test_python_not_an_outline_explorer_comment(line):
     assert not PythonSH.OECOMMENT.match(line)
 
 
+def test_python_highlight_by_chunks(qtbot):
+    """Test that large documents are highlighted by chunks."""
+    txt = '\n'.join(['"""', 'Docstring', '"""', 'def foo(x):',
+                   "    return x + 1  # comment"] * 200)
+    expected = QTextDocument(txt)
+    expected_sh = PythonSH(expected, color_scheme='Spyder')
+    expected_sh.HIGHLIGHT_BY_CHUNKS = False
+    expected_sh.rehighlight()
+
+    doc = QTextDocument(txt)
+    sh = PythonSH(doc, color_scheme='Spyder')
+    sh.LARGE_DOCUMENT_BLOCKS = 100
+    sh.HIGHLIGHT_TIME = 0
+    sh.CHUNK_TIME = 0.001
+    with qtbot.waitSignal(sh.sig_highlighting_finished, timeout=10000):
+        sh.rehighlight()
+        assert sh.is_highlighting()
+    assert not sh.is_highlighting()
+
+    def formats(block):
+        return [(fmt.start, fmt.length, fmt.format.foreground().color().name())
+                for fmt in block.layout().additionalFormats()]
+
+    block, expected_block = doc.firstBlock(), expected.firstBlock()
+    while block.isValid():
+        assert block.userState() == expected_block.userState()
+        assert formats(block) == formats(expected_block)
+        block, expected_block = block.next(), expected_block.next()
+
+    # Blocks changed but not highlighted yet keep their formats
+    doc.documentLayout()
+    block = doc.findBlockByNumber(503)
+    old_formats = formats(block)
+    assert old_formats
+    with qtbot.waitSignal(sh.sig_highlighting_finished, timeout=10000):
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.EndOfBlock)
+        cursor.insertText(' ')
+        assert sh.is_highlighting()
+        assert formats(block) == old_formats
+
+
+def test_python_outlineexplorer_changes(qtbot):
+    """Test that outline explorer data follows changes of the document."""
+    doc = QTextDocument('\n'.join(['def foo():', '    pass', '',
+                                   'class Bar:', '    pass']))
+    # Changes are only highlighted when the document has a layout
+    doc.documentLayout()
+    sh = PythonSH(doc, color_scheme='Spyder')
+    QApplication.processEvents()
+    assert sh.get_outlineexplorer_changes() is None
+
+    def names():
+        return dict((block_nb, data.def_name) for block_nb, data
+                    in sh.get_outlineexplorer_data().items())
+
+    assert names() == {0: 'foo', 3: 'Bar'}
+
+    # Insert lines after the first one
+    cursor = QTextCursor(doc.findBlockByNumber(1))
+    cursor.insertText('def baz():\n    pass\n')
+    assert names() == {0: 'foo', 1: 'baz', 5: 'Bar'}
+    assert sh.get_outlineexplorer_changes() == [(1, 3, 2)]
+    assert sh.get_outlineexplorer_changes() == []
+
+    # Remove the first two lines
+    cursor = QTextCursor(doc.findBlockByNumber(0))
+    cursor.movePosition(QTextCursor.Down, QTextCursor.KeepAnchor, 2)
+    cursor.removeSelectedText()
+    assert names() == {3: 'Bar'}
+    assert sh.get_outlineexplorer_changes() == [(0, 0, -2)]
+
+
+class CssSH(PygmentsSH):
+    _lang_name = 'css'
+
+
+def test_pygments_format_spans(qtbot):
+    """Test that PygmentsSH highlights blocks from format spans."""
+    doc = QTextDocument('/* comment\nstill */\na { color: red; }')
+    sh = CssSH(doc, color_scheme='Spyder')
+    sh.make_charlist()
+    qtbot.waitUntil(lambda: len(sh._lines) == 3)
+    assert sh._spans[:2] == [[(0, 10, 'comment')], [(0, 8, 'comment')]]
+    res = [(0, 4, 'normal'),     # |a { |
+           (4, 5, 'keyword'),    # |color|
+           (9, 2, 'normal'),     # |: |
+           (11, 3, 'keyword'),   # |red|
+           (14, 3, 'normal')]    # |; }|
+    compare_formats(doc.lastBlock().layout().additionalFormats(), res, sh)
+
+
+def lex_again(sh, old_lines, old_spans, old_states, lines):
+    """
+    Lex lines changed since old_lines, checking that the result is the same
+    as when lexing them from the start, and return the range of old lines
+    lexed again
+    """
+    _lines, start, spans, states, end = sh._make_spans(lines, old_lines,
+                                                       old_states)
+    full = sh._make_spans(lines, [], [])
+    assert old_spans[:start] + spans + old_spans[end:] == full[2]
+    assert old_states[:start] + states + old_states[end:] == full[3]
+    return start, end
+
+
+def test_pygments_incremental_lexing():
+    """Test that PygmentsSH only lexes again the lines changed."""
+    sh = CssSH(QTextDocument(), color_scheme='Spyder')
+    old_lines = ['/* comment', 'still */', 'a { color: red; }'] * 10
+    old_lines, _start, spans, states, _end = sh._make_spans(old_lines, [],
+                                                             [])
+
+    def check(lines):
+        return lex_again(sh, old_lines, spans, states, lines)
+
+    # Only the lines around the change are lexed
+    lines = list(old_lines)
+    lines[17] = 'a { color: blue; }'
+    assert check(lines) == (15, 18)
+    lines.insert(17, '')
+    assert check(lines) == (15, 18)
+
+    # And the following ones until the lexer state is the same as before
+    lines = list(old_lines)
+    lines[17] = 'a { color: blue; } /*'
+    assert check(lines) == (15, 20)
+    lines[-1] += ' /*'
+    assert check(lines) == (15, 30)
+
+
+@pytest.mark.parametrize('lang_name, doc, line, text', [
+    # ExtendedRegexLexer with its own context class
+    ('yaml', ['key: value', 'list:', '  - item 1', '  - "item 2"', 'nested:',
+              '  a: 1', '  b: |', '    block', '    text'], 2, '  - item'),
+    ('json', ['[', '  {', '    "name": "foo",', '    "values": [1, 2],',
+              '    "nested": {"a": true, "b": null}', '  },', '  {"c": 1}',
+              ']'], 3, '    "values": [1, 2, 3],'),
+    # CFamilyLexer changes the tokens of its regular expressions
+    ('cpp', ['/* comment', '   still */', 'int foo(int x)', '{',
+             '    size_t n = x;  // comment', '    return n + 1;', '}'], 5,
+     '    return n;'),
+])
+def test_pygments_incremental_lexing_lexers(lang_name, doc, line, text):
+    """Test that PygmentsSH lexes again a bounded range with regex lexers."""
+    class SH(PygmentsSH):
+        _lang_name = lang_name
+
+    sh = SH(QTextDocument(), color_scheme='Spyder')
+    old_lines = doc * 20
+    old_lines, _start, spans, states, _end = sh._make_spans(old_lines, [],
+                                                             [])
+    assert states[0] is not None
+
+    # Change a line in the middle of the text, then insert one
+    number = len(doc) * 10 + line
+    lines = list(old_lines)
+    lines[number] = text
+    start, end = lex_again(sh, old_lines, spans, states, lines)
+    assert number - len(doc) < start <= number < end < number + len(doc)
+    lines.insert(number, text)
+    start, end = lex_again(sh, old_lines, spans, states, lines)
+    assert number - len(doc) < start <= number < end < number + len(doc)
+
+
+def test_pygments_context_fallback(caplog):
+    """Test that text is lexed from the start if lexing with a context
+    fails."""
+    from pygments.lexer import RegexLexer
+    from pygments.token import Name, Text
+
+    def name(lexer, match):
+        yield match.start(), Name, match.group()
+
+    class Lexer(RegexLexer):
+        tokens = {'root': [(r'\w+', name), (r'\s+', Text)]}
+
+    class SH(PygmentsSH):
+        _lexer = Lexer()
+
+    sh = SH(QTextDocument(), color_scheme='Spyder')
+    old_lines = ['foo bar'] * 30
+    old_lines, _start, spans, states, _end = sh._make_spans(old_lines, [],
+                                                             [])
+    assert 'Lexing with a context failed' in caplog.text
+    assert states == [None] * 30
+    lines = list(old_lines)
+    lines[17] = 'foo'
+    assert lex_again(sh, old_lines, spans, states, lines) == (0, 30)
+
+
 if __name__ == '__main__':
     pytest.main()
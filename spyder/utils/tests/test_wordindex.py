@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for wordindex.py"""
+
+# Third party imports
+from qtpy.QtGui import QTextCursor, QTextDocument
+import pytest
+
+# Local imports
+from spyder.utils.wordindex import WordIndex
+
+
+def test_word_index(qtbot):
+    """Test that blocks containing words follow changes of the document."""
+    doc = QTextDocument('spam = 1\nprint(spam)\neggs = spam_eggs\nspam')
+    # Changes are only signaled when the document has a layout
+    doc.documentLayout()
+    index = WordIndex(doc)
+    assert index.find('spam') == [0, 1, 3]
+    assert index.find('eggs') == [2]
+
+    # Insert lines in the middle of a block
+    cursor = QTextCursor(doc.findBlockByNumber(1))
+    cursor.movePosition(QTextCursor.Right, n=6)
+    cursor.insertText('eggs)\nprint(\n')
+    assert index.find('spam') == [0, 3, 5]
+    assert index.find('eggs') == [1, 4]
+
+    # Remove blocks
+    cursor = QTextCursor(doc.findBlockByNumber(1))
+    cursor.movePosition(QTextCursor.Down, QTextCursor.KeepAnchor, 3)
+    cursor.removeSelectedText()
+    assert index.find('spam') == [0, 2]
+    assert index.find('eggs') == [1]
+
+
+def test_word_index_changed_blocks_only(qtbot, monkeypatch):
+    """Test that only changed blocks are read when the document changes."""
+    doc = QTextDocument('spam\n' * 1000)
+    doc.documentLayout()
+    index = WordIndex(doc)
+    assert index.find('spam') == list(range(1000))
+    read = []
+    read_words = index._read_words
+    def counted_read_words(first, last):
+        read.append((first, last))
+        return read_words(first, last)
+    monkeypatch.setattr(index, '_read_words', counted_read_words)
+    monkeypatch.setattr(index, '_get_words', None)
+
+    cursor = QTextCursor(doc.findBlockByNumber(500))
+    cursor.insertText('eggs_')
+    cursor.insertText('\n')
+    assert read == [(500, 500), (500, 501)]
+    assert index.find('spam') == list(range(500)) + list(range(501, 1001))
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Word index of a document
+
+Blocks containing a word in a QTextDocument, to mark occurrences of the
+word under the cursor without searching the whole document every time.
+"""
+
+# Standard library imports
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import re
+
+# Local imports
+from spyder.py3compat import to_text_string
+
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class WordIndex(object):
+    """
+    Blocks containing each word of a QTextDocument
+
+    Words of each block are found when first needed, and read again when
+    the block changes. The block numbers of the last words looked for are
+    kept up to date as the document changes, from the changed blocks only,
+    so that looking for them again doesn't go through the document.
+    """
+    # Number of words whose block numbers are kept
+    MAX_CACHED_WORDS = 10
+    # Maximum number of blocks changed at once for which they are updated
+    # (they are forgotten otherwise)
+    MAX_CHANGED_BLOCKS = 100
+
+    def __init__(self, document):
+        self.document = document
+        # Words of each block (None if not known yet)
+        self._words = None
+        self._block_count = document.blockCount()
+        # Word -> sorted block numbers, least recently used first
+        self._blocks = OrderedDict()
+        document.contentsChange.connect(self._contents_changed)
+
+    def find(self, word):
+        """Return the sorted numbers of blocks containing *word*"""
+        numbers = self._blocks.pop(word, None)
+        if numbers is None:
+            words = self._get_words()
+            numbers = [block_nb for block_nb in range(len(words))
+                       if word in words[block_nb]]
+        self._blocks[word] = numbers
+        while len(self._blocks) > self.MAX_CACHED_WORDS:
+            self._blocks.popitem(last=False)
+        return list(numbers)
+
+    def _get_words(self):
+        """Return the words of every block, finding those not known yet"""
+        if self._words is None:
+            self._words = [None] * self.document.blockCount()
+        block = None
+        for block_nb, words in enumerate(self._words):
+            if words is not None:
+                continue
+            if block is None or block.blockNumber() != block_nb - 1:
+                block = self.document.findBlockByNumber(block_nb)
+            else:
+                block = block.next()
+            self._words[block_nb] = frozenset(
+                WORD_PATTERN.findall(to_text_string(block.text())))
+        return self._words
+
+    def _read_words(self, first, last):
+        """Return the words of blocks *first* to *last*"""
+        words = []
+        block = self.document.findBlockByNumber(first)
+        for _block_nb in range(first, last + 1):
+            words.append(frozenset(
+                WORD_PATTERN.findall(to_text_string(block.text()))))
+            block = block.next()
+        return words
+
+    def _contents_changed(self, position, removed, added):
+        """Read words of changed blocks again and move the following ones"""
+        block_count = self.document.blockCount()
+        delta = block_count - self._block_count
+        self._block_count = block_count
+        if self._words is None:
+            return
+        first = self.document.findBlock(position).blockNumber()
+        last = self.document.findBlock(position + added).blockNumber()
+        if first < 0 or len(self._words) + delta != block_count:
+            self._words = None
+            self._blocks.clear()
+            return
+        if last < first:
+            last = block_count - 1
+        if last - first >= self.MAX_CHANGED_BLOCKS:
+            self._words[first:last - delta + 1] = [None] * (last - first + 1)
+            self._blocks.clear()
+            return
+
+        changed = self._read_words(first, last)
+        self._words[first:last - delta + 1] = changed
+        for word, numbers in self._blocks.items():
+            start = bisect_left(numbers, first)
+            end = bisect_right(numbers, last - delta)
+            found = [first + offset for offset, words in enumerate(changed)
+                     if word in words]
+            if delta:
+                # Blocks were added or removed: move the following ones
+                numbers[start:] = found + [block_nb + delta
+                                           for block_nb in numbers[end:]]
+            else:
+                numbers[start:end] = found
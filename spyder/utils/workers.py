@@ -78,6 +78,10 @@ class PythonWorker(QObject):
 
         if not self._is_finished:
             self.sig_finished.emit(self, output, error)
+        else:
+            # Terminated workers don't emit sig_finished, which quits
+            # their thread
+            self.thread().quit()
         self._is_finished = True
 
         
@@ -35,8 +35,9 @@ from spyder.config.utils import (get_edit_filetypes, get_edit_filters,
                                  get_filter)
 from spyder.py3compat import qbytearray_to_str, to_text_string
 from spyder.utils import icon_manager as ima
-from spyder.utils import (codeanalysis, encoding, sourcecode,
-                          syntaxhighlighters)
+from spyder.utils import (analysis_client, codeanalysis, encoding,
+                          sourcecode, syntaxhighlighters)
+from spyder.utils.instrumentation import INSTRUMENTATION
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     create_toolbutton, mimedata2url)
 from spyder.widgets.editortools import OutlineExplorerWidget
@@ -54,6 +55,13 @@ from spyder.widgets.explorer import show_in_external_file_explorer
 
 DEBUG_EDITOR = DEBUG >= 3
 
+# Files with more bytes or lines than this are opened in large file mode
+# (see CodeEditor.setup_editor), inserting text in the editor by chunks of
+# LOAD_CHUNK_SIZE characters (files are still read and decoded at once)
+LARGE_FILE_SIZE = 20 * 1024**2
+LARGE_FILE_LINES = 200000
+LOAD_CHUNK_SIZE = 1024**2
+
 
 class AnalysisThread(QThread):
     """Analysis thread"""
@@ -66,7 +74,9 @@ class AnalysisThread(QThread):
     def run(self):
         """Run analysis"""
         try:
-            self.results = self.checker(self.source_code)
+            with INSTRUMENTATION.measure('analysis.' +
+                                         self.checker.__name__):
+                self.results = self.checker(self.source_code)
         except Exception:
             if DEBUG_EDITOR:
                 import traceback
@@ -74,18 +84,36 @@ class AnalysisThread(QThread):
 
 
 class ThreadManager(QObject):
-    """Analysis thread manager"""
-    def __init__(self, parent, max_simultaneous_threads=2):
+    """
+    Analysis thread manager
+
+    Checks known by the code analysis workers are run by them (see
+    spyder/utils/analysis_client.py), the rest in threads.
+    """
+    def __init__(self, parent, max_simultaneous_threads=2,
+                 use_workers=True):
         super(ThreadManager, self).__init__(parent)
         self.max_simultaneous_threads = max_simultaneous_threads
+        self.use_workers = use_workers
         self.started_threads = {}
         self.pending_threads = []
         self.end_callbacks = {}
+        # Ids of parents which have sent requests to analysis workers
+        self.worker_parents = set()
 
     def close_threads(self, parent):
         """Close threads associated to parent_id"""
         if DEBUG_EDITOR:
             print("Call to 'close_threads'", file=STDOUT)
+        pool = analysis_client.ANALYSIS_POOL
+        if pool is not None:
+            if parent is None:
+                parent_ids = list(self.worker_parents)
+            else:
+                parent_ids = [id(parent)]
+            for parent_id in parent_ids:
+                pool.cancel(parent_id)
+                self.worker_parents.discard(parent_id)
         if parent is None:
             # Closing all threads
             self.pending_threads = []
@@ -111,9 +139,30 @@ class ThreadManager(QObject):
             print("Call to 'close_all_threads'", file=STDOUT)
         self.close_threads(None)
 
-    def add_thread(self, checker, end_callback, source_code, parent):
-        """Add thread to queue"""
+    def add_thread(self, checker, end_callback, source_code, parent,
+                   incremental=False):
+        """
+        Add thread to queue
+
+        If *incremental* is True, analysis workers reuse the results of the
+        previous check of *parent* when possible.
+        """
         parent_id = id(parent)
+        if self.use_workers and \
+          checker.__name__ in analysis_client.CHECKERS:
+            pool = analysis_client.get_analysis_pool()
+            if pool is not None:
+                self.worker_parents.add(parent_id)
+                fallback = lambda: self._add_thread(checker, end_callback,
+                                                    source_code, parent_id)
+                file_id = parent_id if incremental else None
+                pool.add_request(checker.__name__, source_code, end_callback,
+                                 parent_id, fallback, file_id)
+                return
+        self._add_thread(checker, end_callback, source_code, parent_id)
+
+    def _add_thread(self, checker, end_callback, source_code, parent_id):
+        """Add analysis thread to queue"""
         thread = AnalysisThread(self, checker, source_code)
         self.end_callbacks[id(thread)] = end_callback
         self.pending_threads.append((thread, parent_id))
@@ -197,7 +246,7 @@ class FileInfo(QObject):
         """Return associated editor source code"""
         return to_text_string(self.editor.toPlainText())
 
-    def run_code_analysis(self, run_pyflakes, run_pep8):
+    def run_code_analysis(self, run_pyflakes, run_pep8, incremental=False):
         """Run code analysis"""
         run_pyflakes = run_pyflakes and codeanalysis.is_pyflakes_installed()
         run_pep8 = run_pep8 and\
@@ -214,7 +263,7 @@ class FileInfo(QObject):
             if run_pyflakes:
                 self.threadmanager.add_thread(codeanalysis.check_with_pyflakes,
                                               self.pyflakes_analysis_finished,
-                                              source_code, self)
+                                              source_code, self, incremental)
             if run_pep8:
                 self.threadmanager.add_thread(codeanalysis.check_with_pep8,
                                               self.pep8_analysis_finished,
@@ -247,12 +296,13 @@ class FileInfo(QObject):
         self.analysis_results = []
         self.editor.cleanup_code_analysis()
 
-    def run_todo_finder(self):
+    def run_todo_finder(self, incremental=False):
         """Run TODO finder"""
         if self.editor.is_python():
             self.threadmanager.add_thread(codeanalysis.find_tasks,
                                           self.todo_finished,
-                                          self.get_source_code(), self)
+                                          self.get_source_code(), self,
+                                          incremental)
 
     def todo_finished(self, results):
         """Code analysis thread has finished"""
@@ -403,6 +453,7 @@ class EditorStack(QWidget):
     sig_editor_cursor_position_changed = Signal(int, int)
     sig_refresh_eol_chars = Signal(str)
     starting_long_process = Signal(str)
+    long_process_progress = Signal(str)
     ending_long_process = Signal(str)
     redirect_stdio = Signal(bool)
     exec_in_extconsole = Signal(str, bool)
@@ -509,6 +560,7 @@ class EditorStack(QWidget):
         self.pep8_enabled = False
         self.todolist_enabled = True
         self.realtime_analysis_enabled = False
+        self.incremental_analysis_enabled = True
         self.is_analysis_done = False
         self.linenumbers_enabled = True
         self.blanks_enabled = False
@@ -868,7 +920,8 @@ class EditorStack(QWidget):
         self.show_class_func_dropdown = state
         if self.data:
             for finfo in self.data:
-                if finfo.editor.is_python_like():
+                if finfo.editor.is_python_like() \
+                  and not finfo.editor.large_file_mode:
                     finfo.editor.classfuncdropdown.setVisible(state)
 
     def __update_editor_margins(self, editor):
@@ -918,6 +971,10 @@ class EditorStack(QWidget):
     def set_realtime_analysis_timeout(self, timeout):
         self.analysis_timer.setInterval(timeout)
 
+    def set_incremental_analysis_enabled(self, state):
+        # CONF.get(self.CONF_SECTION, 'realtime_analysis/incremental')
+        self.incremental_analysis_enabled = state
+
     def set_linenumbers_enabled(self, state, current_finfo=None):
         # CONF.get(self.CONF_SECTION, 'line_numbers')
         self.linenumbers_enabled = state
@@ -1071,7 +1128,8 @@ class EditorStack(QWidget):
         self.occurrence_highlighting_enabled = state
         if self.data:
             for finfo in self.data:
-                finfo.editor.set_occurrence_highlighting(state)
+                if not finfo.editor.large_file_mode:
+                    finfo.editor.set_occurrence_highlighting(state)
 
     def set_occurrence_highlighting_timeout(self, timeout):
         # CONF.get(self.CONF_SECTION, 'occurrence_highlighting/timeout')
@@ -1210,7 +1268,8 @@ class EditorStack(QWidget):
 
     def rename_in_data(self, index, new_filename):
         finfo = self.data[index]
-        if osp.splitext(finfo.filename)[1] != osp.splitext(new_filename)[1]:
+        if osp.splitext(finfo.filename)[1] != osp.splitext(new_filename)[1] \
+          and not finfo.editor.large_file_mode:
             # File type has changed!
             txt = to_text_string(finfo.editor.get_text_with_eol())
             language = get_file_language(new_filename, txt)
@@ -1503,13 +1562,8 @@ class EditorStack(QWidget):
             self.analyze_script(index)
             self.introspector.validate()
 
-            #XXX CodeEditor-only: re-scan the whole text to rebuild outline
-            # explorer data from scratch (could be optimized because
-            # rehighlighting text means searching for all syntax coloring
-            # patterns instead of only searching for class/def patterns which
-            # would be sufficient for outline explorer data.
-            finfo.editor.rehighlight()
-
+            # Outline explorer data is kept up to date by the highlighter,
+            # so only the items changed since the last refresh are updated
             self._refresh_outlineexplorer(index)
             return True
         except EnvironmentError as error:
@@ -1634,10 +1688,11 @@ class EditorStack(QWidget):
         if self.data:
             finfo = self.data[index]
             run_pyflakes, run_pep8 = self.pyflakes_enabled, self.pep8_enabled
+            incremental = self.incremental_analysis_enabled
             if run_pyflakes or run_pep8:
-                finfo.run_code_analysis(run_pyflakes, run_pep8)
-            if self.todolist_enabled:
-                finfo.run_todo_finder()
+                finfo.run_code_analysis(run_pyflakes, run_pep8, incremental)
+            if self.todolist_enabled and not finfo.editor.large_file_mode:
+                finfo.run_todo_finder(incremental)
         self.is_analysis_done = True
 
     def set_analysis_results(self, index, analysis_results):
@@ -1879,8 +1934,7 @@ class EditorStack(QWidget):
         txt, finfo.encoding = encoding.read(finfo.filename)
         finfo.lastmodified = QFileInfo(finfo.filename).lastModified()
         position = finfo.editor.get_position('cursor')
-        finfo.editor.set_text(txt)
-        finfo.editor.document().setModified(False)
+        self._set_editor_text(finfo.editor, finfo.filename, txt)
         finfo.editor.set_cursor_position(position)
         self.introspector.validate()
 
@@ -1889,7 +1943,8 @@ class EditorStack(QWidget):
         # rehighlighting text means searching for all syntax coloring
         # patterns instead of only searching for class/def patterns which
         # would be sufficient for outline explorer data.
-        finfo.editor.rehighlight()
+        if not finfo.editor.large_file_mode:
+            finfo.editor.rehighlight()
 
         self._refresh_outlineexplorer(index)
 
@@ -1908,12 +1963,40 @@ class EditorStack(QWidget):
                 return
         self.reload(index)
 
+    def _set_editor_text(self, editor, fname, txt):
+        """
+        Set the text of *editor*, by chunks in large file mode
+
+        Only the insertion in the editor is done by chunks: *txt* is the
+        whole text of the file, read and decoded at once.
+
+        Progress of chunked loads is emitted with long_process_progress,
+        whose slots may process events: the stack is disabled meanwhile, so
+        that the editor can't be closed or edited until it's loaded.
+        """
+        if editor.large_file_mode:
+            name = osp.basename(fname)
+            self.setEnabled(False)
+            try:
+                editor.set_text(txt, chunk_size=LOAD_CHUNK_SIZE,
+                                callback=lambda fraction:
+                                self.long_process_progress.emit(
+                                    _("Loading %s... %d%%") %
+                                    (name, int(100 * fraction))))
+            finally:
+                self.setEnabled(True)
+        else:
+            editor.set_text(txt)
+        editor.document().setModified(False)
+
     def create_new_editor(self, fname, enc, txt, set_current, new=False,
-                          cloned_from=None):
+                          cloned_from=None, large_file=False):
         """
         Create a new editor instance
         Returns finfo object (instead of editor as in previous releases)
         """
+        if cloned_from is not None:
+            large_file = cloned_from.large_file_mode
         editor = codeeditor.CodeEditor(self)
         introspector = self.introspector
         editor.get_completions.connect(introspector.get_completions)
@@ -1966,15 +2049,17 @@ class EditorStack(QWidget):
                 cloned_from=cloned_from,
                 filename=fname,
                 show_class_func_dropdown=self.show_class_func_dropdown,
-                indent_guides=self.indent_guides)
+                indent_guides=self.indent_guides,
+                large_file=large_file)
         if cloned_from is None:
-            editor.set_text(txt)
-            editor.document().setModified(False)
+            self._set_editor_text(editor, fname, txt)
         finfo.text_changed_at.connect(
                                     lambda fname, position:
                                     self.text_changed_at.emit(fname, position))
         editor.sig_cursor_position_changed.connect(
                                            self.editor_cursor_position_changed)
+        editor.sig_highlighting_finished.connect(
+                            lambda: self.highlighting_finished(editor))
         editor.textChanged.connect(self.start_stop_analysis_timer)
         editor.modificationChanged.connect(
                      lambda state: self.modification_changed(state,
@@ -2004,6 +2089,11 @@ class EditorStack(QWidget):
         """Cursor position of one of the editor in the stack has changed"""
         self.sig_editor_cursor_position_changed.emit(line, index)
 
+    def highlighting_finished(self, editor):
+        """A large file has been highlighted: update its outline"""
+        if editor is self.get_current_editor():
+            self._refresh_outlineexplorer()
+
     def send_to_help(self, qstr1, qstr2=None, qstr3=None, qstr4=None,
                      force=False):
         """qstr1: obj_text, qstr2: argpspec, qstr3: note, qstr4: doc_text"""
@@ -2050,10 +2140,19 @@ class EditorStack(QWidget):
         filename = osp.abspath(to_text_string(filename))
         self.starting_long_process.emit(_("Loading %s...") % filename)
         text, enc = encoding.read(filename)
-        finfo = self.create_new_editor(filename, enc, text, set_current)
+        large_file = (osp.getsize(filename) > LARGE_FILE_SIZE or
+                      text.count('\n') > LARGE_FILE_LINES)
+        finfo = self.create_new_editor(filename, enc, text, set_current,
+                                       large_file=large_file)
         index = self.data.index(finfo)
         self._refresh_outlineexplorer(index, update=True)
-        self.ending_long_process.emit("")
+        if large_file:
+            self.ending_long_process.emit(
+                _("%s is a large file: syntax highlighting, code folding, "
+                  "outline and code analysis are disabled") %
+                osp.basename(filename))
+        else:
+            self.ending_long_process.emit("")
         if self.isVisible() and self.checkeolchars_enabled \
            and sourcecode.has_mixed_eol_chars(text):
             name = osp.basename(filename)
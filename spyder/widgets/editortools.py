@@ -20,6 +20,7 @@ from qtpy.QtWidgets import QHBoxLayout, QTreeWidgetItem, QVBoxLayout, QWidget
 from spyder.config.base import _, STDOUT
 from spyder.py3compat import to_text_string
 from spyder.utils import icon_manager as ima
+from spyder.utils.instrumentation import INSTRUMENTATION
 from spyder.utils.qthelpers import (create_action, create_toolbutton,
                                     set_item_user_text)
 from spyder.widgets.onecolumntree import OneColumnTree
@@ -89,22 +90,39 @@ class TreeItem(QTreeWidgetItem):
         
     def set_icon(self, icon):
         self.setIcon(0, icon)
+
+    def set_line(self, line):
+        self.line = line
+        self.set_tooltip()
+
+    def set_tooltip(self):
+        self.setToolTip(0, _("Line %s") % str(self.line))
         
     def setup(self):
-        self.setToolTip(0, _("Line %s") % str(self.line))
+        self.set_tooltip()
 
 class ClassItem(TreeItem):
+    def set_tooltip(self):
+        self.setToolTip(0, _("Class defined at line %s") % str(self.line))
+
     def setup(self):
         self.set_icon(ima.icon('class'))
-        self.setToolTip(0, _("Class defined at line %s") % str(self.line))
+        self.set_tooltip()
 
 class FunctionItem(TreeItem):
     def is_method(self):
         return isinstance(self.parent(), ClassItem)
+
+    def set_tooltip(self):
+        if self.is_method():
+            self.setToolTip(0, _("Method defined at line %s") % str(self.line))
+        else:
+            self.setToolTip(0, _("Function defined at line %s"
+                                 ) % str(self.line))
     
     def setup(self):
+        self.set_tooltip()
         if self.is_method():
-            self.setToolTip(0, _("Method defined at line %s") % str(self.line))
             name = to_text_string(self.text(0))
             if name.startswith('__'):
                 self.set_icon(ima.icon('private2'))
@@ -114,8 +132,6 @@ class FunctionItem(TreeItem):
                 self.set_icon(ima.icon('method'))
         else:
             self.set_icon(ima.icon('function'))
-            self.setToolTip(0, _("Function defined at line %s"
-                                 ) % str(self.line))
 
 class CommentItem(TreeItem):
     def __init__(self, name, line, parent, preceding):
@@ -127,7 +143,7 @@ class CommentItem(TreeItem):
         font = self.font(0)
         font.setItalic(True)
         self.setFont(0, font)
-        self.setToolTip(0, _("Line %s") % str(self.line))
+        self.set_tooltip()
 
 class CellItem(TreeItem):
     def __init__(self, name, line, parent, preceding):
@@ -141,12 +157,15 @@ class CellItem(TreeItem):
             name = name.strip()
         TreeItem.__init__(self, name, line, parent, preceding)
 
+    def set_tooltip(self):
+        self.setToolTip(0, _("Cell starts at line %s") % str(self.line))
+
     def setup(self):
         self.set_icon(ima.icon('cell'))
         font = self.font(0)
         font.setItalic(True)
         self.setFont(0, font)
-        self.setToolTip(0, _("Cell starts at line %s") % str(self.line))
+        self.set_tooltip()
 
 def get_item_children(item):
     children = [item.child(index) for index in range(item.childCount())]
@@ -165,7 +184,9 @@ def item_at_line(root_item, line):
 
 
 def remove_from_tree_cache(tree_cache, line=None, item=None):
-    if line is None:
+    if line is None and tree_cache.get(item.line, (None,))[0] is item:
+        line = item.line
+    elif line is None:
         for line, (_it, _level, _debug) in list(tree_cache.items()):
             if _it is item:
                 break
@@ -180,6 +201,24 @@ def remove_from_tree_cache(tree_cache, line=None, item=None):
         print("unable to remove tree item: ", debug, file=STDOUT)
 
 
+def shift_tree_cache(tree_cache, line, delta):
+    """
+    Update *tree_cache* after *delta* lines were inserted after *line*
+    (removed if negative)
+    """
+    for _l in sorted((_l for _l in tree_cache if _l > line),
+                     reverse=delta > 0):
+        if _l not in tree_cache:
+            # Already removed with its parent
+            continue
+        if _l <= line - delta:
+            remove_from_tree_cache(tree_cache, line=_l)
+        else:
+            item, level, debug = tree_cache.pop(_l)
+            item.set_line(_l + delta)
+            tree_cache[item.line] = (item, level, debug)
+
+
 class OutlineExplorerTreeWidget(OneColumnTree):
     def __init__(self, parent, show_fullpath=False, fullpath_sorting=True,
                  show_all_files=True, show_comments=True):
@@ -191,6 +230,9 @@ class OutlineExplorerTreeWidget(OneColumnTree):
         self.freeze = False # Freezing widget to avoid any unwanted update
         self.editor_items = {}
         self.editor_tree_cache = {}
+        # Highlighters whose outline explorer data changes were consumed
+        # to update the tree of each editor (see update_branch)
+        self.editor_highlighters = {}
         self.editor_ids = {}
         self.current_editor = None
         title = _("Outline")
@@ -272,10 +314,8 @@ class OutlineExplorerTreeWidget(OneColumnTree):
                 self.root_item_selected(item)
                 self.__hide_or_show_root_items(item)
             if update:
-                self.save_expanded_state()
                 tree_cache = self.editor_tree_cache[editor_id]
-                self.populate_branch(editor, item, tree_cache)
-                self.restore_expanded_state()
+                self.update_branch(editor, item, tree_cache)
         else:
     #        import time
     #        t0 = time.time()
@@ -317,6 +357,7 @@ class OutlineExplorerTreeWidget(OneColumnTree):
             if editor_id not in list(self.editor_ids.values()):
                 root_item = self.editor_items.pop(editor_id)
                 self.editor_tree_cache.pop(editor_id)
+                self.editor_highlighters.pop(editor_id, None)
                 try:
                     self.takeTopLevelItem(self.indexOfTopLevelItem(root_item))
                 except RuntimeError:
@@ -330,6 +371,7 @@ class OutlineExplorerTreeWidget(OneColumnTree):
             sort_func = lambda item: osp.basename(item.path.lower())
         self.sort_top_level_items(key=sort_func)
             
+    @INSTRUMENTATION.timed('outline.populate_branch')
     def populate_branch(self, editor, root_item, tree_cache=None):
         if tree_cache is None:
             tree_cache = {}
@@ -341,14 +383,97 @@ class OutlineExplorerTreeWidget(OneColumnTree):
                 # ancestors was deleted in the meantime (deleting all children):
                 if _l in tree_cache:
                     remove_from_tree_cache(tree_cache, line=_l)
-                    
+
+        # Changes of outline explorer data until now are taken into account
+        editor_id = editor.get_document_id()
+        self.editor_highlighters[editor_id] = editor.highlighter
+        editor.highlighter.get_outlineexplorer_changes()
+
+        oe_data = editor.highlighter.get_outlineexplorer_data()
+        editor.has_cell_separators = editor.highlighter.found_cell_separators
+        self.__populate_lines(root_item, tree_cache, oe_data, 0,
+                              editor.get_line_count())
+        return tree_cache
+
+    @INSTRUMENTATION.timed('outline.update_branch')
+    def update_branch(self, editor, root_item, tree_cache):
+        """
+        Update the branch of *editor* with the changes of its outline
+        explorer data since the last update, populating it again only if
+        they are unknown
+        """
+        editor_id = editor.get_document_id()
+        changes = None
+        if self.editor_highlighters.get(editor_id) is editor.highlighter:
+            changes = editor.highlighter.get_outlineexplorer_changes()
+        if changes is None:
+            self.save_expanded_state()
+            self.populate_branch(editor, root_item, tree_cache)
+            self.restore_expanded_state()
+            return
+        if not changes:
+            return
+
+        # Move items after lines inserted or removed and collect the ranges
+        # of lines whose data changed
+        ranges = []
+        for first, last, delta in changes:
+            first, last = first + 1, last + 1
+            if delta:
+                shift_tree_cache(tree_cache, first, delta)
+                ranges = [(max(start + delta, first) if start > first
+                           else start,
+                           max(end + delta, first) if end > first else end)
+                          for start, end in ranges]
+            ranges.append((first, last))
+
+        oe_data = editor.highlighter.get_outlineexplorer_data()
+        editor.has_cell_separators = editor.highlighter.found_cell_separators
+        line_count = editor.get_line_count()
+        start = None
+        for first, last in sorted(ranges):
+            if start is not None and last < start:
+                continue
+            # Items are populated again from the last top-level item before
+            # the changes (items following one don't depend on the ones
+            # before)
+            start = 1
+            for line_nb, (_it, level, _debug) in tree_cache.items():
+                if level == 0 and start < line_nb < first:
+                    start = line_nb
+            preceding = root_item
+            for line_nb, (item, _level, _debug) in tree_cache.items():
+                if line_nb < start and (preceding is root_item or
+                                        line_nb > preceding.line):
+                    preceding = item
+            start = self.__populate_lines(root_item, tree_cache, oe_data,
+                                          start - 1, line_count, last - 1,
+                                          preceding)
+            if start is None:
+                break
+
+    def __populate_lines(self, root_item, tree_cache, oe_data, first_block,
+                         end_block, last_block=None, preceding=None):
+        """
+        Populate *root_item* with items of blocks from *first_block*, which
+        must be the first one or a top-level item, to *end_block* (excluded)
+
+        If *last_block* is given, stop at the first top-level item after it
+        which is already in the tree and return its line number. New items
+        are inserted after *preceding* until an item is found.
+        """
+        if preceding is None:
+            preceding = root_item
         ancestors = [(root_item, 0)]
         previous_item = None
         previous_level = None
+
+        # Only blocks with data or with an item need to be looked at
+        cached = [line_nb - 1 for line_nb in tree_cache
+                  if first_block < line_nb <= end_block]
+        block_numbers = set(oe_data.get_blocks(first_block, end_block))
         
-        oe_data = editor.highlighter.get_outlineexplorer_data()
-        editor.has_cell_separators = oe_data.get('found_cell_separators', False)
-        for block_nb in range(editor.get_line_count()):
+        for block_nb in sorted(block_numbers.union(cached)):
             line_nb = block_nb+1
             data = oe_data.get(block_nb)
             if data is None:
@@ -356,6 +481,9 @@ class OutlineExplorerTreeWidget(OneColumnTree):
             else:
                 level = data.fold_level
             citem, clevel, _d = tree_cache.get(line_nb, (None, None, ""))
+            if last_block is not None and block_nb > last_block and \
+              level == 0 and clevel == 0:
+                return line_nb
             
             # Skip iteration if line is not the first line of a foldable block
             if level is None:
@@ -378,6 +506,8 @@ class OutlineExplorerTreeWidget(OneColumnTree):
                 if level == previous_level:
                     pass
                 elif level > previous_level+4: # Invalid indentation
+                    if citem is not None:
+                        remove_from_tree_cache(tree_cache, line=line_nb)
                     continue
                 elif level > previous_level:
                     ancestors.append((previous_item, previous_level))
@@ -388,9 +518,14 @@ class OutlineExplorerTreeWidget(OneColumnTree):
             parent, _level = ancestors[-1]
             
             if citem is not None:
-                cname = to_text_string(citem.text(0))
+                if citem.parent() is not parent:
+                    remove_from_tree_cache(tree_cache, line=line_nb)
+                    citem = None
+                else:
+                    cname = to_text_string(citem.text(0))
                 
-            preceding = root_item if previous_item is None else previous_item
+            if previous_item is not None:
+                preceding = previous_item
             if not_class_nor_function:
                 if data.is_comment() and not self.show_comments:
                     if citem is not None:
@@ -437,8 +572,6 @@ class OutlineExplorerTreeWidget(OneColumnTree):
             tree_cache[line_nb] = (item, level, debug)
             previous_level = level
             previous_item = item
-            
-        return tree_cache
 
     def root_item_selected(self, item):
         """Root item has been selected: expanding it and collapsing others"""
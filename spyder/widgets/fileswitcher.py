@@ -30,7 +30,7 @@ def process_python_symbol_data(oedata):
     symbol_list = []
     for key in oedata:
         val = oedata[key]
-        if val and key != 'found_cell_separators':
+        if val:
             if val.is_class_or_function():
                 symbol_list.append((key, val.def_name, val.fold_level,
                                     val.get_token()))
@@ -48,23 +48,17 @@ def get_python_symbol_icons(oedata):
     symbols = process_python_symbol_data(oedata)
 
     # line - 1, name, fold level
-    fold_levels = sorted(list(set([s[2] for s in symbols])))
-    parents = [None]*len(symbols)
+    parents = []
     icons = [None]*len(symbols)
-    indexes = []
-
-    parent = None
-    for level in fold_levels:
-        for index, item in enumerate(symbols):
-            line, name, fold_level, token = item
-            if index in indexes:
-                continue
-
-            if fold_level == level:
-                indexes.append(index)
-                parent = item
-            else:
-                parents[index] = parent
+
+    # The parent of an item is the closest previous one less indented
+    stack = []
+    for item in symbols:
+        fold_level = item[2]
+        while stack and stack[-1][2] >= fold_level:
+            stack.pop()
+        parents.append(stack[-1] if stack else None)
+        stack.append(item)
 
     for index, item in enumerate(symbols):
         parent = parents[index]
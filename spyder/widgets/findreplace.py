@@ -108,11 +108,18 @@ class FindReplace(QWidget):
         self.highlight_button.setCheckable(True)
         self.highlight_button.toggled.connect(self.toggle_highlighting)
 
+        self.scrollback_button = create_toolbutton(self,
+                                    text=_("Scrollback"),
+                                    tip=_("Find in lines removed from the "
+                                          "console"),
+                                    triggered=self.find_in_scrollback,
+                                    text_beside_icon=True)
+
         hlayout = QHBoxLayout()
         self.widgets = [self.close_button, self.search_text,
                         self.previous_button, self.next_button,
                         self.re_button, self.case_button, self.words_button,
-                        self.highlight_button]
+                        self.highlight_button, self.scrollback_button]
         for widget in self.widgets[1:]:
             hlayout.addWidget(widget)
         glayout.addLayout(hlayout, 0, 1)
@@ -306,6 +313,7 @@ class FindReplace(QWidget):
         from spyder.widgets.sourcecode.codeeditor import CodeEditor
         self.is_code_editor = isinstance(editor, CodeEditor)
         self.highlight_button.setVisible(self.is_code_editor)
+        self.update_scrollback_button()
         if refresh:
             self.refresh()
         if self.isHidden() and editor is not None:
@@ -326,6 +334,22 @@ class FindReplace(QWidget):
         self.editor.setFocus()
         return state
 
+    def update_scrollback_button(self):
+        """Show scrollback button if lines have been removed from the
+        console (see spyder/utils/scrollback.py)"""
+        scrollback = getattr(self.editor, 'scrollback', None)
+        self.scrollback_button.setVisible(scrollback is not None and
+                                          scrollback.line_count() > 0)
+
+    @Slot()
+    def find_in_scrollback(self):
+        """Find search text in lines removed from the console"""
+        self.editor.show_scrollback(
+            to_text_string(self.search_text.currentText()),
+            case=self.case_button.isChecked(),
+            words=self.words_button.isChecked(),
+            regexp=self.re_button.isChecked())
+
     def text_has_been_edited(self, text):
         """Find text has been edited (this slot won't be triggered when 
         setting the search pattern combo box text programmatically"""
@@ -348,6 +372,7 @@ class FindReplace(QWidget):
     def find(self, changed=True, forward=True,
              rehighlight=True, start_highlight_timer=False):
         """Call the find function"""
+        self.update_scrollback_button()
         text = self.search_text.currentText()
         if len(text) == 0:
             self.search_text.lineEdit().setStyleSheet("")
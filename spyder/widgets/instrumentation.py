@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Performance widget
+
+Timings recorded by the editor instrumentation hooks (see
+spyder/utils/instrumentation.py)
+"""
+
+# Standard library imports
+import os.path as osp
+
+# Third party imports
+from qtpy.compat import getsavefilename
+from qtpy.QtCore import Qt, QTimer, Slot
+from qtpy.QtWidgets import (QCheckBox, QHBoxLayout, QMessageBox,
+                            QTreeWidget, QTreeWidgetItem, QVBoxLayout,
+                            QWidget)
+
+# Local imports
+from spyder.config.base import _
+from spyder.py3compat import getcwd, to_text_string
+from spyder.utils import icon_manager as ima
+from spyder.utils.instrumentation import INSTRUMENTATION
+from spyder.utils.qthelpers import create_toolbutton
+
+
+def format_duration(duration):
+    """Return *duration* (in seconds) in ms"""
+    return '%.3f' % (duration * 1e3)
+
+
+class InstrumentationWidget(QWidget):
+    """
+    Performance widget
+
+    Shows the number of calls and the total, mean, 50th and 95th percentile
+    and maximum durations (in ms) of instrumented operations, and allows to
+    save them as a trace.
+    """
+    COLUMNS = (_("Operation"), _("Count"), _("Total (ms)"), _("Mean (ms)"),
+               _("p50 (ms)"), _("p95 (ms)"), _("Max (ms)"))
+
+    # Interval between refreshes of timings (ms)
+    REFRESH_INTERVAL = 1000
+
+    def __init__(self, parent, instrumentation=INSTRUMENTATION):
+        QWidget.__init__(self, parent)
+        self.instrumentation = instrumentation
+        self.trace_filename = None
+
+        self.enable_box = QCheckBox(_("Record timings"), self)
+        self.enable_box.setChecked(instrumentation.enabled)
+        self.enable_box.toggled.connect(instrumentation.set_enabled)
+        self.reset_button = create_toolbutton(self, icon=ima.icon('editclear'),
+                                              tip=_("Reset timings"),
+                                              triggered=self.reset)
+        self.save_button = create_toolbutton(self, icon=ima.icon('filesave'),
+                                             tip=_("Save trace..."),
+                                             triggered=self.save_trace)
+
+        self.tree = QTreeWidget(self)
+        self.tree.setColumnCount(len(self.COLUMNS))
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(2, Qt.DescendingOrder)
+
+        hlayout = QHBoxLayout()
+        hlayout.addWidget(self.enable_box)
+        hlayout.addStretch()
+        hlayout.addWidget(self.reset_button)
+        hlayout.addWidget(self.save_button)
+        layout = QVBoxLayout()
+        layout.addLayout(hlayout)
+        layout.addWidget(self.tree)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def refresh(self):
+        """Show the current timings"""
+        if not self.isVisible():
+            return
+        items = {}
+        for index in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(index)
+            items[to_text_string(item.text(0))] = item
+        for stats in self.instrumentation.get_stats():
+            item = items.pop(stats[0], None)
+            if item is None:
+                item = StatsItem(self.tree)
+            item.set_stats(stats)
+        for item in items.values():
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+
+    @Slot()
+    def reset(self):
+        """Forget timings"""
+        self.instrumentation.reset()
+        self.tree.clear()
+
+    @Slot()
+    def save_trace(self):
+        """Save the trace of recorded operations"""
+        title = _("Save trace")
+        filename, _selfilter = getsavefilename(
+            self, title, self.trace_filename or getcwd(),
+            "%s (*.json)" % _("Trace files"))
+        if not filename:
+            return
+        filename = osp.normpath(filename)
+        try:
+            self.instrumentation.dump_trace(filename)
+            self.trace_filename = filename
+        except EnvironmentError as error:
+            QMessageBox.critical(self, title,
+                                 _("<b>Unable to save file '%s'</b>"
+                                   "<br><br>Error message:<br>%s"
+                                   ) % (osp.basename(filename),
+                                        to_text_string(error)))
+
+
+class StatsItem(QTreeWidgetItem):
+    """Timings of an operation, sorted numerically"""
+
+    def set_stats(self, stats):
+        """Set (name, count, total, mean, p50, p95, max) timings"""
+        self.stats = stats
+        self.setText(0, stats[0])
+        self.setText(1, str(stats[1]))
+        for column, duration in enumerate(stats[2:], 2):
+            self.setText(column, format_duration(duration))
+            self.setTextAlignment(column, Qt.AlignRight)
+        self.setTextAlignment(1, Qt.AlignRight)
+
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn()
+        return self.stats[column] < other.stats[column]
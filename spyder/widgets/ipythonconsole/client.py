@@ -29,11 +29,14 @@ from qtpy.QtWidgets import (QHBoxLayout, QMenu, QMessageBox, QToolButton,
 # Local imports
 from spyder.config.base import _, get_image_path, get_module_source_path
 from spyder.config.gui import get_font, get_shortcut
+from spyder.config.main import CONF
 from spyder.utils import icon_manager as ima
 from spyder.utils import sourcecode
 from spyder.utils.encoding import get_coding
 from spyder.utils.environ import RemoteEnvDialog
+from spyder.utils.ipython.kernelmonitor import KernelMonitor
 from spyder.utils.ipython.style import create_qss_style
+from spyder.utils.misc import format_size
 from spyder.utils.programs import TEMPDIR
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     create_toolbutton, DialogManager,
@@ -113,6 +116,8 @@ class ClientWidget(QWidget, SaveHistoryMixin):
         self.stop_icon = ima.icon('stop')
         self.history = []
         self.allow_rename = True
+        # Interrupt the kernel when its memory exceeds the limit of monitor
+        self.interrupt_on_memory_limit = False
 
         # --- Widgets
         self.shellwidget = ShellWidget(config=config_options,
@@ -123,6 +128,8 @@ class ClientWidget(QWidget, SaveHistoryMixin):
                                        local_kernel=True)
         self.infowidget = WebView(self)
         self.set_infowidget_font()
+        self.monitor = KernelMonitor(self)
+        self.monitor.sig_memory_exceeded.connect(self.memory_limit_exceeded)
         self.loading_page = self._create_loading_page()
         self._show_loading_page()
 
@@ -372,6 +379,7 @@ class ClientWidget(QWidget, SaveHistoryMixin):
 
     def shutdown(self):
         """Shutdown kernel"""
+        self.monitor.stop()
         if self.get_kernel() is not None and not self.slave:
             self.shellwidget.kernel_manager.shutdown_kernel()
         if self.shellwidget.kernel_client is not None:
@@ -402,6 +410,8 @@ class ClientWidget(QWidget, SaveHistoryMixin):
                     self.infowidget.hide()
                     sw.show()
                 try:
+                    # Restarted kernels read options from the .ini file
+                    CONF.flush()
                     sw.kernel_manager.restart_kernel()
                 except RuntimeError as e:
                     sw._append_plain_text(
@@ -418,6 +428,21 @@ class ClientWidget(QWidget, SaveHistoryMixin):
                     before_prompt=True
                 )
 
+    @Slot(object)
+    def memory_limit_exceeded(self, memory):
+        """
+        Warn that the memory of the kernel exceeds the limit of its monitor,
+        interrupting it if asked to
+        """
+        message = _("The kernel uses %s of memory, more than the limit "
+                    "of %s") % (format_size(memory),
+                                format_size(self.monitor.memory_limit))
+        if self.interrupt_on_memory_limit:
+            message += _(", interrupting it")
+            self.interrupt_kernel()
+        self.shellwidget._append_html("<br><b>%s</b><br>" % message,
+                                      before_prompt=True)
+
     @Slot(str)
     def kernel_restarted_message(self, msg):
         """Show kernel restarted/died messages."""
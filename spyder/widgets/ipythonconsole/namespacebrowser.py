@@ -189,6 +189,11 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         if pdb_state is not None and isinstance(pdb_state, dict):
             self.refresh_from_pdb(pdb_state)
 
+        # Receive memory profiler results and dispatch them
+        memory_profile = data.get('__spy_memory_profile__', None)
+        if memory_profile is not None:
+            self.sig_memory_profile.emit(memory_profile)
+
     # ---- Private API (overrode by us) ----------------------------
     def _handle_execute_reply(self, msg):
         """
@@ -37,6 +37,7 @@ class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget):
     sig_var_properties = Signal(object)
     sig_show_syspath = Signal(object)
     sig_show_env = Signal(object)
+    sig_memory_profile = Signal(str)
 
     # For DebuggingWidget
     sig_pdb_step = Signal(str, int)
@@ -10,16 +10,15 @@ A Class and Function Dropdown Panel for Spyder.
 To demo this panel, run spyder/widgets/sourcecode/codeeditor.py
 """
 import operator
-import copy
 
 from qtpy.QtWidgets import QComboBox, QHBoxLayout
 
 from qtpy.QtCore import Slot
 from qtpy.QtCore import QSize
+from qtpy.QtCore import QTimer
 
 from spyder.api.panel import Panel
 from spyder.widgets.sourcecode.folding import FoldScope
-from spyder.utils.editor import TextBlockHelper
 from spyder.utils.syntaxhighlighters import OutlineExplorerData as OED
 from spyder.utils import icon_manager as ima
 
@@ -48,16 +47,7 @@ def populate(combobox, data):
     combobox.clear()
     combobox.addItem("<None>", 0)
 
-    # First create a list of fully-qualified names.
-    cb_data = []
-    for item in data:
-        fqn = item.name
-        for parent in reversed(item.parents):
-            fqn = parent.name + "." + fqn
-
-        cb_data.append((fqn, item))
-
-    for fqn, item in sorted(cb_data, key=operator.itemgetter(0)):
+    for fqn, item in sorted(_get_names(data), key=operator.itemgetter(0)):
         # Set the icon. Just threw this in here, streight from editortools.py
         icon = None
         if item.def_type == OED.FUNCTION_TOKEN:
@@ -77,76 +67,68 @@ def populate(combobox, data):
             combobox.addItem(fqn, item)
 
 
-def _get_fold_levels(editor):
+def _get_names(data):
     """
-    Return a list of all the class/function definition ranges.
+    Return the fully-qualified names of the given :class:`FoldScopeHelper`.
 
     Parameters
     ----------
-    editor : :class:`spyder.widgets.sourcecode.codeeditor.CodeEditor`
+    data : list of :class:`FoldScopeHelper`
 
     Returns
     -------
-    folds : list of :class:`FoldScopeHelper`
-        A list of all the class or function defintion fold points.
+    names : list of (str, :class:`FoldScopeHelper`)
+        The fully-qualified name of each item, with the item.
     """
-    block = editor.document().firstBlock()
-    oed = editor.get_outlineexplorer_data()
-
-    folds = []
-    parents = []
-    prev = None
-
-    while block.isValid():
-        if TextBlockHelper.is_fold_trigger(block):
-            try:
-                data = oed[block.firstLineNumber()]
-
-                if data.def_type in (OED.CLASS, OED.FUNCTION):
-                    fsh = FoldScopeHelper(FoldScope(block), data)
-
-                    # Determine the parents of the item using a stack.
-                    _adjust_parent_stack(fsh, prev, parents)
-
-                    # Update the parents of this FoldScopeHelper item
-                    fsh.parents = copy.copy(parents)
-                    folds.append(fsh)
-                    prev = fsh
-            except KeyError:
-                pass
-
-        block = block.next()
+    names = []
+    for item in data:
+        fqn = item.name
+        for parent in reversed(item.parents):
+            fqn = parent.name + "." + fqn
 
-    return folds
+        names.append((fqn, item))
+    return names
 
 
-def _adjust_parent_stack(fsh, prev, parents):
+def _get_fold_levels(editor):
     """
-    Adjust the parent stack in-place as the trigger level changes.
+    Return a list of all the class/function definition ranges.
 
     Parameters
     ----------
-    fsh : :class:`FoldScopeHelper`
-        The :class:`FoldScopeHelper` object to act on.
-    prev : :class:`FoldScopeHelper`
-        The previous :class:`FoldScopeHelper` object.
-    parents : list of :class:`FoldScopeHelper`
-        The current list of parent objects.
+    editor : :class:`spyder.widgets.sourcecode.codeeditor.CodeEditor`
 
     Returns
     -------
-    None
+    folds : list of :class:`FoldScopeHelper`
+        A list of all the class or function defintion fold points.
+
+    Notes
+    -----
+    Definitions and their scopes are taken from the symbol table of the
+    editor (see :class:`spyder.utils.symboltable.SymbolTable`), so that
+    only the blocks of definitions are looked at.
     """
-    if prev is None:
-        return
+    document = editor.document()
+    symbols = editor.get_outlineexplorer_data()
+
+    folds = []
+    helpers = {}
+    for block_nb in symbols.get_definitions():
+        fold_range = symbols.get_scope(block_nb)
+        if fold_range is None:
+            continue
+        block = document.findBlockByNumber(block_nb)
+        fsh = FoldScopeHelper(FoldScope(block), symbols[block_nb], fold_range)
+
+        # Parents were created before their children
+        parent = helpers.get(symbols.get_parent(block_nb))
+        if parent is not None:
+            fsh.parents = parent.parents + [parent]
+        helpers[block_nb] = fsh
+        folds.append(fsh)
 
-    if fsh.fold_scope.trigger_level < prev.fold_scope.trigger_level:
-        diff = prev.fold_scope.trigger_level - fsh.fold_scope.trigger_level
-        del parents[-diff:]
-    elif fsh.fold_scope.trigger_level > prev.fold_scope.trigger_level:
-        parents.append(prev)
-    elif fsh.fold_scope.trigger_level == prev.fold_scope.trigger_level:
-        pass
+    return folds
 
 
 def _split_classes_and_methods(folds):
@@ -210,7 +192,7 @@ def _get_parents(folds, linenum):
     return parents
 
 
-def update_selected_cb(parents, combobox):
+def update_selected_cb(parents, combobox, indexes=None):
     """
     Update the combobox with the selected item based on the parents.
 
@@ -219,6 +201,9 @@ def update_selected_cb(parents, combobox):
     parents : list of :class:`FoldScopeHelper`
     combobox : :class:`qtpy.QtWidets.QComboBox`
         The combobox to populate
+    indexes : dict, optional
+        The combobox index of each :class:`FoldScopeHelper`. If not given,
+        the item is looked for in the combobox.
 
     Returns
     -------
@@ -226,6 +211,8 @@ def update_selected_cb(parents, combobox):
     """
     if parents is not None and len(parents) == 0:
         combobox.setCurrentIndex(0)
+    elif indexes is not None:
+        combobox.setCurrentIndex(indexes.get(parents[-1], 0))
     else:
         item = parents[-1]
         for i in range(combobox.count()):
@@ -249,6 +236,8 @@ class FoldScopeHelper(object):
     ----------
     fold_scope : :class:`spyder.widgets.sourcecode.folding.FoldScope`
     oed : :class:`spyder.utils.syntaxhighlighters.OutlineExplorerData`
+    fold_range : tuple of int, optional
+        The (start line, end line) range of ``fold_scope``, if known.
 
     Properties
     ----------
@@ -258,9 +247,10 @@ class FoldScopeHelper(object):
         last index will be the class or funtion that contains this object.
     """
 
-    def __init__(self, fold_scope, oed):
+    def __init__(self, fold_scope, oed, fold_range=None):
         self._fold_scope = fold_scope
         self._oed = oed
+        self._range = fold_range
         self.parents = []
 
     def __str__(self):
@@ -293,6 +283,8 @@ class FoldScopeHelper(object):
 
     @property
     def range(self):
+        if self._range is not None:
+            return self._range
         return self.fold_scope.get_range()
 
     @property
@@ -335,6 +327,9 @@ class ClassFunctionDropdown(Panel):
         The editor to act on.
     """
 
+    # Delay (in ms) before updating the dropdowns after definitions changed
+    UPDATE_DELAY = 300
+
     def __init__(self, editor):
         Panel.__init__(self, editor)
         self._editor = editor
@@ -358,6 +353,17 @@ class ClassFunctionDropdown(Panel):
         self.parents = None
         self.classes = None
         self.funcs = None
+        # Symbol table and revision the data was taken from, items by line
+        # and combobox index of each item
+        self._symbols = None
+        self._revision = None
+        self._keys = None
+        self._lines = {}
+        self._indexes = {}
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.UPDATE_DELAY)
+        self._update_timer.timeout.connect(self._delayed_update)
 
         # Initial data for the dropdowns.
         self.class_cb.addItem("<None>", 0)
@@ -375,15 +381,38 @@ class ClassFunctionDropdown(Panel):
         """Get the default height of a QComboBox."""
         return self.class_cb.height()
 
+    def _is_up_to_date(self):
+        """Return True if definitions didn't change since the last update."""
+        symbols = self.editor.get_outlineexplorer_data()
+        return symbols is self._symbols and symbols.revision == self._revision
+
     def _update_data(self):
         """Update the internal data values."""
+        if self._is_up_to_date():
+            return
+        self._symbols = self.editor.get_outlineexplorer_data()
+        self._revision = self._symbols.revision
+
         _old = self.folds
         self.folds = _get_fold_levels(self.editor)
+        keys = [(fqn, item.line, item.def_type)
+                for fqn, item in _get_names(self.folds)]
 
         # only update our dropdown lists if the folds have changed.
-        if self.folds != _old:
+        if keys != self._keys:
+            self._keys = keys
             self.classes, self.funcs = _split_classes_and_methods(self.folds)
             self.populate_dropdowns()
+        else:
+            # Keep the items in the dropdowns, their ranges aren't used
+            self.folds = _old
+        self._lines = dict((fold.line, fold) for fold in self.folds)
+
+    def _delayed_update(self):
+        """Update the dropdowns once definitions stopped changing."""
+        if self.enabled:
+            self._update_data()
+            self.update_selected(self.editor.get_cursor_line_column()[0])
 
     def populate_dropdowns(self):
         self.class_cb.clear()
@@ -392,6 +421,11 @@ class ClassFunctionDropdown(Panel):
         populate(self.class_cb, self.classes)
         populate(self.method_cb, self.funcs)
 
+        self._indexes = {}
+        for combobox in (self.class_cb, self.method_cb):
+            for index in range(1, combobox.count()):
+                self._indexes[combobox.itemData(index)] = index
+
     def combobox_activated(self):
         """Move the cursor to the selected definition."""
         sender = self.sender()
@@ -402,13 +436,27 @@ class ClassFunctionDropdown(Panel):
 
     def update_selected(self, linenum):
         """Updates the dropdowns to reflect the current class and function."""
-        self.parents = _get_parents(self.funcs, linenum)
-        update_selected_cb(self.parents, self.method_cb)
+        # Definitions containing linenum, from the symbol table
+        parents = [self._lines[line]
+                   for line in self._symbols.get_scopes(linenum)
+                   if line in self._lines]
+
+        self.parents = [fold for fold in parents
+                        if fold.def_type == OED.FUNCTION_TOKEN]
+        update_selected_cb(self.parents, self.method_cb, self._indexes)
 
-        self.parents = _get_parents(self.classes, linenum)
-        update_selected_cb(self.parents, self.class_cb)
+        self.parents = [fold for fold in parents
+                        if fold.def_type == OED.CLASS_TOKEN]
+        update_selected_cb(self.parents, self.class_cb, self._indexes)
 
     @Slot(int, int)
     def _handle_cursor_position_change_event(self, linenum, column):
-        self._update_data()
+        if not self.enabled:
+            return
+        if self.folds is None:
+            self._update_data()
+        elif not self._is_up_to_date():
+            # Don't go through all definitions on every key press
+            self._update_timer.start()
+            return
         self.update_selected(linenum)
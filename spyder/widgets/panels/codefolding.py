@@ -152,6 +152,7 @@ class FoldingPanel(Panel):
         self.setMouseTracking(True)
         self.scrollable = True
         self._mouse_over_line = None
+        #: the (start, end) range of the highlighted fold scope
         self._current_scope = None
         self._prev_cursor = None
         self.context_menu = None
@@ -221,9 +222,8 @@ class FoldingPanel(Panel):
         :param block: Current block.
         :param painter: QPainter
         """
-        r = FoldScope(block)
         th = TextHelper(self.editor)
-        start, end = r.get_range(ignore_blank_lines=True)
+        start, end = self._get_scope_range(block)
         if start > 0:
             top = th.line_pos_from_number(start)
         else:
@@ -326,6 +326,43 @@ class FoldingPanel(Panel):
                 block = block.previous()
         return block
 
+    def _get_fold_regions(self):
+        """
+        Return the fold regions of the document (see
+        spyder/utils/foldregions.py) if they are up to date, or None
+        """
+        regions = getattr(self.editor, 'fold_regions', None)
+        if regions is not None and regions.is_up_to_date():
+            return regions
+        return None
+
+    def _get_scope_range(self, block):
+        """
+        Return the (start, end) range of the fold scope of a fold trigger
+        block, from fold regions if possible.
+
+        :raise: `ValueError` if the text block is not a fold trigger.
+        """
+        regions = self._get_fold_regions()
+        if regions is not None:
+            scope = regions.get_range(block.blockNumber())
+            if scope is not None:
+                return scope
+        return FoldScope(block).get_range()
+
+    def _find_parent_scope(self, block):
+        """
+        Find the fold trigger of the innermost scope containing a block, from
+        fold regions if possible.
+        """
+        regions = self._get_fold_regions()
+        if regions is None:
+            return FoldScope.find_parent_scope(block)
+        start = regions.find_scope(block.blockNumber())
+        if start is None:
+            return block
+        return block.document().findBlockByNumber(start)
+
     def _clear_scope_decos(self):
         """Clear scope decorations (on the editor)"""
         for deco in self._scope_decos:
@@ -362,13 +399,12 @@ class FoldingPanel(Panel):
 
         :param block: Block that starts the current fold scope.
         """
-        scope = FoldScope(block)
-        if (self._current_scope is None or
-                self._current_scope.get_range() != scope.get_range()):
+        scope = self._get_scope_range(block)
+        if self._current_scope != scope:
             self._current_scope = scope
             self._clear_scope_decos()
             # highlight current scope with darker or lighter color
-            start, end = scope.get_range()
+            start, end = scope
             if not TextBlockHelper.is_collapsed(block):
                 self._decorate_block(start, end)
 
@@ -384,7 +420,7 @@ class FoldingPanel(Panel):
         th = TextHelper(self.editor)
         line = th.line_nbr_from_position(event.pos().y())
         if line >= 0:
-            block = FoldScope.find_parent_scope(
+            block = self._find_parent_scope(
                 self.editor.document().findBlockByNumber(line-1))
             if TextBlockHelper.is_fold_trigger(block):
                 if self._mouse_over_line is None:
@@ -582,26 +618,44 @@ class FoldingPanel(Panel):
         invisible.
         """
         self._clear_block_deco()
-        block = self.editor.document().firstBlock()
-        last = self.editor.document().lastBlock()
-        while block.isValid():
-            lvl = TextBlockHelper.get_fold_lvl(block)
-            trigger = TextBlockHelper.is_fold_trigger(block)
-            if trigger:
-                if lvl == 0:
+        regions = self._get_fold_regions()
+        if regions is not None:
+            # Only blocks of fold regions need to be changed
+            document = self.editor.document()
+            for start, _end, _raw_end in regions.get_regions():
+                block = document.findBlockByNumber(start)
+                if TextBlockHelper.is_fold_trigger(block):
+                    TextBlockHelper.set_collapsed(block, True)
+            for start, end, _raw_end in regions.get_regions(outermost=True):
+                self._set_blocks_visible(start + 1, end, False)
+        else:
+            block = self.editor.document().firstBlock()
+            last = self.editor.document().lastBlock()
+            while block.isValid():
+                lvl = TextBlockHelper.get_fold_lvl(block)
+                trigger = TextBlockHelper.is_fold_trigger(block)
+                if trigger:
+                    if lvl == 0:
+                        self._show_previous_blank_lines(block)
+                    TextBlockHelper.set_collapsed(block, True)
+                block.setVisible(lvl == 0)
+                if block == last and block.text().strip() == '':
+                    block.setVisible(True)
                     self._show_previous_blank_lines(block)
-                TextBlockHelper.set_collapsed(block, True)
-            block.setVisible(lvl == 0)
-            if block == last and block.text().strip() == '':
-                block.setVisible(True)
-                self._show_previous_blank_lines(block)
-            block = block.next()
+                block = block.next()
         self._refresh_editor_and_scrollbars()
         tc = self.editor.textCursor()
         tc.movePosition(tc.Start)
         self.editor.setTextCursor(tc)
         self.collapse_all_triggered.emit()
 
+    def _set_blocks_visible(self, first, last, visible):
+        """Show or hide blocks from line *first* to *last* (0-based)."""
+        block = self.editor.document().findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            block.setVisible(visible)
+            block = block.next()
+
     def _clear_block_deco(self):
         """Clear the folded block decorations."""
         for deco in self._block_decos:
@@ -610,18 +664,28 @@ class FoldingPanel(Panel):
 
     def expand_all(self):
         """Expands all fold triggers."""
-        block = self.editor.document().firstBlock()
-        while block.isValid():
-            TextBlockHelper.set_collapsed(block, False)
-            block.setVisible(True)
-            block = block.next()
+        regions = self._get_fold_regions()
+        if regions is not None:
+            # Only blocks of fold regions can be hidden
+            document = self.editor.document()
+            for start, _end, _raw_end in regions.get_regions():
+                TextBlockHelper.set_collapsed(
+                    document.findBlockByNumber(start), False)
+            for start, _end, raw_end in regions.get_regions(outermost=True):
+                self._set_blocks_visible(start + 1, raw_end, True)
+        else:
+            block = self.editor.document().firstBlock()
+            while block.isValid():
+                TextBlockHelper.set_collapsed(block, False)
+                block.setVisible(True)
+                block = block.next()
         self._clear_block_deco()
         self._refresh_editor_and_scrollbars()
         self.expand_all_triggered.emit()
 
     def _on_action_toggle(self):
         """Toggle the current fold trigger."""
-        block = FoldScope.find_parent_scope(self.editor.textCursor().block())
+        block = self._find_parent_scope(self.editor.textCursor().block())
         self.toggle_fold_trigger(block)
 
     def _on_action_collapse_all_triggered(self):
@@ -645,8 +709,7 @@ class FoldingPanel(Panel):
         cursor = self.editor.textCursor()
         block_nbr = cursor.blockNumber()
         if self._block_nbr != block_nbr:
-            block = FoldScope.find_parent_scope(
-                self.editor.textCursor().block())
+            block = self._find_parent_scope(self.editor.textCursor().block())
             try:
                 s = FoldScope(block)
             except ValueError:
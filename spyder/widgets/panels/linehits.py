@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+"""
+This module contains the Line Hits panel
+"""
+from qtpy.QtCore import QSize, Qt
+from qtpy.QtGui import QColor, QPainter
+from qtpy.QtWidgets import QToolTip
+
+from spyder.config.base import _
+from spyder.api.panel import Panel
+from spyder.utils.misc import format_size
+
+
+class LineHitsPanel(Panel):
+    """
+    Line hits area (on the left side of the text editor widget)
+
+    Shows the number of profiler samples in which each line was running (or
+    the memory it allocated), as a number and a bar proportional to it. The
+    panel is hidden when there are no hits.
+    """
+    # Width of the widest bar
+    BAR_WIDTH = 30
+
+    def __init__(self, editor):
+        Panel.__init__(self, editor)
+        self.setMouseTracking(True)
+        self.scrollable = True
+        self.bar_color = QColor(234, 100, 44, 120)
+        self.hits = {}
+        self.total = 0
+        self.max_hits = 0
+        self.sizes = False
+        self.hide()
+
+    def set_hits(self, hits, total=0, sizes=False):
+        """
+        Set the number of samples (*hits*, {line number: hits}) of lines
+        and the total number of samples, or if *sizes* is True, the memory
+        allocated by lines and the peak memory usage (in bytes)
+        """
+        self.hits = dict(hits) if hits else {}
+        self.sizes = sizes
+        self.max_hits = max(self.hits.values()) if self.hits else 0
+        self.total = total or sum(self.hits.values())
+        self.setVisible(bool(self.hits))
+        self.update()
+
+    def get_text(self, hits):
+        """Return the text shown for *hits*"""
+        return format_size(hits) if self.sizes else str(hits)
+
+    # --- Qt Overrides
+    # -----------------------------------------------------------------
+    def sizeHint(self):
+        """Override Qt method."""
+        if self.sizes:
+            text = '999.9M'
+        else:
+            text = '9' * len(str(self.max_hits))
+        return QSize(self.editor.fontMetrics().width(text) +
+                     self.BAR_WIDTH + 6, 0)
+
+    def paintEvent(self, event):
+        """Override Qt method."""
+        super(LineHitsPanel, self).paintEvent(event)
+        if not self.max_hits:
+            return
+        painter = QPainter(self)
+        font_height = self.editor.fontMetrics().height()
+        width = self.width() - 3
+        painter.setPen(self.editor.normal_color)
+        for top, line_number, _block in self.editor.visible_blocks:
+            hits = self.hits.get(line_number)
+            if not hits:
+                continue
+            bar_width = max(1, hits * self.BAR_WIDTH // self.max_hits)
+            painter.fillRect(width - bar_width, top, bar_width, font_height,
+                             self.bar_color)
+            painter.drawText(0, top, width, font_height,
+                             Qt.AlignRight | Qt.AlignBottom,
+                             self.get_text(hits))
+
+    def mouseMoveEvent(self, event):
+        """Override Qt method: show percentage of samples."""
+        line_number = self.editor.get_linenumber_from_mouse_event(event)
+        hits = self.hits.get(line_number)
+        if hits and self.sizes:
+            QToolTip.showText(event.globalPos(),
+                              _("%s allocated (%.1f%% of peak usage)") % (
+                                  format_size(hits),
+                                  100. * hits / max(self.total, 1)), self)
+        elif hits:
+            QToolTip.showText(event.globalPos(),
+                              _("%d samples (%.1f%%)") % (
+                                  hits, 100. * hits / self.total), self)
+        else:
+            QToolTip.hideText()
+
+    def wheelEvent(self, event):
+        """Override Qt method."""
+        self.editor.wheelEvent(event)
@@ -8,7 +8,7 @@ This module contains the Scroll Flag panel
 """
 
 from qtpy.QtCore import QSize, Qt, QRect
-from qtpy.QtGui import QPainter, QBrush, QColor
+from qtpy.QtGui import QPainter, QBrush, QColor, QPixmap
 
 from spyder.api.panel import Panel
 
@@ -24,6 +24,16 @@ class ScrollFlagArea(Panel):
         self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.scrollable = True
 
+        # (block number, editor color attribute) of flags of block data,
+        # sorted, or None if they must be collected again from the blocks
+        self._flags = None
+        self._document = None
+        self._block_count = None
+        self._character_count = None
+        # Flags painted in the cached pixmap, and what they depend on
+        self._pixmap = None
+        self._pixmap_key = None
+
     def sizeHint(self):
         """Override Qt method"""
         return QSize(self.WIDTH, 0)
@@ -33,51 +43,12 @@ class ScrollFlagArea(Panel):
         Override Qt method.
         Painting the scroll flag area
         """
-        make_flag = self.make_flag_qrect
         make_slider = self.make_slider_range
 
-        # Filling the whole painting area
+        # Painting flags (cached as they only change with the document,
+        # not with the scrollbar position)
         painter = QPainter(self)
-        painter.fillRect(event.rect(), self.editor.sideareas_color)
-        block = self.editor.document().firstBlock()
-
-        # Painting warnings and todos
-        for line_number in range(1, self.editor.document().blockCount()+1):
-            data = block.userData()
-            if data:
-                position = self.value_to_position(line_number)
-                if data.code_analysis:
-                    # Warnings
-                    color = self.editor.warning_color
-                    for _message, error in data.code_analysis:
-                        if error:
-                            color = self.editor.error_color
-                            break
-                    self.set_painter(painter, color)
-                    painter.drawRect(make_flag(position))
-                if data.todo:
-                    # TODOs
-                    self.set_painter(painter, self.editor.todo_color)
-                    painter.drawRect(make_flag(position))
-                if data.breakpoint:
-                    # Breakpoints
-                    self.set_painter(painter, self.editor.breakpoint_color)
-                    painter.drawRect(make_flag(position))
-            block = block.next()
-
-        # Occurrences
-        if self.editor.occurrences:
-            self.set_painter(painter, self.editor.occurrence_color)
-            for line_number in self.editor.occurrences:
-                position = self.value_to_position(line_number)
-                painter.drawRect(make_flag(position))
-
-        # Found results
-        if self.editor.found_results:
-            self.set_painter(painter, self.editor.found_results_color)
-            for line_number in self.editor.found_results:
-                position = self.value_to_position(line_number)
-                painter.drawRect(make_flag(position))
+        painter.drawPixmap(0, 0, self.get_flags_pixmap())
 
         # Painting the slider range
         pen_color = QColor(Qt.white)
@@ -88,6 +59,130 @@ class ScrollFlagArea(Panel):
         painter.setBrush(QBrush(brush_color))
         painter.drawRect(make_slider(self.editor.firstVisibleBlock().blockNumber()))
 
+    def get_flags_pixmap(self):
+        """Return a pixmap of the area with flags painted on it"""
+        editor = self.editor
+        vsb = editor.verticalScrollBar()
+        colors = [QColor(color).name() for color in (
+            editor.sideareas_color, editor.warning_color, editor.error_color,
+            editor.todo_color, editor.breakpoint_color,
+            editor.occurrence_color, editor.found_results_color)]
+        flags = self.get_flags()
+        key = (self.width(), self.height(), vsb.minimum(), vsb.maximum(),
+               vsb.pageStep(), colors, flags, editor.occurrences,
+               editor.found_results)
+        if self._pixmap is not None and self._is_same_key(key):
+            return self._pixmap
+
+        make_flag = self.make_flag_qrect
+        pixmap = QPixmap(self.size())
+        pixmap.fill(QColor(editor.sideareas_color))
+        painter = QPainter(pixmap)
+
+        # Painting warnings, todos and breakpoints
+        previous_color = None
+        for line_number, color_attr in flags:
+            color = getattr(editor, color_attr)
+            if color != previous_color:
+                self.set_painter(painter, color)
+                previous_color = color
+            painter.drawRect(make_flag(self.value_to_position(line_number)))
+
+        # Occurrences and found results (block numbers)
+        for color, line_numbers in (
+                (editor.occurrence_color, editor.occurrences),
+                (editor.found_results_color, editor.found_results)):
+            if line_numbers:
+                self.set_painter(painter, color)
+                for line_number in line_numbers:
+                    position = self.value_to_position(line_number)
+                    painter.drawRect(make_flag(position))
+        painter.end()
+
+        self._pixmap = pixmap
+        self._pixmap_key = key
+        return pixmap
+
+    def _is_same_key(self, key):
+        """Return True if flags painted with *key* are those of the pixmap
+        (lists of flags, occurrences and found results are replaced, not
+        modified, when they change)"""
+        old_key = self._pixmap_key
+        return key[:6] == old_key[:6] and \
+            all(new is old for new, old in zip(key[6:], old_key[6:]))
+
+    def get_flags(self):
+        """
+        Return (line number, editor color attribute) of flags of warnings,
+        errors, todos and breakpoints, collecting them from the blocks of the
+        document if needed
+        """
+        document = self.editor.document()
+        if document is not self._document:
+            if self._document is not None:
+                try:
+                    self._document.contentsChange.disconnect(
+                        self._contents_changed)
+                except (TypeError, RuntimeError):
+                    pass
+            document.contentsChange.connect(self._contents_changed)
+            self._document = document
+            self._flags = None
+        if self._flags is None:
+            flags = []
+            block = document.firstBlock()
+            line_number = 1
+            while block.isValid():
+                data = block.userData()
+                if data:
+                    if data.code_analysis:
+                        color_attr = 'warning_color'
+                        for _message, error in data.code_analysis:
+                            if error:
+                                color_attr = 'error_color'
+                                break
+                        flags.append((line_number, color_attr))
+                    if data.todo:
+                        flags.append((line_number, 'todo_color'))
+                    if data.breakpoint:
+                        flags.append((line_number, 'breakpoint_color'))
+                block = block.next()
+                line_number += 1
+            self._flags = flags
+            self._block_count = document.blockCount()
+            self._character_count = document.characterCount()
+        return self._flags
+
+    def update_flags(self):
+        """Collect flags again (warnings, todos or breakpoints changed)"""
+        self._flags = None
+        self.update()
+
+    def _contents_changed(self, position, removed, added):
+        """Move flags of blocks following lines inserted or removed"""
+        document = self._document
+        block_count = document.blockCount()
+        character_count = document.characterCount()
+        delta = block_count - self._block_count
+        whole = removed >= self._character_count - 1
+        self._block_count = block_count
+        self._character_count = character_count
+        if self._flags is None:
+            return
+        if whole:
+            # Text replaced: flags will be set again
+            self._flags = []
+            return
+        if not delta:
+            return
+        # Flags of the block where lines are inserted stay on it, those of
+        # blocks removed are removed
+        line_number = document.findBlock(position).blockNumber() + 1
+        self._flags = [(number + delta if number > line_number else number,
+                        color_attr)
+                       for number, color_attr in self._flags
+                       if not line_number < number <= line_number - delta]
+
     def mousePressEvent(self, event):
         """Override Qt method"""
         vsb = self.editor.verticalScrollBar()
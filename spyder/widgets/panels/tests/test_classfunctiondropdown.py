@@ -139,6 +139,31 @@ def test_get_parents(editor_bot):
     assert len(cfd._get_parents(folds, 10)) == 2
 
 
+def test_update_selected(editor_bot):
+    qtbot, _ = editor_bot
+    editor = create_editor(editor_bot, simple)
+    dropdown = editor.classfuncdropdown
+    dropdown._handle_cursor_position_change_event(10, 0)
+    assert dropdown.class_cb.currentText() == 'MyClass'
+    assert dropdown.method_cb.currentText() == 'MyClass.__init__'
+    dropdown._handle_cursor_position_change_event(3, 0)
+    assert dropdown.class_cb.currentIndex() == 0
+    assert dropdown.method_cb.currentText() == 'my_add'
+
+    # Dropdowns are only populated again when definitions change
+    item = dropdown.method_cb.itemData(1)
+    cursor = QTextCursor(editor.document().findBlockByNumber(3))
+    cursor.insertText('    c = 3;')
+    revision = dropdown._revision
+    dropdown._update_data()
+    assert dropdown._revision != revision
+    assert dropdown.method_cb.itemData(1) is item
+    cursor = QTextCursor(editor.document().findBlockByNumber(6))
+    cursor.insertText('def other():\n    pass\n')
+    editor.go_to_line(7)
+    qtbot.waitUntil(lambda: dropdown.method_cb.currentText() == 'other')
+
+
 class TestFoldScopeHelper(object):
 
     test_case = """# -*- coding: utf-8 -*-
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+"""Tests for the line hits panel."""
+
+# Third party imports
+import pytest
+from pytestqt import qtbot
+
+# Local imports
+from spyder.widgets.sourcecode.codeeditor import CodeEditor
+
+
+@pytest.fixture
+def editor_bot(qtbot):
+    editor = CodeEditor(parent=None)
+    editor.setup_editor(language='Python')
+    editor.set_text("a = 1\nb = 2\nc = 3\n")
+    editor.resize(400, 300)
+    editor.show()
+    qtbot.addWidget(editor)
+    return qtbot, editor
+
+
+def test_line_hits(editor_bot):
+    """Show and hide line hits in the margin."""
+    qtbot, editor = editor_bot
+    panel = editor.line_hits_panel
+    assert not panel.isVisible()
+    margin = editor.viewportMargins().left()
+
+    editor.set_line_hits({1: 5, 3: 15})
+    assert panel.isVisible()
+    assert panel.total == 20
+    assert panel.max_hits == 15
+    assert editor.viewportMargins().left() > margin
+    panel.repaint()
+
+    editor.set_line_hits(None)
+    assert not panel.isVisible()
+    assert editor.viewportMargins().left() == margin
+
+
+def test_line_sizes(editor_bot):
+    """Show memory allocated by lines in the margin."""
+    qtbot, editor = editor_bot
+    panel = editor.line_hits_panel
+    editor.set_line_hits({2: 3 * 1024 ** 2}, 4 * 1024 ** 2, sizes=True)
+    assert panel.isVisible()
+    assert panel.total == 4 * 1024 ** 2
+    assert panel.get_text(panel.hits[2]) == '3.0M'
+    panel.repaint()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Console scrollback viewer"""
+
+# Standard library imports
+import re
+
+# Third party imports
+from qtpy.QtCore import Slot
+from qtpy.QtGui import QTextCursor
+from qtpy.QtWidgets import (QDialog, QHBoxLayout, QLabel, QLineEdit,
+                            QPlainTextEdit, QVBoxLayout)
+
+# Local imports
+from spyder.config.base import _
+from spyder.py3compat import to_text_string
+from spyder.utils import icon_manager as ima
+from spyder.utils.qthelpers import create_toolbutton
+from spyder.utils.scrollback import get_search_regex
+
+
+class ScrollbackViewer(QDialog):
+    """
+    Scrollback viewer
+
+    Shows the lines removed from a console (see spyder/utils/scrollback.py)
+    page by page, and finds text in all of them.
+    """
+    STYLE = {False: "background-color:rgb(255, 175, 90);",
+             True: ""}
+
+    def __init__(self, parent, scrollback):
+        QDialog.__init__(self, parent)
+        self.setWindowTitle(_("Scrollback"))
+        self.resize(800, 600)
+        self.scrollback = scrollback
+        self.page = None
+        self.found_line = None
+        self.search_options = dict(case=False, words=False, regexp=False)
+
+        self.editor = QPlainTextEdit(self)
+        self.editor.setReadOnly(True)
+        self.editor.setLineWrapMode(QPlainTextEdit.NoWrap)
+        if parent is not None:
+            self.editor.setFont(parent.font())
+
+        self.first_button = create_toolbutton(
+            self, icon=ima.icon('ArrowBack'), tip=_("First page"),
+            triggered=lambda: self.show_page(0))
+        self.previous_button = create_toolbutton(
+            self, icon=ima.icon('previous'), tip=_("Previous page"),
+            triggered=lambda: self.show_page(self.page - 1))
+        self.next_button = create_toolbutton(
+            self, icon=ima.icon('next'), tip=_("Next page"),
+            triggered=lambda: self.show_page(self.page + 1))
+        self.last_button = create_toolbutton(
+            self, icon=ima.icon('ArrowForward'), tip=_("Last page"),
+            triggered=lambda: self.show_page(self.scrollback.page_count()-1))
+        self.page_label = QLabel(self)
+
+        self.search_text = QLineEdit(self)
+        self.search_text.setPlaceholderText(_("Search string"))
+        self.search_text.textEdited.connect(self.text_has_been_edited)
+        self.search_text.returnPressed.connect(self.find_previous)
+        self.find_previous_button = create_toolbutton(
+            self, icon=ima.icon('ArrowUp'), tip=_("Find previous"),
+            triggered=self.find_previous)
+        self.find_next_button = create_toolbutton(
+            self, icon=ima.icon('ArrowDown'), tip=_("Find next"),
+            triggered=self.find_next)
+
+        hlayout = QHBoxLayout()
+        for widget in (self.first_button, self.previous_button,
+                       self.page_label, self.next_button, self.last_button):
+            hlayout.addWidget(widget)
+        hlayout.addStretch()
+        for widget in (self.search_text, self.find_previous_button,
+                       self.find_next_button):
+            hlayout.addWidget(widget)
+        layout = QVBoxLayout()
+        layout.addLayout(hlayout)
+        layout.addWidget(self.editor)
+        self.setLayout(layout)
+
+        self.show_page(scrollback.page_count() - 1)
+
+    def show_page(self, index):
+        """Show page *index*"""
+        count = self.scrollback.page_count()
+        index = max(0, min(index, count - 1))
+        if index != self.page:
+            self.page = index
+            lines = self.scrollback.get_page(index) if count else []
+            self.editor.setPlainText('\n'.join(lines))
+        first = index * self.scrollback.PAGE_SIZE
+        line_count = self.scrollback.line_count()
+        self.page_label.setText(
+            _("Lines %d-%d of %d") % (min(first + 1, line_count),
+                                     min(first + self.scrollback.PAGE_SIZE,
+                                         line_count),
+                                     line_count))
+        self.first_button.setEnabled(index > 0)
+        self.previous_button.setEnabled(index > 0)
+        self.next_button.setEnabled(index < count - 1)
+        self.last_button.setEnabled(index < count - 1)
+
+    def show_line(self, line):
+        """Show and select *line*"""
+        index, offset = divmod(line, self.scrollback.PAGE_SIZE)
+        self.show_page(index)
+        block = self.editor.document().findBlockByNumber(offset)
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        self.editor.setTextCursor(cursor)
+        self.editor.centerCursor()
+
+    def set_search(self, text, case=False, words=False, regexp=False):
+        """Set text to find and how to find it (as FindReplace does)"""
+        self.search_text.setText(text)
+        self.search_options = dict(case=case, words=words, regexp=regexp)
+        self.found_line = None
+
+    def text_has_been_edited(self, text):
+        """Find text from the end again"""
+        self.found_line = None
+        self.search_text.setStyleSheet("")
+
+    @Slot()
+    def find_previous(self):
+        """Find previous line containing search text"""
+        return self.find(forward=False)
+
+    @Slot()
+    def find_next(self):
+        """Find next line containing search text"""
+        return self.find(forward=True)
+
+    def find(self, forward=True):
+        """Find search text from the last line found"""
+        text = to_text_string(self.search_text.text())
+        if not text:
+            return None
+        try:
+            regex = get_search_regex(text, **self.search_options)
+        except re.error:
+            found = False
+        else:
+            line = self.scrollback.find(regex, self.found_line, forward)
+            found = line is not None
+            if found:
+                self.found_line = line
+                self.show_line(line)
+        self.search_text.setStyleSheet(self.STYLE[found])
+        return found
@@ -22,7 +22,7 @@ import time
 
 # Third party imports
 from qtpy.compat import getsavefilename
-from qtpy.QtCore import Property, QCoreApplication, Qt, QTimer, Signal, Slot
+from qtpy.QtCore import Property, QCoreApplication, Qt, Signal, Slot
 from qtpy.QtGui import QKeySequence, QTextCharFormat, QTextCursor
 from qtpy.QtWidgets import QApplication, QMenu, QMessageBox, QToolTip
 
@@ -34,10 +34,12 @@ from spyder.py3compat import (builtins, is_string, is_text_string,
                               PY3, to_text_string)
 from spyder.utils import encoding
 from spyder.utils import icon_manager as ima
+from spyder.utils.consoleoutput import OutputPipeline
 from spyder.utils.qthelpers import (add_actions, create_action, keybinding,
                                     restore_keyevent)
 from spyder.widgets.mixins import (GetHelpMixin, SaveHistoryMixin,
                                    TracebackLinksMixin, BrowseHistoryMixin)
+from spyder.widgets.scrollback import ScrollbackViewer
 from spyder.widgets.sourcecode.base import ConsoleBaseWidget
 
 
@@ -80,15 +82,12 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         # Simple profiling test
         self.profile = profile
         
-        # Buffer to increase performance of write/flush operations
-        self.__buffer = []
+        # Output is inserted at most once per frame (see
+        # spyder/utils/consoleoutput.py)
+        self.output_pipeline = OutputPipeline(self, self.maximumBlockCount)
+        self.output_pipeline.sig_output_ready.connect(self.insert_output)
         if initial_message:
-            self.__buffer.append(initial_message)
-
-        self.__timestamp = 0.0
-        self.__flushtimer = QTimer(self)
-        self.__flushtimer.setSingleShot(True)
-        self.__flushtimer.timeout.connect(self.flush)
+            self.output_pipeline.write(initial_message)
 
         # Give focus to widget
         self.setFocus()
@@ -141,9 +140,14 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
                                     shortcut=keybinding('SelectAll'),
                                     icon=ima.icon('selectall'),
                                     triggered=self.selectAll)
+        self.scrollback_action = create_action(self, _("Show scrollback..."),
+                                    tip=_("Show output lines removed from "
+                                          "the console"),
+                                    triggered=lambda: self.show_scrollback())
         add_actions(self.menu, (self.cut_action, self.copy_action,
                                 paste_action, self.delete_action, None,
-                                selectall_action, None, save_action) )
+                                selectall_action, None, save_action,
+                                self.scrollback_action) )
           
     def contextMenuEvent(self, event):
         """Reimplement Qt method"""
@@ -151,10 +155,25 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         self.copy_action.setEnabled(state)
         self.cut_action.setEnabled(state)
         self.delete_action.setEnabled(state)
+        self.scrollback_action.setEnabled(
+            self.scrollback is not None and self.scrollback.line_count() > 0)
         self.menu.popup(event.globalPos())
         event.accept()        
         
         
+    @Slot()
+    def show_scrollback(self, text=None, case=False, words=False,
+                        regexp=False):
+        """Show lines removed from the console, finding *text* from the
+        last one if not None"""
+        if self.scrollback is None:
+            return
+        viewer = ScrollbackViewer(self, self.scrollback)
+        if text:
+            viewer.set_search(text, case=case, words=words, regexp=regexp)
+            viewer.find_previous()
+        viewer.exec_()
+
     #------ Input buffer
     def get_current_line_from_cursor(self):
         return self.get_text('cursor', 'eof')
@@ -175,6 +194,8 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         Child classes reimplement this method to write prompt
         """
         self.clear()
+        if self.scrollback is not None:
+            self.scrollback.clear()
 
     # The buffer being edited
     def _set_input_buffer(self, text):
@@ -201,6 +222,7 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         """
         Print a new prompt and save its (line, index) position
         """
+        self.output_pipeline.flush()
         if self.get_cursor_line_column()[1] != 0:
             self.write('\n')
         self.write(prompt, prompt=True)
@@ -257,9 +279,12 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         self.redirect_stdio.emit(True)
         if filename:
             filename = osp.normpath(filename)
+            text = to_text_string(self.get_text_with_eol())
+            if self.scrollback is not None:
+                text = self.scrollback.get_text().replace(
+                    '\n', self.get_line_separator()) + text
             try:
-                encoding.write(to_text_string(self.get_text_with_eol()),
-                               filename)
+                encoding.write(text, filename)
                 self.historylog_filename = filename
                 CONF.set('main', 'historylog_filename', filename)
             except EnvironmentError as error:
@@ -523,44 +548,46 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
             STDERR.write(text)
 
     def write(self, text, flush=False, error=False, prompt=False):
-        """Simulate stdout and stderr"""
-        if prompt:
-            self.flush()
-        if not is_string(text):
+        """
+        Simulate stdout and stderr
+
+        Text written after an idle period (see OutputPipeline.is_idle) is
+        shown right away, and text written meanwhile at the end of the frame,
+        or right away if the event loop is blocked. Prompts are always shown
+        right away. *flush* is kept for compatibility, since text is always
+        shown within a frame anyway.
+        """
+        if PY3 and isinstance(text, bytes):
+            # Fix for Issue 2452
+            try:
+                text = text.decode(locale.getdefaultlocale()[1])
+            except Exception:
+                text = text.decode('utf-8', 'replace')
+        elif not is_string(text):
             # This test is useful to discriminate QStrings from decoded str
             text = to_text_string(text)
-        self.__buffer.append(text)
-        ts = time.time()
-        if flush or prompt:
+        idle = self.output_pipeline.is_idle()
+        self.output_pipeline.write(text, error=error, prompt=prompt)
+        if prompt or idle or self.output_pipeline.is_overdue():
             self.flush(error=error, prompt=prompt)
-        elif ts - self.__timestamp > 0.05:
-            self.flush(error=error)
-            self.__timestamp = ts
-            # Timer to flush strings cached by last write() operation in series
-            self.__flushtimer.start(50)
 
     def flush(self, error=False, prompt=False):
         """Flush buffer, write text to console"""
-        # Fix for Issue 2452 
-        if PY3:
-            try:
-                text = "".join(self.__buffer)
-            except TypeError:
-                text = b"".join(self.__buffer)
-                try:
-                    text = text.decode( locale.getdefaultlocale()[1] )
-                except:
-                    pass
-        else:
-            text = "".join(self.__buffer)
-
-        self.__buffer = []
-        self.insert_text(text, at_end=True, error=error, prompt=prompt)
+        self.output_pipeline.flush()
         QCoreApplication.processEvents()
         self.repaint()
+
+    def insert_output(self, output):
+        """Reimplement ConsoleBaseWidget method"""
+        ConsoleBaseWidget.insert_output(self, output)
         # Clear input buffer:
         self.new_input_line = True
 
+    def set_max_output_rate(self, rate):
+        """Set the number of lines of standard output shown per second,
+        beyond which they are dropped (0 for no limit)"""
+        self.output_pipeline.max_rate = rate
+
 
     #------ Text Insertion
     def insert_text(self, text, at_end=False, error=False, prompt=False):
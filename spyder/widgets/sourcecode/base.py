@@ -31,6 +31,9 @@ from spyder.config.gui import get_font
 from spyder.config.main import CONF
 from spyder.py3compat import PY3, str_lower, to_text_string
 from spyder.utils import icon_manager as ima
+from spyder.utils.consoleoutput import (COLOR_PATTERN, DEFAULT, ERROR, LINK,
+                                        PROMPT, parse_output)
+from spyder.utils.scrollback import ScrollbackStore
 from spyder.widgets.calltip import CallTipWidget
 from spyder.widgets.mixins import BaseEditMixin
 from spyder.widgets.sourcecode.terminal import ANSIEscapeCodeHandler
@@ -1269,7 +1272,7 @@ class ConsoleFontStyle(object):
 class ConsoleBaseWidget(TextEditBaseWidget):
     """Console base widget"""
     BRACE_MATCHING_SCOPE = ('sol', 'eol')
-    COLOR_PATTERN = re.compile('\x01?\x1b\[(.*?)m\x02?')
+    COLOR_PATTERN = COLOR_PATTERN
     traceback_available = Signal(str)
     userListActivated = Signal(int, str)
     completion_widget_activated = Signal(str)
@@ -1281,6 +1284,10 @@ class ConsoleBaseWidget(TextEditBaseWidget):
 
         self.setMaximumBlockCount(300)
 
+        # Lines removed to keep the maximum block count (see
+        # set_scrollback_enabled)
+        self.scrollback = None
+
         # ANSI escape code handler
         self.ansi_handler = QtANSIEscapeCodeHandler()
                 
@@ -1318,6 +1325,15 @@ class ConsoleBaseWidget(TextEditBaseWidget):
         self.ansi_handler.set_light_background(state)
         self.set_pythonshell_font()
         
+    def set_scrollback_enabled(self, state):
+        """Keep lines removed from the shell in a scrollback store if
+        *state* is True (see spyder/utils/scrollback.py)"""
+        if state and self.scrollback is None:
+            self.scrollback = ScrollbackStore()
+        elif not state and self.scrollback is not None:
+            self.scrollback.close()
+            self.scrollback = None
+
     def set_selection(self, start, end):
         cursor = self.textCursor()
         cursor.setPosition(start)
@@ -1367,61 +1383,71 @@ class ConsoleBaseWidget(TextEditBaseWidget):
         Handles ANSI color sequences
         Handles ANSI FF sequence
         """
+        self.insert_output(parse_output([(text, error, prompt)],
+                                        self.maximumBlockCount()))
+
+    def insert_output(self, output):
+        """
+        Insert parsed output at the end of the shell
+        (see spyder/utils/consoleoutput.py)
+        """
+        clear, segments, traceback, removed = output
+        if not clear and self.scrollback is not None and \
+          self.maximumBlockCount():
+            self.spill_lines(removed + ''.join(segment[0]
+                                               for segment in segments))
+        if clear or removed:
+            # Lines were removed from output because it doesn't fit in
+            # the shell: none of its current lines will be kept
+            self.clear()
+        formats = {ERROR: self.error_style.format,
+                   LINK: self.traceback_link_style.format,
+                   PROMPT: self.prompt_style.format}
         cursor = self.textCursor()
         cursor.movePosition(QTextCursor.End)
-        if '\r' in text:    # replace \r\n with \n
-            text = text.replace('\r\n', '\n')
-            text = text.replace('\r', '\n')
-        while True:
-            index = text.find(chr(12))
-            if index == -1:
-                break
-            text = text[index+1:]
-            self.clear()
-        if error:
-            is_traceback = False
-            for text in text.splitlines(True):
-                if text.startswith('  File') \
-                and not text.startswith('  File "<'):
-                    is_traceback = True
-                    # Show error links in blue underlined text
-                    cursor.insertText('  ', self.default_style.format)
-                    cursor.insertText(text[2:],
-                                      self.traceback_link_style.format)
-                else:
-                    # Show error/warning messages in red
-                    cursor.insertText(text, self.error_style.format)
-            if is_traceback:
-                self.traceback_available.emit(text)
-        elif prompt:
-            # Show prompt in green
-            insert_text_to(cursor, text, self.prompt_style.format)
-        else:
-            # Show other outputs in black
-            last_end = 0
-            for match in self.COLOR_PATTERN.finditer(text):
-                insert_text_to(cursor, text[last_end:match.start()],
-                               self.default_style.format)
-                last_end = match.end()
-                try:
-                    for code in [int(_c) for _c in match.group(1).split(';')]:
-                        self.ansi_handler.set_code(code)
-                except ValueError:
-                    pass
+        cursor.beginEditBlock()
+        for text, style, codes in segments:
+            if codes:
+                for code in codes:
+                    self.ansi_handler.set_code(code)
                 self.default_style.format = self.ansi_handler.get_format()
-            insert_text_to(cursor, text[last_end:], self.default_style.format)
-#            # Slower alternative:
-#            segments = self.COLOR_PATTERN.split(text)
-#            cursor.insertText(segments.pop(0), self.default_style.format)
-#            if segments:
-#                for ansi_tags, text in zip(segments[::2], segments[1::2]):
-#                    for ansi_tag in ansi_tags.split(';'):
-#                        self.ansi_handler.set_code(int(ansi_tag))
-#                    self.default_style.format = self.ansi_handler.get_format()
-#                    cursor.insertText(text, self.default_style.format)
+            if style == DEFAULT:
+                # Show other outputs in black
+                insert_text_to(cursor, text, self.default_style.format)
+            elif style == PROMPT:
+                # Show prompt in green
+                insert_text_to(cursor, text, formats[style])
+            elif text:
+                cursor.insertText(text, formats[style])
+        cursor.endEditBlock()
+        if traceback is not None:
+            self.traceback_available.emit(traceback)
         self.set_cursor_position('eof')
         self.setCurrentCharFormat(self.default_style.format)
 
+    def spill_lines(self, text):
+        """Move to the scrollback store the lines which will be removed
+        from the shell when *text* is appended"""
+        document = self.document()
+        count = (document.blockCount() + text.count('\n') -
+                 self.maximumBlockCount())
+        if count <= 0:
+            return
+        lines = []
+        block = document.firstBlock()
+        while count and block != document.lastBlock():
+            lines.append(to_text_string(block.text()) + '\n')
+            block = block.next()
+            count -= 1
+        if count:
+            # The last line of the shell is continued by text
+            text = to_text_string(block.text()) + text
+            position = -1
+            for _i in range(count):
+                position = text.find('\n', position + 1)
+            lines.append(text[:position + 1])
+        self.scrollback.append(''.join(lines))
+
     def set_pythonshell_font(self, font=None):
         """Python Shell only"""
         if font is None:
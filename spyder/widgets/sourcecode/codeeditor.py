@@ -19,6 +19,7 @@ Editor widget based on QtGui.QPlainTextEdit
 
 # Standard library imports
 from __future__ import division
+from bisect import bisect_left, bisect_right
 from unicodedata import category
 import os.path as osp
 import re
@@ -55,9 +56,12 @@ from spyder.utils import encoding, sourcecode
 from spyder.utils.dochelpers import getobj
 from spyder.utils.qthelpers import add_actions, create_action, mimedata2url
 from spyder.utils.sourcecode import ALL_LANGUAGES, CELL_LANGUAGES
+from spyder.utils.documentstate import DocumentState
+from spyder.utils.instrumentation import INSTRUMENTATION
 from spyder.widgets.editortools import PythonCFM
 from spyder.widgets.sourcecode.base import TextEditBaseWidget
 from spyder.widgets.sourcecode.kill_ring import QtKillRing
+from spyder.widgets.panels.linehits import LineHitsPanel
 from spyder.widgets.panels.linenumber import LineNumberArea
 from spyder.widgets.panels.edgeline import EdgeLine
 from spyder.widgets.panels.indentationguides import IndentationGuide
@@ -249,6 +253,9 @@ class CodeEditor(TextEditBaseWidget):
     #: Signal emitted when a new text is set on the widget
     new_text_set = Signal()
 
+    #: Signal emitted when a large document has been highlighted by chunks
+    sig_highlighting_finished = Signal()
+
     def __init__(self, parent=None):
         TextEditBaseWidget.__init__(self, parent)
 
@@ -293,6 +300,9 @@ class CodeEditor(TextEditBaseWidget):
 
         # Line number area management
         self.linenumberarea = self.panels.register(LineNumberArea(self))
+
+        # Profiler line hits (shown only when set)
+        self.line_hits_panel = self.panels.register(LineHitsPanel(self))
         
         # Class and Method/Function Dropdowns
         self.classfuncdropdown = self.panels.register(
@@ -346,18 +356,17 @@ class CodeEditor(TextEditBaseWidget):
 
         # Indicate occurrences of the selected word
         self.cursorPositionChanged.connect(self.__cursor_position_changed)
-        self.__find_first_pos = None
         self.__find_flags = None
+        self.document_state = None
+        self.__set_document_state(DocumentState(self.document()))
 
         self.supported_language = False
         self.supported_cell_language = False
+        self.large_file_mode = False
         self.classfunc_match = None
         self.comment_string = None
         self._kill_ring = QtKillRing(self)
 
-        # Block user data
-        self.blockuserdata_list = []
-
         # Update breakpoints if the number of lines in the file changes
         self.blockCountChanged.connect(self.update_breakpoints)
 
@@ -379,12 +388,17 @@ class CodeEditor(TextEditBaseWidget):
         self.occurrence_timer.setSingleShot(True)
         self.occurrence_timer.setInterval(1500)
         self.occurrence_timer.timeout.connect(self.__mark_occurrences)
+        # Block numbers of occurrences (for the scroll flag area) and word
+        # marked
         self.occurrences = []
+        self.__occurrence_word = None
         self.occurrence_color = QColor(Qt.yellow).lighter(160)
 
         # Mark found results
         self.textChanged.connect(self.__text_has_changed)
+        # Block numbers and (start, end) positions of found results
         self.found_results = []
+        self.__found_spans = []
         self.found_results_color = QColor(Qt.magenta).lighter(180)
 
         # Context menu
@@ -421,6 +435,11 @@ class CodeEditor(TextEditBaseWidget):
 
         self.verticalScrollBar().valueChanged.connect(
                                        lambda value: self.rehighlight_cells())
+        self.verticalScrollBar().valueChanged.connect(
+                                       lambda value: self.highlight_viewport())
+        # Only visible occurrences and found results are highlighted
+        self.verticalScrollBar().valueChanged.connect(
+                                lambda value: self.__update_visible_marks())
 
     def create_shortcuts(self):
         codecomp = config_shortcut(self.do_completion, context='Editor',
@@ -565,9 +584,30 @@ class CodeEditor(TextEditBaseWidget):
         """Set as clone editor"""
         self.setDocument(editor.document())
         self.document_id = editor.get_document_id()
+        self.__set_document_state(editor.document_state)
         self.highlighter = editor.highlighter
         self._apply_highlighter_color_scheme()
 
+    def __set_document_state(self, document_state):
+        """Set the state of the document shared with clones"""
+        if self.document_state is not None:
+            self.document_state.sig_analysis_results_changed.disconnect(
+                self.__update_code_analysis_markers)
+            self.document_state.sig_todo_results_changed.disconnect(
+                self.scrollflagarea.update_flags)
+            self.document_state.sig_breakpoints_changed.disconnect(
+                self.__update_breakpoint_markers)
+        self.document_state = document_state
+        self.word_index = document_state.word_index
+        self.fold_regions = document_state.fold_regions
+        self.blockuserdata_list = document_state.blockuserdata_list
+        document_state.sig_analysis_results_changed.connect(
+            self.__update_code_analysis_markers)
+        document_state.sig_todo_results_changed.connect(
+            self.scrollflagarea.update_flags)
+        document_state.sig_breakpoints_changed.connect(
+            self.__update_breakpoint_markers)
+
     #-----Widget setup and options
     def toggle_wrap_mode(self, enable):
         """Enable/disable wrap mode"""
@@ -593,7 +633,7 @@ class CodeEditor(TextEditBaseWidget):
                      add_colons=True, auto_unindent=True, indent_chars=" "*4,
                      tab_stop_width_spaces=4, cloned_from=None, filename=None,
                      occurrence_timeout=1500, show_class_func_dropdown=True,
-                     indent_guides=False):
+                     indent_guides=False, large_file=False):
         
         # Code completion and calltips
         self.set_codecompletion_auto(codecompletion_auto)
@@ -607,6 +647,19 @@ class CodeEditor(TextEditBaseWidget):
         self.set_auto_unindent_enabled(auto_unindent)
         self.set_indent_chars(indent_chars)
         self.set_tab_stop_width_spaces(tab_stop_width_spaces)
+        self.fold_regions.indent_len = len(self.indent_chars)
+
+        # Large file mode: disable features whose cost grows with the size
+        # of the file (syntax highlighting, folding, occurrence highlighting,
+        # scrollbar flags and, in the editor stack, outline and analysis)
+        self.large_file_mode = large_file
+        if large_file:
+            language = filename = None
+            occurrence_highlighting = scrollflagarea = False
+            folding_panel = self.panels.get(FoldingPanel)
+            folding_panel.enabled = False
+            folding_panel.setVisible(False)
+            self.classfuncdropdown.enabled = False
 
         # Scrollbar flag area
         self.scrollflagarea.set_enabled(scrollflagarea)
@@ -632,6 +685,10 @@ class CodeEditor(TextEditBaseWidget):
 
         # Lexer
         self.set_language(language, filename)
+        if large_file:
+            # Keep the plain text highlighter for colors only
+            self.highlighter.fold_detector = None
+            self.highlighter.setDocument(None)
 
         # Highlight current cell
         self.set_highlight_current_cell(highlight_current_cell)
@@ -758,6 +815,8 @@ class CodeEditor(TextEditBaseWidget):
 
         self.highlighter.fold_detector = IndentFoldDetector()
         self.highlighter.editor = self
+        self.highlighter.sig_highlighting_finished.connect(
+                                                self.sig_highlighting_finished)
 
     def is_json(self):
         return (isinstance(self.highlighter, sh.PygmentsSH) and
@@ -839,6 +898,11 @@ class CodeEditor(TextEditBaseWidget):
         if self.highlight_current_cell_enabled:
             self.highlight_current_cell()
 
+    def highlight_viewport(self):
+        """Highlight visible lines of large files not highlighted yet"""
+        if self.highlighter is not None:
+            self.highlighter.highlight_viewport()
+
     def remove_trailing_spaces(self):
         """Remove trailing spaces"""
         cursor = self.textCursor()
@@ -878,25 +942,6 @@ class CodeEditor(TextEditBaseWidget):
             self.remove_selected_text()
 
     #------Find occurrences
-    def __find_first(self, text):
-        """Find first occurrence: scan whole document"""
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
-        cursor = self.textCursor()
-        # Scanning whole document
-        cursor.movePosition(QTextCursor.Start)
-        regexp = QRegExp(r"\b%s\b" % QRegExp.escape(text), Qt.CaseSensitive)
-        cursor = self.document().find(regexp, cursor, flags)
-        self.__find_first_pos = cursor.position()
-        return cursor
-
-    def __find_next(self, text, cursor):
-        """Find next occurrence"""
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
-        regexp = QRegExp(r"\b%s\b" % QRegExp.escape(text), Qt.CaseSensitive)
-        cursor = self.document().find(regexp, cursor, flags)
-        if cursor.position() != self.__find_first_pos:
-            return cursor
-
     def __cursor_position_changed(self):
         """Cursor position has changed"""
         line, column = self.get_cursor_line_column()
@@ -916,6 +961,7 @@ class CodeEditor(TextEditBaseWidget):
     def __clear_occurrences(self):
         """Clear occurrence markers"""
         self.occurrences = []
+        self.__occurrence_word = None
         self.clear_extra_selections('occurrences')
         self.scrollflagarea.update()
 
@@ -960,22 +1006,66 @@ class CodeEditor(TextEditBaseWidget):
            to_text_string(text) == 'self'):
             return
 
-        # Highlighting all occurrences of word *text*
-        cursor = self.__find_first(text)
-        self.occurrences = []
-        while cursor:
-            self.occurrences.append(cursor.blockNumber())
-            self.__highlight_selection('occurrences', cursor,
-                                       background_color=self.occurrence_color)
-            cursor = self.__find_next(text, cursor)
-        self.update_extra_selections()
-        if len(self.occurrences) > 1 and self.occurrences[-1] == 0:
-            # XXX: this is never happening with PySide but it's necessary
-            # for PyQt4... this must be related to a different behavior for
-            # the QTextDocument.find function between those two libraries
-            self.occurrences.pop(-1)
+        # Highlighting visible occurrences of word *text*
+        self.occurrences = self.word_index.find(text)
+        self.__occurrence_word = text
+        self.__update_visible_marks()
         self.scrollflagarea.update()
 
+    def __get_visible_block_range(self):
+        """Return numbers of the first and last visible blocks"""
+        first = self.firstVisibleBlock().blockNumber()
+        lines = self.viewport().height() // max(self.fontMetrics().height(), 1)
+        return first, first + lines + 1
+
+    def __update_visible_marks(self):
+        """
+        Highlight occurrences and found results in the visible blocks only
+        (highlighting thousands of them makes typing and scrolling slow)
+        """
+        if not self.occurrences and not self.__found_spans:
+            return
+        first, last = self.__get_visible_block_range()
+        document = self.document()
+
+        if self.occurrences:
+            self.clear_extra_selections('occurrences')
+            regexp = re.compile(r"\b%s\b" % re.escape(self.__occurrence_word),
+                                re.UNICODE)
+            start = bisect_left(self.occurrences, first)
+            end = bisect_right(self.occurrences, last)
+            for block_nb in self.occurrences[start:end]:
+                block = document.findBlockByNumber(block_nb)
+                text = to_text_string(block.text())
+                for match in regexp.finditer(text):
+                    cursor = QTextCursor(block)
+                    cursor.setPosition(block.position() + match.start())
+                    cursor.setPosition(block.position() + match.end(),
+                                       QTextCursor.KeepAnchor)
+                    self.__highlight_selection(
+                        'occurrences', cursor,
+                        background_color=self.occurrence_color)
+
+        if self.__found_spans:
+            first_position = document.findBlockByNumber(first).position()
+            last_block = document.findBlockByNumber(last)
+            if last_block.isValid():
+                last_position = last_block.position() + last_block.length()
+            else:
+                last_position = document.characterCount()
+            start = bisect_left(self.__found_spans, (first_position,))
+            end = bisect_left(self.__found_spans, (last_position,))
+            extra_selections = []
+            for pos1, pos2 in self.__found_spans[start:end]:
+                selection = QTextEdit.ExtraSelection()
+                selection.format.setBackground(self.found_results_color)
+                selection.cursor = self.textCursor()
+                selection.cursor.setPosition(pos1)
+                selection.cursor.setPosition(pos2, QTextCursor.KeepAnchor)
+                extra_selections.append(selection)
+            self.set_extra_selections('find', extra_selections)
+        self.update_extra_selections()
+
     #-----highlight found results (find/replace widget)
     def highlight_found_results(self, pattern, words=False, regexp=False):
         """Highlight all found patterns"""
@@ -990,23 +1080,17 @@ class CodeEditor(TextEditBaseWidget):
             regobj = re.compile(pattern)
         except sre_constants.error:
             return
-        extra_selections = []
-        self.found_results = []
-        for match in regobj.finditer(text):
-            pos1, pos2 = match.span()
-            selection = QTextEdit.ExtraSelection()
-            selection.format.setBackground(self.found_results_color)
-            selection.cursor = self.textCursor()
-            selection.cursor.setPosition(pos1)
-            self.found_results.append(selection.cursor.blockNumber())
-            selection.cursor.setPosition(pos2, QTextCursor.KeepAnchor)
-            extra_selections.append(selection)
-        self.set_extra_selections('find', extra_selections)
-        self.update_extra_selections()
+        document = self.document()
+        self.__found_spans = [match.span() for match in regobj.finditer(text)]
+        self.found_results = [document.findBlock(pos1).blockNumber()
+                              for pos1, _pos2 in self.__found_spans]
+        self.clear_extra_selections('find')
+        self.__update_visible_marks()
 
     def clear_found_results(self):
         """Clear found results highlighting"""
         self.found_results = []
+        self.__found_spans = []
         self.clear_extra_selections('find')
         self.scrollflagarea.update()
 
@@ -1119,10 +1203,14 @@ class CodeEditor(TextEditBaseWidget):
                or text.startswith("'"):
                 data.breakpoint = False
         block.setUserData(data)
-        self.linenumberarea.update()
-        self.scrollflagarea.update()
+        self.document_state.sig_breakpoints_changed.emit()
         self.breakpoints_changed.emit()
 
+    def __update_breakpoint_markers(self):
+        """Update breakpoint markers from breakpoints set on blocks"""
+        self.linenumberarea.update()
+        self.scrollflagarea.update_flags()
+
     def get_breakpoints(self):
         """Get breakpoints"""
         breakpoints = []
@@ -1142,6 +1230,7 @@ class CodeEditor(TextEditBaseWidget):
             # data.breakpoint_condition = None  # not necessary, but logical
             if data.is_empty():
                 del data
+        self.document_state.sig_breakpoints_changed.emit()
 
     def set_breakpoints(self, breakpoints):
         """Set breakpoints"""
@@ -1153,6 +1242,15 @@ class CodeEditor(TextEditBaseWidget):
         """Update breakpoints"""
         self.breakpoints_changed.emit()
 
+    #-----Profiler line hits
+    def set_line_hits(self, hits, total=0, sizes=False):
+        """
+        Show the number of profiler samples of lines in the margin
+        (*hits*: {line number: hits}, None to hide them), or the memory
+        they allocated (in bytes) if *sizes* is True
+        """
+        self.line_hits_panel.set_hits(hits, total, sizes)
+
     #-----Code introspection
     def do_completion(self, automatic=False):
         """Trigger completion"""
@@ -1187,6 +1285,7 @@ class CodeEditor(TextEditBaseWidget):
         """Reimplemented Qt method to handle p resizing"""
         TextEditBaseWidget.resizeEvent(self, event)
         self.panels.resize()
+        self.__update_visible_marks()
 
     def showEvent(self, event):
         """Overrides showEvent to update the viewport margins."""
@@ -1255,9 +1354,40 @@ class CodeEditor(TextEditBaseWidget):
         else:
             self.unhighlight_current_line()
 
-    def set_text(self, text):
-        """Set the text of the editor"""
-        self.setPlainText(text)
+    def set_text(self, text, chunk_size=None, callback=None):
+        """
+        Set the text of the editor
+
+        If *chunk_size* is given, text is inserted by chunks of about that
+        number of characters (ending with a line break), calling *callback*
+        after each one with the fraction of text inserted so far. Only the
+        insertion is done by chunks: *text* is still held in memory as a
+        whole.
+        """
+        if chunk_size is None:
+            self.setPlainText(text)
+        else:
+            self.setPlainText('')
+            document = self.document()
+            document.setUndoRedoEnabled(False)
+            # Emit signals once at the end, as setPlainText does (slots
+            # connected to them can be slow on large files)
+            self.blockSignals(True)
+            try:
+                cursor = QTextCursor(document)
+                start = 0
+                while start < len(text):
+                    end = text.find('\n', start + chunk_size) + 1 or len(text)
+                    cursor.movePosition(QTextCursor.End)
+                    cursor.insertText(text[start:end])
+                    start = end
+                    if callback is not None:
+                        callback(start / len(text))
+            finally:
+                self.blockSignals(False)
+                document.setUndoRedoEnabled(True)
+            self.blockCountChanged.emit(self.blockCount())
+            self.textChanged.emit()
         self.set_eol_chars(text)
         #if self.supported_language:
             #self.highlighter.rehighlight()
@@ -1332,29 +1462,29 @@ class CodeEditor(TextEditBaseWidget):
 
     def cleanup_code_analysis(self):
         """Remove all code analysis markers"""
-        self.setUpdatesEnabled(False)
-        self.clear_extra_selections('code_analysis')
-        for data in self.blockuserdata_list[:]:
-            data.code_analysis = []
-            if data.is_empty():
-                del data
-        self.setUpdatesEnabled(True)
-        # When the new code analysis results are empty, it is necessary
-        # to update manually the scrollflag and linenumber areas (otherwise,
-        # the old flags will still be displayed):
-        self.scrollflagarea.update()
-        self.linenumberarea.update()
+        self.__set_code_analysis_results([])
 
     def process_code_analysis(self, check_results):
         """Analyze filename code with pyflakes"""
-        self.cleanup_code_analysis()
         if check_results is None:
             # Not able to compile module
-            return
-        self.setUpdatesEnabled(False)
-        cursor = self.textCursor()
-        document = self.document()
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
+            check_results = []
+        if check_results is self.document_state.analysis_results:
+            # Results already set on blocks by a clone of this editor
+            self.__update_code_analysis_markers()
+        else:
+            self.__set_code_analysis_results(check_results)
+
+    def __set_code_analysis_results(self, check_results):
+        """
+        Set code analysis results on blocks, and update markers of all
+        editors of the document
+        """
+        self.document_state.analysis_results = check_results
+        for data in self.blockuserdata_list[:]:
+            data.code_analysis = []
+            if data.is_empty():
+                del data
         for message, line_number in check_results:
             error = 'syntax' in message
             # Note: line_number start from 1 (not 0)
@@ -1364,6 +1494,18 @@ class CodeEditor(TextEditBaseWidget):
                 data = BlockUserData(self)
             data.code_analysis.append( (message, error) )
             block.setUserData(data)
+        self.document_state.sig_analysis_results_changed.emit()
+
+    def __update_code_analysis_markers(self):
+        """Update code analysis markers from results set on blocks"""
+        self.setUpdatesEnabled(False)
+        self.clear_extra_selections('code_analysis')
+        cursor = self.textCursor()
+        document = self.document()
+        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
+        for message, line_number in self.document_state.analysis_results:
+            error = 'syntax' in message
+            block = document.findBlockByNumber(line_number-1)
             refs = re.findall(r"\'[a-zA-Z0-9_]*\'", message)
             for ref in refs:
                 # Highlighting found references
@@ -1397,6 +1539,7 @@ class CodeEditor(TextEditBaseWidget):
         self.update_extra_selections()
         self.setUpdatesEnabled(True)
         self.linenumberarea.update()
+        self.scrollflagarea.update_flags()
         self.classfuncdropdown.update()
 
     def show_code_analysis_results(self, line_number, code_analysis):
@@ -1462,6 +1605,10 @@ class CodeEditor(TextEditBaseWidget):
 
     def process_todo(self, todo_results):
         """Process todo finder results"""
+        if todo_results is self.document_state.todo_results:
+            # Results already set on blocks by a clone of this editor
+            return
+        self.document_state.todo_results = todo_results
         for data in self.blockuserdata_list[:]:
             data.todo = ''
             if data.is_empty():
@@ -1473,7 +1620,7 @@ class CodeEditor(TextEditBaseWidget):
                 data = BlockUserData(self)
             data.todo = message
             block.setUserData(data)
-        self.scrollflagarea.update()
+        self.document_state.sig_todo_results_changed.emit()
 
 
     #------Comments/Indentation
@@ -2755,6 +2902,7 @@ class CodeEditor(TextEditBaseWidget):
             TextEditBaseWidget.dropEvent(self, event)
 
     #------ Paint event
+    @INSTRUMENTATION.timed('editor.paintEvent')
     def paintEvent(self, event):
         """Overrides paint event to update the list of visible blocks"""
         self.update_visible_blocks(event)
@@ -16,6 +16,7 @@ import pytest
 from spyder.utils.qthelpers import qapplication
 from spyder.widgets.sourcecode.codeeditor import CodeEditor
 from spyder.widgets.sourcecode.api.folding import print_tree
+from spyder.widgets.panels.codefolding import FoldingPanel
 
 
 # --- Fixtures
@@ -53,3 +54,32 @@ def test_simple_folding(get_fold_levels):
                                  [10, 2, 'V']]
 
 
+def test_collapse_expand_all(qtbot):
+    """Test collapsing and expanding all fold regions."""
+    editor = CodeEditor(parent=None)
+    editor.setup_editor(language='Python')
+    editor.set_text('class a():\n'
+                    '    def b(self):\n'
+                    '        pass\n'
+                    '\n'
+                    'def c():\n'
+                    '    pass\n')
+    qtbot.addWidget(editor)
+    folding_panel = editor.panels.get(FoldingPanel)
+
+    def visible_lines():
+        block = editor.document().firstBlock()
+        lines = []
+        while block.isValid():
+            if block.isVisible():
+                lines.append(block.blockNumber())
+            block = block.next()
+        return lines
+
+    # Folding from block fold levels, then from fold regions
+    for _i in range(2):
+        folding_panel.collapse_all()
+        assert visible_lines() == [0, 3, 4, 6]
+        folding_panel.expand_all()
+        assert visible_lines() == list(range(7))
+        qtbot.waitUntil(editor.fold_regions.is_up_to_date)
@@ -56,5 +56,36 @@ def test_activate_panels(setting, panelclass, state):
     assert found
 
 
+def test_scrollflagarea_flags(qtbot):
+    """Test that scroll flags follow the document and are painted once."""
+    editor = construct_editor()
+    qtbot.addWidget(editor)
+    editor.set_text('\n'.join('x = %d' % i for i in range(100)))
+    editor.resize(400, 300)
+    editor.show()
+    area = editor.scrollflagarea
+    editor.add_remove_breakpoint(10)
+    editor.process_todo([('TODO', 50)])
+    assert area.get_flags() == [(10, 'breakpoint_color'), (50, 'todo_color')]
+
+    # Lines inserted before the todo and removed after the breakpoint
+    cursor = QTextCursor(editor.document().findBlockByNumber(20))
+    cursor.insertText('y = 1\n' * 3)
+    assert area.get_flags() == [(10, 'breakpoint_color'), (53, 'todo_color')]
+    cursor = QTextCursor(editor.document().findBlockByNumber(10))
+    cursor.movePosition(QTextCursor.Down, QTextCursor.KeepAnchor, 5)
+    cursor.removeSelectedText()
+    assert area.get_flags() == [(10, 'breakpoint_color'), (48, 'todo_color')]
+    editor.process_todo([])
+    assert area.get_flags() == [(10, 'breakpoint_color')]
+
+    # The pixmap of flags is only painted again when they change
+    pixmap = area.get_flags_pixmap()
+    editor.verticalScrollBar().setValue(20)
+    assert area.get_flags_pixmap() is pixmap
+    editor.add_remove_breakpoint(30)
+    assert area.get_flags_pixmap() is not pixmap
+
+
 if __name__ == '__main__':
     pytest.main()
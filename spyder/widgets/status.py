@@ -10,7 +10,8 @@
 import os
 
 # Third party imports
-from qtpy.QtCore import Qt, QTimer
+from qtpy.QtCore import QPointF, QSize, Qt, QTimer
+from qtpy.QtGui import QPainter, QPolygonF
 from qtpy.QtWidgets import QHBoxLayout, QLabel, QWidget
 
 # Local imports
@@ -18,6 +19,7 @@ from spyder import dependencies
 from spyder.config.base import _
 from spyder.config.gui import get_font
 from spyder.py3compat import to_text_string
+from spyder.utils.misc import format_size
 
 
 if not os.name == 'nt':
@@ -148,6 +150,97 @@ class CPUStatus(BaseTimerStatus):
         return psutil.cpu_percent(interval=0)
 
 
+class SparklineWidget(QWidget):
+    """Small line chart of a history of values, without axes."""
+
+    def __init__(self, parent=None):
+        """Small line chart of a history of values, without axes."""
+        super(SparklineWidget, self).__init__(parent)
+        self.values = []
+
+    def set_values(self, values):
+        """Set values, the oldest first."""
+        self.values = list(values)
+        self.update()
+
+    def sizeHint(self):
+        """Override Qt method."""
+        return QSize(60, self.fontMetrics().height())
+
+    def paintEvent(self, event):
+        """Override Qt method."""
+        if len(self.values) < 2:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.palette().windowText().color())
+        height = self.height() - 1
+        top = float(max(self.values)) or 1.
+        step = float(self.width() - 1) / (len(self.values) - 1)
+        painter.drawPolyline(QPolygonF([
+            QPointF(index * step, height * (1 - value / top))
+            for index, value in enumerate(self.values)]))
+
+
+class KernelStatus(StatusBarWidget):
+    """Status bar widget for the resource usage of the current kernel."""
+
+    TIP = _("Resource usage of the kernel of the current IPython console "
+            "(the chart shows its memory over the last samples)")
+
+    def __init__(self, parent, statusbar):
+        """Status bar widget for the resource usage of the current kernel."""
+        super(KernelStatus, self).__init__(parent, statusbar)
+        self.monitor = None
+
+        # Widgets
+        self.label = QLabel(_("Kernel:"))
+        self.value = QLabel()
+        self.sparkline = SparklineWidget(self)
+
+        # Widget setup
+        self.value.setAlignment(Qt.AlignRight)
+        self.value.setFont(self.label_font)
+        fm = self.value.fontMetrics()
+        self.value.setMinimumWidth(fm.width('000 % 000.0M'))
+
+        # Layout
+        layout = self.layout()
+        layout.addWidget(self.label)
+        layout.addWidget(self.value)
+        layout.addWidget(self.sparkline)
+        layout.addSpacing(20)
+        self.hide()
+
+    def set_monitor(self, monitor):
+        """Show the samples of KernelMonitor *monitor* (None for none)."""
+        if self.monitor is not None:
+            self.monitor.sig_updated.disconnect(self.update_status)
+        self.monitor = monitor
+        if monitor is not None:
+            monitor.sig_updated.connect(self.update_status)
+        self.update_status()
+
+    def update_status(self):
+        """Update the status with the last sample of the monitor."""
+        sample = None
+        if self.monitor is not None:
+            sample = self.monitor.get_last_sample()
+        if sample is None:
+            self.hide()
+            return
+        self.value.setText('%d %% %s' % (sample['cpu'],
+                                         format_size(sample['memory'])))
+        self.sparkline.set_values([old['memory']
+                                   for old in self.monitor.history])
+        tip = self.TIP + '\n' + _("Threads: %d") % sample['threads']
+        if self.monitor.memory_limit:
+            tip += '\n' + _("Memory limit: %s") % format_size(
+                                                    self.monitor.memory_limit)
+        self.setToolTip(tip)
+        self.show()
+
+
 # =============================================================================
 # Editor-related status bar widgets
 # =============================================================================
@@ -17,10 +17,13 @@ except ImportError:
 # Third party imports
 import pytest
 from qtpy.QtCore import Qt
+from qtpy.QtGui import QTextCursor
 
 # Local imports
 from spyder.utils.fixtures import setup_editor
+from spyder.widgets import editor as editor_module
 from spyder.widgets.editor import EditorStack
+from spyder.widgets.panels.codefolding import FoldingPanel
 from spyder.widgets.findreplace import FindReplace
 
 # Qt Test Fixtures
@@ -210,5 +213,118 @@ def test_advance_cell(editor_cells_bot):
     assert editor.get_cursor_line_column() == (6, 0)
 
 
+def test_load_large_file(base_editor_bot, tmpdir, monkeypatch):
+    """Test that large files are loaded by chunks in large file mode."""
+    editor_stack, qtbot = base_editor_bot
+    monkeypatch.setattr(editor_module, 'LARGE_FILE_LINES', 100)
+    monkeypatch.setattr(editor_module, 'LOAD_CHUNK_SIZE', 500)
+    text = ''.join('def f{0}(x):\n    return x + {0}\n'.format(i)
+                   for i in range(200))
+    filename = tmpdir.join('large.py')
+    filename.write(text)
+    progress = []
+    enabled = []
+    editor_stack.long_process_progress.connect(progress.append)
+    editor_stack.long_process_progress.connect(
+        lambda message: enabled.append(editor_stack.isEnabled()))
+    editor = editor_stack.load(str(filename)).editor
+    qtbot.addWidget(editor_stack)
+
+    assert editor.large_file_mode
+    assert editor.toPlainText() == text
+    assert not editor.document().isUndoAvailable()
+    assert len(progress) > 1 and progress[-1].endswith('100%')
+    assert not editor.is_python() and editor.highlighter.document() is None
+    assert not editor.panels.get(FoldingPanel).enabled
+    assert not editor.scrollflagarea.enabled
+    assert not editor.occurrence_highlighting
+    # The stack is disabled while loading
+    assert not any(enabled) and editor_stack.isEnabled()
+
+    # Features stay disabled when options change, or on reload and rename
+    editor_stack.set_occurrence_highlighting_enabled(True)
+    editor_stack.set_classfunc_dropdown_visible(True)
+    assert not editor.occurrence_highlighting
+    assert not editor.classfuncdropdown.isVisible()
+    del progress[:]
+    editor_stack.reload(editor_stack.get_stack_index())
+    assert editor.toPlainText() == text and progress
+    editor_stack.rename_in_data(editor_stack.get_stack_index(),
+                                str(tmpdir.join('large.pyx')))
+    assert editor.highlighter.document() is None
+
+    # Small files are loaded as usual
+    filename = tmpdir.join('small.py')
+    filename.write('x = 1\n')
+    editor = editor_stack.load(str(filename)).editor
+    assert not editor.large_file_mode and editor.is_python()
+
+
+def test_highlight_visible_marks(base_editor_bot):
+    """Test that only visible occurrences and found results are highlighted."""
+    editor_stack, qtbot = base_editor_bot
+    text = 'spam = 1\n' + 'print(spam)\n' * 2000
+    editor = editor_stack.new('spam.py', 'utf-8', text).editor
+    qtbot.addWidget(editor_stack)
+    editor.set_occurrence_highlighting(True)
+    editor.set_occurrence_timeout(10)
+
+    cursor = editor.textCursor()
+    cursor.movePosition(QTextCursor.End)
+    editor.setTextCursor(cursor)
+    cursor.movePosition(QTextCursor.Start)
+    editor.setTextCursor(cursor)
+    qtbot.waitUntil(lambda: len(editor.occurrences) > 0)
+    assert editor.occurrences == list(range(2001))
+    selections = editor.get_extra_selections('occurrences')
+    assert 0 < len(selections) < 100
+    assert selections[0].cursor.selectedText() == 'spam'
+
+    editor.highlight_found_results('print')
+    assert editor.found_results == list(range(1, 2001))
+    assert 0 < len(editor.get_extra_selections('find')) < 100
+
+    # Selections follow scrolling
+    editor.verticalScrollBar().setValue(1000)
+    for key in ('occurrences', 'find'):
+        selections = editor.get_extra_selections(key)
+        assert 0 < len(selections) < 100
+        assert all(selection.cursor.blockNumber() >= 1000
+                   for selection in selections)
+
+
+def test_clones_share_document_state(base_editor_bot):
+    """Test that results are set once on blocks for all clones."""
+    editor_stack, qtbot = base_editor_bot
+    finfo = editor_stack.new('foo.py', 'utf-8', 'import os\nx = 1\n')
+    other_stack = EditorStack(None, [])
+    other_stack.set_introspector(Mock())
+    other_stack.set_find_widget(Mock())
+    other_stack.set_io_actions(Mock(), Mock(), Mock(), Mock())
+    other_stack.set_default_font(finfo.editor.font())
+    qtbot.addWidget(editor_stack)
+    qtbot.addWidget(other_stack)
+    other_stack.clone_from(editor_stack)
+    editor, clone = finfo.editor, other_stack.get_current_editor()
+    assert clone.document_state is editor.document_state
+
+    # Results given to all editors, as the Editor plugin does
+    results = [("'os' imported but unused", 1)]
+    finfo.set_analysis_results(results)
+    other_stack.set_analysis_results(0, results)
+    data = editor.document().firstBlock().userData()
+    assert data.code_analysis == [("'os' imported but unused", False)]
+    for code_editor in (editor, clone):
+        selections = code_editor.get_extra_selections('code_analysis')
+        assert [selection.cursor.selectedText()
+                for selection in selections] == ['os']
+
+    # Markers of breakpoints set in a clone are updated in the other one
+    clone.add_remove_breakpoint(2)
+    assert editor.get_breakpoints() == [(2, None)]
+    assert editor.scrollflagarea.get_flags() == [
+        (1, 'warning_color'), (2, 'breakpoint_color')]
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for editortools.py
+"""
+
+# Standard library imports
+from __future__ import print_function
+import os
+import time
+
+# Third party imports
+from qtpy.QtGui import QTextCursor
+import pytest
+
+# Local imports
+from spyder.widgets.sourcecode.codeeditor import CodeEditor
+from spyder.widgets.editortools import OutlineExplorerTreeWidget
+
+
+# Set this environment variable to run the outline benchmark (with pytest's
+# -s option to see its results)
+BENCHMARK_ENV = 'SPYDER_OUTLINE_BENCHMARK'
+
+TEXT = '''class Foo{0}(object):
+    """Docstring"""
+    def method(self, x):
+        if x:
+            return x + 1
+
+    # ---- Section
+    def other(self):
+        return None
+
+
+def function{0}(a, b):
+    return a + b
+
+'''
+
+
+# --- Helpers
+# -----------------------------------------------------------------------------
+def create_editor(qtbot, text):
+    editor = CodeEditor(None)
+    editor.setup_editor(language='Python')
+    editor.highlighter.HIGHLIGHT_BY_CHUNKS = False
+    editor.set_text(text)
+    qtbot.addWidget(editor)
+    return editor
+
+
+def get_tree(item, depth=0):
+    """Return (depth, text, line) of all items under *item*"""
+    tree = []
+    for index in range(item.childCount()):
+        child = item.child(index)
+        tree.append((depth, child.text(0), child.line))
+        tree += get_tree(child, depth + 1)
+    return tree
+
+
+def get_outline(qtbot, editor):
+    """Return the outline of *editor* populated from scratch"""
+    other_editor = create_editor(qtbot, editor.toPlainText())
+    treewidget = OutlineExplorerTreeWidget(None)
+    qtbot.addWidget(treewidget)
+    treewidget.set_current_editor(other_editor, 'test.py', update=False)
+    return get_tree(treewidget.editor_items[other_editor.get_document_id()])
+
+
+def measure_outline_updates(qtbot, count):
+    """
+    Return the time (in seconds) taken by the outline of a module with
+    *count* classes and functions (14 lines each) to be populated, refreshed
+    without changes, updated after inserting a function in the middle of
+    the module (update_branch) and populated again (populate_branch), and
+    the number of blocks whose outline data was looked at by each of them
+    """
+    editor = create_editor(qtbot, ''.join(TEXT.format(i)
+                                          for i in range(count)))
+    assert editor.get_line_count() > 14 * count
+    treewidget = OutlineExplorerTreeWidget(None)
+    qtbot.addWidget(treewidget)
+    oe_data = editor.highlighter.get_outlineexplorer_data()
+    lookups = []
+    get_data = oe_data.get
+    def counted_get_data(block_nb, default=None):
+        lookups.append(block_nb)
+        return get_data(block_nb, default)
+    oe_data.get = counted_get_data
+    times = {}
+    counts = {}
+
+    def measure(name, func, *args):
+        del lookups[:]
+        t0 = time.time()
+        func(*args)
+        times[name] = time.time() - t0
+        counts[name] = len(lookups)
+
+    measure('populate', treewidget.set_current_editor, editor, 'test.py',
+            False)
+    editor_id = editor.get_document_id()
+    root_item = treewidget.editor_items[editor_id]
+    tree_cache = treewidget.editor_tree_cache[editor_id]
+    measure('refresh', treewidget.update_branch, editor, root_item,
+            tree_cache)
+
+    middle = editor.get_line_count() // 2
+    cursor = QTextCursor(editor.document().findBlockByNumber(middle))
+    cursor.insertText('def new_function():\n    pass\n')
+    measure('update_branch', treewidget.update_branch, editor, root_item,
+            tree_cache)
+
+    cursor.insertText('x = 1\n')
+    measure('populate_branch', treewidget.populate_branch, editor, root_item,
+            tree_cache)
+    assert get_tree(root_item) == get_outline(qtbot, editor)
+    return times, counts
+
+
+# --- Tests
+# -----------------------------------------------------------------------------
+def test_update_branch(qtbot):
+    """Test that the outline is updated from changes of the document."""
+    editor = create_editor(qtbot, ''.join(TEXT.format(i) for i in range(3)))
+    treewidget = OutlineExplorerTreeWidget(None)
+    qtbot.addWidget(treewidget)
+    treewidget.set_current_editor(editor, 'test.py', update=False)
+    root_item = treewidget.editor_items[editor.get_document_id()]
+    document = editor.document()
+
+    def edit(first, last, text):
+        cursor = QTextCursor(document.findBlockByNumber(first))
+        block = document.findBlockByNumber(last)
+        cursor.setPosition(block.position() + block.length() - 1,
+                           QTextCursor.KeepAnchor)
+        cursor.insertText(text)
+
+    # Rename a method, add a class and remove another
+    edit(2, 2, '    def renamed(self, x):')
+    edit(16, 16, 'class Inserted:\n    def new(self):\n        pass\n')
+    edit(29, 31, '')
+    treewidget.set_current_editor(editor, 'test.py', update=True)
+    assert get_tree(root_item) == get_outline(qtbot, editor)
+    assert (1, 'renamed', 3) in get_tree(root_item)
+
+    # Methods following a new class are moved to it
+    edit(0, 0, 'class Foo:\n    pass\nclass Bar:')
+    treewidget.set_current_editor(editor, 'test.py', update=True)
+    assert get_tree(root_item) == get_outline(qtbot, editor)
+    assert [(depth, name) for depth, name, _line in get_tree(root_item)[:3]
+            ] == [(0, 'Foo'), (0, 'Bar'), (1, 'renamed')]
+
+
+def test_update_branch_work(qtbot):
+    """Test that updating the outline only looks at the changed items."""
+    _times, counts = measure_outline_updates(qtbot, 100)
+    # Populating looks at every block with outline data or with an item
+    assert counts['populate'] >= 6 * 100
+    assert counts['populate_branch'] >= counts['populate']
+    assert counts['refresh'] == 0
+    # The new function and the items of the class and function around it
+    assert counts['update_branch'] <= 10
+
+
+@pytest.mark.skipif(not os.environ.get(BENCHMARK_ENV),
+                    reason="Benchmark, run when %s is set" % BENCHMARK_ENV)
+def test_outline_benchmark(qtbot):
+    """
+    Print the times taken to update the outline of a 20k-line module,
+    best of 5 runs, and check that update_branch is faster than
+    populate_branch.
+    """
+    runs = [measure_outline_updates(qtbot, 1430)[0] for _i in range(5)]
+    best = dict((name, min(times[name] for times in runs))
+                for name in runs[0])
+    print()
+    for name in ['populate', 'refresh', 'update_branch', 'populate_branch']:
+        print("%-16s %8.1f ms" % (name, 1000 * best[name]))
+    assert best['update_branch'] < best['populate_branch'] / 2
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for instrumentation.py"""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.utils.instrumentation import INSTRUMENTATION
+from spyder.widgets.instrumentation import InstrumentationWidget
+from spyder.widgets.sourcecode.codeeditor import CodeEditor
+
+
+@pytest.fixture
+def instrumentation():
+    INSTRUMENTATION.reset()
+    INSTRUMENTATION.set_enabled(True)
+    yield INSTRUMENTATION
+    INSTRUMENTATION.set_enabled(False)
+    INSTRUMENTATION.reset()
+
+
+def test_editor_timings(qtbot, instrumentation):
+    """Test that the widget shows timings recorded by the editor."""
+    editor = CodeEditor(None)
+    editor.setup_editor(language='Python')
+    editor.set_text('def f():\n    pass\n' * 10)
+    qtbot.addWidget(editor)
+    # Panels are timed as soon as instrumentation is enabled (highlighting
+    # only if it's enabled at startup)
+    editor.show()
+    qtbot.waitUntil(lambda: any(name.startswith('panel.') for name
+                                in instrumentation.histograms))
+
+    widget = InstrumentationWidget(None)
+    qtbot.addWidget(widget)
+    widget.show()
+    widget.refresh()
+    names = [widget.tree.topLevelItem(index).text(0)
+             for index in range(widget.tree.topLevelItemCount())]
+    assert 'panel.LineNumberArea' in names
+
+    widget.enable_box.setChecked(False)
+    assert not instrumentation.enabled
+    widget.reset()
+    widget.refresh()
+    assert widget.tree.topLevelItemCount() == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
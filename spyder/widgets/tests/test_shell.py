@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for shell.py"""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.widgets.scrollback import ScrollbackViewer
+from spyder.widgets.shell import PythonShellWidget
+
+
+def test_output(qtbot, tmpdir):
+    """Test that output written in a shell is coalesced."""
+    shell = PythonShellWidget(None, str(tmpdir.join('history.py')))
+    qtbot.addWidget(shell)
+    shell.setMaximumBlockCount(50)
+    # Output written after an idle period is inserted right away
+    shell.write('first\n')
+    assert shell.get_text_line(0) == 'first'
+    for i in range(1000):
+        shell.write('%d\n' % i)
+    assert shell.output_pipeline.has_pending_output()
+    qtbot.waitUntil(lambda: not shell.output_pipeline.has_pending_output())
+    assert shell.document().blockCount() == 50
+    assert shell.get_text_line(48) == '999'
+    shell.write('>>> ', prompt=True)
+    assert shell.get_text_line(49) == '>>> '
+
+
+
+def test_scrollback(qtbot, tmpdir):
+    """Test that lines removed from the shell are kept in its scrollback."""
+    shell = PythonShellWidget(None, str(tmpdir.join('history.py')))
+    qtbot.addWidget(shell)
+    shell.setMaximumBlockCount(10)
+    shell.set_scrollback_enabled(True)
+    shell.write('\x1b[31mstart\x1b[0m\n')
+    shell.flush()
+    for i in range(100):
+        shell.write('%d\n' % i)
+        if i % 7 == 0:
+            shell.flush()
+    shell.write('end')
+    shell.flush()
+    assert shell.scrollback.get_text() + shell.toPlainText() == \
+        'start\n' + ''.join('%d\n' % i for i in range(100)) + 'end'
+
+    # Lines which wouldn't fit in the shell aren't inserted in it
+    shell.write(''.join(' %d\n' % i for i in range(100, 130)))
+    shell.flush()
+    assert shell.scrollback.get_text() + shell.toPlainText() == \
+        'start\n' + ''.join('%d\n' % i for i in range(100)) + 'end' + \
+        ''.join(' %d\n' % i for i in range(100, 130))
+
+    viewer = ScrollbackViewer(shell, shell.scrollback)
+    qtbot.addWidget(viewer)
+    viewer.set_search('7')
+    assert viewer.find_previous()
+    assert viewer.found_line == 118
+    assert viewer.editor.textCursor().selectedText() == ' 117'
+    assert viewer.find_next() is False
+
+    shell.clear_terminal()
+    assert shell.scrollback.line_count() == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -8,16 +8,36 @@
 Tests for status.py
 """
 
+# Standard library imports
+import os
+
 # Test library imports
 import pytest
 
 # Thrid party imports
+from qtpy.QtCore import QObject
 from qtpy.QtWidgets import QMainWindow
 
 # Local imports
+from spyder.utils.ipython.kernelmonitor import KernelMonitor
+from spyder.utils.procstats import ProcessSampler
 from spyder.widgets.status import (ReadWriteStatus, EOLStatus, EncodingStatus,
                                    CursorPositionStatus, MemoryStatus,
-                                   CPUStatus)
+                                   CPUStatus, KernelStatus)
+
+
+class FakeKernel(object):
+    pid = os.getpid()
+
+
+class FakeKernelManager(object):
+    kernel = FakeKernel()
+
+
+class FakeClient(QObject):
+    def get_kernel(self):
+        return FakeKernelManager()
+
 
 @pytest.fixture
 def setup_status_bar(qtbot):
@@ -41,5 +61,35 @@ def test_status_bar(qtbot):
     assert len(swidgets) == 6
 
 
+def test_kernel_status(qtbot):
+    """Show the resource usage of a kernel."""
+    if ProcessSampler(FakeKernel.pid).sample() is None:
+        pytest.skip("Resource usage can't be read on this platform")
+    win, statusbar = setup_status_bar(qtbot)
+    win.show()
+    swidget = KernelStatus(win, statusbar)
+    client = FakeClient()
+    monitor = KernelMonitor(client)
+    swidget.set_monitor(monitor)
+    assert not swidget.isVisible()
+
+    monitor.memory_limit = 1
+    with qtbot.waitSignal(monitor.sig_memory_exceeded) as blocker:
+        monitor.sample()
+    assert blocker.args[0] > 1
+    # The limit is only signaled when crossed
+    with qtbot.assertNotEmitted(monitor.sig_memory_exceeded):
+        monitor.sample()
+    assert len(monitor.history) == 2
+    assert swidget.isVisible()
+    assert '%' in swidget.value.text()
+    assert swidget.sparkline.values == [sample['memory']
+                                        for sample in monitor.history]
+
+    monitor.stop()
+    assert not monitor.history
+    assert not swidget.isVisible()
+
+
 if __name__ == "__main__":
     pytest.main()
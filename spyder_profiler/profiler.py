@@ -49,8 +49,49 @@ class ProfilerConfigPage(PluginConfigPage):
         results_layout.addWidget(results_label2)
         results_group.setLayout(results_layout)
 
+        sampling_group = QGroupBox(_("Sampling"))
+        sampling_spin = self.create_spinbox(
+                _("Sampling interval:"), _("ms"), 'sampling_interval',
+                default=5, min_=1, max_=1000,
+                tip=_("Interval between two samples of the running lines "
+                      "in sampling mode"))
+        sampling_layout = QVBoxLayout()
+        sampling_layout.addWidget(sampling_spin)
+        sampling_group.setLayout(sampling_layout)
+
+        memory_group = QGroupBox(_("Memory"))
+        memory_spin = self.create_spinbox(
+                _("Snapshot interval:"), _("ms"), 'memory_interval',
+                default=1000, min_=10, max_=3600000, step=100,
+                tip=_("Interval between two snapshots of the memory "
+                      "allocated by each line when profiling memory usage "
+                      "in the IPython console"))
+        memory_layout = QVBoxLayout()
+        memory_layout.addWidget(memory_spin)
+        memory_group.setLayout(memory_layout)
+
+        history_group = QGroupBox(_("History"))
+        history_spin = self.create_spinbox(
+                _("Runs kept for each script:"), None, 'history_runs',
+                default=20, min_=2, max_=1000,
+                tip=_("Number of runs of each script which are kept to be "
+                      "compared with later runs (the baseline run is "
+                      "always kept)"))
+        threshold_spin = self.create_spinbox(
+                _("Regression threshold:"), _("%"), 'regression_threshold',
+                default=10, min_=1, max_=1000,
+                tip=_("Functions whose time is longer than in the compared "
+                      "run by more than this ratio are highlighted"))
+        history_layout = QVBoxLayout()
+        history_layout.addWidget(history_spin)
+        history_layout.addWidget(threshold_spin)
+        history_group.setLayout(history_layout)
+
         vlayout = QVBoxLayout()
         vlayout.addWidget(results_group)
+        vlayout.addWidget(sampling_group)
+        vlayout.addWidget(memory_group)
+        vlayout.addWidget(history_group)
         vlayout.addStretch(1)
         self.setLayout(vlayout)
 
@@ -66,6 +107,17 @@ class Profiler(SpyderPluginWidget):
 
         max_entries = self.get_option('max_entries', 50)
         self.profiler = ProfilerWidget(self, max_entries)
+        self.profiler.set_sampling(self.get_option('sampling', False))
+        self.profiler.sampling_interval = self.get_option('sampling_interval',
+                                                          5)
+        self.profiler.mode_combo.currentIndexChanged.connect(
+                        lambda index: self.set_option('sampling', index == 1))
+        self.profiler.history.max_runs = self.get_option('history_runs', 20)
+        self.profiler.datatree.regression_threshold = self.get_option(
+                                            'regression_threshold', 10) / 100.
+        self.profiler.set_compare_combo(self.get_option('compare_with', 0))
+        self.profiler.compare_combo.currentIndexChanged.connect(
+                        lambda index: self.set_option('compare_with', index))
 
         layout = QVBoxLayout()
         layout.addWidget(self.profiler)
@@ -103,6 +155,14 @@ class Profiler(SpyderPluginWidget):
     def register_plugin(self):
         """Register plugin in Spyder's main window"""
         self.profiler.datatree.sig_edit_goto.connect(self.main.editor.load)
+        self.profiler.flamegraph.sig_edit_goto.connect(self.main.editor.load)
+        self.profiler.sig_line_hits.connect(self.main.editor.set_line_hits)
+        self.profiler.memoryview.sig_edit_goto.connect(self.main.editor.load)
+        self.profiler.sig_line_sizes.connect(
+            lambda line_sizes, peak: self.main.editor.set_line_hits(
+                                            line_sizes, peak, sizes=True))
+        self.main.ipyconsole.sig_memory_profile.connect(
+                                                self.show_memory_profile)
         self.profiler.redirect_stdio.connect(
             self.main.redirect_internalshell_stdio)
         self.main.add_dockwidget(self)
@@ -113,9 +173,16 @@ class Profiler(SpyderPluginWidget):
         profiler_act.setEnabled(is_profiler_installed())
         self.register_shortcut(profiler_act, context="Profiler",
                                name="Run profiler")
+        memory_act = create_action(self, _("Profile memory usage"),
+                                   icon=self.get_plugin_icon(),
+                                   tip=_("Run current file in the IPython "
+                                         "console, taking snapshots of its "
+                                         "memory usage"),
+                                   triggered=self.run_memory_profiler)
         
-        self.main.run_menu_actions += [profiler_act]
-        self.main.editor.pythonfile_dependent_actions += [profiler_act]
+        self.main.run_menu_actions += [profiler_act, memory_act]
+        self.main.editor.pythonfile_dependent_actions += [profiler_act,
+                                                          memory_act]
 
     def refresh_plugin(self):
         """Refresh profiler widget"""
@@ -129,7 +196,14 @@ class Profiler(SpyderPluginWidget):
         """Apply configuration file's plugin settings"""
         # The history depth option will be applied at 
         # next Spyder startup, which is soon enough
-        pass
+        if 'sampling_interval' in options:
+            self.profiler.sampling_interval = self.get_option(
+                                                        'sampling_interval')
+        if 'history_runs' in options:
+            self.profiler.history.max_runs = self.get_option('history_runs')
+        if 'regression_threshold' in options:
+            self.profiler.datatree.regression_threshold = self.get_option(
+                                                'regression_threshold') / 100.
         
     #------ Public API ---------------------------------------------------------        
     def run_profiler(self):
@@ -137,6 +211,30 @@ class Profiler(SpyderPluginWidget):
         if self.main.editor.save():
             self.analyze(self.main.editor.get_current_filename())
 
+    def run_memory_profiler(self):
+        """Run current file in the IPython console, profiling memory"""
+        if not self.main.editor.save():
+            return
+        filename = self.main.editor.get_current_filename()
+        runconf = get_run_configuration(filename)
+        wdir, args = None, None
+        if runconf is not None:
+            if runconf.wdir_enabled:
+                wdir = runconf.wdir
+            if runconf.args_enabled:
+                args = runconf.args
+        self.main.ipyconsole.run_script_in_current_client(
+            filename, wdir, args, False, False, False,
+            memory_profile=self.profiler.MEMORYPATH,
+            memory_interval=self.get_option('memory_interval', 1000) / 1000.)
+
+    def show_memory_profile(self, filename):
+        """Show memory snapshots saved by the IPython console"""
+        if self.dockwidget and not self.ismaximized:
+            self.dockwidget.setVisible(True)
+            self.dockwidget.raise_()
+        self.profiler.show_memory_profile(filename)
+
     def analyze(self, filename):
         """Reimplement analyze method"""
         if self.dockwidget and not self.ismaximized:
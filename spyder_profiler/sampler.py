@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Sampling profiler
+
+Runs a Python script while a helper thread samples the stack of its main
+thread at a regular interval, then saves the number of samples of each
+stack in a JSON file:
+
+    python sampler.py [-i INTERVAL] -o OUTFILE SCRIPT [ARGS]
+
+Unlike cProfile, function calls aren't traced, so the overhead doesn't
+depend on the number of calls. Samples are only taken when the main thread
+releases the GIL, so the switch interval of Python 3 is reduced to the
+sampling interval.
+
+This module must only use the standard library, since it's run by the
+interpreter used to run the script.
+"""
+
+# Standard library imports
+import json
+import optparse
+import os.path as osp
+import sys
+import threading
+import time
+
+
+# Version of the file format
+VERSION = 1
+
+
+class Sampler(object):
+    """
+    Stack sampler of a thread
+
+    Frames are (filename, first line of function, function name, line)
+    lists, and stacks are tuples of frames, the outermost one first.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None, stop_code=None):
+        self.interval = interval
+        if thread_id is None:
+            thread_id = threading.current_thread().ident
+        self.thread_id = thread_id
+        # Code of the function whose frames (and outer frames) are ignored
+        self.stop_code = stop_code
+        self.samples = {}
+        self.duration = 0.
+        self._start_time = None
+        self._code_info = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling"""
+        # Let the sampling thread take the GIL as often as it needs it
+        if hasattr(sys, 'setswitchinterval'):
+            sys.setswitchinterval(min(sys.getswitchinterval(),
+                                      self.interval))
+        self._start_time = time.time()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.duration = time.time() - self._start_time
+
+    def take_sample(self):
+        """Sample the stack of the thread"""
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if code is self.stop_code:
+                break
+            info = self._code_info.get(code)
+            if info is None:
+                filename = code.co_filename
+                if not filename.startswith('<'):
+                    filename = osp.normpath(osp.abspath(filename))
+                info = self._code_info[code] = (filename, code.co_firstlineno,
+                                                code.co_name)
+            stack.append(info + (frame.f_lineno,))
+            frame = frame.f_back
+        if stack:
+            stack = tuple(reversed(stack))
+            self.samples[stack] = self.samples.get(stack, 0) + 1
+
+    def dump(self, filename):
+        """Save samples in *filename*"""
+        data = {'version': VERSION,
+                'interval': self.interval,
+                'duration': self.duration,
+                'samples': [[[list(frame) for frame in stack], count]
+                            for stack, count in self.samples.items()]}
+        with open(filename, 'w') as output:
+            json.dump(data, output)
+
+    def _run(self):
+        """Sample until stopped"""
+        while True:
+            self._stop_event.wait(self.interval)
+            if self._stop_event.is_set():
+                break
+            self.take_sample()
+
+
+def run_script(filename, args):
+    """Run script *filename* with *args* as __main__"""
+    sys.argv = [filename] + args
+    sys.path.insert(0, osp.dirname(filename))
+    with open(filename, 'rb') as script:
+        code = compile(script.read(), filename, 'exec')
+    namespace = {'__file__': filename, '__name__': '__main__',
+                 '__package__': None, '__builtins__': __builtins__}
+    exec(code, namespace)
+
+
+def main():
+    """Run a script with the sampler"""
+    parser = optparse.OptionParser(
+        usage="sampler.py [-i interval] -o output_file scriptfile [arg] ...")
+    parser.allow_interspersed_args = False
+    parser.add_option('-o', '--outfile', dest='outfile',
+                      help="Save samples to <outfile>")
+    parser.add_option('-i', '--interval', dest='interval', type='float',
+                      default=5., help="Sampling interval (ms)")
+    options, args = parser.parse_args()
+    if not args or not options.outfile:
+        parser.print_usage()
+        sys.exit(2)
+    outfile = osp.abspath(options.outfile)
+
+    sampler = Sampler(options.interval / 1000.,
+                      stop_code=run_script.__code__)
+    sampler.start()
+    exit_code = 0
+    try:
+        run_script(osp.abspath(args[0]), args[1:])
+    except SystemExit as error:
+        exit_code = error.code
+    finally:
+        sampler.stop()
+        sampler.dump(outfile)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Indexed call graph of profiler results
+
+The statistics of pstats are dictionaries keyed by function, callers being
+stored in the statistics of each function. CallGraph numbers functions
+once, so that statistics, callers and callees of a function are found by
+index, without sorting or traversing the whole table.
+"""
+
+
+class CallGraph(object):
+    """
+    Call graph of profile/cProfile results
+
+    Function *i* is *functions[i]*, a (filename, line number, function name)
+    tuple, *calls[i]*, *local_times[i]* and *cumulative_times[i]* are its
+    statistics (see ProfilerDataTree), and *callers[i]* and *callees[i]* are
+    lists of indexes of the functions calling it and called by it.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.functions = list(stats.stats.keys())
+        self.index = dict((func, index)
+                          for index, func in enumerate(self.functions))
+        self.calls = []
+        self.local_times = []
+        self.cumulative_times = []
+        self.callers = [[] for _func in self.functions]
+        self.callees = [[] for _func in self.functions]
+        for index, func in enumerate(self.functions):
+            _cc, nc, tt, ct, callers = stats.stats[func]
+            self.calls.append(nc)
+            self.local_times.append(tt)
+            self.cumulative_times.append(ct)
+            for caller in callers:
+                caller_index = self.index.get(caller)
+                if caller_index is not None:
+                    self.callers[index].append(caller_index)
+                    self.callees[caller_index].append(index)
+
+    @classmethod
+    def load(cls, filename):
+        """Load profiler data saved by profile/cProfile in *filename*"""
+        import pstats
+        return cls(pstats.Stats(filename))
+
+    def find_root(self):
+        """
+        Return the index of the function with the largest cumulative time,
+        built-in functions aside (the profiler itself being one of them), or
+        None if there's no such function
+        """
+        root = None
+        for index, func in enumerate(self.functions):
+            if ('~', 0) == func[0:2] or func[2].startswith(
+                    '<built-in method exec>'):
+                continue
+            if root is None or \
+              self.cumulative_times[index] > self.cumulative_times[root]:
+                root = index
+        return root
+
+    def get_compared_stats(self, other):
+        """
+        Return the calls, local times and cumulative times of the functions
+        in *other* CallGraph, as lists aligned with the functions of this one
+        (0 for functions missing from *other*)
+        """
+        indexes = [other.index.get(func) for func in self.functions]
+        return tuple([values[index] if index is not None else 0
+                      for index in indexes]
+                     for values in (other.calls, other.local_times,
+                                    other.cumulative_times))
+
+    def get_regressions(self, compared_times, threshold=0.1, min_time=1e-3):
+        """
+        Return the indexes of the functions whose cumulative time is more
+        than *threshold* (relative) and *min_time* (seconds) longer than
+        *compared_times* (see get_compared_stats)
+        """
+        return set(index for index, (cumulative, compared) in enumerate(
+                       zip(self.cumulative_times, compared_times))
+                   if cumulative - compared > max(min_time,
+                                                  threshold * compared))
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Flame graph of sampling profiler results
+
+Samples are saved by spyder_profiler/sampler.py.
+"""
+
+# Standard library imports
+import json
+import zlib
+
+# Third party imports
+from qtpy.QtCore import QRect, QSize, Qt, Signal
+from qtpy.QtGui import QColor, QPainter
+from qtpy.QtWidgets import QToolTip, QWidget
+
+# Local imports
+from spyder.config.base import get_translation
+
+# This is needed for testing this module as a stand alone script
+try:
+    _ = get_translation("profiler", "spyder_profiler")
+except KeyError as error:
+    import gettext
+    _ = gettext.gettext
+
+
+class CallNode(object):
+    """
+    Function of a call tree
+
+    *hits* is the number of samples in which the function (called by its
+    parents) was on the stack and *self_hits* the number of samples in which
+    it was running.
+    """
+
+    def __init__(self, filename, first_line, name, parent=None):
+        self.filename = filename
+        self.first_line = first_line
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.hits = 0
+        self.self_hits = 0
+
+    def get_child(self, filename, first_line, name):
+        """Return the child node of a function, adding it if needed"""
+        key = (filename, first_line, name)
+        child = self.children.get(key)
+        if child is None:
+            child = self.children[key] = CallNode(filename, first_line, name,
+                                                  self)
+        return child
+
+    def get_depth(self):
+        """Return the depth of the subtree of the node"""
+        if not self.children:
+            return 0
+        return 1 + max(child.get_depth() for child in self.children.values())
+
+    def get_ancestors(self):
+        """Return ancestors of the node, the root first"""
+        ancestors = []
+        node = self.parent
+        while node is not None:
+            ancestors.insert(0, node)
+            node = node.parent
+        return ancestors
+
+    def sorted_children(self):
+        """Return children, the most sampled first"""
+        return sorted(self.children.values(),
+                      key=lambda child: (-child.hits, child.name))
+
+
+class SampleData(object):
+    """
+    Results of a sampling profiler run
+
+    *samples* are (stack, count) pairs, stacks being lists of (filename,
+    first line of function, function name, line) frames, the outermost one
+    first.
+    """
+
+    def __init__(self, samples, interval=0., duration=0.):
+        self.samples = samples
+        self.interval = interval
+        self.duration = duration
+        self.total = sum(count for _stack, count in samples)
+
+    @classmethod
+    def load(cls, filename):
+        """Load samples saved by the sampler in *filename*"""
+        with open(filename) as data_file:
+            data = json.load(data_file)
+        return cls(data['samples'], data['interval'], data['duration'])
+
+    def get_call_tree(self):
+        """Return the root CallNode of the call tree"""
+        root = CallNode('', 0, _('all'))
+        root.hits = self.total
+        for stack, count in self.samples:
+            node = root
+            for filename, first_line, name, _line in stack:
+                node = node.get_child(filename, first_line, name)
+                node.hits += count
+            node.self_hits += count
+        return root
+
+    def get_line_hits(self):
+        """
+        Return the number of samples in which each line was running (or
+        calling a running function), as {filename: {line: hits}}
+        """
+        line_hits = {}
+        for stack, count in self.samples:
+            lines = set((filename, line)
+                        for filename, _first_line, _name, line in stack)
+            for filename, line in lines:
+                if filename.startswith('<'):
+                    continue
+                hits = line_hits.setdefault(filename, {})
+                hits[line] = hits.get(line, 0) + count
+        return line_hits
+
+
+class FlameGraphWidget(QWidget):
+    """
+    Flame graph (drawn as an icicle graph) of sampling profiler results
+
+    Each function is drawn below its caller, with a width proportional to
+    the number of samples in which it was on the stack. Clicking a function
+    zooms on it (clicking one of its callers zooms out), double-clicking it
+    goes to its definition.
+    """
+    # Height of a function (px)
+    ROW_HEIGHT = 18
+    # Minimal width of a drawn function (px)
+    MIN_WIDTH = 2
+
+    sig_edit_goto = Signal(str, int, str)
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+        self.setMouseTracking(True)
+        self.root = None
+        self.zoomed = None
+        self.total = 0
+        # (QRect, CallNode) of drawn functions, computed when needed
+        self._rects = None
+
+    def set_data(self, data):
+        """Show the call tree of SampleData *data* (or nothing if None)"""
+        if data is None:
+            self.root = self.zoomed = None
+            self.total = 0
+        else:
+            self.root = self.zoomed = data.get_call_tree()
+            self.total = data.total
+        self._rects = None
+        self.updateGeometry()
+        self.update()
+
+    def zoom(self, node):
+        """Zoom on *node*"""
+        self.zoomed = node
+        self._rects = None
+        self.update()
+
+    def sizeHint(self):
+        """Override Qt method"""
+        depth = self.root.get_depth() + 1 if self.root is not None else 0
+        return QSize(400, depth * self.ROW_HEIGHT)
+
+    def minimumSizeHint(self):
+        """Override Qt method"""
+        return QSize(0, self.sizeHint().height())
+
+    def get_color(self, node):
+        """Return the color of a function (warm, depending on its name)"""
+        value = zlib.crc32(node.name.encode('utf-8')) & 0xffff
+        return QColor(205 + value % 50, 80 + (value >> 4) % 140, 40)
+
+    def get_rects(self):
+        """Return (QRect, CallNode) of the functions to draw"""
+        if self._rects is None:
+            self._rects = []
+            if self.zoomed is not None and self.zoomed.hits:
+                width = self.width()
+                ancestors = self.zoomed.get_ancestors()
+                for row, node in enumerate(ancestors):
+                    self._add_rect(node, 0, row, width)
+                self._add_tree_rects(self.zoomed, 0., len(ancestors),
+                                     float(width) / self.zoomed.hits)
+        return self._rects
+
+    def get_node_at(self, pos):
+        """Return the node drawn at *pos*, or None"""
+        for rect, node in self.get_rects():
+            if rect.contains(pos):
+                return node
+        return None
+
+    def resizeEvent(self, event):
+        """Override Qt method"""
+        self._rects = None
+        QWidget.resizeEvent(self, event)
+
+    def paintEvent(self, event):
+        """Override Qt method"""
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.palette().base())
+        painter.setPen(Qt.black)
+        metrics = painter.fontMetrics()
+        for rect, node in self.get_rects():
+            if not rect.intersects(event.rect()):
+                continue
+            painter.fillRect(rect, self.get_color(node))
+            if rect.width() > 3 * self.MIN_WIDTH:
+                text = metrics.elidedText(node.name, Qt.ElideRight,
+                                          rect.width() - 4)
+                painter.drawText(rect.adjusted(2, 0, -2, 0),
+                                 Qt.AlignLeft | Qt.AlignVCenter, text)
+
+    def mouseMoveEvent(self, event):
+        """Override Qt method: show function tooltip"""
+        node = self.get_node_at(event.pos())
+        if node is None:
+            QToolTip.hideText()
+            return
+        text = "<b>%s</b>" % node.name
+        if node.filename:
+            text += "<br>%s : %d" % (node.filename, node.first_line)
+        text += "<br>" + _("%d samples (%.1f%%), %d in function") % (
+            node.hits, 100. * node.hits / max(self.total, 1),
+            node.self_hits)
+        QToolTip.showText(event.globalPos(), text, self)
+
+    def mouseReleaseEvent(self, event):
+        """Override Qt method: zoom on function"""
+        if event.button() == Qt.LeftButton:
+            node = self.get_node_at(event.pos())
+            if node is not None:
+                self.zoom(node)
+
+    def mouseDoubleClickEvent(self, event):
+        """Override Qt method: go to function definition"""
+        node = self.get_node_at(event.pos())
+        if node is not None and node.filename \
+          and not node.filename.startswith('<'):
+            self.sig_edit_goto.emit(node.filename, node.first_line, '')
+
+    def _add_tree_rects(self, node, left, row, scale):
+        """Add rectangles of *node* and its children"""
+        width = node.hits * scale
+        if width < self.MIN_WIDTH:
+            return
+        self._add_rect(node, int(left), row, int(width))
+        for child in node.sorted_children():
+            self._add_tree_rects(child, left, row + 1, scale)
+            left += child.hits * scale
+
+    def _add_rect(self, node, left, row, width):
+        """Add the rectangle of *node*"""
+        rect = QRect(left, row * self.ROW_HEIGHT, width - 1,
+                     self.ROW_HEIGHT - 1)
+        self._rects.append((rect, node))
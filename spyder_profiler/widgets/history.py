@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+History of profiler runs
+
+The profiler data of the last runs of each script is kept, with the
+arguments of the script and the revision of its repository, so that runs
+can be compared with the previous one or with a baseline run.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import os
+import os.path as osp
+import shutil
+import time
+
+# Local imports
+from spyder.py3compat import to_binary_string
+from spyder.utils import vcs
+
+
+def get_revision(filename):
+    """
+    Return the revision of the repository of *filename* (commit and branch),
+    or None if it's not in a repository
+    """
+    root = vcs.get_vcs_root(osp.dirname(osp.abspath(filename)))
+    if root is None:
+        return None
+    if vcs.get_vcs_info(root)['name'] == 'Git':
+        commit, branch = vcs.get_git_revision(root)
+    else:
+        commit, _local, branch = vcs.get_hg_revision(root)
+    if not commit:
+        return None
+    return '%s (%s)' % (commit, branch) if branch else commit
+
+
+class ProfileHistory(object):
+    """
+    Profiler data of the last *max_runs* runs of each script
+
+    Runs of a script are saved in their own subdirectory of *directory*,
+    with an index file listing them, the oldest first, as dictionaries:
+    id, date, args, revision, data (name of the data file) and baseline
+    (True for the run other runs are compared with). The baseline run is
+    kept until another one is chosen.
+    """
+    INDEX = 'runs.json'
+
+    def __init__(self, directory, max_runs=20):
+        self.directory = directory
+        self.max_runs = max_runs
+
+    def get_script_dir(self, filename):
+        """Return the directory of the runs of script *filename*"""
+        key = osp.normcase(osp.abspath(filename))
+        return osp.join(self.directory,
+                        hashlib.sha1(to_binary_string(key, 'utf-8')
+                                     ).hexdigest())
+
+    def get_runs(self, filename):
+        """Return the runs of script *filename*, the oldest first"""
+        try:
+            with open(osp.join(self.get_script_dir(filename),
+                               self.INDEX)) as index_file:
+                return json.load(index_file)
+        except (IOError, OSError, ValueError):
+            return []
+
+    def get_data_path(self, filename, run):
+        """Return the path of the profiler data of *run* of *filename*"""
+        return osp.join(self.get_script_dir(filename), run['data'])
+
+    def add_run(self, filename, datafile, args=None, revision=None):
+        """
+        Add a run of script *filename*, whose profiler data is saved in
+        *datafile*, and return it
+        """
+        runs = self.get_runs(filename)
+        run_id = runs[-1]['id'] + 1 if runs else 1
+        run = {'id': run_id, 'date': time.time(), 'args': args or '',
+               'revision': revision, 'data': 'run%d.prof' % run_id,
+               'baseline': False}
+        directory = self.get_script_dir(filename)
+        if not osp.isdir(directory):
+            os.makedirs(directory)
+        shutil.copyfile(datafile, osp.join(directory, run['data']))
+        runs.append(run)
+        while len(runs) > self.max_runs:
+            oldest = [old for old in runs if not old['baseline']][0]
+            runs.remove(oldest)
+            try:
+                os.remove(self.get_data_path(filename, oldest))
+            except OSError:
+                pass
+        self._save_runs(filename, runs)
+        return run
+
+    def get_previous_run(self, filename):
+        """Return the run before the last one of *filename*, or None"""
+        runs = self.get_runs(filename)
+        return runs[-2] if len(runs) > 1 else None
+
+    def get_baseline_run(self, filename):
+        """Return the baseline run of *filename*, or None"""
+        for run in self.get_runs(filename):
+            if run['baseline']:
+                return run
+        return None
+
+    def set_baseline(self, filename, run_id):
+        """Make run *run_id* of *filename* the baseline run"""
+        runs = self.get_runs(filename)
+        if not runs:
+            return
+        for run in runs:
+            run['baseline'] = run['id'] == run_id
+        self._save_runs(filename, runs)
+
+    def _save_runs(self, filename, runs):
+        """Save the index of the runs of *filename*"""
+        with open(osp.join(self.get_script_dir(filename),
+                           self.INDEX), 'w') as index_file:
+            json.dump(runs, index_file)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Memory profiler results
+
+Memory snapshots are taken with tracemalloc while runfile runs a script in
+an IPython console (see MemoryProfiler in spyder/utils/site/sitecustomize.py)
+and saved as JSON.
+"""
+
+# Standard library imports
+import json
+import os.path as osp
+
+# Third party imports
+from qtpy.QtCore import Qt, Signal
+from qtpy.QtWidgets import (QLabel, QSplitter, QTreeWidget, QTreeWidgetItem,
+                            QVBoxLayout, QWidget)
+
+# Local imports
+from spyder.config.base import get_translation
+from spyder.utils.misc import format_size
+
+# This is needed for testing this module as a stand alone script
+try:
+    _ = get_translation("profiler", "spyder_profiler")
+except KeyError as error:
+    import gettext
+    _ = gettext.gettext
+
+
+class MemoryProfileData(object):
+    """
+    Results of a memory profiler run
+
+    *snapshots* are dictionaries: time (since the script started, in
+    seconds), size and count (memory and number of blocks allocated), top
+    (lines allocating the most memory, as [filename, line, size, count]) and
+    growth (lines whose allocated memory grew the most since the previous
+    snapshot, as [filename, line, size difference, size]). *lines* is the
+    largest memory allocated by each line, as {filename: [[line, size]]}.
+    """
+
+    def __init__(self, snapshots, lines=None, interval=1., duration=0.,
+                 peak=0):
+        self.snapshots = snapshots
+        self.lines = lines or {}
+        self.interval = interval
+        self.duration = duration
+        self.peak = peak
+
+    @classmethod
+    def load(cls, filename):
+        """Load snapshots saved by the memory profiler in *filename*"""
+        with open(filename) as data_file:
+            data = json.load(data_file)
+        return cls(data['snapshots'], data['lines'], data['interval'],
+                   data['duration'], data['peak'])
+
+    def get_line_sizes(self):
+        """
+        Return the largest memory allocated by each line, as {filename:
+        {line: size}}
+        """
+        return dict((filename, dict((line, size) for line, size in lines))
+                    for filename, lines in self.lines.items())
+
+    def get_sites(self, index):
+        """
+        Return the allocation sites of snapshot *index*, as (filename, line,
+        size, count, growth) tuples, the largest first and then those which
+        only grew the most (count being None for these)
+        """
+        snapshot = self.snapshots[index]
+        growth = dict(((filename, line), size_diff)
+                      for filename, line, size_diff, _size
+                      in snapshot['growth'])
+        sites = []
+        for filename, line, size, count in snapshot['top']:
+            sites.append((filename, line, size, count,
+                          growth.pop((filename, line), 0)))
+        for filename, line, size_diff, size in snapshot['growth']:
+            if (filename, line) in growth:
+                sites.append((filename, line, size, None, size_diff))
+        return sites
+
+
+class MemoryProfileWidget(QWidget):
+    """
+    Memory profiler results: snapshots and allocation sites of the selected
+    snapshot
+
+    Double-clicking an allocation site goes to its line.
+    """
+    sig_edit_goto = Signal(str, int, str)
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+        self.data = None
+
+        self.summary_label = QLabel(self)
+        self.snapshot_tree = QTreeWidget(self)
+        self.snapshot_tree.setHeaderLabels([_("Time"), _("Memory"),
+                                            _("Growth"), _("Blocks")])
+        self.snapshot_tree.setRootIsDecorated(False)
+        self.snapshot_tree.currentItemChanged.connect(
+            lambda current, _previous: self.show_sites(
+                self.snapshot_tree.indexOfTopLevelItem(current)))
+        self.site_tree = QTreeWidget(self)
+        self.site_tree.setHeaderLabels([_("Line"), _("Memory"),
+                                        _("Growth"), _("Blocks")])
+        self.site_tree.setRootIsDecorated(False)
+        self.site_tree.itemActivated.connect(self.site_activated)
+
+        splitter = QSplitter(Qt.Vertical, self)
+        splitter.addWidget(self.snapshot_tree)
+        splitter.addWidget(self.site_tree)
+        splitter.setStretchFactor(1, 2)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    def set_data(self, data):
+        """Show MemoryProfileData *data* (or nothing if None)"""
+        self.data = data
+        self.snapshot_tree.clear()
+        self.site_tree.clear()
+        if data is None:
+            self.summary_label.clear()
+            return
+        self.summary_label.setText(
+            _("Peak memory usage: %s, %d snapshots in %.1f s") % (
+                format_size(data.peak), len(data.snapshots), data.duration))
+        previous_size = 0
+        for snapshot in data.snapshots:
+            item = QTreeWidgetItem(self.snapshot_tree)
+            item.setText(0, "%.1f s" % snapshot['time'])
+            item.setText(1, format_size(snapshot['size']))
+            item.setText(2, self.format_growth(snapshot['size'] -
+                                               previous_size))
+            item.setText(3, str(snapshot['count']))
+            previous_size = snapshot['size']
+        for column in range(self.snapshot_tree.columnCount()):
+            self.snapshot_tree.resizeColumnToContents(column)
+        if data.snapshots:
+            self.snapshot_tree.setCurrentItem(self.snapshot_tree.topLevelItem(
+                                                len(data.snapshots) - 1))
+
+    def show_sites(self, index):
+        """Show the allocation sites of snapshot *index*"""
+        self.site_tree.clear()
+        if self.data is None or index < 0:
+            return
+        for filename, line, size, count, growth in self.data.get_sites(index):
+            item = QTreeWidgetItem(self.site_tree)
+            item.setText(0, "%s:%d" % (osp.basename(filename), line))
+            item.setToolTip(0, "%s:%d" % (filename, line))
+            item.setData(0, Qt.UserRole, (filename, line))
+            item.setText(1, format_size(size))
+            item.setText(2, self.format_growth(growth))
+            if count is not None:
+                item.setText(3, str(count))
+        for column in range(self.site_tree.columnCount()):
+            self.site_tree.resizeColumnToContents(column)
+
+    def format_growth(self, size_diff):
+        """Return the text of a memory growth"""
+        if not size_diff:
+            return ''
+        return ('+' if size_diff > 0 else '') + format_size(size_diff)
+
+    def site_activated(self, item):
+        """Go to the line of an allocation site"""
+        filename, line = item.data(0, Qt.UserRole)
+        if not filename.startswith('<'):
+            self.sig_edit_goto.emit(filename, line, '')
@@ -25,11 +25,13 @@ from qtpy.compat import getopenfilename, getsavefilename
 from qtpy.QtCore import (QByteArray, QProcess, QProcessEnvironment, QTextCodec,
                          Qt, Signal)
 from qtpy.QtGui import QColor
-from qtpy.QtWidgets import (QApplication, QHBoxLayout, QLabel, QMessageBox,
+from qtpy.QtWidgets import (QApplication, QComboBox, QHBoxLayout, QLabel,
+                            QMessageBox, QScrollArea, QStackedWidget,
                             QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget)
 
 # Local imports
-from spyder.config.base import get_conf_path, get_translation
+from spyder.config.base import (get_conf_path, get_module_source_path,
+                                get_translation)
 from spyder.py3compat import getcwd, to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import (create_toolbutton, get_item_user_text,
@@ -38,6 +40,11 @@ from spyder.utils.programs import shell_split
 from spyder.widgets.comboboxes import PythonModulesComboBox
 from spyder.utils.misc import add_pathlist_to_PYTHONPATH
 from spyder.widgets.variableexplorer.texteditor import TextEditor
+from spyder_profiler.widgets.callgraph import CallGraph
+from spyder_profiler.widgets.flamegraph import FlameGraphWidget, SampleData
+from spyder_profiler.widgets.history import get_revision, ProfileHistory
+from spyder_profiler.widgets.memorygui import (MemoryProfileData,
+                                               MemoryProfileWidget)
 
 # This is needed for testing this module as a stand alone script
 try:
@@ -60,8 +67,16 @@ class ProfilerWidget(QWidget):
     Profiler widget
     """
     DATAPATH = get_conf_path('profiler.results')
+    SAMPLESPATH = get_conf_path('profiler.samples')
+    SAMPLERPATH = get_module_source_path('spyder_profiler', 'sampler.py')
+    HISTORYPATH = get_conf_path('profiler_history')
+    MEMORYPATH = get_conf_path('profiler.memory')
     VERSION = '0.0.1'
+    # Pages of the results stack
+    TREE_PAGE, FLAMEGRAPH_PAGE, MEMORY_PAGE = range(3)
     redirect_stdio = Signal(bool)
+    sig_line_hits = Signal(object, int)
+    sig_line_sizes = Signal(object, object)
     
     def __init__(self, parent, max_entries=100):
         QWidget.__init__(self, parent)
@@ -70,12 +85,32 @@ class ProfilerWidget(QWidget):
         
         self.output = None
         self.error_output = None
+
+        # Sampling mode: sample the stack (see spyder_profiler/sampler.py)
+        # every *sampling_interval* ms instead of running cProfile
+        self.sampling = False
+        self.sampling_interval = 5
+        self._sampling_run = False
+        self._start_time = 0
+
+        # Runs of each script, compared with the previous or baseline run
+        # depending on compare_combo
+        self.history = ProfileHistory(self.HISTORYPATH)
         
         self._last_wdir = None
         self._last_args = None
         self._last_pythonpath = None
         
         self.filecombo = PythonModulesComboBox(self)
+
+        self.mode_combo = QComboBox(self)
+        self.mode_combo.addItems([_("Deterministic"), _("Sampling")])
+        self.mode_combo.setToolTip(_("Deterministic profiling (cProfile) "
+                                     "times every function call, sampling "
+                                     "profiling regularly records the "
+                                     "running lines, with a low overhead"))
+        self.mode_combo.currentIndexChanged.connect(
+                                lambda index: self.set_sampling(index == 1))
         
         self.start_button = create_toolbutton(self, icon=ima.icon('run'),
                                     text=_("Profile"),
@@ -105,6 +140,15 @@ class ProfilerWidget(QWidget):
                                             triggered=self.show_log)
 
         self.datatree = ProfilerDataTree(self)
+        self.flamegraph = FlameGraphWidget(self)
+        flamegraph_area = QScrollArea(self)
+        flamegraph_area.setWidgetResizable(True)
+        flamegraph_area.setWidget(self.flamegraph)
+        self.stack = QStackedWidget(self)
+        self.stack.addWidget(self.datatree)
+        self.stack.addWidget(flamegraph_area)
+        self.memoryview = MemoryProfileWidget(self)
+        self.stack.addWidget(self.memoryview)
 
         self.collapse_button = create_toolbutton(self,
                                                  icon=ima.icon('collapse'),
@@ -132,9 +176,25 @@ class ProfilerWidget(QWidget):
                                               icon=ima.icon('editdelete'),
                                               triggered=self.clear)
 
+        self.compare_combo = QComboBox(self)
+        self.compare_combo.addItems([_("No comparison"),
+                                     _("Compare with previous run"),
+                                     _("Compare with baseline run")])
+        self.compare_combo.setToolTip(_("Compare each run with the previous "
+                                        "run or the baseline run of the "
+                                        "script, highlighting functions "
+                                        "whose time regressed"))
+        self.compare_combo.currentIndexChanged.connect(self.set_compare_mode)
+        self.baseline_button = create_toolbutton(self, text_beside_icon=True,
+                            text=_("Set as baseline"),
+                            icon=ima.icon('filesave'),
+                            triggered=self.set_baseline,
+                            tip=_('Compare next runs with the last run'))
+
         hlayout1 = QHBoxLayout()
         hlayout1.addWidget(self.filecombo)
         hlayout1.addWidget(browse_button)
+        hlayout1.addWidget(self.mode_combo)
         hlayout1.addWidget(self.start_button)
         hlayout1.addWidget(self.stop_button)
 
@@ -145,6 +205,8 @@ class ProfilerWidget(QWidget):
         hlayout2.addWidget(self.datelabel)
         hlayout2.addStretch()
         hlayout2.addWidget(self.log_button)
+        hlayout2.addWidget(self.compare_combo)
+        hlayout2.addWidget(self.baseline_button)
         hlayout2.addWidget(self.save_button)
         hlayout2.addWidget(self.load_button)
         hlayout2.addWidget(self.clear_button)
@@ -152,13 +214,14 @@ class ProfilerWidget(QWidget):
         layout = QVBoxLayout()
         layout.addLayout(hlayout1)
         layout.addLayout(hlayout2)
-        layout.addWidget(self.datatree)
+        layout.addWidget(self.stack)
         self.setLayout(layout)
         
         self.process = None
         self.set_running_state(False)
         self.start_button.setEnabled(False)
         self.clear_button.setEnabled(False)
+        self.baseline_button.setEnabled(False)
 
         if not is_profiler_installed():
             # This should happen only on certain GNU/Linux distributions 
@@ -174,6 +237,26 @@ class ProfilerWidget(QWidget):
         else:
             pass # self.show_data()
             
+    def set_sampling(self, state):
+        """Set sampling mode, used by the next profiling"""
+        self.sampling = state
+        self.mode_combo.setCurrentIndex(1 if state else 0)
+
+    def set_view(self, page):
+        """
+        Show the tree of cProfile data, the flame graph of samples or memory
+        snapshots (see TREE_PAGE, FLAMEGRAPH_PAGE and MEMORY_PAGE)
+        """
+        self.stack.setCurrentIndex(page)
+        tree = page == self.TREE_PAGE
+        for widget in (self.collapse_button, self.expand_button,
+                       self.save_button, self.load_button,
+                       self.compare_combo):
+            widget.setEnabled(tree)
+        self.baseline_button.setEnabled(tree and bool(self.get_runs()))
+        self.clear_button.setEnabled(tree and
+                                     self.datatree.compare_file is not None)
+
     def save_data(self):
         """Save data"""
         title = _( "Save profiler result")
@@ -187,16 +270,71 @@ class ProfilerWidget(QWidget):
         filename, _selfilter = getopenfilename(self, _("Select script to compare"),
                                                getcwd(), _("Profiler result")+" (*.Result)")
         if filename:
+            self.set_compare_combo(0)
             self.datatree.compare(filename)
             self.show_data()
             self.clear_button.setEnabled(True)
 
     def clear(self):
+        self.set_compare_combo(0)
         self.datatree.compare(None)
         self.datatree.hide_diff_cols(True)
         self.show_data()
         self.clear_button.setEnabled(False)
 
+    def set_compare_combo(self, index):
+        """Set comparison mode combo index without comparing"""
+        self.compare_combo.blockSignals(True)
+        self.compare_combo.setCurrentIndex(index)
+        self.compare_combo.blockSignals(False)
+
+    def set_compare_mode(self, index):
+        """
+        Compare data with the previous run (index 1), the baseline run
+        (index 2) or nothing (index 0)
+        """
+        if index == 0:
+            if self.datatree.compare_file is not None:
+                self.clear()
+        elif self.datatree.graph is not None:
+            self.compare_with_history()
+            self.show_data()
+
+    def get_runs(self):
+        """Return the runs of the current script (see ProfileHistory)"""
+        filename = to_text_string(self.filecombo.currentText())
+        return self.history.get_runs(filename) if filename else []
+
+    def add_run(self):
+        """Add the last run of the current script to its history"""
+        filename = to_text_string(self.filecombo.currentText())
+        if osp.isfile(self.DATAPATH) and \
+          osp.getmtime(self.DATAPATH) >= self._start_time:
+            self.history.add_run(filename, self.DATAPATH, self._last_args,
+                                 get_revision(filename))
+
+    def set_baseline(self):
+        """Make the last run of the current script the baseline run"""
+        runs = self.get_runs()
+        if runs:
+            filename = to_text_string(self.filecombo.currentText())
+            self.history.set_baseline(filename, runs[-1]['id'])
+
+    def compare_with_history(self):
+        """Compare data with the run chosen in compare_combo, if any"""
+        filename = to_text_string(self.filecombo.currentText())
+        if self.compare_combo.currentIndex() == 1:
+            run = self.history.get_previous_run(filename)
+        else:
+            run = self.history.get_baseline_run(filename)
+        if run is None:
+            self.datatree.compare(None)
+            self.datatree.hide_diff_cols(True)
+            self.clear_button.setEnabled(False)
+        else:
+            self.datatree.compare(self.history.get_data_path(filename, run))
+            self.clear_button.setEnabled(True)
+
     def analyze(self, filename, wdir=None, args=None, pythonpath=None):
         if not is_profiler_installed():
             return
@@ -249,6 +387,7 @@ class ProfilerWidget(QWidget):
         self._last_pythonpath = pythonpath
         
         self.datelabel.setText(_('Profiling, please wait...'))
+        self.sig_line_hits.emit({}, 0)
         
         self.process = QProcess(self)
         self.process.setProcessChannelMode(QProcess.SeparateChannels)
@@ -273,7 +412,16 @@ class ProfilerWidget(QWidget):
         self.output = ''
         self.error_output = ''
         
-        p_args = ['-m', 'cProfile', '-o', self.DATAPATH]
+        self._sampling_run = self.sampling
+        self._start_time = time.time()
+        if self.sampling:
+            # Don't show samples of a previous run if this one is stopped
+            if osp.isfile(self.SAMPLESPATH):
+                os.remove(self.SAMPLESPATH)
+            p_args = [self.SAMPLERPATH, '-i', str(self.sampling_interval),
+                      '-o', self.SAMPLESPATH]
+        else:
+            p_args = ['-m', 'cProfile', '-o', self.DATAPATH]
         if os.name == 'nt':
             # On Windows, one has to replace backslashes by slashes to avoid 
             # confusion with escape characters (otherwise, for example, '\t' 
@@ -320,6 +468,11 @@ class ProfilerWidget(QWidget):
         self.set_running_state(False)
         self.show_errorlog()  # If errors occurred, show them.
         self.output = self.error_output + self.output
+        if self._sampling_run:
+            self.show_samples()
+            return
+        if exit_status == QProcess.NormalExit:
+            self.add_run()
         # FIXME: figure out if show_data should be called here or
         #        as a signal from the combobox
         self.show_data(justanalyzed=True)
@@ -343,9 +496,55 @@ class ProfilerWidget(QWidget):
         self.datelabel.setText(_('Sorting data, please wait...'))
         QApplication.processEvents()
         
-        self.datatree.load_data(self.DATAPATH)
+        self.set_view(self.TREE_PAGE)
+        # Data is only loaded again when changed (not when compared)
+        if justanalyzed or self.datatree.graph is None:
+            self.datatree.load_data(self.DATAPATH)
+            if self.compare_combo.currentIndex() != 0:
+                self.compare_with_history()
         self.datatree.show_tree()
-            
+        self.baseline_button.setEnabled(bool(self.get_runs()))
+        self.show_date()
+        if self.datatree.compared_stats is not None:
+            regressions = len(self.datatree.regressions)
+            if regressions:
+                text = _("%d functions regressed") % regressions
+                self.datelabel.setText(self.datelabel.text() +
+                                       " <span style='color: #cc0000'>"
+                                       "%s</span>" % text)
+
+    def show_samples(self):
+        """Show the flame graph and line hits of sampling results"""
+        self.log_button.setEnabled(bool(self.output))
+        self.set_view(self.FLAMEGRAPH_PAGE)
+        try:
+            data = SampleData.load(self.SAMPLESPATH)
+        except (IOError, OSError, ValueError, KeyError):
+            self.flamegraph.set_data(None)
+            self.datelabel.setText(_('No samples were saved'))
+            return
+        self.flamegraph.set_data(data)
+        self.sig_line_hits.emit(data.get_line_hits(), data.total)
+        self.show_date()
+
+    def show_memory_profile(self, filename=None):
+        """
+        Show the memory snapshots saved in *filename* (MEMORYPATH by
+        default) by runfile, and the memory allocated by each line
+        """
+        self.set_view(self.MEMORY_PAGE)
+        try:
+            data = MemoryProfileData.load(filename or self.MEMORYPATH)
+        except (IOError, OSError, ValueError, KeyError):
+            self.memoryview.set_data(None)
+            self.datelabel.setText(_('No memory snapshots were saved'))
+            return
+        self.memoryview.set_data(data)
+        self.sig_line_sizes.emit(data.get_line_sizes(), data.peak)
+        self.show_date()
+
+    def show_date(self):
+        """Show the date of results"""
         text_style = "<span style=\'color: #444444\'><b>%s </b></span>"
         date_text = text_style % time.strftime("%d %b %Y %H:%M",
                                                time.localtime())
@@ -355,6 +554,8 @@ class ProfilerWidget(QWidget):
 class TreeWidgetItem( QTreeWidgetItem ):
     def __init__(self, parent=None):
         QTreeWidgetItem.__init__(self, parent)
+        # Index of the function in the call graph
+        self.function = None
     
     def __lt__(self, otherItem):
         column = self.treeWidget().sortColumn()
@@ -399,7 +600,13 @@ class ProfilerDataTree(QTreeWidget):
                          'constructor': ima.icon('class')}
         self.profdata = None   # To be filled by self.load_data()
         self.stats = None      # To be filled by self.load_data()
-        self.item_depth = None
+        self.graph = None      # To be filled by self.load_data()
+        self.compare_graph = None
+        self.compared_stats = None
+        # Functions whose cumulative time is longer than in compared data,
+        # by more than *regression_threshold* (relative)
+        self.regressions = set()
+        self.regression_threshold = 0.1
         self.item_list = None
         self.items_to_be_shown = None
         self.current_view_depth = None
@@ -422,51 +629,53 @@ class ProfilerDataTree(QTreeWidget):
     def initialize_view(self):
         """Clean the tree and view parameters"""
         self.clear()
-        self.item_depth = 0   # To be use for collapsing/expanding one level
         self.item_list = []  # To be use for collapsing/expanding one level
         self.items_to_be_shown = {}
         self.current_view_depth = 0
 
     def load_data(self, profdatafile):
         """Load profiler data saved by profile/cProfile module"""
-        import pstats
-        stats_indi = [pstats.Stats(profdatafile),]
-        self.profdata = stats_indi[0]
-        
-        if self.compare_file is not None:
-            stats_indi.append(pstats.Stats(self.compare_file))
-        map(lambda x: x.calc_callees(), stats_indi)
-        self.profdata.calc_callees()
-        self.stats1 = stats_indi
-        self.stats = stats_indi[0].stats
-        
-    def compare(self,filename):
+        self.graph = CallGraph.load(profdatafile)
+        self.profdata = self.graph.stats
+        self.stats = self.profdata.stats
+        self.update_compared_stats()
+
+    def compare(self, filename):
+        """Compare data with profiler data saved in *filename* (or None)"""
         self.hide_diff_cols(False)
+        if filename is None:
+            self.compare_graph = None
+        elif filename != self.compare_file or self.compare_graph is None:
+            self.compare_graph = CallGraph.load(filename)
         self.compare_file = filename
-        
+        self.update_compared_stats()
+
+    def update_compared_stats(self):
+        """Align the statistics of compared data with data"""
+        if self.graph is None or self.compare_graph is None:
+            self.compared_stats = None
+            self.regressions = set()
+        else:
+            self.compared_stats = self.graph.get_compared_stats(
+                                                        self.compare_graph)
+            self.regressions = self.graph.get_regressions(
+                            self.compared_stats[2], self.regression_threshold)
+
     def hide_diff_cols(self, hide):
         for i in (2,4,6):
             self.setColumnHidden(i, hide)
     
     def save_data(self, filename):
         """"""
-        self.stats1[0].dump_stats(filename)
+        self.profdata.dump_stats(filename)
 
     def find_root(self):
         """Find a function without a caller"""
-        self.profdata.sort_stats("cumulative")
-        for func in self.profdata.fcn_list:
-            if ('~', 0) != func[0:2] and not func[2].startswith(
-                    '<built-in method exec>'):
-                # This skips the profiler function at the top of the list
-                # it does only occur in Python 3
-                return func
+        return self.graph.find_root()
     
     def find_callees(self, parent):
         """Find all functions called by (parent) function."""
-        # FIXME: This implementation is very inneficient, because it
-        #        traverses all the data to find children nodes (callees)
-        return self.profdata.all_callees[parent]
+        return self.graph.callees[parent]
 
     def show_tree(self):
         """Populate the tree with profiler data and display it."""
@@ -474,7 +683,7 @@ class ProfilerDataTree(QTreeWidget):
         self.setItemsExpandable(True)
         self.setSortingEnabled(False)
         rootkey = self.find_root()  # This root contains profiler overhead
-        if rootkey:
+        if rootkey is not None:
             self.populate_tree(self, self.find_callees(rootkey))
             self.resizeColumnToContents(0)
             self.setSortingEnabled(True)
@@ -545,23 +754,29 @@ class ProfilerDataTree(QTreeWidget):
 
     def format_output(self, child_key):
         """ Formats the data"""
-        if True:
-            data = [x.stats.get(child_key, [0,0,0,0,0]) for x in self.stats1]
-            format_data = zip(list(zip(*data))[1:4],
-                              [["%s"]*2, ["%s", "%s"], ["%s", "%s"]])
-            return (map(self.color_string, format_data))
+        graph = self.graph
+        data = [[graph.calls[child_key]], [graph.local_times[child_key]],
+                [graph.cumulative_times[child_key]]]
+        if self.compared_stats is not None:
+            for values, compared in zip(data, self.compared_stats):
+                values.append(compared[child_key])
+        format_data = zip(data, [["%s"]*2, ["%s", "%s"], ["%s", "%s"]])
+        return (map(self.color_string, format_data))
             
     def populate_tree(self, parentItem, children_list):
-        """Recursive method to create each item (and associated data) in the tree."""
+        """
+        Create the items (and associated data) of functions *children_list*
+        in the tree, their own children being created when expanded
+        """
         for child_key in children_list:
-            self.item_depth += 1
             (filename, line_number, function_name, file_and_line, node_type
-             ) = self.function_info(child_key)
+             ) = self.function_info(self.graph.functions[child_key])
 
             ((total_calls, total_calls_dif), (loc_time, loc_time_dif), (cum_time,
              cum_time_dif)) = self.format_output(child_key)
 
             child_item = TreeWidgetItem(parentItem)
+            child_item.function = child_key
             self.item_list.append(child_item)
             self.set_item_data(child_item, filename, line_number)
 
@@ -602,18 +817,20 @@ class ProfilerDataTree(QTreeWidget):
             child_item.setToolTip(7, _('File:line '\
                                        'where function is defined'))
             child_item.setData(7, Qt.DisplayRole, file_and_line)
+            if child_key in self.regressions:
+                for column in range(len(self.header_list)):
+                    child_item.setBackground(column, QColor(255, 215, 215))
+                child_item.setToolTip(1, _('Time in function (including '
+                                           'sub-functions), which regressed'))
             #child_item.setExpanded(True)
             if self.is_recursive(child_item):
                 child_item.setData(7, Qt.DisplayRole, '(%s)' % _('recursion'))
                 child_item.setDisabled(True)
             else:
                 callees = self.find_callees(child_key)
-                if self.item_depth < 3:
-                    self.populate_tree(child_item, callees)
-                elif callees:
+                if callees:
                     child_item.setChildIndicatorPolicy(child_item.ShowIndicator)
                     self.items_to_be_shown[id(child_item)] = callees
-            self.item_depth -= 1
         
     def item_activated(self, item):
         filename, line_number = self.get_item_data(item)
@@ -627,12 +844,8 @@ class ProfilerDataTree(QTreeWidget):
     def is_recursive(self, child_item):
         """Returns True is a function is a descendant of itself."""
         ancestor = child_item.parent()
-        # FIXME: indexes to data should be defined by a dictionary on init
         while ancestor:
-            if (child_item.data(0, Qt.DisplayRole
-                                ) == ancestor.data(0, Qt.DisplayRole) and
-                child_item.data(4, Qt.DisplayRole
-                                ) == ancestor.data(4, Qt.DisplayRole)):
+            if child_item.function == ancestor.function:
                 return True
             else:
                 ancestor = ancestor.parent()
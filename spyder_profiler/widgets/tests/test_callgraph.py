@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for the profiler call graph and data tree."""
+
+# Standard library imports
+import cProfile
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.qthelpers import qapplication
+
+# The plugin has to be imported after spyder.plugins (circular imports) and
+# once a QApplication exists (icons are created on import)
+app = qapplication()
+import spyder.plugins  # analysis:ignore
+from spyder_profiler.widgets.callgraph import CallGraph
+from spyder_profiler.widgets.profilergui import ProfilerDataTree
+
+
+def leaf(n):
+    return sum(range(n))
+
+
+def branch(n):
+    return leaf(n) + leaf(2 * n)
+
+
+def trunk(n):
+    for _i in range(n):
+        branch(n)
+
+
+def profile(tmpdir, name, n):
+    """Profile trunk(n) and return the data file"""
+    filename = str(tmpdir.join(name))
+    profiler = cProfile.Profile()
+    profiler.runcall(trunk, n)
+    profiler.dump_stats(filename)
+    return filename
+
+
+def get_function(graph, name):
+    """Return the index of function *name* in *graph*"""
+    for index, func in enumerate(graph.functions):
+        if func[2] == name:
+            return index
+
+
+def test_call_graph(tmpdir):
+    """Build the call graph of profiler data and compare it."""
+    graph = CallGraph.load(profile(tmpdir, 'data.prof', 10))
+    root = graph.find_root()
+    assert graph.functions[root][2] == 'trunk'
+
+    branch_index = get_function(graph, 'branch')
+    leaf_index = get_function(graph, 'leaf')
+    assert branch_index in graph.callees[root]
+    assert graph.callees[branch_index] == [leaf_index]
+    assert graph.callers[leaf_index] == [branch_index]
+    assert graph.calls[branch_index] == 10
+    assert graph.calls[leaf_index] == 20
+
+    other = CallGraph.load(profile(tmpdir, 'other.prof', 5))
+    calls, local_times, cumulative_times = graph.get_compared_stats(other)
+    assert calls[leaf_index] == 10
+    assert len(local_times) == len(cumulative_times) == len(graph.functions)
+
+    # Only functions taking longer than in other are regressions
+    regressions = graph.get_regressions(cumulative_times, min_time=0)
+    assert root in regressions
+    assert not other.get_regressions(other.cumulative_times, threshold=0,
+                                     min_time=0)
+
+
+def test_lazy_tree(qtbot, tmpdir):
+    """Create items of the tree when they are expanded."""
+    tree = ProfilerDataTree(None)
+    qtbot.addWidget(tree)
+    tree.load_data(profile(tmpdir, 'data.prof', 10))
+    tree.show_tree()
+
+    # Top level items and their children are created, not the next level
+    item = [item for item in tree.get_top_level_items()
+            if item.text(0) == 'branch'][0]
+    assert item.isExpanded()
+    assert item.childCount() == 1
+    child = item.child(0)
+    assert child.text(0) == 'leaf'
+    assert child.childCount() == 0
+
+    # Compared data is shown in diff columns
+    tree.compare(profile(tmpdir, 'other.prof', 5))
+    tree.show_tree()
+    item = [item for item in tree.get_top_level_items()
+            if item.text(0) == 'branch'][0]
+    assert item.text(5) == '10'
+    assert item.text(6) == '+5'
+
+
+if __name__ == "__main__":
+    pytest.main()
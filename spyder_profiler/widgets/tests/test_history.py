@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for the history of profiler runs."""
+
+# Standard library imports
+import os.path as osp
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.qthelpers import qapplication
+
+# The plugin has to be imported after spyder.plugins (circular imports) and
+# once a QApplication exists (icons are created on import)
+app = qapplication()
+import spyder.plugins  # analysis:ignore
+from spyder_profiler.widgets.history import get_revision, ProfileHistory
+from spyder_profiler.widgets.profilergui import ProfilerWidget
+
+
+def test_history(tmpdir):
+    """Add runs, keeping the baseline run."""
+    history = ProfileHistory(str(tmpdir.join('history')), max_runs=3)
+    script = str(tmpdir.join('script.py'))
+    datafile = tmpdir.join('data.prof')
+
+    assert history.get_runs(script) == []
+    assert history.get_previous_run(script) is None
+    for index in range(5):
+        datafile.write('data%d' % index)
+        run = history.add_run(script, str(datafile), args='-v')
+        if index == 0:
+            history.set_baseline(script, run['id'])
+
+    runs = history.get_runs(script)
+    assert [run['id'] for run in runs] == [1, 4, 5]
+    assert runs[-1]['args'] == '-v'
+    assert history.get_previous_run(script)['id'] == 4
+    baseline = history.get_baseline_run(script)
+    assert baseline['id'] == 1
+    with open(history.get_data_path(script, baseline)) as data:
+        assert data.read() == 'data0'
+    assert not osp.isfile(osp.join(history.get_script_dir(script),
+                                   'run2.prof'))
+
+    # Runs of other scripts are kept apart
+    assert history.get_runs(str(tmpdir.join('other.py'))) == []
+
+
+def test_get_revision(tmpdir):
+    """Get the revision of files out of repositories."""
+    assert get_revision(str(tmpdir.join('script.py'))) is None
+
+
+def test_compare_with_previous_run(qtbot, tmpdir, monkeypatch):
+    """Compare each run with the previous one."""
+    monkeypatch.setattr(ProfilerWidget, 'DATAPATH',
+                        str(tmpdir.join('profiler.results')))
+    monkeypatch.setattr(ProfilerWidget, 'HISTORYPATH',
+                        str(tmpdir.join('history')))
+    script = tmpdir.join('script.py')
+    script.write('print(sum(range(1000)))')
+    widget = ProfilerWidget(None)
+    qtbot.addWidget(widget)
+    widget.set_compare_combo(1)
+    widget.filecombo.addItem(str(script))
+    widget.filecombo.setCurrentIndex(0)
+
+    for count in (1, 2):
+        widget.start(wdir=str(tmpdir))
+        qtbot.waitUntil(lambda: len(widget.get_runs()) == count,
+                        timeout=20000)
+    assert widget.datatree.compare_file == widget.history.get_data_path(
+        str(script), widget.get_runs()[0])
+    assert widget.datatree.compared_stats is not None
+    assert widget.baseline_button.isEnabled()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for the memory profiler results."""
+
+# Standard library imports
+import json
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.qthelpers import qapplication
+
+# The plugin has to be imported after spyder.plugins (circular imports) and
+# once a QApplication exists (icons are created on import)
+app = qapplication()
+import spyder.plugins  # analysis:ignore
+from spyder_profiler.widgets.memorygui import (MemoryProfileData,
+                                               MemoryProfileWidget)
+from spyder_profiler.widgets.profilergui import ProfilerWidget
+
+
+DATA = {
+    'version': 1, 'interval': 1., 'duration': 2.5, 'peak': 3000000,
+    'snapshots': [
+        {'time': 1., 'size': 1000000, 'count': 10,
+         'top': [['/a.py', 3, 1000000, 10]],
+         'growth': [['/a.py', 3, 1000000, 1000000]]},
+        {'time': 2., 'size': 2500000, 'count': 25,
+         'top': [['/a.py', 3, 1500000, 15], ['/b.py', 7, 1000000, 10]],
+         'growth': [['/b.py', 7, 1000000, 1000000],
+                    ['/a.py', 3, 500000, 1500000],
+                    ['/c.py', 1, 1000, 2000]]}],
+    'lines': {'/a.py': [[3, 1500000]], '/b.py': [[7, 1000000]]}}
+
+
+@pytest.fixture
+def datafile(tmpdir):
+    filename = tmpdir.join('memory.json')
+    filename.write(json.dumps(DATA))
+    return str(filename)
+
+
+def test_memory_data(datafile):
+    """Read memory snapshots and their allocation sites."""
+    data = MemoryProfileData.load(datafile)
+    assert data.peak == 3000000
+    assert data.get_line_sizes() == {'/a.py': {3: 1500000},
+                                     '/b.py': {7: 1000000}}
+    assert data.get_sites(1) == [('/a.py', 3, 1500000, 15, 500000),
+                                 ('/b.py', 7, 1000000, 10, 1000000),
+                                 ('/c.py', 1, 2000, None, 1000)]
+
+
+def test_memory_widget(qtbot, datafile):
+    """Show snapshots and go to allocation sites."""
+    widget = MemoryProfileWidget()
+    qtbot.addWidget(widget)
+    widget.set_data(MemoryProfileData.load(datafile))
+    assert widget.snapshot_tree.topLevelItemCount() == 2
+    assert widget.snapshot_tree.topLevelItem(1).text(2) == '+1.4M'
+    # The last snapshot is selected
+    assert widget.site_tree.topLevelItemCount() == 3
+
+    widget.snapshot_tree.setCurrentItem(widget.snapshot_tree.topLevelItem(0))
+    assert widget.site_tree.topLevelItemCount() == 1
+    item = widget.site_tree.topLevelItem(0)
+    assert item.text(0) == 'a.py:3'
+    with qtbot.waitSignal(widget.sig_edit_goto) as blocker:
+        widget.site_activated(item)
+    assert blocker.args == ['/a.py', 3, '']
+
+
+def test_profiler_memory(qtbot, datafile):
+    """Show memory snapshots and line sizes in the profiler."""
+    widget = ProfilerWidget(None)
+    qtbot.addWidget(widget)
+    line_sizes = []
+    widget.sig_line_sizes.connect(
+        lambda sizes, peak: line_sizes.append((sizes, peak)))
+    widget.show_memory_profile(datafile)
+    assert widget.stack.currentIndex() == widget.MEMORY_PAGE
+    assert not widget.save_button.isEnabled()
+    assert line_sizes[-1][1] == 3000000
+    assert line_sizes[-1][0]['/b.py'] == {7: 1000000}
+
+    widget.show_memory_profile(datafile + '.missing')
+    assert widget.memoryview.data is None
+
+
+if __name__ == "__main__":
+    pytest.main()
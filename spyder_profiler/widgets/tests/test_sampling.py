@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for the sampling profiler."""
+
+# Standard library imports
+import os.path as osp
+import subprocess
+import sys
+
+# Test library imports
+import pytest
+from qtpy.QtCore import QPoint
+
+# Local imports
+from spyder.utils.qthelpers import qapplication
+
+# The plugin has to be imported after spyder.plugins (circular imports) and
+# once a QApplication exists (icons are created on import)
+app = qapplication()
+import spyder.plugins  # analysis:ignore
+from spyder_profiler.widgets.flamegraph import FlameGraphWidget, SampleData
+from spyder_profiler.widgets.profilergui import ProfilerWidget
+
+
+SCRIPT = """
+import sys
+
+def inner(n):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+def outer():
+    for _i in range(30):
+        inner(100000)
+
+outer()
+sys.exit(3)
+"""
+
+
+@pytest.fixture
+def script(tmpdir):
+    filename = tmpdir.join('script.py')
+    filename.write(SCRIPT)
+    return str(filename)
+
+
+def test_sampler(script, tmpdir):
+    """Run a script with the sampler and read its samples."""
+    output = str(tmpdir.join('samples.json'))
+    exit_code = subprocess.call([sys.executable,
+                                 ProfilerWidget.SAMPLERPATH, '-i', '1',
+                                 '-o', output, script])
+    assert exit_code == 3
+    data = SampleData.load(output)
+    assert data.total > 0
+
+    root = data.get_call_tree()
+    assert root.hits == data.total
+    module, = root.children.values()
+    assert module.name == '<module>'
+    assert module.filename == osp.normpath(script)
+    outer = module.get_child(module.filename, 10, 'outer')
+    inner = outer.get_child(module.filename, 4, 'inner')
+    assert inner.hits > 0.5 * data.total
+    assert inner.self_hits == inner.hits
+
+    line_hits = data.get_line_hits()[module.filename]
+    assert line_hits[12] == outer.hits
+    assert line_hits[14] == module.hits
+    assert sum(line_hits.get(line, 0) for line in (5, 6, 7, 8)) \
+        == inner.hits
+
+
+def test_call_tree_and_line_hits():
+    """Compute the call tree and line hits of samples."""
+    main = ['a.py', 1, '<module>', 10]
+    samples = [[[main, ['a.py', 2, 'f', 3]], 3],
+               [[main, ['a.py', 2, 'f', 4], ['a.py', 2, 'f', 3]], 2],
+               [[main, ['<string>', 1, 'g', 1]], 1]]
+    data = SampleData(samples)
+    root = data.get_call_tree()
+    assert root.hits == 6
+    module = root.get_child('a.py', 1, '<module>')
+    assert module.hits == 6
+    assert module.self_hits == 0
+    func = module.get_child('a.py', 2, 'f')
+    assert func.hits == 5
+    assert func.self_hits == 3
+    assert func.get_child('a.py', 2, 'f').self_hits == 2
+    assert root.get_depth() == 3
+    assert [node.name for node in module.sorted_children()] == ['f', 'g']
+    # Recursive calls are counted once by line
+    assert data.get_line_hits() == {'a.py': {10: 6, 3: 5, 4: 2}}
+
+
+def test_flamegraph(qtbot):
+    """Zoom on functions of the flame graph."""
+    main = ['a.py', 1, '<module>', 10]
+    data = SampleData([[[main, ['a.py', 2, 'f', 3]], 3],
+                       [[main, ['a.py', 5, 'g', 6]], 1]])
+    widget = FlameGraphWidget()
+    qtbot.addWidget(widget)
+    widget.resize(400, 100)
+    widget.set_data(data)
+    row_height = widget.ROW_HEIGHT
+    assert widget.get_node_at(QPoint(10, row_height // 2)) is widget.root
+    node_f = widget.get_node_at(QPoint(10, row_height * 5 // 2))
+    assert node_f.name == 'f'
+    assert widget.get_node_at(QPoint(350, row_height * 5 // 2)).name == 'g'
+
+    widget.zoom(node_f)
+    # Callers are drawn above the zoomed function, with the full width
+    assert widget.get_node_at(QPoint(350, row_height // 2)) is widget.root
+    assert widget.get_node_at(QPoint(350, row_height * 5 // 2)) is node_f
+
+    with qtbot.waitSignal(widget.sig_edit_goto) as blocker:
+        qtbot.mouseDClick(widget, 1, pos=QPoint(10, row_height * 5 // 2))
+    assert blocker.args == ['a.py', 2, '']
+
+
+def test_profiler_sampling(qtbot, script, tmpdir, monkeypatch):
+    """Profile a script in sampling mode."""
+    monkeypatch.setattr(ProfilerWidget, 'SAMPLESPATH',
+                        str(tmpdir.join('samples.json')))
+    widget = ProfilerWidget(None)
+    qtbot.addWidget(widget)
+    widget.set_sampling(True)
+    assert widget.mode_combo.currentIndex() == 1
+    line_hits = []
+    widget.sig_line_hits.connect(lambda hits, total: line_hits.append(hits))
+    widget.filecombo.addItem(script)
+    widget.filecombo.setCurrentIndex(0)
+    widget.start(wdir=str(tmpdir))
+    qtbot.waitUntil(lambda: bool(line_hits and line_hits[-1]),
+                    timeout=20000)
+    assert widget.stack.currentIndex() == 1
+    assert not widget.save_button.isEnabled()
+    assert widget.flamegraph.root.hits > 0
+    assert osp.normpath(script) in line_hits[-1]
+
+
+if __name__ == "__main__":
+    pytest.main()
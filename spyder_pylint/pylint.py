@@ -143,7 +143,13 @@ class Pylint(SpyderPluginWidget):
         self.register_shortcut(pylint_act, context="Pylint",
                                name="Run analysis")
         
-        self.main.source_menu_actions += [MENU_SEPARATOR, pylint_act]
+        project_act = create_action(self,
+                                    _("Run static code analysis on project"),
+                                    triggered=self.run_project_pylint)
+        project_act.setEnabled(is_module_installed('pylint', '>=1.4'))
+
+        self.main.source_menu_actions += [MENU_SEPARATOR, pylint_act,
+                                          project_act]
         self.main.editor.pythonfile_dependent_actions += [pylint_act]
 
     def refresh_plugin(self):
@@ -178,6 +184,23 @@ class Pylint(SpyderPluginWidget):
            and not self.main.editor.save():
             return
         self.analyze( self.main.editor.get_current_filename() )
+
+    @Slot()
+    def run_project_pylint(self):
+        """Run pylint code analysis on the active project (or on the
+        directory of the current file if there's no project)"""
+        path = None
+        if self.main.projects is not None:
+            path = self.main.projects.get_active_project_path()
+        if path is None:
+            path = osp.dirname(self.main.editor.get_current_filename())
+        if self.get_option('save_before', True):
+            self.main.editor.save_all()
+        if self.dockwidget and not self.ismaximized:
+            self.dockwidget.setVisible(True)
+            self.dockwidget.setFocus()
+            self.dockwidget.raise_()
+        self.pylint.analyze_project(path)
         
     def analyze(self, filename):
         """Reimplement analyze method"""
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Project analysis with pylint
+
+The Python files of a project are analyzed by several pylint processes in
+parallel, using pylint's JSON reporter. Messages of each file are cached
+under the hash of its content and of the pylintrc file, so that only
+changed files are analyzed again.
+
+Messages depending on other files (e.g. members of imported modules)
+aren't updated when only those files change.
+"""
+
+# Standard library imports
+import codecs
+import hashlib
+import json
+import os
+import os.path as osp
+import shutil
+import sys
+
+# Third party imports
+from qtpy.QtCore import QByteArray, QObject, QProcess, QThread, Signal
+
+# Local imports
+from spyder.py3compat import to_text_string
+
+
+# Directories which are never analyzed
+EXCLUDED_DIRS = ('__pycache__', 'build', 'dist', 'node_modules')
+
+
+def get_python_files(path):
+    """Return the Python files of project *path*, hidden ones aside"""
+    filenames = []
+    for dirpath, dirnames, names in os.walk(path):
+        dirnames[:] = sorted(name for name in dirnames
+                             if not name.startswith('.')
+                             and name not in EXCLUDED_DIRS)
+        filenames += [osp.join(dirpath, name) for name in sorted(names)
+                      if name.endswith(('.py', '.pyw'))
+                      and not name.startswith('.')]
+    return filenames
+
+
+def find_pylintrc(path):
+    """
+    Return the pylintrc file used to analyze project *path* (as pylint
+    finds it), or None
+    """
+    candidates = [osp.join(path, 'pylintrc'), osp.join(path, '.pylintrc')]
+    if os.environ.get('PYLINTRC'):
+        candidates.append(os.environ['PYLINTRC'])
+    candidates += [osp.join(osp.expanduser('~'), '.pylintrc'),
+                   osp.join(osp.expanduser('~'), '.config', 'pylintrc'),
+                   '/etc/pylintrc']
+    for filename in candidates:
+        if osp.isfile(filename):
+            return filename
+    return None
+
+
+def get_file_hash(filename):
+    """Return the hash of the content of *filename* ('' if unreadable)"""
+    try:
+        with open(filename, 'rb') as source:
+            return hashlib.sha1(source.read()).hexdigest()
+    except (IOError, OSError):
+        return ''
+
+
+class LintCache(object):
+    """
+    On-disk LRU cache of pylint messages of files
+
+    Each entry is a file named after the hash of the analyzed file path
+    (relative to its project, as messages depend on module names), of its
+    content and of the pylint configuration (see get_key). Its modification
+    time is updated when it's read, so that the least recently used entries
+    are removed when there are more than *max_entries*.
+    """
+
+    def __init__(self, directory, max_entries=5000):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    @staticmethod
+    def get_key(relpath, file_hash, config_hash):
+        """
+        Return the key of the messages of a file, *relpath* being its path
+        relative to its project
+        """
+        relpath = osp.normcase(relpath).replace(os.sep, '/')
+        return hashlib.sha1((relpath + '\0' + file_hash + config_hash
+                             ).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the messages cached under *key*, or None"""
+        filename = osp.join(self.directory, key)
+        try:
+            with codecs.open(filename, 'r', encoding='utf-8') as cache_file:
+                messages = json.load(cache_file)
+            os.utime(filename, None)
+        except (IOError, OSError, ValueError):
+            return None
+        return messages
+
+    def set(self, key, messages):
+        """Cache *messages* under *key*"""
+        try:
+            if not osp.isdir(self.directory):
+                os.makedirs(self.directory)
+            with codecs.open(osp.join(self.directory, key), 'w',
+                             encoding='utf-8') as cache_file:
+                json.dump(messages, cache_file)
+        except (IOError, OSError):
+            pass
+
+    def clear(self):
+        """Remove all entries"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def evict(self):
+        """Remove the least recently used entries in excess"""
+        try:
+            filenames = [osp.join(self.directory, name)
+                         for name in os.listdir(self.directory)]
+        except OSError:
+            return
+        if len(filenames) <= self.max_entries:
+            return
+        filenames.sort(key=osp.getmtime)
+        for filename in filenames[:len(filenames) - self.max_entries]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+class ProjectLinter(QObject):
+    """
+    Pylint analysis of all the Python files of a project
+
+    Files whose messages aren't cached are analyzed by batches of at most
+    BATCH_SIZE files, in at most *jobs* pylint processes at a time (by
+    default, one per processor). sig_progress is emitted when a batch is
+    analyzed, and sig_finished with the messages of all the files
+    ({filename: [message]}, messages being dicts of pylint's JSON reporter)
+    and pylint's error output.
+    """
+    BATCH_SIZE = 10
+
+    sig_progress = Signal(int, int)
+    sig_finished = Signal(object, str)
+
+    def __init__(self, parent=None, cache=None, jobs=0):
+        QObject.__init__(self, parent)
+        self.cache = cache
+        self.jobs = jobs or QThread.idealThreadCount()
+        self.path = None
+        self.messages = {}
+        self.error_output = ''
+        self._pylintrc = None
+        self._config_hash = ''
+        self._keys = {}
+        self._batches = []
+        self._processes = []
+        self._count = 0
+
+    def get_config_hash(self):
+        """Return the hash of pylint's version and configuration"""
+        import pylint
+        config = pylint.__version__
+        if self._pylintrc is not None:
+            config += get_file_hash(self._pylintrc)
+        return hashlib.sha1(config.encode('utf-8')).hexdigest()
+
+    def is_running(self):
+        """Return True if files are being analyzed"""
+        return bool(self._processes)
+
+    def start(self, path):
+        """Analyze the Python files of project *path*"""
+        self.stop()
+        self.path = path
+        self.messages = {}
+        self.error_output = ''
+        self._pylintrc = find_pylintrc(path)
+        self._config_hash = self.get_config_hash()
+        self._keys = {}
+        filenames = []
+        for filename in get_python_files(path):
+            key = LintCache.get_key(osp.relpath(filename, path),
+                                    get_file_hash(filename),
+                                    self._config_hash)
+            messages = None if self.cache is None else self.cache.get(key)
+            if messages is None:
+                self._keys[filename] = key
+                filenames.append(filename)
+            else:
+                self.messages[filename] = messages
+        self._count = len(filenames)
+        self._batches = [filenames[index:index + self.BATCH_SIZE]
+                         for index in range(0, len(filenames),
+                                            self.BATCH_SIZE)]
+        self._start_processes()
+
+    def stop(self):
+        """Stop analyzing files"""
+        self._batches = []
+        for process, _filenames, _output in self._processes:
+            process.finished.disconnect()
+            process.kill()
+            process.waitForFinished()
+        self._processes = []
+
+    def _start_processes(self):
+        """Start analyzing batches, finishing if there's none left"""
+        while self._batches and len(self._processes) < self.jobs:
+            filenames = self._batches.pop(0)
+            process = QProcess(self)
+            process.setProcessChannelMode(QProcess.SeparateChannels)
+            process.setWorkingDirectory(self.path)
+            output = [QByteArray(), QByteArray()]
+            process.readyReadStandardOutput.connect(
+                lambda process=process, output=output:
+                    output[0].append(process.readAllStandardOutput()))
+            process.readyReadStandardError.connect(
+                lambda process=process, output=output:
+                    output[1].append(process.readAllStandardError()))
+            process.finished.connect(
+                lambda exit_code, exit_status, process=process:
+                    self._process_finished(process, exit_code, exit_status))
+            self._processes.append((process, filenames, output))
+            p_args = ['-m', 'pylint', '--output-format=json']
+            if self._pylintrc is not None:
+                p_args.append('--rcfile=%s' % self._pylintrc)
+            process.start(sys.executable, p_args + filenames)
+            if not process.waitForStarted():
+                self._processes.pop(-1)
+                self.error_output += process.errorString() + '\n'
+        if not self._processes:
+            if self.cache is not None:
+                self.cache.evict()
+            self.sig_finished.emit(self.messages, self.error_output)
+
+    def _process_finished(self, process, exit_code, exit_status):
+        """Read the messages of a finished batch"""
+        for index, (batch_process, filenames, output) in enumerate(
+                                                            self._processes):
+            if batch_process is process:
+                break
+        else:
+            return
+        self._processes.pop(index)
+        output[0].append(process.readAllStandardOutput())
+        output[1].append(process.readAllStandardError())
+        self.error_output += to_text_string(bytes(output[1].data()),
+                                            'utf-8')
+        text = to_text_string(bytes(output[0].data()), 'utf-8').strip()
+        # Pylint exit codes are bit fields, 32 meaning a usage error (no
+        # output at all meaning pylint crashed, unless it found nothing)
+        if exit_status == QProcess.NormalExit and not exit_code & 32 \
+          and (text or not exit_code):
+            messages = self.parse_output(text)
+        else:
+            messages = None
+        if messages is not None:
+            for filename in filenames:
+                file_messages = messages.get(
+                            osp.normcase(osp.abspath(filename)), [])
+                self.messages[filename] = file_messages
+                if self.cache is not None:
+                    self.cache.set(self._keys[filename], file_messages)
+        analyzed = self._count - sum(len(batch) for batch in self._batches) \
+                   - sum(len(filenames) for _process, filenames, _output
+                         in self._processes)
+        self.sig_progress.emit(analyzed, self._count)
+        self._start_processes()
+
+    def parse_output(self, text):
+        """
+        Return the messages of pylint's JSON output *text* by file
+        ({normcased absolute filename: [message]}), or None if it isn't
+        valid
+        """
+        if not text.strip():
+            # No messages at all
+            return {}
+        try:
+            messages = json.loads(text)
+        except ValueError:
+            return None
+        files = {}
+        for message in messages:
+            filename = osp.normcase(osp.abspath(osp.join(self.path,
+                                                         message['path'])))
+            files.setdefault(filename, []).append(message)
+        return files
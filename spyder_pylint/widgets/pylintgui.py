@@ -30,12 +30,14 @@ from spyder import dependencies
 from spyder.config.base import get_conf_path, get_translation
 from spyder.py3compat import getcwd, pickle, to_text_string
 from spyder.utils import icon_manager as ima
+from spyder.utils import programs
 from spyder.utils.encoding import to_unicode_from_fs
 from spyder.utils.qthelpers import create_toolbutton
 from spyder.widgets.comboboxes import (is_module_or_package,
                                        PythonModulesComboBox)
 from spyder.widgets.onecolumntree import OneColumnTree
 from spyder.widgets.variableexplorer.texteditor import TextEditor
+from spyder_pylint.widgets.projectlint import LintCache, ProjectLinter
 
 
 # This is needed for testing this module as a stand alone script
@@ -48,6 +50,33 @@ except KeyError as error:
 locale_codec = QTextCodec.codecForLocale()
 PYLINT_REQVER = '>=0.25'
 PYLINT_VER = pylint.__version__
+# Version from which project analysis (with the JSON reporter) is supported
+PYLINT_PROJECT_REQVER = '1.4'
+
+# Message types of pylint's JSON reporter
+MESSAGE_TYPES = {'convention': 'C:', 'refactor': 'R:', 'warning': 'W:',
+                 'error': 'E:', 'fatal': 'E:'}
+
+
+def get_project_results(file_messages):
+    """
+    Return results of the analysis of a project (as results of the analysis
+    of a file, see PylintWidget.finished) from messages of pylint's JSON
+    reporter by file
+    """
+    results = {'C:': [], 'R:': [], 'W:': [], 'E:': []}
+    for filename in sorted(file_messages):
+        for message in file_messages[filename]:
+            msg_type = MESSAGE_TYPES.get(message['type'])
+            if msg_type is None:
+                continue
+            msg_id = message.get('message-id', message['symbol'])
+            text = message['message']
+            if message.get('obj'):
+                text = '%s: %s' % (message['obj'], text)
+            results[msg_type].append((message['module'], message['line'],
+                                      ' ' + text, msg_id, filename))
+    return results
 dependencies.add("pylint", _("Static code analysis"),
                  required_version=PYLINT_REQVER, installed_version=PYLINT_VER)
 
@@ -105,7 +134,21 @@ class ResultsTree(OneColumnTree):
             if not messages:
                 title_item.setDisabled(True)
             modules = {}
-            for module, lineno, message, msg_id in messages:
+            for result in messages:
+                module, lineno, message, msg_id = result[:4]
+                if len(result) > 4:
+                    # Results of a project, with their file
+                    modname = result[4]
+                    parent = modules.get(modname)
+                    if parent is None:
+                        item = QTreeWidgetItem(title_item, [module],
+                                               QTreeWidgetItem.Type)
+                        item.setIcon(0, ima.icon('python'))
+                        modules[modname] = item
+                        parent = item
+                    self.add_message(parent, modname, lineno, message,
+                                     msg_id)
+                    continue
                 basename = osp.splitext(osp.basename(self.filename))[0]
                 if not module.startswith(basename):
                     # Pylint bug
@@ -132,13 +175,17 @@ class ResultsTree(OneColumnTree):
                         parent = item
                 else:
                     parent = title_item
-                if len(msg_id) > 1:
-                    text = "[%s] %d : %s" % (msg_id, lineno, message)
-                else:
-                    text = "%d : %s" % (lineno, message)
-                msg_item = QTreeWidgetItem(parent, [text], QTreeWidgetItem.Type)
-                msg_item.setIcon(0, ima.icon('arrow'))
-                self.data[id(msg_item)] = (modname, lineno)
+                self.add_message(parent, modname, lineno, message, msg_id)
+
+    def add_message(self, parent, modname, lineno, message, msg_id):
+        """Add the item of a message of module *modname* to *parent*"""
+        if len(msg_id) > 1:
+            text = "[%s] %d : %s" % (msg_id, lineno, message)
+        else:
+            text = "%d : %s" % (lineno, message)
+        msg_item = QTreeWidgetItem(parent, [text], QTreeWidgetItem.Type)
+        msg_item.setIcon(0, ima.icon('arrow'))
+        self.data[id(msg_item)] = (modname, lineno)
 
 
 class PylintWidget(QWidget):
@@ -146,6 +193,7 @@ class PylintWidget(QWidget):
     Pylint widget
     """
     DATAPATH = get_conf_path('pylint.results')
+    CACHEPATH = get_conf_path('pylint_cache')
     VERSION = '1.1.0'
     redirect_stdio = Signal(bool)
     
@@ -217,6 +265,11 @@ class PylintWidget(QWidget):
         self.setLayout(layout)
         
         self.process = None
+        # Analysis of directories (projects), see ProjectLinter
+        self.project_linter = ProjectLinter(self, LintCache(self.CACHEPATH))
+        self.project_linter.sig_progress.connect(self.show_project_progress)
+        self.project_linter.sig_finished.connect(self.project_finished)
+        self.stop_button.clicked.connect(self.stop_project)
         self.set_running_state(False)
         self.show_data()
         
@@ -233,6 +286,18 @@ class PylintWidget(QWidget):
         if self.filecombo.is_valid():
             self.start()
 
+    def analyze_project(self, path):
+        """Analyze all the Python files of project *path*"""
+        path = osp.abspath(to_text_string(path))
+        self.kill_if_running()
+        index, _data = self.get_data(path)
+        if index is None:
+            self.filecombo.addItem(path)
+            self.filecombo.setCurrentIndex(self.filecombo.count()-1)
+        else:
+            self.filecombo.setCurrentIndex(self.filecombo.findText(path))
+        self.start()
+
     @Slot()
     def select_file(self):
         self.redirect_stdio.emit(False)
@@ -245,7 +310,7 @@ class PylintWidget(QWidget):
     def remove_obsolete_items(self):
         """Removing obsolete items"""
         self.rdata = [(filename, data) for filename, data in self.rdata
-                      if is_module_or_package(filename)]
+                      if is_module_or_package(filename) or osp.isdir(filename)]
         
     def get_filenames(self):
         return [filename for filename, _data in self.rdata]
@@ -280,6 +345,10 @@ class PylintWidget(QWidget):
     @Slot()
     def start(self):
         filename = to_text_string(self.filecombo.currentText())
+        if osp.isdir(filename) and programs.check_version(
+                PYLINT_VER, PYLINT_PROJECT_REQVER, '>='):
+            self.start_project(filename)
+            return
         
         self.process = QProcess(self)
         self.process.setProcessChannelMode(QProcess.SeparateChannels)
@@ -315,6 +384,43 @@ class PylintWidget(QWidget):
             QMessageBox.critical(self, _("Error"),
                                  _("Process failed to start"))
     
+    def start_project(self, path):
+        """Analyze the Python files of directory *path* in parallel"""
+        self.output = ''
+        self.error_output = ''
+        self.set_running_state(True)
+        self.ratelabel.setText(_('Analyzing project, please wait...'))
+        self.project_linter.start(path)
+
+    @Slot()
+    def stop_project(self):
+        """Stop project analysis"""
+        if self.project_linter.is_running():
+            self.project_linter.stop()
+            self.set_running_state(False)
+            self.show_data()
+
+    def show_project_progress(self, analyzed, count):
+        """Show the number of analyzed files of the project"""
+        self.ratelabel.setText(_('Analyzing project: %d/%d files') % (
+                                                            analyzed, count))
+
+    def project_finished(self, file_messages, error_output):
+        """Show results of project analysis"""
+        self.set_running_state(False)
+        path = self.project_linter.path
+        self.error_output = error_output
+        self.output = error_output
+        if file_messages:
+            results = get_project_results(file_messages)
+        else:
+            results = None
+        # Files aren't rated, the number of analyzed files is kept instead
+        # of the previous rate
+        self.set_data(path, (time.localtime(), None, len(file_messages),
+                             results))
+        self.show_data(justanalyzed=True)
+
     def set_running_state(self, state=True):
         self.start_button.setEnabled(not state)
         self.stop_button.setEnabled(state)
@@ -397,6 +503,9 @@ class PylintWidget(QWidget):
         self.show_data(justanalyzed=True)
         
     def kill_if_running(self):
+        if self.project_linter.is_running():
+            self.project_linter.stop()
+            self.set_running_state(False)
         if self.process is not None:
             if self.process.state() == QProcess.Running:
                 self.process.kill()
@@ -419,7 +528,18 @@ class PylintWidget(QWidget):
             date_text = ''
         else:
             datetime, rate, previous_rate, results = data
-            if rate is None:
+            if rate is None and results is not None and osp.isdir(filename):
+                # Results of a project: files are analyzed separately, so
+                # they aren't rated
+                text_style = "<span style=\'color: #444444\'><b>%s </b></span>"
+                count = sum(len(messages) for messages in results.values())
+                text = text_style % (_('%d messages in %d files') % (
+                                                    count, previous_rate))
+                self.treewidget.set_results(filename, results)
+                date = to_text_string(time.strftime("%d %b %Y %H:%M", datetime),
+                                      encoding='utf8')
+                date_text = text_style % date
+            elif rate is None:
                 text = _('Analysis did not succeed '
                          '(see output for more details).')
                 self.treewidget.clear_results()
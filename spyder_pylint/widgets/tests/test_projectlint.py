@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for project analysis with pylint."""
+
+# Standard library imports
+import os.path as osp
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.qthelpers import qapplication
+
+# The plugin has to be imported after spyder.plugins (circular imports) and
+# once a QApplication exists (icons are created on import)
+app = qapplication()
+import spyder.plugins  # analysis:ignore
+from spyder_pylint.widgets.projectlint import (get_python_files, LintCache,
+                                               ProjectLinter)
+from spyder_pylint.widgets.pylintgui import get_project_results, PylintWidget
+
+
+@pytest.fixture
+def project(tmpdir):
+    """Create a project with a package and a hidden directory"""
+    tmpdir.join('script.py').write('import os\n')
+    package = tmpdir.mkdir('package')
+    package.join('__init__.py').write('"""Package."""\n')
+    package.join('module.py').write('"""Module."""\n\nprint(undefined)\n')
+    tmpdir.mkdir('.hidden').join('hidden.py').write('')
+    return str(tmpdir)
+
+
+def test_get_python_files(project):
+    """Find the Python files of a project."""
+    assert get_python_files(project) == [
+        osp.join(project, 'script.py'),
+        osp.join(project, 'package', '__init__.py'),
+        osp.join(project, 'package', 'module.py')]
+
+
+def test_project_linter(qtbot, project, tmpdir_factory):
+    """Analyze a project, then only its changed files."""
+    cache = LintCache(str(tmpdir_factory.mktemp('cache')))
+    linter = ProjectLinter(cache=cache, jobs=2)
+    linter.BATCH_SIZE = 1
+    with qtbot.waitSignal(linter.sig_finished, timeout=60000) as blocker:
+        linter.start(project)
+    file_messages = blocker.args[0]
+    script = osp.join(project, 'script.py')
+    module = osp.join(project, 'package', 'module.py')
+    assert len(file_messages) == 3
+    assert 'unused-import' in [message['symbol']
+                               for message in file_messages[script]]
+    assert 'undefined-variable' in [message['symbol']
+                                    for message in file_messages[module]]
+
+    results = get_project_results(file_messages)
+    assert (module, 3) in [(result[4], result[1])
+                           for result in results['E:']]
+
+    # Only the changed file is analyzed again
+    with open(script, 'w') as script_file:
+        script_file.write('"""Script."""\n')
+    progress = []
+    linter.sig_progress.connect(lambda analyzed, count:
+                                progress.append(count))
+    with qtbot.waitSignal(linter.sig_finished, timeout=60000) as blocker:
+        linter.start(project)
+    assert progress == [1]
+    file_messages = blocker.args[0]
+    assert 'unused-import' not in [message['symbol']
+                                   for message in file_messages[script]]
+    assert 'undefined-variable' in [message['symbol']
+                                    for message in file_messages[module]]
+
+    # Files with the same content aren't given each other's messages
+    copy = osp.join(project, 'package', 'copy.py')
+    with open(module) as module_file, open(copy, 'w') as copy_file:
+        copy_file.write(module_file.read())
+    progress[:] = []
+    with qtbot.waitSignal(linter.sig_finished, timeout=60000) as blocker:
+        linter.start(project)
+    assert progress == [1]
+    assert set(message['module'] for message in blocker.args[0][copy]) == \
+        set(['package.copy'])
+
+
+def test_analyze_project(qtbot, project, tmpdir_factory, monkeypatch):
+    """Show the results of a project analysis."""
+    tmpdir = tmpdir_factory.mktemp('conf')
+    monkeypatch.setattr(PylintWidget, 'DATAPATH',
+                        str(tmpdir.join('pylint.results')))
+    monkeypatch.setattr(PylintWidget, 'CACHEPATH', str(tmpdir.join('cache')))
+    widget = PylintWidget(None)
+    qtbot.addWidget(widget)
+    with qtbot.waitSignal(widget.project_linter.sig_finished, timeout=60000):
+        widget.analyze_project(project)
+    assert widget.start_button.isEnabled()
+    assert '3 files' in widget.ratelabel.text()
+    _index, data = widget.get_data(project)
+    assert data[3]['E:']
+    assert widget.treewidget.topLevelItemCount() == 4
+
+
+if __name__ == "__main__":
+    pytest.main()